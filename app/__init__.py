@@ -79,6 +79,27 @@ def create_app(config_name='default'):
     # Initialize security logger
     security_logger.init_app(app)
     
+    # Initialize live feed (SSE pub/sub, Redis varsa worker'lar arası)
+    from app.services.live_feed import live_feed
+    live_feed.init_app(app)
+    
+    # Initialize report cache (süreç içi bellek, Redis varsa worker'lar arası)
+    from app.services.report_cache import report_cache
+    report_cache.init_app(app)
+    
+    # Initialize seating type registry (süreç içi, cache_versions ile tazelenir)
+    from app.services.seating_type_registry import seating_type_registry
+    seating_type_registry.init_app(app)
+    
+    # Initialize event versions (koşullu GET için etkinlik değişiklik sayaçları)
+    from app.services.event_versions import event_versions
+    event_versions.init_app(app)
+    
+    # Initialize background job queue (thread havuzu veya Redis listesi)
+    from app.services.job_queue import job_queue
+    from app.services import background_tasks  # noqa: görev kayıtları
+    job_queue.init_app(app)
+    
     # Initialize session (Redis veya Filesystem)
     if not app.config.get('TESTING'):
         session_type = app.config.get('SESSION_TYPE', 'filesystem')
@@ -133,7 +154,7 @@ def create_app(config_name='default'):
         session.init_app(app)
 
     # Register blueprints
-    from app.routes import auth, admin, event, template, reservation, report, controller, checkin, security
+    from app.routes import auth, admin, event, template, reservation, report, controller, checkin, security, jobs
     app.register_blueprint(auth.bp)
     app.register_blueprint(admin.bp)
     app.register_blueprint(event.bp, url_prefix='/event')
@@ -143,6 +164,7 @@ def create_app(config_name='default'):
     app.register_blueprint(checkin.bp)
     app.register_blueprint(controller.bp)
     app.register_blueprint(security.bp)
+    app.register_blueprint(jobs.bp, url_prefix='/jobs')
 
     # Add context processors
     from app.utils.context_processors import inject_globals
@@ -5,3 +5,7 @@ from .user import User
 from .event import Event
 from .seating import SeatingType, EventSeating, SeatingLayoutTemplate, EventTemplate
 from .reservation import Reservation, ReservationStatus, ActivityLog
+from .occupancy import EventOccupancy
+from .rollup import ReservationDailyRollup, ReportRollupCoverage
+from .cache_version import CacheVersion
+from .job import BackgroundJob
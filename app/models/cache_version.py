@@ -0,0 +1,14 @@
+from datetime import datetime
+from app import db
+
+
+class CacheVersion(db.Model):
+    """Süreç içi önbellekler için paylaşılan sürüm damgaları (değişiklikte artar)"""
+    __tablename__ = 'cache_versions'
+
+    name = db.Column(db.String(100), primary_key=True)  # "seating_types"
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<CacheVersion {self.name}={self.version}>'
@@ -48,6 +48,11 @@ class Event(db.Model):
     seatings = db.relationship('EventSeating', backref='event', lazy=True, cascade='all, delete-orphan')
     reservations = db.relationship('Reservation', backref='event', lazy=True, cascade='all, delete-orphan')
 
+    __table_args__ = (
+        db.Index('ix_events_company_status_date', 'company_id', 'status', 'event_date'),
+        db.Index('ix_events_company_created', 'company_id', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f'<Event {self.name}>'
 
@@ -56,4 +61,6 @@ class Event(db.Model):
         """Calculate total seating capacity for the event"""
         if not self.seatings:
             return 0
-        return sum(seating.seating_type.capacity for seating in self.seatings)
+        # Oturum tipleri süreç içi kayıttan okunur (oturum başına lazy yükleme yok)
+        from app.services.seating_type_registry import seating_type_registry
+        return sum(seating_type_registry.capacity(seating.seating_type_id) for seating in self.seatings)
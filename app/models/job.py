@@ -0,0 +1,19 @@
+from datetime import datetime
+from app import db
+
+
+class BackgroundJob(db.Model):
+    """Arka plan işlerinin durumu ve sonucu (thread backend'inde tüm worker'lar okur)"""
+    __tablename__ = 'background_jobs'
+
+    id = db.Column(db.String(32), primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    company_id = db.Column(db.Integer, nullable=True)
+    payload = db.Column(db.Text, nullable=False)  # İş kaydı (JSON)
+    result_data = db.Column(db.LargeBinary, nullable=True)  # Üretilen dosya
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<BackgroundJob {self.name} {self.id} {self.status}>'
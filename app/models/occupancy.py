@@ -0,0 +1,38 @@
+from datetime import datetime
+from app import db
+
+
+class EventOccupancy(db.Model):
+    """Etkinlik başına canlı doluluk sayaçları (rezervasyon/iptal/check-in ile güncellenir)"""
+    __tablename__ = 'event_occupancy'
+
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id', ondelete='CASCADE'), primary_key=True)
+    total_capacity = db.Column(db.Integer, nullable=False, default=0)
+    reserved_people = db.Column(db.Integer, nullable=False, default=0)  # Aktif rezervasyonlardaki kişi sayısı
+    active_reservations = db.Column(db.Integer, nullable=False, default=0)
+    total_reservations = db.Column(db.Integer, nullable=False, default=0)  # İptaller dahil
+    checked_in_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    event = db.relationship(
+        'Event',
+        backref=db.backref('occupancy', uselist=False, cascade='all, delete-orphan')
+    )
+
+    def __repr__(self):
+        return f'<EventOccupancy event={self.event_id}>'
+
+    def to_dict(self):
+        available = self.total_capacity - self.reserved_people
+        occupancy_rate = (self.reserved_people / self.total_capacity * 100) if self.total_capacity > 0 else 0
+        return {
+            'event_id': self.event_id,
+            'total_capacity': self.total_capacity,
+            'reserved_people': self.reserved_people,
+            'available_seats': available,
+            'active_reservations': self.active_reservations,
+            'total_reservations': self.total_reservations,
+            'checked_in_count': self.checked_in_count,
+            'occupancy_rate': round(occupancy_rate, 1)
+        }
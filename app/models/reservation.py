@@ -1,9 +1,10 @@
 from datetime import datetime
 from enum import Enum
 import os
-import qrcode
 from io import BytesIO
+from sqlalchemy import DDL
 from app import db
+from app.utils.search_text import SEARCH_TEXT_LENGTH, build_search_text
 
 
 class ReservationStatus(Enum):
@@ -32,68 +33,90 @@ class Reservation(db.Model):
     notes = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Katlanmış ad, soyad, kod ve telefon rakamları (app/utils/search_text.py)
+    search_text = db.Column(db.String(SEARCH_TEXT_LENGTH))
+
+    __table_args__ = (
+        db.Index('ix_reservations_event_status', 'event_id', 'status'),
+        db.Index('ix_reservations_event_checked_in', 'event_id', 'checked_in'),
+        db.Index('ix_reservations_seating_status', 'seating_id', 'status'),
+        db.Index('ix_reservations_phone', 'phone'),
+        # Keyset sayfalama: (created_at, id) sırası
+        db.Index('ix_reservations_event_created', 'event_id', 'created_at', 'id'),
+        db.Index('ix_reservations_created', 'created_at', 'id'),
+        # Aktif rezervasyonlar: doluluk, oturum müsaitliği ve check-in listeleri
+        db.Index(
+            'ix_reservations_active_event_seating', 'event_id', 'seating_id',
+            postgresql_where=db.text("status = 'ACTIVE'"),
+            sqlite_where=db.text("status = 'ACTIVE'")
+        ),
+        # Arama: pg_trgm ile '%ifade%' araması; SQLite'ta bellek içi indeks kullanılır
+        db.Index(
+            'ix_reservations_search_trgm', 'search_text',
+            postgresql_using='gin',
+            postgresql_ops={'search_text': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
 
     def __repr__(self):
         return f'<Reservation {self.reservation_code}>'
 
     @property
     def customer_name(self):
-        if self.first_name and self.last_name:
-            return f"{self.first_name} {self.last_name}"
-        elif self.first_name:
-            return self.first_name
+        return self.format_customer_name(self.first_name, self.last_name)
+
+    @staticmethod
+    def format_customer_name(first_name, last_name):
+        if first_name and last_name:
+            return f"{first_name} {last_name}"
+        elif first_name:
+            return first_name
         else:
             return "İsimsiz"
 
     def generate_qr_code(self, save_path='app/static/uploads/qr'):
-        """Generate QR code for this reservation"""
-        # Create directory if it doesn't exist
-        os.makedirs(save_path, exist_ok=True)
-        
-        # Generate QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(self.reservation_code)
-        qr.make(fit=True)
-        
-        # Create image
-        img = qr.make_image(fill_color="black", back_color="white")
+        """Generate QR code file for this reservation"""
+        from app.services.qr_service import get_qr_service
         
-        # Save to file
-        filename = f"{self.reservation_code}.png"
-        filepath = os.path.join(save_path, filename)
-        
-        with open(filepath, 'wb') as f:
-            img.save(f)
+        filepath = get_qr_service().save_png(self.reservation_code, save_path)
         
         # Update database path (relative path for web access)
-        self.qr_code_path = f"uploads/qr/{filename}"
+        self.qr_code_path = f"uploads/qr/{os.path.basename(filepath)}"
         
         return filepath
     
     def get_qr_code_bytes(self):
         """Get QR code as bytes (for email attachments)"""
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(self.reservation_code)
-        qr.make(fit=True)
-        
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Save to BytesIO
-        img_bytes = BytesIO()
-        img.save(img_bytes)
-        img_bytes.seek(0)
+        from app.services.qr_service import get_qr_service
         
-        return img_bytes
+        return BytesIO(get_qr_service().png_bytes(self.reservation_code))
+
+
+db.event.listen(
+    Reservation.__table__,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+)
+
+
+@db.event.listens_for(Reservation, 'before_insert')
+def _set_search_text(mapper, connection, target):
+    """Yeni rezervasyonun search_text'ini doldurur (indeks yeni ID'leri kendisi ekler)"""
+    target.search_text = build_search_text(
+        target.first_name, target.last_name, target.phone, target.reservation_code
+    )
+
+
+@db.event.listens_for(Reservation, 'before_update')
+def _refresh_search_text(mapper, connection, target):
+    """Aranan alanlar değiştiğinde search_text'i günceller, indekslenmiş metni düşürür"""
+    search_text = build_search_text(
+        target.first_name, target.last_name, target.phone, target.reservation_code
+    )
+    if target.search_text != search_text:
+        target.search_text = search_text
+        from app.services.search_service import invalidate_search_index
+        invalidate_search_index(target.event_id)
 
 
 class ActivityLog(db.Model):
@@ -0,0 +1,41 @@
+from datetime import datetime
+from app import db
+
+
+class ReservationDailyRollup(db.Model):
+    """
+    Rapor fact tablosu: etkinlik, gün ve saat başına rezervasyon hareketleri
+
+    Her sayaç hareketin olduğu güne/saate (UTC) yazılır: oluşturma
+    created_at'e, iptal iptal anına, check-in check-in anına. Saat sütunu
+    günlük satırları saat histogramına böler.
+    """
+    __tablename__ = 'reservation_daily_rollup'
+
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id', ondelete='CASCADE'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    hour = db.Column(db.SmallInteger, primary_key=True)
+    company_id = db.Column(db.Integer, db.ForeignKey('companies.id', ondelete='CASCADE'), nullable=False)
+    created = db.Column(db.Integer, nullable=False, default=0)
+    cancelled = db.Column(db.Integer, nullable=False, default=0)
+    checked_in = db.Column(db.Integer, nullable=False, default=0)
+    people = db.Column(db.Integer, nullable=False, default=0)  # O gün oluşturulan rezervasyonlardaki kişi sayısı
+
+    __table_args__ = (
+        db.Index('ix_reservation_daily_rollup_company_day', 'company_id', 'day'),
+    )
+
+    def __repr__(self):
+        return f'<ReservationDailyRollup event={self.event_id} {self.day} {self.hour:02d}h>'
+
+
+class ReportRollupCoverage(db.Model):
+    """Şirket başına rollup kapsamı: bu günden itibaren rollup temel tablolarla birebir"""
+    __tablename__ = 'report_rollup_coverage'
+
+    company_id = db.Column(db.Integer, db.ForeignKey('companies.id', ondelete='CASCADE'), primary_key=True)
+    covered_from = db.Column(db.Date)  # None: tüm geçmiş
+    built_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ReportRollupCoverage company={self.company_id} from={self.covered_from}>'
@@ -45,6 +45,10 @@ class EventSeating(db.Model):
     # Relationships
     reservations = db.relationship('Reservation', backref='seating', lazy=True)
 
+    __table_args__ = (
+        db.Index('ix_event_seatings_event_status', 'event_id', 'status'),
+    )
+
     def __repr__(self):
         return f'<EventSeating {self.seat_number}>'
 
@@ -22,6 +22,10 @@ class User(UserMixin, db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_users_company_created', 'company_id', 'created_at', 'id'),
+    )
+
     # Relationships
     activity_logs = db.relationship('ActivityLog', backref='user', lazy=True, cascade='all, delete-orphan')
     checkins = db.relationship('Reservation', foreign_keys='Reservation.checked_in_by', lazy=True)
@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, abort
 from flask_login import login_required, current_user
 from marshmallow import ValidationError
 from sqlalchemy import func
@@ -8,15 +8,17 @@ from app.models import (
     Company,
     Event,
     SeatingType,
-    EventSeating,
     Reservation,
-    ReservationStatus,
     SeatingLayoutTemplate,
     EventTemplate,
 )
 from app.utils.decorators import admin_required
 from app.schemas.user_schema import UserSchema, PasswordChangeSchema
 from app.services.security_logger import security_logger
+from app.services.occupancy_service import OccupancyService
+from app.services.live_feed import live_feed, company_channel
+from app.services.seating_type_registry import seating_type_registry
+from app.utils.pagination import keyset_paginate, page_args
 
 bp = Blueprint('admin', __name__)
 
@@ -29,12 +31,9 @@ def dashboard():
     # Temel sayılar
     users_count = User.query.filter_by(company_id=current_user.company_id).count()
     events_count = Event.query.filter_by(company_id=current_user.company_id).count()
-    reservations_count = (
-        db.session.query(db.func.count(Reservation.id))
-        .join(Event, Reservation.event_id == Event.id)
-        .filter(Event.company_id == current_user.company_id)
-        .scalar()
-    ) or 0
+    # Canlı doluluk sayaçları (etkinlik başına artımlı tutulur)
+    occupancy = OccupancyService.get_company_totals(current_user.company_id)
+    reservations_count = occupancy['total_reservations']
     layout_templates_count = SeatingLayoutTemplate.query.filter_by(
         company_id=current_user.company_id
     ).count()
@@ -46,14 +45,10 @@ def dashboard():
     # 🚨 KRİTİK DASHBOARD İSTATİSTİKLERİ (Yüksek Öncelik)
     
     # 1. TOPLAM KAPASİTE (Tüm etkinliklerdeki oturma kapasitesi toplamı)
-    total_capacity = db.session.query(func.sum(SeatingType.capacity)).join(
-        EventSeating, SeatingType.id == EventSeating.seating_type_id
-    ).join(Event, EventSeating.event_id == Event.id).filter(Event.company_id == current_user.company_id).scalar() or 0
+    total_capacity = occupancy['total_capacity']
 
     # 2. REZERVE EDİLEN KOLTUK (Aktif rezervasyonlardaki toplam kişi sayısı)
-    reserved_seats = db.session.query(func.sum(Reservation.number_of_people)).filter(
-        Reservation.status == ReservationStatus.ACTIVE
-    ).scalar() or 0
+    reserved_seats = occupancy['reserved_people']
 
     # 3. BOŞ KOLTUK
     available_seats = total_capacity - reserved_seats
@@ -74,9 +69,7 @@ def dashboard():
     ).scalar() or 0
 
     # 7. AKTİF REZERVASYON SAYISI
-    active_reservations = db.session.query(func.count(Reservation.id)).filter(
-        Reservation.status == ReservationStatus.ACTIVE
-    ).scalar() or 0
+    active_reservations = occupancy['active_reservations']
 
     return render_template(
         'admin/dashboard.html',
@@ -95,12 +88,52 @@ def dashboard():
         active_reservations=active_reservations,
     )
 
+@bp.route('/api/live-feed')
+@login_required
+@admin_required
+def live_feed_stream():
+    """Şirket geneli canlı rezervasyon/check-in akışı (Server-Sent Events)"""
+    snapshot = OccupancyService.get_company_totals(current_user.company_id)
+    return live_feed.stream(company_channel(current_user.company_id), snapshot)
+
 @bp.route('/users')
 @login_required
 @admin_required
 def users():
-    users = User.query.filter_by(company_id=current_user.company_id).all()
-    return render_template('admin/users.html', users=users)
+    page = _users_page()
+    return render_template('admin/users.html', users=page, page=page)
+
+@bp.route('/api/users')
+@login_required
+@admin_required
+def api_users():
+    """JSON API: Şirket kullanıcıları (keyset sayfalı, yeniden eskiye)"""
+    page = _users_page()
+    return jsonify({
+        'users': [
+            {
+                'id': user.id,
+                'username': user.username,
+                'email': user.email,
+                'first_name': user.first_name,
+                'last_name': user.last_name,
+                'role': user.role,
+                'is_active': user.is_active,
+                'created_at': user.created_at.isoformat() if user.created_at else None
+            }
+            for user in page
+        ],
+        'next_cursor': page.next_cursor
+    })
+
+def _users_page():
+    """Şirket kullanıcılarının istenen sayfası (cursor geçersizse 400)"""
+    cursor, per_page = page_args()
+    query = User.query.filter_by(company_id=current_user.company_id)
+    try:
+        return keyset_paginate(query, User, cursor, per_page)
+    except ValueError:
+        abort(400)
 
 @bp.route('/users/create', methods=['POST'])
 @login_required
@@ -272,7 +305,7 @@ def change_own_password():
 @admin_required
 def seating_types():
     """List all seating types"""
-    types = SeatingType.query.all()
+    types = seating_type_registry.all()
     return render_template('admin/seating_types.html', seating_types=types)
 
 
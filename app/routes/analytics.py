@@ -2,7 +2,7 @@
 Analytics Routes - Gelişmiş raporlama ve analiz API endpoint'leri
 """
 
-from flask import Blueprint, request, jsonify, send_file, render_template
+from flask import Blueprint, request, jsonify, send_file, render_template, abort
 from flask_login import login_required, current_user
 from marshmallow import ValidationError
 from app import db
@@ -10,6 +10,12 @@ from app.models import Event
 from app.utils.decorators import admin_required
 from app.services.analytics_service import AnalyticsService
 from app.services.export_service import ExportService
+from app.services.occupancy_service import OccupancyService
+from app.services.job_queue import job_queue
+from app.services.report_cache import report_cache
+from app.services.event_versions import event_versions
+from app.utils.http_payload import json_response
+from app.routes.jobs import job_accepted
 from datetime import datetime
 import io
 
@@ -46,24 +52,24 @@ def get_event_analytics(event_id):
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         report_type = request.args.get('type', 'overview')
-        
-        if report_type == 'overview':
-            data = analytics_service.get_event_overview_analytics(event_id, start_date, end_date)
-        elif report_type == 'trends':
-            days = int(request.args.get('days', 30))
-            data = analytics_service.get_reservation_trends(event_id, days)
-        elif report_type == 'seating':
-            data = analytics_service.get_seating_analysis(event_id)
-        elif report_type == 'customers':
-            data = analytics_service.get_customer_analysis(event_id)
-        elif report_type == 'timing':
-            data = analytics_service.get_time_based_analysis(event_id)
-        elif report_type == 'comparative':
-            comparison_days = int(request.args.get('comparison_days', 30))
-            data = analytics_service.get_comparative_analysis(current_user.company_id, comparison_days)
-        else:
+        days = int(request.args.get('days', 30))
+        comparison_days = int(request.args.get('comparison_days', 30))
+        
+        def compute():
+            if report_type == 'overview':
+                return analytics_service.get_event_overview_analytics(event_id, start_date, end_date)
+            elif report_type == 'trends':
+                return analytics_service.get_reservation_trends(event_id, days)
+            elif report_type == 'seating':
+                return analytics_service.get_seating_analysis(event_id)
+            elif report_type == 'customers':
+                return analytics_service.get_customer_analysis(event_id)
+            elif report_type == 'timing':
+                return analytics_service.get_time_based_analysis(event_id)
+            elif report_type == 'comparative':
+                return analytics_service.get_comparative_analysis(current_user.company_id, comparison_days)
             # Tam analiz
-            data = {
+            return {
                 'overview': analytics_service.get_event_overview_analytics(event_id, start_date, end_date),
                 'trends': analytics_service.get_reservation_trends(event_id),
                 'seating': analytics_service.get_seating_analysis(event_id),
@@ -71,6 +77,21 @@ def get_event_analytics(event_id):
                 'timing': analytics_service.get_time_based_analysis(event_id)
             }
         
+        # Karşılaştırmalı analiz şirket geneli; diğerleri yalnızca bu etkinliğe bağlı
+        data = report_cache.get_or_compute(
+            f'event_analytics:{report_type}',
+            compute,
+            company_id=current_user.company_id,
+            event_id=None if report_type == 'comparative' else event_id,
+            params={
+                'event_id': event_id,
+                'start_date': start_date,
+                'end_date': end_date,
+                'days': days,
+                'comparison_days': comparison_days
+            }
+        )
+        
         return jsonify({
             'success': True,
             'data': data,
@@ -142,6 +163,9 @@ def export_pdf():
             company_id=current_user.company_id
         ).first_or_404()
         
+        if data.get('async'):
+            return _enqueue_export(event, 'pdf', report_type=report_type)
+        
         export_service = ExportService()
         pdf_file = export_service.export_to_pdf(event_id, report_type)
         
@@ -175,6 +199,9 @@ def export_excel():
             company_id=current_user.company_id
         ).first_or_404()
         
+        if data.get('async'):
+            return _enqueue_export(event, 'excel', include_analytics=bool(include_analytics))
+        
         export_service = ExportService()
         excel_file = export_service.export_to_excel(event_id, include_analytics)
         
@@ -208,6 +235,9 @@ def export_csv():
             company_id=current_user.company_id
         ).first_or_404()
         
+        if data.get('async'):
+            return _enqueue_export(event, 'csv', file_format=file_format)
+        
         export_service = ExportService()
         csv_file = export_service.export_to_csv(event_id, file_format)
         
@@ -240,6 +270,9 @@ def export_json():
             company_id=current_user.company_id
         ).first_or_404()
         
+        if data.get('async'):
+            return _enqueue_export(event, 'json')
+        
         export_service = ExportService()
         json_file = export_service.create_json_export(event_id)
         
@@ -251,21 +284,35 @@ def export_json():
             'message': f'JSON export hatası: {str(e)}'
         }), 500
 
+def _enqueue_export(event, export_format, **options):
+    """Export'u arka plan işi olarak başlatır (async: true)"""
+    job_id = job_queue.enqueue(
+        'event_export',
+        company_id=current_user.company_id,
+        user_id=current_user.id,
+        event_id=event.id,
+        export_format=export_format,
+        **options
+    )
+    return job_accepted(job_id)
+
 @bp.route('/api/events/<int:event_id>/dashboard-data', methods=['GET'])
 @login_required
 @admin_required
 def get_dashboard_data(event_id):
-    """Dashboard için hızlı veri"""
-    event = Event.query.filter_by(
-        id=event_id,
-        company_id=current_user.company_id
-    ).first_or_404()
+    """Dashboard için hızlı veri (değişmediyse 304)"""
+    # Trendler güne bağlı: tarih de ETag'in parçası
+    etag = event_versions.etag(event_id, current_user.company_id,
+                               extra=[datetime.now().date().isoformat()])
+    if etag is None:
+        abort(404)
     
-    try:
+    def build():
+        event = db.session.get(Event, event_id)
         analytics_service = AnalyticsService()
         
-        # Dashboard metrikleri
-        overview = analytics_service.get_event_overview_analytics(event_id)
+        # Dashboard metrikleri - kapasite/rezervasyon/check-in canlı sayaçlardan
+        counters = OccupancyService.get_counters(event_id)
         trends = analytics_service.get_reservation_trends(event_id, days=7)
         seating = analytics_service.get_seating_analysis(event_id)
         
@@ -278,12 +325,14 @@ def get_dashboard_data(event_id):
                 'status': event.status.value if event.status else None
             },
             'quick_stats': {
-                'total_capacity': overview['capacity_metrics']['total_capacity'],
-                'active_reservations': overview['capacity_metrics']['active_reservations'],
-                'available_seats': overview['capacity_metrics']['available_seats'],
-                'occupancy_rate': overview['capacity_metrics']['occupancy_rate'],
-                'checkin_rate': overview['reservation_metrics']['checkin_rate'],
-                'checked_in': overview['reservation_metrics']['checked_in']
+                'total_capacity': counters.total_capacity,
+                'active_reservations': counters.active_reservations,
+                'available_seats': counters.total_capacity - counters.reserved_people,
+                'occupancy_rate': counters.to_dict()['occupancy_rate'],
+                'checkin_rate': round(
+                    counters.checked_in_count / counters.active_reservations * 100, 2
+                ) if counters.active_reservations > 0 else 0,
+                'checked_in': counters.checked_in_count
             },
             'recent_trends': trends['daily_trends'][-7:] if trends['daily_trends'] else [],
             'seating_status': {
@@ -293,11 +342,14 @@ def get_dashboard_data(event_id):
             }
         }
         
-        return jsonify({
+        return {
             'success': True,
             'data': dashboard_data
-        })
-        
+        }
+    
+    try:
+        return json_response(build, etag=etag)
+    
     except Exception as e:
         return jsonify({
             'success': False,
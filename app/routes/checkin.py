@@ -5,6 +5,13 @@ from datetime import datetime
 from app import db, limiter
 from app.models import Reservation, Event
 from app.utils.decorators import controller_required, admin_required
+from app.services import reservation_events
+from app.services.checkin_service import (
+    CheckinService,
+    CHECKIN_NOT_FOUND,
+    CHECKIN_DUPLICATE,
+    CHECKIN_CANCELLED,
+)
 
 bp = Blueprint('checkin', __name__, url_prefix='/checkin')
 
@@ -24,26 +31,24 @@ def scan():
     data = request.get_json()
     code = data.get('code')
     
-    reservation = Reservation.query.filter_by(
-        reservation_code=code
-    ).first()
+    # Kod haritası bellekte; tekrar/bulunamadı okutmaları DB'ye gitmez
+    result = CheckinService().check_in(code, user_id=current_user.id) if code else None
     
-    if reservation:
-        if reservation.checked_in:
-            return jsonify({'error': 'Bu rezervasyon zaten check-in yapılmış!'})
-        
-        reservation.checked_in = True
-        reservation.checked_in_at = db.func.now()
-        reservation.checked_in_by = current_user.id
-        db.session.commit()
-        
-        return jsonify({'success': True, 'reservation': {
-            'name': reservation.customer_name,
-            'phone': reservation.phone,
-            'seat_number': reservation.seating.seat_number if reservation.seating else 'N/A'
-        }})
+    if result is None or result.status == CHECKIN_NOT_FOUND:
+        return jsonify({'error': 'Rezervasyon bulunamadı!'})
+    
+    if result.status == CHECKIN_DUPLICATE:
+        return jsonify({'error': 'Bu rezervasyon zaten check-in yapılmış!'})
+    
+    if result.status == CHECKIN_CANCELLED:
+        return jsonify({'error': 'Bu rezervasyon iptal edilmiş!'})
     
-    return jsonify({'error': 'Rezervasyon bulunamadı!'})
+    entry = result.entry
+    return jsonify({'success': True, 'reservation': {
+        'name': entry.name,
+        'phone': entry.phone,
+        'seat_number': entry.seat_number
+    }})
 
 @bp.route('/manual/<int:id>', methods=['POST'])
 @login_required
@@ -58,6 +63,7 @@ def manual_checkin(id):
         reservation.checked_in = True
         reservation.checked_in_at = datetime.utcnow()
         reservation.checked_in_by = current_user.id
+        reservation_events.on_checked_in(reservation)
         db.session.commit()
         flash('Check-in başarıyla tamamlandı!', 'success')
     
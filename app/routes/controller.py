@@ -1,12 +1,28 @@
 # -*- coding: utf-8 -*-
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, current_app, abort
 from flask_login import login_required, current_user
 from app import db
 from app.models import Event, Reservation, EventSeating
+from app.models.reservation import ReservationStatus
 from app.services.report_service import ReportService
+from app.services.seating_map_service import SeatingMapService
+from app.services.occupancy_service import OccupancyService
+from app.services.search_service import ReservationSearchService
+from app.services.seating_type_registry import seating_type_registry
+from app.services.live_feed import live_feed, event_channel
+from app.services.event_versions import event_versions
+from app.services.checkin_service import (
+    CheckinService,
+    CHECKIN_NOT_FOUND,
+    CHECKIN_DUPLICATE,
+    CHECKIN_CANCELLED,
+)
 from app.utils.decorators import controller_required
+from app.utils.pagination import keyset_paginate, page_args
+from app.utils.http_payload import json_response
 from datetime import datetime, timedelta
 from sqlalchemy import func, and_
+from sqlalchemy.orm import joinedload
 
 bp = Blueprint('controller', __name__)
 
@@ -71,20 +87,62 @@ def reservations():
     status = request.args.get('status', '').strip()
     checked_in = request.args.get('checked_in', '').strip()
     
-    # Base query
-    query = Reservation.query.filter_by(event_id=event.id)
+    page = _event_reservations_page(event.id, search, status, checked_in)
+    
+    return render_template('controller/reservations.html',
+                         event=event,
+                         reservations=page,
+                         page=page,
+                         search=search,
+                         status=status,
+                         checked_in=checked_in)
+
+@bp.route('/api/event-reservations')
+@login_required
+@controller_required
+def api_event_reservations():
+    """JSON API: Aktif etkinliğin rezervasyonları (filtreli, keyset sayfalı)"""
+    if 'active_event_id' not in session:
+        return jsonify({'error': 'Aktif etkinlik seçilmedi'}), 400
+    
+    page = _event_reservations_page(
+        session['active_event_id'],
+        request.args.get('search', '').strip(),
+        request.args.get('status', '').strip(),
+        request.args.get('checked_in', '').strip()
+    )
+    
+    return jsonify({
+        'reservations': [
+            {
+                'id': r.id,
+                'code': r.reservation_code,
+                'name': r.customer_name,
+                'phone': r.phone,
+                'people': r.number_of_people,
+                'seating': r.seating.seat_number if r.seating else 'N/A',
+                'checked_in': r.checked_in,
+                'status': r.status.value if r.status else None,
+                'created_at': r.created_at.isoformat() if r.created_at else None
+            }
+            for r in page
+        ],
+        'next_cursor': page.next_cursor
+    })
+
+def _event_reservations_page(event_id, search, status, checked_in):
+    """Etkinlik rezervasyonlarının filtrelenmiş sayfası (cursor geçersizse 400)"""
+    query = Reservation.query.filter_by(event_id=event_id).options(joinedload(Reservation.seating))
     
     # Filtreler
     if search:
-        query = query.filter(
-            Reservation.phone.like(f'%{search}%') |
-            Reservation.first_name.like(f'%{search}%') |
-            Reservation.last_name.like(f'%{search}%') |
-            Reservation.reservation_code.like(f'%{search}%')
-        )
+        query = ReservationSearchService(event_id).filter(query, search)
     
     if status:
-        query = query.filter(Reservation.status == status)
+        try:
+            query = query.filter(Reservation.status == ReservationStatus(status))
+        except ValueError:
+            pass
     
     if checked_in:
         if checked_in == 'true':
@@ -92,14 +150,11 @@ def reservations():
         elif checked_in == 'false':
             query = query.filter(Reservation.checked_in == False)
     
-    reservations = query.order_by(Reservation.created_at.desc()).all()
-    
-    return render_template('controller/reservations.html',
-                         event=event,
-                         reservations=reservations,
-                         search=search,
-                         status=status,
-                         checked_in=checked_in)
+    cursor, per_page = page_args()
+    try:
+        return keyset_paginate(query, Reservation, cursor, per_page)
+    except ValueError:
+        abort(400)
 
 @bp.route('/api/reservations/search')
 @login_required
@@ -114,16 +169,16 @@ def api_search_reservations():
     if not query:
         return jsonify({'reservations': []})
     
-    reservations = Reservation.query.filter(
-        Reservation.event_id == session['active_event_id'],
-        Reservation.status == 'active',
-        (
-            Reservation.phone.like(f'%{query}%') |
-            Reservation.first_name.like(f'%{query}%') |
-            Reservation.last_name.like(f'%{query}%') |
-            Reservation.reservation_code.like(f'%{query}%')
-        )
-    ).limit(10).all()
+    event_id = session['active_event_id']
+    reservations = ReservationSearchService(event_id).filter(
+        Reservation.query.filter(
+            Reservation.event_id == event_id,
+            Reservation.status == ReservationStatus.ACTIVE
+        ),
+        query
+    ).options(
+        joinedload(Reservation.seating)
+    ).order_by(Reservation.id.desc()).limit(10).all()
     
     results = []
     for r in reservations:
@@ -148,45 +203,41 @@ def seating_map():
         return redirect(url_for('controller.dashboard'))
     
     event = Event.query.get(session['active_event_id'])
-    seatings = EventSeating.query.filter_by(event_id=event.id).all()
-    
-    # Oturum durumlarını hesapla
-    seating_data = []
-    for seating in seatings:
-        status = 'available'
-        reservation = None
-        
-        if seating.status == 'reserved':
-            active_res = Reservation.query.filter_by(
-                seating_id=seating.id,
-                status='active'
-            ).first()
-            if active_res:
-                status = 'reserved'
-                reservation = active_res
-        elif seating.status == 'disabled':
-            status = 'disabled'
-        
-        seating_data.append({
-            'id': seating.id,
-            'number': seating.seat_number,
-            'type': seating.seating_type.name,
-            'capacity': seating.seating_type.capacity,
-            'status': status,
-            'position_x': seating.position_x,
-            'position_y': seating.position_y,
-            'color': seating.color_code or seating.seating_type.color_code,
-            'reservation': {
-                'name': reservation.customer_name if reservation else None,
-                'phone': reservation.phone if reservation else None,
-                'checked_in': reservation.checked_in if reservation else None
-            } if reservation else None
-        })
+    seating_data = SeatingMapService(event.id).get_seating_map()
     
     return render_template('controller/seating_map.html',
                          event=event,
                          seatings=seating_data)
 
+@bp.route('/api/seating-map')
+@login_required
+@controller_required
+def api_seating_map():
+    """AJAX oturum haritası verisi (periyodik yenileme için)"""
+    if 'active_event_id' not in session:
+        return jsonify({'error': 'Aktif etkinlik seçilmedi'}), 400
+    
+    event_id = session['active_event_id']
+    
+    # Harita değişmediyse 304 (oturum/rezervasyon sorgusu çalışmaz)
+    return json_response(lambda: {
+        'event_id': event_id,
+        'seatings': SeatingMapService(event_id).get_seating_map()
+    }, etag=event_versions.etag(event_id, seating_types=True))
+
+@bp.route('/api/events/<int:event_id>/live')
+@login_required
+@controller_required
+def live_feed_stream(event_id):
+    """Etkinlik için canlı check-in/rezervasyon akışı (Server-Sent Events)"""
+    event = Event.query.filter_by(
+        id=event_id,
+        company_id=current_user.company_id
+    ).first_or_404()
+    
+    snapshot = OccupancyService.get_counters(event.id).to_dict()
+    return live_feed.stream(event_channel(event.id), snapshot)
+
 @bp.route('/api/seating-status')
 @login_required
 @controller_required
@@ -195,36 +246,46 @@ def api_seating_status():
     if 'active_event_id' not in session:
         return jsonify({'error': 'Aktif etkinlik seçilmedi'}), 400
     
-    seating_id = request.args.get('seating_id')
+    seating_id = request.args.get('seating_id', type=int)
     
     if not seating_id:
         return jsonify({'error': 'Oturum ID gerekli'}), 400
     
-    seating = EventSeating.query.filter_by(
-        id=seating_id,
-        event_id=session['active_event_id']
-    ).first_or_404()
+    event_id = session['active_event_id']
+    etag = event_versions.etag(event_id, seating_types=True, extra=[seating_id])
+    if etag is None:
+        abort(404)
     
-    # Rezervasyon bilgisi
-    reservation = Reservation.query.filter_by(
-        seating_id=seating.id,
-        status='active'
-    ).first()
+    def build():
+        seating = EventSeating.query.filter_by(
+            id=seating_id,
+            event_id=event_id
+        ).first_or_404()
+        
+        # Rezervasyon bilgisi
+        reservation = Reservation.query.filter_by(
+            seating_id=seating.id,
+            status=ReservationStatus.ACTIVE
+        ).first()
+        
+        seating_type = seating_type_registry.get(seating.seating_type_id)
+        
+        return {
+            'seating': {
+                'id': seating.id,
+                'number': seating.seat_number,
+                'type': seating_type.name if seating_type else None,
+                'status': seating.status.value,
+                'capacity': seating_type.capacity if seating_type else 0
+            },
+            'reservation': {
+                'name': reservation.customer_name if reservation else None,
+                'phone': reservation.phone if reservation else None,
+                'checked_in': reservation.checked_in if reservation else None
+            } if reservation else None
+        }
     
-    return jsonify({
-        'seating': {
-            'id': seating.id,
-            'number': seating.seat_number,
-            'type': seating.seating_type.name,
-            'status': seating.status.value,
-            'capacity': seating.seating_type.capacity
-        },
-        'reservation': {
-            'name': reservation.customer_name if reservation else None,
-            'phone': reservation.phone if reservation else None,
-            'checked_in': reservation.checked_in if reservation else None
-        } if reservation else None
-    })
+    return json_response(build, etag=etag)
 
 @bp.route('/checkin', methods=['GET', 'POST'])
 @login_required
@@ -256,65 +317,49 @@ def api_checkin():
     if not code:
         return jsonify({'error': 'Rezervasyon kodu gerekli'}), 400
     
-    reservation = Reservation.query.filter_by(
-        reservation_code=code,
-        event_id=session['active_event_id']
-    ).first()
+    result = CheckinService(event_id=session['active_event_id']).check_in(
+        code, user_id=current_user.id
+    )
     
-    if not reservation:
+    if result.status == CHECKIN_NOT_FOUND:
         return jsonify({'error': 'Rezervasyon bulunamadı'}), 404
     
-    if reservation.checked_in:
+    entry = result.entry
+    if result.status == CHECKIN_DUPLICATE:
         return jsonify({
             'error': 'Bu rezervasyon zaten check-in yapılmış!',
             'reservation': {
-                'name': reservation.customer_name,
-                'phone': reservation.phone,
-                'seating': reservation.seating.seat_number if reservation.seating else 'N/A',
-                'checked_in_at': reservation.checked_in_at.strftime('%d.%m.%Y %H:%M') if reservation.checked_in_at else None
+                'name': entry.name,
+                'phone': entry.phone,
+                'seating': entry.seat_number,
+                'checked_in_at': entry.checked_in_at.strftime('%d.%m.%Y %H:%M') if entry.checked_in_at else None
             }
         }), 400
     
-    if reservation.status != 'active':
+    if result.status == CHECKIN_CANCELLED:
         return jsonify({'error': 'Bu rezervasyon iptal edilmiş'}), 400
     
-    # Check-in yap
-    reservation.checked_in = True
-    reservation.checked_in_at = datetime.utcnow()
-    reservation.checked_in_by = current_user.id
-    db.session.commit()
-    
     return jsonify({
         'success': True,
         'message': 'Check-in başarıyla tamamlandı!',
         'reservation': {
-            'name': reservation.customer_name,
-            'phone': reservation.phone,
-            'seating': reservation.seating.seat_number if reservation.seating else 'N/A',
-            'people_count': reservation.number_of_people
+            'name': entry.name,
+            'phone': entry.phone,
+            'seating': entry.seat_number,
+            'people_count': entry.people
         }
     })
 
 # Yardımcı fonksiyonlar
 
 def calculate_dashboard_stats(event):
-    """Dashboard istatistiklerini hesaplar"""
+    """Dashboard istatistiklerini canlı doluluk sayaçlarından hesaplar (sabit sorgu sayısı)"""
     try:
-        # Toplam kapasite
-        total_capacity = 0
-        for seating in event.seatings:
-            total_capacity += seating.seating_type.capacity
+        # Kapasite, aktif kişi sayısı ve check-in: artımlı sayaçlar (O(1))
+        counters = OccupancyService.get_counters(event.id)
         
-        # Rezerve edilen koltuklar
-        reserved_count = 0
-        for seating in event.seatings:
-            if seating.status == 'reserved':
-                reservation = Reservation.query.filter_by(
-                    seating_id=seating.id,
-                    status='active'
-                ).first()
-                if reservation:
-                    reserved_count += reservation.number_of_people
+        total_capacity = counters.total_capacity
+        reserved_count = counters.reserved_people
         
         # Boş koltuklar
         empty_seats = total_capacity - reserved_count
@@ -322,12 +367,6 @@ def calculate_dashboard_stats(event):
         # Doluluk oranı
         occupancy_rate = (reserved_count / total_capacity * 100) if total_capacity > 0 else 0
         
-        # Güncel check-in sayısı
-        checked_in_count = Reservation.query.filter_by(
-            event_id=event.id,
-            checked_in=True
-        ).count()
-        
         # Son 7 günün rezervasyon trendi
         today = datetime.now().date()
         week_ago = today - timedelta(days=7)
@@ -338,19 +377,17 @@ def calculate_dashboard_stats(event):
         ).filter(
             Reservation.event_id == event.id,
             Reservation.created_at >= week_ago
-        ).group_by('date').order_by('date').all()
+        ).group_by(func.date(Reservation.created_at)).all()
+        
+        # func.date SQLite'ta string, PostgreSQL'de date döner
+        counts_by_date = {str(d.date): d.count for d in daily_reservations}
         
         trend_data = []
         for i in range(7):
             date = week_ago + timedelta(days=i)
-            count = 0
-            for d in daily_reservations:
-                if d.date == date:
-                    count = d.count
-                    break
             trend_data.append({
                 'date': date.strftime('%d.%m'),
-                'count': count
+                'count': counts_by_date.get(date.isoformat(), 0)
             })
         
         return {
@@ -358,14 +395,15 @@ def calculate_dashboard_stats(event):
             'reserved_seats': reserved_count,
             'empty_seats': empty_seats,
             'occupancy_rate': round(occupancy_rate, 1),
-            'checked_in_count': checked_in_count,
-            'total_reservations': Reservation.query.filter_by(event_id=event.id).count(),
+            'checked_in_count': counters.checked_in_count,
+            'total_reservations': counters.total_reservations,
             'daily_trend': trend_data,
             'event_date': event.event_date.strftime('%d.%m.%Y'),
             'event_name': event.name
         }
         
     except Exception as e:
+        current_app.logger.error(f"Dashboard stats error: {str(e)}")
         return {}
 
 def handle_checkin():
@@ -375,29 +413,25 @@ def handle_checkin():
     if not code:
         return redirect(url_for('controller.checkin'))
     
-    reservation = Reservation.query.filter_by(
-        reservation_code=code,
-        event_id=session['active_event_id']
-    ).first()
+    result = CheckinService(event_id=session['active_event_id']).check_in(
+        code, user_id=current_user.id
+    )
     
-    if not reservation:
+    if result.status == CHECKIN_NOT_FOUND:
         flash('Rezervasyon bulunamadı', 'error')
         return redirect(url_for('controller.checkin'))
     
-    if reservation.checked_in:
-        flash('Bu rezervasyon zaten check-in yapılmış!', 'warning')
-        return render_template('controller/already_checked_in.html',
-                             reservation=reservation)
-    
-    if reservation.status != 'active':
+    if result.status == CHECKIN_CANCELLED:
         flash('Bu rezervasyon iptal edilmiş', 'error')
         return redirect(url_for('controller.checkin'))
     
-    # Check-in yap
-    reservation.checked_in = True
-    reservation.checked_in_at = datetime.utcnow()
-    reservation.checked_in_by = current_user.id
-    db.session.commit()
+    # Şablonlar ilişkili alanları kullandığından nesne yalnızca burada yüklenir
+    reservation = db.session.get(Reservation, result.entry.reservation_id)
+    
+    if result.status == CHECKIN_DUPLICATE:
+        flash('Bu rezervasyon zaten check-in yapılmış!', 'warning')
+        return render_template('controller/already_checked_in.html',
+                             reservation=reservation)
     
     return render_template('controller/checkin_success.html',
                          reservation=reservation)
@@ -1,15 +1,25 @@
-from datetime import datetime
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from datetime import date, datetime
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, abort, current_app
 from flask_login import login_required, current_user
 from marshmallow import ValidationError
 from app import db
-from app.models import Event, EventSeating, SeatingType
+from app.models import Event, EventSeating
 from app.models.event import StagePosition, EventStatus
 from app.models.reservation import Reservation, ReservationStatus
 from app.models.seating import SeatingLayoutTemplate
 from app.utils.decorators import admin_required
 from app.schemas.event_schema import EventSchema
 from app.services.security_logger import security_logger
+from app.services import reservation_events
+from app.services.occupancy_service import OccupancyService
+from app.services.layout_service import LayoutService, ReservedSeatDeletionError
+from app.services.seating_service import SeatingService
+from app.services.seating_type_registry import seating_type_registry
+from app.services.event_versions import event_versions
+from app.utils.pagination import keyset_paginate, page_args
+from app.utils.http_payload import get_request_json, json_response
+from app.utils.layout_codec import dumps_layout, load_configuration, pack_seatings, unpack_seatings
+from sqlalchemy import func
 import json
 
 bp = Blueprint('event', __name__)
@@ -18,8 +28,66 @@ bp = Blueprint('event', __name__)
 @login_required
 @admin_required
 def index():
-    events = Event.query.filter_by(company_id=current_user.company_id).all()
-    return render_template('event/index.html', events=events)
+    page = _events_page()
+    
+    # Sayaçlar tüm etkinlikler için; liste yalnızca bu sayfa
+    status_counts = dict(db.session.query(
+        Event.status, func.count(Event.id)
+    ).filter(
+        Event.company_id == current_user.company_id
+    ).group_by(Event.status).all())
+    next_event = Event.query.filter(
+        Event.company_id == current_user.company_id,
+        Event.event_date >= date.today()
+    ).order_by(Event.event_date, Event.id).first()
+    metrics = {
+        'total': sum(status_counts.values()),
+        'active': status_counts.get(EventStatus.ACTIVE, 0),
+        'draft': status_counts.get(EventStatus.DRAFT, 0),
+        'capacity': OccupancyService.get_company_totals(current_user.company_id)['total_capacity']
+    }
+    capacities = OccupancyService.capacity_by_event(
+        [event.id for event in page] + ([next_event.id] if next_event else [])
+    )
+    
+    return render_template('event/index.html',
+                         events=page,
+                         page=page,
+                         metrics=metrics,
+                         next_event=next_event,
+                         capacities=capacities)
+
+@bp.route('/api/list')
+@login_required
+@admin_required
+def api_list():
+    """JSON API: Şirket etkinlikleri (keyset sayfalı, yeniden eskiye)"""
+    page = _events_page()
+    capacities = OccupancyService.capacity_by_event([event.id for event in page])
+    return jsonify({
+        'events': [
+            {
+                'id': event.id,
+                'name': event.name,
+                'event_date': event.event_date.isoformat() if event.event_date else None,
+                'status': event.status.value if event.status else None,
+                'venue_name': event.venue_name,
+                'total_capacity': capacities[event.id],
+                'created_at': event.created_at.isoformat() if event.created_at else None
+            }
+            for event in page
+        ],
+        'next_cursor': page.next_cursor
+    })
+
+def _events_page():
+    """Şirket etkinliklerinin istenen sayfası (cursor geçersizse 400)"""
+    cursor, per_page = page_args()
+    query = Event.query.filter_by(company_id=current_user.company_id)
+    try:
+        return keyset_paginate(query, Event, cursor, per_page)
+    except ValueError:
+        abort(400)
 
 @bp.route('/create', methods=['GET', 'POST'])
 @login_required
@@ -80,7 +148,7 @@ def edit(event_id):
     ).first_or_404()
     
     seatings = EventSeating.query.filter_by(event_id=event.id).all()
-    seating_types = SeatingType.query.all()
+    seating_types = seating_type_registry.all()
     
     if request.method == 'POST':
         # Handle status changes and general updates
@@ -129,6 +197,8 @@ def edit(event_id):
                     for reservation in active_reservations:
                         reservation.status = ReservationStatus.CANCELLED
                         db.session.add(reservation)
+                    
+                    reservation_events.on_reservations_cancelled(event.id, active_reservations)
             
             db.session.commit()
             flash('Etkinlik başarıyla güncellendi.', 'success')
@@ -175,6 +245,7 @@ def cancel(event_id):
             db.session.add(reservation)
             cancelled_count += 1
         
+        reservation_events.on_reservations_cancelled(event.id, active_reservations)
         db.session.commit()
         flash(f'Etkinlik iptal edildi. {cancelled_count} aktif rezervasyon da iptal edildi.', 'success')
         
@@ -232,36 +303,52 @@ def add_seating(event_id):
         position_y=data['position_y']
     )
     db.session.add(seating)
+    reservation_events.on_layout_changed(event.id)
     db.session.commit()
     
     return jsonify({'success': True, 'seating_id': seating.id})
 
+@bp.route('/<int:event_id>/generate-seatings', methods=['POST'])
+@login_required
+@admin_required
+def generate_seatings(event_id):
+    """Toplu oturum üretimi (ızgara, koridorlu sıralar veya daire düzeni)"""
+    event = Event.query.filter_by(
+        id=event_id,
+        company_id=current_user.company_id
+    ).first_or_404()
+    
+    data = request.get_json(silent=True) or {}
+    configs = data.get('seatings')
+    if not isinstance(configs, list) or not configs:
+        return jsonify({'success': False, 'message': 'Oturum konfigürasyonu gerekli'}), 400
+    
+    result = SeatingService(current_user.company_id).add_seatings_to_event(event.id, configs)
+    if not result['success']:
+        return jsonify({'success': False, 'message': result['error']}), 500
+    return jsonify(result), 201 if result['created_count'] else 400
+
 @bp.route('/<int:event_id>/save-layout', methods=['POST'])
 @login_required
 @admin_required
 def save_layout(event_id):
-    """Save complete venue layout (stage + seats) - Enhanced for visual editor"""
+    """Save venue layout (stage + seats) - applies only the changed seats"""
     event = Event.query.filter_by(
         id=event_id,
         company_id=current_user.company_id
     ).first_or_404()
     
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'success': False, 'message': 'Veri alınamadı'}), 400
-            
-        print(f"🔍 save_layout called for event {event_id}")
-        print(f"📥 Received data: {json.dumps(data, indent=2)}")
-        
-        # Delete existing seatings
-        deleted_count = EventSeating.query.filter_by(event_id=event.id).delete()
-        print(f"🗑️ Deleted {deleted_count} existing seatings")
-        
+        data = get_request_json()
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    if not data:
+        return jsonify({'success': False, 'message': 'Veri alınamadı'}), 400
+    
+    try:
         # Save stage configuration
         if data.get('stage'):
             event.stage_config = json.dumps(data['stage'])
-            print(f"🎭 Stage config saved")
         
         # Save stage position (convert string to Enum)
         stage_pos = data.get('stage_position', 'top')
@@ -270,86 +357,79 @@ def save_layout(event_id):
                 event.stage_position = StagePosition(stage_pos.upper())
             else:
                 event.stage_position = stage_pos
-            print(f"📍 Stage position: {event.stage_position.value if event.stage_position else 'None'}")
-        except ValueError as e:
-            print(f"⚠️ Invalid stage position: {stage_pos}, using default 'TOP'")
+        except ValueError:
             event.stage_position = StagePosition.TOP
         
         # Save canvas dimensions and grid settings
         event.canvas_width = int(data.get('canvas_width', 800))
         event.canvas_height = int(data.get('canvas_height', 600))
         event.grid_size = int(data.get('grid_size', 20))
-        print(f"📐 Canvas: {event.canvas_width}x{event.canvas_height}, Grid: {event.grid_size}")
         
-        # Save enhanced seatings with visual editor properties
-        seats_data = data.get('seats', [])
-        print(f"💺 Saving {len(seats_data)} seatings")
-        
-        if not seats_data:
-            print("⚠️ No seats to save")
-        
-        for idx, seat_data in enumerate(seats_data):
-            try:
-                print(f"  {idx+1}. {seat_data.get('seat_number')}: type_id={seat_data.get('seating_type_id')}, pos=({seat_data.get('position_x')}, {seat_data.get('position_y')})")
-                
-                seating = EventSeating(
-                    event_id=event.id,
-                    seating_type_id=int(seat_data['seating_type_id']),
-                    seat_number=str(seat_data['seat_number']),
-                    position_x=float(seat_data['position_x']),
-                    position_y=float(seat_data['position_y']),
-                    width=float(seat_data.get('width', 60)),
-                    height=float(seat_data.get('height', 40)),
-                    color_code=seat_data.get('color_code', '#3498db')
-                )
-                db.session.add(seating)
-            except Exception as seat_error:
-                print(f"❌ Error adding seat {idx+1}: {str(seat_error)}")
-                raise
+        # Editör değişiklik kümesi gönderebilir; tam liste (ayrıntılı veya
+        # sütunlu) gelirse fark burada hesaplanır
+        service = LayoutService(event.id)
+        if 'changes' in data:
+            changes = service.changes_from_payload(data['changes'] or {})
+        elif 'layout' in data:
+            changes = service.diff(unpack_seatings(data['layout']))
+        else:
+            changes = service.diff(data.get('seats') or [])
         
+        result = service.apply(changes)
+        if changes:
+            reservation_events.on_layout_changed(event.id)
         db.session.commit()
-        print(f"✅ Layout saved successfully! Total seats: {len(seats_data)}")
         
+    except ReservedSeatDeletionError as e:
+        db.session.rollback()
         return jsonify({
-            'success': True, 
-            'message': 'Görsel yerleşim planı kaydedildi',
-            'seats_saved': len(seats_data)
-        })
-        
+            'success': False,
+            'message': str(e),
+            'reserved_seats': e.seat_numbers,
+            'conflict': True
+        }), 409
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': str(e)}), 400
     except Exception as e:
         db.session.rollback()
-        print(f"❌ Error saving layout: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        current_app.logger.exception(f'Layout save failed for event {event_id}')
         return jsonify({'success': False, 'message': f'Kayıt hatası: {str(e)}'}), 500
+    
+    return jsonify({
+        'success': True,
+        'message': 'Görsel yerleşim planı kaydedildi',
+        'seats_saved': EventSeating.query.filter_by(event_id=event.id).count(),
+        **result
+    })
 
 @bp.route('/<int:event_id>/seating-config', methods=['GET', 'POST'])
 @login_required
 @admin_required
 def seating_config(event_id):
     """Get or save visual seating configuration"""
-    event = Event.query.filter_by(
-        id=event_id,
-        company_id=current_user.company_id
-    ).first_or_404()
+    if request.method == 'POST':
+        # Save configuration via visual editor
+        return save_layout(event_id)
     
-    if request.method == 'GET':
-        # Return current configuration
+    # İstemcinin kopyası güncelse oturumlar hiç okunmaz (304)
+    etag = event_versions.etag(event_id, current_user.company_id, seating_types=True)
+    if etag is None:
+        abort(404)
+    
+    def build():
+        event = db.session.get(Event, event_id)
         seatings = EventSeating.query.filter_by(event_id=event.id).all()
-        seating_types = SeatingType.query.all()
+        seating_types = seating_type_registry.all()
         
-        return jsonify({
+        def seat_type(s):
+            return seating_type_registry.get(s.seating_type_id)
+        
+        return {
             'success': True,
             'data': {
-                'canvas': {
-                    'width': event.canvas_width or 800,
-                    'height': event.canvas_height or 600,
-                    'grid_size': event.grid_size or 20
-                },
-                'stage': {
-                    'position': event.stage_position.value if event.stage_position else 'top',
-                    'config': json.loads(event.stage_config) if event.stage_config else {}
-                },
+                'canvas': _canvas(event),
+                'stage': _stage(event),
                 'seatings': [{
                     'id': s.id,
                     'seating_type_id': s.seating_type_id,
@@ -358,10 +438,10 @@ def seating_config(event_id):
                     'position_y': s.position_y,
                     'width': s.width or 60,
                     'height': s.height or 40,
-                    'capacity': s.seating_type.capacity if s.seating_type else 4,
+                    'capacity': seat_type(s).capacity if seat_type(s) else 4,
                     'color_code': s.color_code or '#3498db',
-                    'icon': s.seating_type.icon if s.seating_type else '🪑',
-                    'name': s.seating_type.name if s.seating_type else f'Masa {s.seat_number}',
+                    'icon': seat_type(s).icon if seat_type(s) else '🪑',
+                    'name': seat_type(s).name if seat_type(s) else f'Masa {s.seat_number}',
                     'is_reserved': s.status.value == 'reserved' if hasattr(s.status, 'value') else s.status == 'reserved',
                     'status': s.status.value if hasattr(s.status, 'value') else s.status
                 } for s in seatings],
@@ -374,12 +454,55 @@ def seating_config(event_id):
                     'color_code': st.color_code
                 } for st in seating_types]
             }
-        })
+        }
     
-    elif request.method == 'POST':
-        # Save configuration via visual editor
-        result = save_layout(event_id)
-        return result
+    return json_response(build, etag=etag)
+
+@bp.route('/<int:event_id>/layout')
+@login_required
+@admin_required
+def layout(event_id):
+    """Görsel editör için sütunlu yerleşim (gzip/deflate, ETag ile koşullu)"""
+    etag = event_versions.etag(event_id, current_user.company_id, seating_types=True)
+    if etag is None:
+        abort(404)
+    
+    def build():
+        event = db.session.get(Event, event_id)
+        seatings = db.session.query(
+            EventSeating.id,
+            EventSeating.seating_type_id,
+            EventSeating.seat_number,
+            EventSeating.position_x,
+            EventSeating.position_y,
+            EventSeating.width,
+            EventSeating.height,
+            EventSeating.color_code,
+            EventSeating.status
+        ).filter(EventSeating.event_id == event.id).order_by(EventSeating.id).all()
+        
+        return {
+            'canvas': _canvas(event),
+            'stage': _stage(event),
+            'layout': pack_seatings(seatings, seating_type_registry.all(), include_status=True)
+        }
+    
+    return json_response(build, etag=etag)
+
+def _canvas(event):
+    """Editör tuval ayarları"""
+    return {
+        'width': event.canvas_width or 800,
+        'height': event.canvas_height or 600,
+        'grid_size': event.grid_size or 20
+    }
+
+def _stage(event):
+    """Sahne konumu ve ayarları"""
+    return {
+        'position': event.stage_position.value if event.stage_position else 'top',
+        'config': json.loads(event.stage_config) if event.stage_config else {}
+    }
 
 @bp.route('/<int:event_id>/template/save', methods=['POST'])
 @login_required
@@ -404,17 +527,13 @@ def save_as_template(event_id):
             canvas_width=event.canvas_width or 800,
             canvas_height=event.canvas_height or 600,
             grid_size=event.grid_size or 20,
-            configuration=json.dumps({
+            configuration=dumps_layout({
                 'stage_config': json.loads(event.stage_config) if event.stage_config else {},
-                'seatings': [{
-                    'seating_type_id': s.seating_type_id,
-                    'seat_number': s.seat_number,
-                    'position_x': s.position_x,
-                    'position_y': s.position_y,
-                    'width': s.width,
-                    'height': s.height,
-                    'color_code': s.color_code
-                } for s in event.seatings]
+                'layout': pack_seatings(
+                    EventSeating.query.filter_by(event_id=event.id).order_by(EventSeating.id),
+                    seating_type_registry.all(),
+                    include_ids=False
+                )
             })
         )
         
@@ -442,19 +561,20 @@ def load_template(template_id):
     ).first_or_404()
     
     try:
-        config = json.loads(template.configuration)
+        config = load_configuration(template.configuration)
+        data = {
+            'stage_position': template.stage_position,
+            'canvas_width': template.canvas_width,
+            'canvas_height': template.canvas_height,
+            'grid_size': template.grid_size,
+            'stage_config': config.get('stage_config', {}),
+            'layout': config['layout']
+        }
+        # Eski istemciler için oturum listesi; editör ?format=packed ister
+        if request.args.get('format') != 'packed':
+            data['seatings'] = unpack_seatings(config['layout'])
         
-        return jsonify({
-            'success': True,
-            'data': {
-                'stage_position': template.stage_position,
-                'canvas_width': template.canvas_width,
-                'canvas_height': template.canvas_height,
-                'grid_size': template.grid_size,
-                'stage_config': config.get('stage_config', {}),
-                'seatings': config.get('seatings', [])
-            }
-        })
+        return json_response({'success': True, 'data': data})
         
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)}), 500
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from io import BytesIO
+from flask import Blueprint, jsonify, send_file, url_for, abort
+from flask_login import login_required, current_user
+from app.services.job_queue import job_queue, JOB_FINISHED
+
+bp = Blueprint('jobs', __name__)
+
+
+def job_accepted(job_id):
+    """İş kuyruğa alındı yanıtı (202); istemci durumu status_url'den izler"""
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status_url': url_for('jobs.status', job_id=job_id)
+    }), 202
+
+
+def _get_own_job(job_id):
+    """İşi getirir; başka şirketin işi ise 404"""
+    job = job_queue.get(job_id)
+    if job is None or job.get('company_id') != current_user.company_id:
+        abort(404)
+    return job
+
+
+@bp.route('/<job_id>')
+@login_required
+def status(job_id):
+    """Arka plan işinin durumu"""
+    job = _get_own_job(job_id)
+
+    if job['status'] == JOB_FINISHED and job.get('filename'):
+        job['download_url'] = url_for('jobs.download', job_id=job_id)
+
+    return jsonify({'success': True, 'job': job})
+
+
+@bp.route('/<job_id>/download')
+@login_required
+def download(job_id):
+    """Bitmiş işin ürettiği dosyayı indirir"""
+    job = _get_own_job(job_id)
+
+    if job['status'] != JOB_FINISHED:
+        return jsonify({'success': False, 'status': job['status'], 'error': job.get('error')}), 409
+
+    data = job_queue.get_result(job_id)
+    if data is None:
+        return jsonify({'success': False, 'message': 'Dosya bulunamadı veya süresi doldu'}), 404
+
+    return send_file(
+        BytesIO(data),
+        mimetype=job['mimetype'],
+        as_attachment=True,
+        download_name=job['filename']
+    )
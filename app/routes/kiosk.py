@@ -1,8 +1,11 @@
 from flask import Blueprint, render_template, request, jsonify
-from app import db
-from app.models.reservation import Reservation
-from app.models.event import Event
 from flask_login import current_user
+from app.services.checkin_service import (
+    CheckinService,
+    CHECKIN_NOT_FOUND,
+    CHECKIN_DUPLICATE,
+    CHECKIN_CANCELLED,
+)
 
 bp = Blueprint('kiosk', __name__)
 
@@ -23,45 +26,39 @@ def api_kiosk_checkin():
             'error': 'Lütfen geçerli bir rezervasyon kodu girin.'
         })
     
-    # Rezervasyonu bul
-    reservation = Reservation.query.filter_by(reservation_code=code).first()
+    # Kod haritası bellekte; check-in tek koşullu UPDATE ile yapılır
+    user_id = current_user.id if current_user.is_authenticated else None
+    result = CheckinService().check_in(code, user_id=user_id)
     
-    if not reservation:
+    if result.status == CHECKIN_NOT_FOUND:
         return jsonify({
             'success': False,
             'error': 'Rezervasyon kodu bulunamadı. Lütfen kodu kontrol edin.'
         })
     
-    if reservation.status == 'cancelled':
+    if result.status == CHECKIN_CANCELLED:
         return jsonify({
             'success': False,
             'error': 'Bu rezervasyon iptal edilmiştir.'
         })
     
-    if reservation.checked_in:
+    if result.status == CHECKIN_DUPLICATE:
         return jsonify({
             'success': False,
             'error': 'Bu rezervasyon zaten check-in yapılmıştır.'
         })
     
-    # Check-in yap
-    reservation.checked_in = True
-    reservation.checked_in_at = db.func.now()
-    if current_user.is_authenticated:
-        reservation.checked_in_by = current_user.id
-    
-    db.session.commit()
-    
     # Başarılı response
+    entry = result.entry
     return jsonify({
         'success': True,
         'message': 'Rezervasyon başarıyla onaylandı!',
         'reservation': {
-            'name': reservation.customer_name,
-            'phone': reservation.phone,
-            'seat_number': reservation.seating.seat_number if reservation.seating else 'N/A',
-            'people_count': reservation.number_of_people,
-            'event_name': reservation.event.name if reservation.event else 'N/A',
-            'checked_in_at': reservation.checked_in_at.strftime('%H:%M') if reservation.checked_in_at else ''
+            'name': entry.name,
+            'phone': entry.phone,
+            'seat_number': entry.seat_number,
+            'people_count': entry.people,
+            'event_name': result.event_name or 'N/A',
+            'checked_in_at': entry.checked_in_at.strftime('%H:%M') if entry.checked_in_at else ''
         }
     })
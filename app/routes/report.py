@@ -1,8 +1,13 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
 from app import db
-from app.models import Event, Reservation
+from app.models import Event
 from app.services.report_service import ReportService
+from app.services.export_service import ExportService
+from app.services.report_cache import report_cache
+from app.services.job_queue import job_queue
+from app.services.background_tasks import EXPORT_FORMATS
+from app.routes.jobs import job_accepted
 from app.utils.decorators import admin_required, controller_required
 from datetime import datetime, timedelta
 import json
@@ -35,7 +40,12 @@ def summary():
         
         # Rapor servisi
         report_service = ReportService(current_user.company_id)
-        report_data = report_service.get_summary_report(date_filter_start, date_filter_end)
+        report_data = report_cache.get_or_compute(
+            'summary',
+            lambda: report_service.get_summary_report(date_filter_start, date_filter_end),
+            company_id=current_user.company_id,
+            params={'start_date': start_date, 'end_date': end_date}
+        )
         
         return render_template('report/summary.html',
                              report_data=report_data,
@@ -84,8 +94,13 @@ def reservation_analysis():
             date_filter_end = datetime.fromisoformat(end_date)
         
         report_service = ReportService(current_user.company_id)
-        report_data = report_service.get_reservation_analysis_report(
-            date_filter_start, date_filter_end, group_by
+        report_data = report_cache.get_or_compute(
+            'reservation_analysis',
+            lambda: report_service.get_reservation_analysis_report(
+                date_filter_start, date_filter_end, group_by
+            ),
+            company_id=current_user.company_id,
+            params={'start_date': start_date, 'end_date': end_date, 'group_by': group_by}
         )
         
         return render_template('report/reservation_analysis.html',
@@ -106,6 +121,7 @@ def occupancy_analysis():
     try:
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
+        page = request.args.get('page', 1, type=int)
         
         date_filter_start = None
         date_filter_end = None
@@ -116,8 +132,13 @@ def occupancy_analysis():
             date_filter_end = datetime.fromisoformat(end_date)
         
         report_service = ReportService(current_user.company_id)
-        report_data = report_service.get_occupancy_analysis_report(
-            date_filter_start, date_filter_end
+        report_data = report_cache.get_or_compute(
+            'occupancy_analysis',
+            lambda: report_service.get_occupancy_analysis_report(
+                date_filter_start, date_filter_end, page
+            ),
+            company_id=current_user.company_id,
+            params={'start_date': start_date, 'end_date': end_date, 'page': page}
         )
         
         return render_template('report/occupancy_analysis.html',
@@ -147,8 +168,13 @@ def customer_analysis():
             date_filter_end = datetime.fromisoformat(end_date)
         
         report_service = ReportService(current_user.company_id)
-        report_data = report_service.get_customer_analysis_report(
-            date_filter_start, date_filter_end
+        report_data = report_cache.get_or_compute(
+            'customer_analysis',
+            lambda: report_service.get_customer_analysis_report(
+                date_filter_start, date_filter_end
+            ),
+            company_id=current_user.company_id,
+            params={'start_date': start_date, 'end_date': end_date}
         )
         
         return render_template('report/customer_analysis.html',
@@ -202,51 +228,75 @@ def export_excel():
 @login_required
 @admin_required
 def export_csv():
-    """CSV formatında export"""
+    """CSV formatında export (satırlar veritabanından akıtılır)"""
+    event_id = request.args.get('event_id', type=int)
+    event = None
+    if request.args.get('type', 'reservations') == 'reservations' and event_id:
+        event = Event.query.filter_by(
+            id=event_id,
+            company_id=current_user.company_id
+        ).first_or_404()
+    
     try:
-        report_type = request.args.get('type', 'reservations')
-        event_id = request.args.get('event_id')
-        
-        report_service = ReportService(current_user.company_id)
+        export_service = ExportService()
         
-        if report_type == 'reservations' and event_id:
+        if event:
             # Belirli etkinliğin rezervasyonlarını export et
-            report_data = report_service.get_event_detail_report(int(event_id))
-            if 'reservations' in report_data:
-                data = report_data['reservations']
-                filename = f'reservations_event_{event_id}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-            else:
-                data = []
-                filename = f'reservations_event_{event_id}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-        else:
-            # Tüm rezervasyonlar
-            reservations = Reservation.query.join(Event).filter(
-                Event.company_id == current_user.company_id
-            ).all()
-            
-            data = [
-                {
-                    'ID': r.id,
-                    'Müşteri Adı': r.customer_name,
-                    'Telefon': r.phone,
-                    'Etkinlik': r.event.name,
-                    'Oturum': r.seating.seat_number if r.seating else 'N/A',
-                    'Kişi Sayısı': r.number_of_people,
-                    'Check-in': 'Evet' if r.checked_in else 'Hayır',
-                    'Durum': r.status.value
-                }
-                for r in reservations
-            ]
-            filename = f'reservations_all_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-        
-        filepath = report_service.export_to_csv(data, filename)
-        
-        return redirect(f'/static/uploads/reports/{filename}')
+            return export_service.export_to_csv(event.id, 'utf-8-sig')
+        
+        # Tüm rezervasyonlar
+        return export_service.export_company_to_csv(current_user.company_id)
         
     except Exception as e:
         flash(f'CSV export hatası: {str(e)}', 'error')
         return redirect(url_for('report.index'))
 
+@bp.route('/export/jobs/report', methods=['POST'])
+@login_required
+@admin_required
+def enqueue_report_export():
+    """Rapor Excel export'unu arka plan işi olarak başlatır"""
+    data = request.get_json(silent=True) or {}
+    
+    job_id = job_queue.enqueue(
+        'report_excel',
+        company_id=current_user.company_id,
+        user_id=current_user.id,
+        report_type=data.get('type', 'summary'),
+        start_date=data.get('start_date'),
+        end_date=data.get('end_date')
+    )
+    
+    return job_accepted(job_id)
+
+@bp.route('/export/jobs/event/<int:event_id>', methods=['POST'])
+@login_required
+@admin_required
+def enqueue_event_export(event_id):
+    """Etkinlik export'unu (csv, excel, pdf, json) arka plan işi olarak başlatır"""
+    event = Event.query.filter_by(
+        id=event_id,
+        company_id=current_user.company_id
+    ).first_or_404()
+    
+    data = request.get_json(silent=True) or {}
+    export_format = data.get('format', 'excel')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'success': False, 'message': 'Desteklenmeyen export formatı'}), 400
+    
+    job_id = job_queue.enqueue(
+        'event_export',
+        company_id=current_user.company_id,
+        user_id=current_user.id,
+        event_id=event.id,
+        export_format=export_format,
+        report_type=data.get('report_type', 'comprehensive'),
+        include_analytics=bool(data.get('include_analytics', True)),
+        file_format=data.get('file_format', 'utf-8')
+    )
+    
+    return job_accepted(job_id)
+
 @bp.route('/api/summary')
 @login_required
 @admin_required
@@ -254,7 +304,12 @@ def api_summary():
     """JSON API: Özet rapor verileri"""
     try:
         report_service = ReportService(current_user.company_id)
-        report_data = report_service.get_summary_report()
+        report_data = report_cache.get_or_compute(
+            'summary',
+            report_service.get_summary_report,
+            company_id=current_user.company_id,
+            params={'start_date': None, 'end_date': None}
+        )
         
         return jsonify({
             'success': True,
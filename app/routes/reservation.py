@@ -1,12 +1,19 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app, abort
 from flask_login import login_required, current_user
 from marshmallow import ValidationError
 from app import db
 from app.models import Reservation, Event, EventSeating
+from app.models.seating import SeatStatus
 from app.utils.decorators import admin_required
 from app.schemas.reservation_schema import ReservationSchema
 from app.services.security_logger import security_logger
-import uuid
+from app.services.reservation_service import ReservationService, SeatUnavailableError
+from app.services.reservation_import_service import ReservationImportService
+from app.services.job_queue import job_queue
+from app.services.qr_service import QR_FORMATS, get_qr_service, parse_box_size
+from app.services.occupancy_service import OccupancyService
+from app.utils.pagination import keyset_paginate, page_args
+from sqlalchemy.orm import contains_eager
 
 bp = Blueprint('reservation', __name__)
 
@@ -14,10 +21,48 @@ bp = Blueprint('reservation', __name__)
 @login_required
 @admin_required
 def index():
-    reservations = Reservation.query.join(Event).filter(
+    page = _company_reservations_page()
+    total = OccupancyService.get_company_totals(current_user.company_id)['total_reservations']
+    return render_template('reservation/index.html',
+                         reservations=page,
+                         page=page,
+                         total_reservations=total)
+
+@bp.route('/api/reservations')
+@login_required
+@admin_required
+def api_list():
+    """JSON API: Şirket rezervasyonları (keyset sayfalı, yeniden eskiye)"""
+    page = _company_reservations_page()
+    return jsonify({
+        'reservations': [
+            {
+                'id': r.id,
+                'code': r.reservation_code,
+                'name': r.customer_name,
+                'phone': r.phone,
+                'people': r.number_of_people,
+                'event_id': r.event_id,
+                'event_name': r.event.name,
+                'status': r.status.value if r.status else None,
+                'checked_in': r.checked_in,
+                'created_at': r.created_at.isoformat() if r.created_at else None
+            }
+            for r in page
+        ],
+        'next_cursor': page.next_cursor
+    })
+
+def _company_reservations_page():
+    """Şirket rezervasyonlarının istenen sayfası (cursor geçersizse 400)"""
+    cursor, per_page = page_args()
+    query = Reservation.query.join(Event).filter(
         Event.company_id == current_user.company_id
-    ).all()
-    return render_template('reservation/index.html', reservations=reservations)
+    ).options(contains_eager(Reservation.event))
+    try:
+        return keyset_paginate(query, Reservation, cursor, per_page)
+    except ValueError:
+        abort(400)
 
 @bp.route('/create/<int:event_id>', methods=['GET', 'POST'])
 @login_required
@@ -38,7 +83,7 @@ def create(event_id):
         else:
             available_seatings = EventSeating.query.filter_by(
                 event_id=event.id,
-                status='available'
+                status=SeatStatus.AVAILABLE
             ).all()
             return render_template('reservation/create.html', 
                                  event=event, 
@@ -58,53 +103,12 @@ def create(event_id):
         }
     
     try:
-        # Validate seating availability
-        seating_id = data_input.get('seating_id')
-        if not seating_id:
-            raise ValueError('Oturum seçilmedi')
-        
-        seating = EventSeating.query.filter_by(
-            id=seating_id,
-            event_id=event.id
-        ).first()
-        
-        if not seating:
-            raise ValueError('Geçersiz oturum')
-        
-        if seating.status != 'available':
-            raise ValueError('Bu oturum müsait değil')
-        
-        # Kapasite kontrolü
-        number_of_people = int(data_input.get('number_of_people', 1))
-        if number_of_people > seating.seating_type.capacity:
-            raise ValueError(f'Kişi sayısı oturum kapasitesini ({seating.seating_type.capacity}) aşıyor')
-        
-        # Rezervasyon oluştur
-        reservation_code = str(uuid.uuid4())
+        # Oturum tek koşullu UPDATE ile ayrılır; eşzamanlı isteklerden biri kazanır
+        reservation = ReservationService(event.id).create_reservation(data_input)
         
-        reservation = Reservation(
-            event_id=event.id,
-            seating_id=seating.id,
-            phone=data_input['phone'],
-            first_name=data_input['first_name'],
-            last_name=data_input['last_name'],
-            number_of_people=number_of_people,
-            notes=data_input.get('notes'),
-            reservation_code=reservation_code
-        )
-        db.session.add(reservation)
-        
-        # Oturum durumunu güncelle
-        seating.status = 'reserved'
-        
-        db.session.commit()
-        
-        # QR kod oluştur
-        try:
-            reservation.generate_qr_code()
-            db.session.commit()
-        except Exception as e:
-            print(f"QR code generation error: {e}")
+        # QR kod arka planda oluşturulur (istek thread'ini bekletmez)
+        job_queue.enqueue('qr_codes', company_id=current_user.company_id,
+                          user_id=current_user.id, codes=[reservation.reservation_code])
         
         if request.is_json:
             return jsonify({
@@ -117,6 +121,12 @@ def create(event_id):
             flash('Rezervasyon oluşturuldu.', 'success')
             return redirect(url_for('reservation.index'))
             
+    except SeatUnavailableError as e:
+        if request.is_json:
+            return jsonify({'success': False, 'message': str(e), 'conflict': True}), 409
+        else:
+            flash(str(e), 'danger')
+            return redirect(url_for('reservation.create', event_id=event_id))
     except ValueError as e:
         if request.is_json:
             return jsonify({'success': False, 'message': str(e)}), 400
@@ -132,6 +142,50 @@ def create(event_id):
             flash('Rezervasyon oluşturulurken hata oluştu', 'danger')
             return redirect(url_for('reservation.create', event_id=event_id))
 
+@bp.route('/import/<int:event_id>', methods=['POST'])
+@login_required
+@admin_required
+def import_reservations(event_id):
+    """CSV/XLSX misafir listesinden toplu rezervasyon içe aktarma"""
+    event = Event.query.filter_by(
+        id=event_id,
+        company_id=current_user.company_id
+    ).first_or_404()
+    
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        return jsonify({'success': False, 'message': 'Dosya seçilmedi'}), 400
+    
+    dry_run = request.form.get('dry_run', 'false').lower() == 'true'
+    assign_seats = request.form.get('assign_seats', 'true').lower() == 'true'
+    service = ReservationImportService(event.id)
+    
+    try:
+        rows = service.read_rows(upload.stream, upload.filename)
+        report = service.import_rows(rows, assign_seats=assign_seats, dry_run=dry_run)
+    except SeatUnavailableError as e:
+        return jsonify({'success': False, 'message': str(e), 'conflict': True}), 409
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    codes = report.pop('codes')
+    qr_job_id = service.queue_qr_generation(
+        codes, company_id=current_user.company_id, user_id=current_user.id
+    )
+    
+    current_app.logger.info(
+        f"Reservation import event={event.id} user={current_user.id} "
+        f"imported={report['imported']} failed={report['failed']} dry_run={dry_run}"
+    )
+    
+    return jsonify({
+        'success': True,
+        'dry_run': dry_run,
+        'qr_pending': len(codes),
+        'qr_job_id': qr_job_id,
+        **report
+    })
+
 @bp.route('/view/<int:id>')
 @login_required
 @admin_required
@@ -144,6 +198,30 @@ def view(id):
     
     return render_template('reservation/view.html', reservation=reservation)
 
+@bp.route('/qr/<code>.<fmt>')
+@login_required
+def qr_image(code, fmt):
+    """QR görselini (png/svg) önbellekten, ETag ile sunar"""
+    if fmt not in QR_FORMATS:
+        abort(404)
+    
+    exists = db.session.query(Reservation.id).join(Event).filter(
+        Reservation.reservation_code == code,
+        Event.company_id == current_user.company_id
+    ).first()
+    if exists is None:
+        abort(404)
+    
+    image = get_qr_service().get(code, fmt, parse_box_size(request.args.get('size')))
+    
+    response = current_app.response_class(image.data, mimetype=image.mimetype)
+    response.set_etag(image.etag)
+    response.cache_control.private = True
+    response.cache_control.max_age = current_app.config.get('QR_CACHE_MAX_AGE', 86400)
+    if request.args.get('download'):
+        response.headers['Content-Disposition'] = f'attachment; filename=qr_{code}.{fmt}'
+    return response.make_conditional(request)
+
 @bp.route('/generate-qr/<int:id>', methods=['POST'])
 @login_required
 @admin_required
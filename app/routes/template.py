@@ -7,6 +7,7 @@ from app.utils.decorators import admin_required
 from app.schemas.template_schema import SeatingTemplateSchema, EventTemplateSchema
 from app.services.security_logger import security_logger
 import json
+from app.utils.layout_codec import layout_seat_count
 
 bp = Blueprint('template', __name__)
 
@@ -150,9 +151,7 @@ def api_list_templates():
             # Parse configuration to get seating count
             seating_count = 0
             try:
-                config = json.loads(template.configuration) if template.configuration else {}
-                seatings = config.get('seatings', [])
-                seating_count = len(seatings)
+                seating_count = layout_seat_count(json.loads(template.configuration or '{}'))
             except:
                 pass
             
@@ -5,12 +5,24 @@ Gelişmiş raporlama sistemi için veri işleme servisleri
 
 from datetime import datetime, date, timedelta
 from sqlalchemy import func, and_, or_
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from app import db
-from app.models import Event, EventSeating, Reservation, SeatingType
+from app.models import Event, EventSeating, Reservation, SeatingType, ReservationDailyRollup
 from app.models.reservation import ReservationStatus
-import pandas as pd
+from app.services.rollup_service import RollupService
+from app.utils.lazy_imports import lazy_import
 
+# pandas yalnızca DataFrame isteyen çağıranlar için yüklenir
+pd = lazy_import('pandas')
+
+# Rezervasyon export'larının sütunları (CSV/Excel başlıkları)
+EXPORT_COLUMNS = [
+    'Rezervasyon_ID', 'Telefon', 'Ad', 'Soyad', 'Etkinlik', 'Oturum_No', 'Oturum_Tip',
+    'Kapasite', 'Kisi_Sayisi', 'Durum', 'Check_in', 'Olusturma_Tarihi'
+]
+
+# Export satırı: sütun adlarıyla erişilen hafif tuple (CSV/Excel doğrudan yazar)
+ExportRow = namedtuple('ExportRow', EXPORT_COLUMNS)
 
 class AnalyticsService:
     """Etkinlik analitik verilerini işleyen servis"""
@@ -236,51 +248,72 @@ class AnalyticsService:
         end_date = datetime.now().date()
         start_date = end_date - timedelta(days=comparison_period_days)
         
-        # Bu dönem
-        current_period = db.session.query(
-            func.count(Reservation.id).label('reservations'),
-            func.sum(Reservation.number_of_people).label('people')
-        ).join(
-            Event, Reservation.event_id == Event.id
-        ).filter(
-            and_(
-                Event.company_id == company_id,
-                Reservation.created_at >= start_date,
-                Reservation.created_at <= end_date
-            )
-        ).first()
-        
-        # Önceki dönem
         prev_start = start_date - timedelta(days=comparison_period_days)
         prev_end = start_date
         
-        previous_period = db.session.query(
-            func.count(Reservation.id).label('reservations'),
-            func.sum(Reservation.number_of_people).label('people')
-        ).join(
-            Event, Reservation.event_id == Event.id
-        ).filter(
-            and_(
-                Event.company_id == company_id,
-                Reservation.created_at >= prev_start,
-                Reservation.created_at <= prev_end
-            )
-        ).first()
+        if RollupService.covers(company_id, prev_start):
+            # Oluşturma günlerine göre dönem toplamları rollup tablosundan
+            current_period = self._rollup_period(company_id, start_date, end_date)
+            previous_period = self._rollup_period(company_id, prev_start, prev_end)
+        else:
+            # Bu dönem
+            current_period = db.session.query(
+                func.count(Reservation.id).label('reservations'),
+                func.sum(Reservation.number_of_people).label('people')
+            ).join(
+                Event, Reservation.event_id == Event.id
+            ).filter(
+                and_(
+                    Event.company_id == company_id,
+                    Reservation.created_at >= start_date,
+                    Reservation.created_at <= end_date
+                )
+            ).first()
+            
+            # Önceki dönem
+            previous_period = db.session.query(
+                func.count(Reservation.id).label('reservations'),
+                func.sum(Reservation.number_of_people).label('people')
+            ).join(
+                Event, Reservation.event_id == Event.id
+            ).filter(
+                and_(
+                    Event.company_id == company_id,
+                    Reservation.created_at >= prev_start,
+                    Reservation.created_at <= prev_end
+                )
+            ).first()
         
         # Etkinlik performansı
-        event_performance = db.session.query(
-            Event.name,
-            func.count(Reservation.id).label('reservations'),
-            func.sum(Reservation.number_of_people).label('people')
-        ).join(
-            Reservation, Event.id == Reservation.event_id
-        ).filter(
-            and_(
-                Event.company_id == company_id,
-                Event.event_date >= start_date,
-                Event.event_date <= end_date
-            )
-        ).group_by(Event.id, Event.name).all()
+        if RollupService.covers(company_id):
+            reservations = func.sum(ReservationDailyRollup.created)
+            event_performance = db.session.query(
+                Event.name,
+                reservations.label('reservations'),
+                func.sum(ReservationDailyRollup.people).label('people')
+            ).join(
+                ReservationDailyRollup, Event.id == ReservationDailyRollup.event_id
+            ).filter(
+                and_(
+                    Event.company_id == company_id,
+                    Event.event_date >= start_date,
+                    Event.event_date <= end_date
+                )
+            ).group_by(Event.id, Event.name).having(reservations > 0).all()
+        else:
+            event_performance = db.session.query(
+                Event.name,
+                func.count(Reservation.id).label('reservations'),
+                func.sum(Reservation.number_of_people).label('people')
+            ).join(
+                Reservation, Event.id == Reservation.event_id
+            ).filter(
+                and_(
+                    Event.company_id == company_id,
+                    Event.event_date >= start_date,
+                    Event.event_date <= end_date
+                )
+            ).group_by(Event.id, Event.name).all()
         
         return {
             'current_period': {
@@ -311,6 +344,17 @@ class AnalyticsService:
             ]
         }
     
+    def _rollup_period(self, company_id, start_day, end_day):
+        """[start_day, end_day) günlerinde oluşturulan rezervasyon ve kişi toplamı"""
+        return db.session.query(
+            func.coalesce(func.sum(ReservationDailyRollup.created), 0).label('reservations'),
+            func.coalesce(func.sum(ReservationDailyRollup.people), 0).label('people')
+        ).filter(
+            ReservationDailyRollup.company_id == company_id,
+            ReservationDailyRollup.day >= start_day,
+            ReservationDailyRollup.day < end_day
+        ).one()
+    
     def _calculate_growth_rate(self, current, previous):
         """Büyüme oranı hesapla"""
         if previous == 0:
@@ -318,9 +362,22 @@ class AnalyticsService:
         return round(((current - previous) / previous) * 100, 2)
     
     def export_data_to_dataframe(self, event_id):
-        """Verileri pandas DataFrame'e aktar"""
-        # Rezervasyon verileri
-        reservations = db.session.query(
+        """
+        Verileri pandas DataFrame'e aktar
+        
+        Export'lar iter_export_rows satırlarını doğrudan kullanır; pandas yalnızca
+        DataFrame isteyen çağıranlar için burada yüklenir.
+        """
+        return pd.DataFrame.from_records(list(self.iter_export_rows(event_id)), columns=EXPORT_COLUMNS)
+    
+    def iter_export_rows(self, event_id=None, company_id=None, batch_size=500, limit=None):
+        """
+        Export satırlarını veritabanından parça parça okuyarak üretir
+        
+        Sorgu `yield_per` ile çalışır; satırlar ExportRow olarak tek tek döner,
+        tüm sonuç belleğe alınmaz.
+        """
+        query = db.session.query(
             Reservation.id,
             Reservation.phone,
             Reservation.first_name,
@@ -339,26 +396,29 @@ class AnalyticsService:
             EventSeating, Reservation.seating_id == EventSeating.id
         ).outerjoin(
             SeatingType, EventSeating.seating_type_id == SeatingType.id
-        ).filter(
-            Reservation.event_id == event_id
-        ).all()
+        )
         
-        # DataFrame oluştur
-        data = []
-        for res in reservations:
-            data.append({
-                'Rezervasyon_ID': res.id,
-                'Telefon': res.phone,
-                'Ad': res.first_name or '',
-                'Soyad': res.last_name or '',
-                'Etkinlik': res.event_name or '',
-                'Oturum_No': res.seat_number or '',
-                'Oturum_Tip': res.seating_type or '',
-                'Kapasite': res.capacity or 0,
-                'Kisi_Sayisi': res.number_of_people or 0,
-                'Durum': res.status.value if res.status else '',
-                'Check_in': 'Evet' if res.checked_in else 'Hayır',
-                'Olusturma_Tarihi': res.created_at.strftime('%d.%m.%Y %H:%M') if res.created_at else ''
-            })
+        if event_id is not None:
+            query = query.filter(Reservation.event_id == event_id)
+        if company_id is not None:
+            query = query.filter(Event.company_id == company_id)
         
-        return pd.DataFrame(data)
+        query = query.order_by(Reservation.event_id, Reservation.id).execution_options(yield_per=batch_size)
+        if limit is not None:
+            query = query.limit(limit)
+        
+        for res in query:
+            yield ExportRow(
+                res.id,
+                res.phone,
+                res.first_name or '',
+                res.last_name or '',
+                res.event_name or '',
+                res.seat_number or '',
+                res.seating_type or '',
+                res.capacity or 0,
+                res.number_of_people or 0,
+                res.status.value if res.status else '',
+                'Evet' if res.checked_in else 'Hayır',
+                res.created_at.strftime('%d.%m.%Y %H:%M') if res.created_at else ''
+            )
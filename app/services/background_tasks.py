@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Arka Plan Görevleri
+İş kuyruğunda çalışan yavaş işler: QR kodu üretimi, etkinlik export'ları ve
+rapor Excel'leri. Görevler uygulama bağlamında çalışır.
+"""
+from typing import Any, Dict, List, Optional
+from flask import current_app
+from app import db
+from app.models import Reservation
+from app.services.job_queue import job_queue
+
+EXPORT_FORMATS = ('csv', 'excel', 'pdf', 'json')
+
+
+@job_queue.task('qr_codes')
+def generate_qr_codes(codes: List[str], chunk_size: int = 100) -> Dict[str, int]:
+    """
+    Verilen rezervasyon kodları için QR dosyalarını üretir
+
+    Args:
+        codes: Rezervasyon kodları
+        chunk_size: Commit başına rezervasyon sayısı
+
+    Returns:
+        Dict: Üretilen QR kodu sayısı
+    """
+    generated = 0
+    for start in range(0, len(codes), chunk_size):
+        reservations = Reservation.query.filter(
+            Reservation.reservation_code.in_(codes[start:start + chunk_size])
+        ).all()
+        for reservation in reservations:
+            try:
+                reservation.generate_qr_code()
+                generated += 1
+            except Exception as e:
+                current_app.logger.warning(f'QR code generation error ({reservation.reservation_code}): {e}')
+        db.session.commit()
+    return {'generated': generated, 'total': len(codes)}
+
+
+@job_queue.task('event_export')
+def export_event(event_id: int, export_format: str, report_type: str = 'comprehensive',
+                 include_analytics: bool = True, file_format: str = 'utf-8') -> Dict[str, Any]:
+    """Etkinlik verisini istenen formatta dosyaya aktarır"""
+    from app.services.export_service import (
+        ExportService, CSV_MIMETYPE, XLSX_MIMETYPE, PDF_MIMETYPE, JSON_MIMETYPE
+    )
+
+    service = ExportService()
+    if export_format == 'csv':
+        data, filename = service.build_csv(event_id, file_format)
+        mimetype = CSV_MIMETYPE
+    elif export_format == 'excel':
+        data, filename = service.build_excel(event_id, include_analytics)
+        mimetype = XLSX_MIMETYPE
+    elif export_format == 'pdf':
+        data, filename = service.build_pdf(event_id, report_type)
+        mimetype = PDF_MIMETYPE
+    elif export_format == 'json':
+        data, filename = service.build_json(event_id)
+        mimetype = JSON_MIMETYPE
+    else:
+        raise ValueError(f'Desteklenmeyen export formatı: {export_format}')
+
+    return {'data': data, 'filename': filename, 'mimetype': mimetype}
+
+
+@job_queue.task('report_excel')
+def export_report_excel(company_id: int, report_type: str = 'summary',
+                        start_date: Optional[str] = None,
+                        end_date: Optional[str] = None) -> Dict[str, Any]:
+    """Şirket raporunu Excel olarak üretir"""
+    from datetime import datetime
+    from app.services.export_service import XLSX_MIMETYPE
+    from app.services.report_service import ReportService
+
+    date_filter_start = datetime.fromisoformat(start_date) if start_date else None
+    date_filter_end = datetime.fromisoformat(end_date) if end_date else None
+
+    service = ReportService(company_id)
+    if report_type == 'reservation':
+        report_data = service.get_reservation_analysis_report(date_filter_start, date_filter_end)
+    else:
+        report_data = service.get_summary_report(date_filter_start, date_filter_end)
+
+    data, filename = service.build_excel(report_data, report_type)
+    return {'data': data, 'filename': filename, 'mimetype': XLSX_MIMETYPE}
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Önbellek Sürüm Damgaları
+Süreç içi önbellekler (oturum tipleri vb.) worker'lar arasında cache_versions
+tablosundaki sayaçlarla tazelenir: veriyi değiştiren transaction sayacı aynı
+transaction içinde artırır, okuyan süreç kendi yüklediği sürümle
+karşılaştırıp farklıysa yeniden yükler.
+"""
+from datetime import datetime
+from typing import Dict, Iterable
+
+from sqlalchemy import insert, select, update
+from app import db
+from app.models import CacheVersion
+
+
+def bump_version(connection, name: str) -> None:
+    """
+    Sürüm sayacını çağıranın transaction'ı içinde artırır
+
+    Args:
+        connection: Session'ın bağlantısı (session.connection())
+        name: Sayaç adı
+    """
+    result = connection.execute(
+        update(CacheVersion.__table__)
+        .where(CacheVersion.__table__.c.name == name)
+        .values(version=CacheVersion.__table__.c.version + 1, updated_at=datetime.utcnow())
+    )
+    if result.rowcount == 0:
+        connection.execute(
+            insert(CacheVersion.__table__).values(name=name, version=1, updated_at=datetime.utcnow())
+        )
+
+
+def read_version(name: str) -> int:
+    """Sayacın güncel değeri (hiç artırılmadıysa 0)"""
+    return read_versions([name])[name]
+
+
+def read_versions(names: Iterable[str]) -> Dict[str, int]:
+    """Birden fazla sayacı tek sorguda okur"""
+    names = list(names)
+    rows = db.session.execute(
+        select(CacheVersion.name, CacheVersion.version).where(CacheVersion.name.in_(names))
+    ).all() if names else []
+    versions = dict.fromkeys(names, 0)
+    versions.update({row.name: row.version for row in rows})
+    return versions
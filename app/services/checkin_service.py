@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+Check-in Servisi
+Etkinlik başına rezervasyon kodlarını bellekte tutar; tekrar ve bulunamadı
+okutmalarını veritabanına gitmeden yanıtlar. Check-in yazımı tek bir koşullu
+UPDATE ile yapılır, böylece iki kapıdan aynı anda okutulan kod bir kez işlenir.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from flask import current_app
+from sqlalchemy import update
+from app import db
+from app.models import Event, EventSeating, Reservation
+from app.models.reservation import ReservationStatus
+from app.services import reservation_events
+
+CHECKIN_OK = 'ok'
+CHECKIN_DUPLICATE = 'duplicate'
+CHECKIN_CANCELLED = 'cancelled'
+CHECKIN_NOT_FOUND = 'not_found'
+
+
+class CheckinEntry:
+    """Tek bir rezervasyonun check-in için gereken alanları"""
+
+    __slots__ = (
+        'reservation_id', 'event_id', 'code', 'seating_id', 'seat_number',
+        'people', 'name', 'phone', 'checked_in', 'checked_in_at', 'cancelled'
+    )
+
+    def __init__(self, row):
+        self.reservation_id = row.id
+        self.event_id = row.event_id
+        self.code = row.reservation_code
+        self.seating_id = row.seating_id
+        self.seat_number = row.seat_number or 'N/A'
+        self.people = row.number_of_people
+        self.name = Reservation.format_customer_name(row.first_name, row.last_name)
+        self.phone = row.phone
+        self.checked_in = bool(row.checked_in)
+        self.checked_in_at = row.checked_in_at
+        self.cancelled = row.status == ReservationStatus.CANCELLED
+
+    def summary(self) -> Dict[str, Any]:
+        """Canlı akış mesajı için rezervasyon özeti"""
+        return {
+            'id': self.reservation_id,
+            'code': self.code,
+            'name': self.name,
+            'people': self.people,
+            'seating_id': self.seating_id
+        }
+
+
+class CheckinResult:
+    """Check-in denemesinin sonucu"""
+
+    def __init__(self, status: str, entry: Optional[CheckinEntry] = None,
+                 event_name: Optional[str] = None):
+        self.status = status
+        self.entry = entry
+        self.event_name = event_name
+
+    @property
+    def success(self) -> bool:
+        return self.status == CHECKIN_OK
+
+
+class _EventCodes:
+    """Bir etkinliğin kod -> rezervasyon haritası"""
+
+    def __init__(self, event_name: Optional[str], entries: Dict[str, CheckinEntry]):
+        self.event_name = event_name
+        self.entries = entries
+        self.loaded_at = time.monotonic()
+
+
+class CheckinCache:
+    """
+    Uygulama başına check-in önbelleği
+
+    Harita süreç içidir; diğer worker'lardaki değişiklikler, bilinmeyen kod
+    okutulduğunda (en fazla reload_interval saniyede bir) veya max_age dolunca
+    yeniden yüklenerek görülür. Doğruluk koşullu UPDATE ile sağlanır.
+    """
+
+    def __init__(self, reload_interval: float = 5, max_age: float = 300):
+        self.reload_interval = reload_interval
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._events: Dict[int, _EventCodes] = {}
+        self._code_events: Dict[str, int] = {}
+        self._misses: Dict[str, float] = {}
+
+    def get_event(self, event_id: int) -> _EventCodes:
+        codes = self._events.get(event_id)
+        if codes is None or time.monotonic() - codes.loaded_at > self.max_age:
+            codes = self.load_event(event_id)
+        return codes
+
+    def load_event(self, event_id: int) -> _EventCodes:
+        """Etkinliğin tüm rezervasyon kodlarını tek sorguda yükler"""
+        rows = db.session.query(
+            Reservation.id,
+            Reservation.event_id,
+            Reservation.reservation_code,
+            Reservation.seating_id,
+            Reservation.number_of_people,
+            Reservation.first_name,
+            Reservation.last_name,
+            Reservation.phone,
+            Reservation.checked_in,
+            Reservation.checked_in_at,
+            Reservation.status,
+            EventSeating.seat_number,
+            Event.name.label('event_name')
+        ).join(
+            Event, Reservation.event_id == Event.id
+        ).outerjoin(
+            EventSeating, Reservation.seating_id == EventSeating.id
+        ).filter(
+            Reservation.event_id == event_id
+        ).all()
+
+        entries = {row.reservation_code: CheckinEntry(row) for row in rows}
+        event_name = rows[0].event_name if rows else None
+        codes = _EventCodes(event_name, entries)
+
+        with self._lock:
+            self._events[event_id] = codes
+            for code in entries:
+                self._code_events[code] = event_id
+                self._misses.pop(code, None)
+
+        return codes
+
+    def find(self, code: str, event_id: Optional[int] = None) -> Optional[CheckinEntry]:
+        """
+        Kodu önbellekte arar
+
+        Args:
+            code: Rezervasyon kodu
+            event_id: Okutmanın yapıldığı etkinlik (biliniyorsa)
+
+        Returns:
+            CheckinEntry veya None
+        """
+        if event_id is None:
+            event_id = self._code_events.get(code)
+        # Kod veritabanında az önce bulunduysa harita ne kadar yeni olursa olsun yenilenir
+        confirmed = False
+        if event_id is None:
+            event_id = self._resolve_event(code)
+            if event_id is None:
+                return None
+            confirmed = True
+
+        codes = self.get_event(event_id)
+        entry = codes.entries.get(code)
+        if entry is None and (confirmed or time.monotonic() - codes.loaded_at > self.reload_interval):
+            # Başka bir worker'da yeni oluşturulmuş olabilir
+            entry = self.load_event(event_id).entries.get(code)
+        return entry
+
+    def event_name(self, event_id: int) -> Optional[str]:
+        codes = self._events.get(event_id)
+        return codes.event_name if codes is not None else None
+
+    def invalidate(self, event_id: int) -> None:
+        with self._lock:
+            self._events.pop(event_id, None)
+
+    def _resolve_event(self, code: str) -> Optional[int]:
+        """Etkinliği bilinmeyen kod için indeksli tek kolon sorgusu (negatif önbellekli)"""
+        missed_at = self._misses.get(code)
+        if missed_at is not None and time.monotonic() - missed_at < self.reload_interval:
+            return None
+
+        event_id = db.session.query(Reservation.event_id).filter(
+            Reservation.reservation_code == code
+        ).scalar()
+
+        with self._lock:
+            if event_id is None:
+                if len(self._misses) > 10000:
+                    self._misses.clear()
+                self._misses[code] = time.monotonic()
+            else:
+                self._code_events[code] = event_id
+
+        return event_id
+
+
+class CheckinService:
+    """QR / kod ile check-in işlemlerini yöneten servis sınıfı"""
+
+    def __init__(self, event_id: Optional[int] = None):
+        self.event_id = event_id
+        self.cache = get_checkin_cache()
+
+    def check_in(self, code: str, user_id: Optional[int] = None) -> CheckinResult:
+        """
+        Rezervasyon kodu ile check-in yapar
+
+        Args:
+            code: Rezervasyon kodu
+            user_id: Check-in yapan kullanıcı (kiosk için None)
+
+        Returns:
+            CheckinResult: ok, duplicate, cancelled veya not_found
+        """
+        entry = self.cache.find(code, self.event_id)
+        if entry is None:
+            return CheckinResult(CHECKIN_NOT_FOUND)
+
+        event_name = self.cache.event_name(entry.event_id)
+        if entry.cancelled:
+            return CheckinResult(CHECKIN_CANCELLED, entry, event_name)
+        if entry.checked_in:
+            return CheckinResult(CHECKIN_DUPLICATE, entry, event_name)
+
+        checked_in_at = datetime.utcnow()
+        result = db.session.execute(
+            update(Reservation)
+            .where(
+                Reservation.id == entry.reservation_id,
+                Reservation.checked_in == False,  # noqa: E712
+                Reservation.status == ReservationStatus.ACTIVE
+            )
+            .values(checked_in=True, checked_in_at=checked_in_at, checked_in_by=user_id)
+            .execution_options(synchronize_session=False)
+        )
+
+        if result.rowcount == 0:
+            # Başka kapıdan okutulmuş veya iptal edilmiş: güncel durumu yükle
+            db.session.rollback()
+            entry = self.cache.load_event(entry.event_id).entries.get(code)
+            if entry is None:
+                return CheckinResult(CHECKIN_NOT_FOUND)
+            status = CHECKIN_CANCELLED if entry.cancelled else CHECKIN_DUPLICATE
+            return CheckinResult(status, entry, event_name)
+
+        reservation_events.on_checked_in_entry(entry)
+        db.session.commit()
+
+        entry.checked_in = True
+        entry.checked_in_at = checked_in_at
+        return CheckinResult(CHECKIN_OK, entry, event_name)
+
+
+def get_checkin_cache() -> CheckinCache:
+    """Uygulamaya ait check-in önbelleğini getirir, yoksa oluşturur"""
+    cache = current_app.extensions.get('checkin_cache')
+    if cache is None:
+        cache = CheckinCache(
+            reload_interval=current_app.config.get('CHECKIN_CACHE_RELOAD_INTERVAL', 5),
+            max_age=current_app.config.get('CHECKIN_CACHE_MAX_AGE', 300)
+        )
+        current_app.extensions['checkin_cache'] = cache
+    return cache
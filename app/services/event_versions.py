@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Etkinlik Sürüm Damgaları
+Yerleşim, oturum durumu ve dashboard uçları sık sık yoklanır ve çoğu zaman
+aynı veriyi döner. Her etkinlik için cache_versions tablosunda bir değişiklik
+sayacı ('event:<id>') tutulur; etkinliği, oturumlarını veya rezervasyonlarını
+değiştiren transaction sayacı aynı transaction içinde artırır. Uçlar sayacı
+ETag olarak kullanır ve istemcinin kopyası güncelse (If-None-Match) pahalı
+sorguları çalıştırmadan 304 döner.
+
+ORM ile yapılan değişiklikler flush dinleyicisiyle yakalanır; flush'a
+görünmeyen toplu UPDATE'ler (check-in, iptal, içe aktarma, yerleşim farkı)
+reservation_events kancaları üzerinden `touch` ile işaretlenir. Sayaç her
+transaction'da etkinlik başına en fazla bir kez artırılır.
+"""
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import event as sa_event, select
+
+from app.services.seating_type_registry import VERSION_NAME as SEATING_TYPES_VERSION
+
+BUMPED_KEY = 'event_versions_bumped'
+
+
+def version_name(event_id: int) -> str:
+    """Etkinlik sayacı adı"""
+    return f'event:{event_id}'
+
+
+class EventVersions:
+    """Etkinlik değişiklik sayaçlarını artıran ve ETag üreten sınıf"""
+
+    def __init__(self, app=None):
+        self._listeners_registered = False
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Sayaçları Flask app ile başlatır"""
+        self._register_session_listeners()
+
+    def _register_session_listeners(self):
+        """Flush edilen değişikliklerde sayacı artırır, transaction bitince işaretleri siler"""
+        if self._listeners_registered:
+            return
+
+        from app import db
+
+        @sa_event.listens_for(db.session, 'after_flush')
+        def _bump_on_flush(session, flush_context):
+            self._collect(session)
+
+        @sa_event.listens_for(db.session, 'after_commit')
+        def _reset_on_commit(session):
+            session.info.pop(BUMPED_KEY, None)
+
+        @sa_event.listens_for(db.session, 'after_rollback')
+        def _reset_on_rollback(session):
+            session.info.pop(BUMPED_KEY, None)
+
+        self._listeners_registered = True
+
+    def touch(self, session, event_id: int) -> None:
+        """
+        Etkinlik sayacını mevcut transaction içinde artırır (transaction başına bir kez)
+
+        Args:
+            session: SQLAlchemy session
+            event_id: Değişen etkinlik
+        """
+        from app.services.cache_versions import bump_version
+
+        bumped = session.info.setdefault(BUMPED_KEY, set())
+        if event_id is None or event_id in bumped:
+            return
+        bump_version(session.connection(), version_name(event_id))
+        bumped.add(event_id)
+
+    def etag(self, event_id: int, company_id: Optional[int] = None,
+             seating_types: bool = False, extra: Iterable[Any] = ()) -> Optional[str]:
+        """
+        Etkinliğin güncel ETag'i; yetki kontrolüyle birlikte tek sorguda okunur
+
+        Args:
+            event_id: Etkinlik ID'si
+            company_id: Verilirse etkinlik bu şirkete ait olmalıdır
+            seating_types: Yanıt oturum tipi bilgisi içeriyorsa True
+                (tip değişiklikleri de ETag'i değiştirir)
+            extra: Yanıtı etkileyen diğer değerler (tarih, parametre vb.)
+
+        Returns:
+            str: ETag değeri; etkinlik yoksa veya şirkete ait değilse None
+        """
+        from app import db
+        from app.models import CacheVersion, Event
+
+        def counter(name):
+            return select(CacheVersion.version).where(CacheVersion.name == name).scalar_subquery()
+
+        columns = [counter(version_name(event_id))]
+        if seating_types:
+            columns.append(counter(SEATING_TYPES_VERSION))
+
+        query = select(Event.id, *columns).where(Event.id == event_id)
+        if company_id is not None:
+            query = query.where(Event.company_id == company_id)
+
+        row = db.session.execute(query).first()
+        if row is None:
+            return None
+        parts = [str(value or 0) for value in row] + [str(value) for value in extra]
+        return '-'.join(parts)
+
+    def _collect(self, session) -> None:
+        """Flush edilen etkinlik, oturum ve rezervasyon değişikliklerinin sayaçlarını artırır"""
+        from app.models import Event, EventSeating, Reservation
+
+        event_ids = set()
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            if isinstance(obj, Event):
+                event_ids.add(obj.id)
+            elif isinstance(obj, (Reservation, EventSeating)):
+                event_ids.add(obj.event_id)
+
+        for event_id in sorted(event_id for event_id in event_ids if event_id is not None):
+            self.touch(session, event_id)
+
+
+event_versions = EventVersions()
@@ -4,22 +4,36 @@ Gelişmiş raporlama sistemi için export fonksiyonları
 """
 
 from datetime import datetime
-from io import BytesIO
+from io import BytesIO, StringIO
+from urllib.parse import quote
+import codecs
 import csv
 import json
-from flask import send_file, make_response
-from reportlab.lib.pagesizes import A4, letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
-import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
-from openpyxl.utils.dataframe import dataframe_to_rows
-from .analytics_service import AnalyticsService
+import tempfile
+import unicodedata
+from flask import Response, send_file, make_response, stream_with_context
+from app.utils.lazy_imports import lazy_import
+from .analytics_service import AnalyticsService, EXPORT_COLUMNS
+
+# reportlab ve openpyxl ilk export'ta yüklenir
+pagesizes = lazy_import('reportlab.lib.pagesizes')
+platypus = lazy_import('reportlab.platypus')
+rl_styles = lazy_import('reportlab.lib.styles')
+colors = lazy_import('reportlab.lib.colors')
+openpyxl = lazy_import('openpyxl')
+xl_cell = lazy_import('openpyxl.cell')
+xl_styles = lazy_import('openpyxl.styles')
+xl_utils = lazy_import('openpyxl.utils')
+
+CSV_MIMETYPE = 'text/csv'
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+PDF_MIMETYPE = 'application/pdf'
+JSON_MIMETYPE = 'application/json'
+
+# CSV akışında parça başına satır
+CSV_CHUNK_ROWS = 500
+
+EXPORT_COLUMN_WIDTHS = [16, 16, 18, 18, 30, 12, 16, 10, 12, 12, 10, 18]
 
 
 class ExportService:
@@ -29,81 +43,114 @@ class ExportService:
         self.analytics_service = AnalyticsService()
     
     def export_to_csv(self, event_id, file_format='utf-8'):
-        """CSV formatında dışa aktar"""
+        """CSV formatında dışa aktar (akış olarak gönderilir)"""
+        filename = f"rezervasyon_raporu_{self._get_event_name(event_id)}_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
+        return self._stream(self.stream_csv(event_id=event_id, file_format=file_format), filename, CSV_MIMETYPE)
+    
+    def export_company_to_csv(self, company_id, file_format='utf-8-sig'):
+        """Şirketin tüm rezervasyonlarını CSV olarak akıtır"""
+        filename = f"reservations_all_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        return self._stream(self.stream_csv(company_id=company_id, file_format=file_format), filename, CSV_MIMETYPE)
+    
+    def build_csv(self, event_id, file_format='utf-8'):
+        """CSV içeriğini üretir (arka plan işleri için) -> (bytes, dosya adı)"""
         try:
-            df = self.analytics_service.export_data_to_dataframe(event_id)
-            
-            # CSV oluştur
-            output = BytesIO()
-            df.to_csv(output, index=False, encoding=file_format)
-            output.seek(0)
+            data = b''.join(self.stream_csv(event_id=event_id, file_format=file_format))
             
             # Dosya adı
             event_name = self._get_event_name(event_id)
             filename = f"rezervasyon_raporu_{event_name}_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
             
-            return send_file(
-                output,
-                mimetype='text/csv',
-                as_attachment=True,
-                download_name=filename
-            )
+            return data, filename
             
         except Exception as e:
             raise Exception(f"CSV export hatası: {str(e)}")
     
+    def stream_csv(self, event_id=None, company_id=None, file_format='utf-8'):
+        """
+        Rezervasyonları CSV parçaları halinde üretir
+        
+        Satırlar veritabanından yield_per ile okunur ve CSV_CHUNK_ROWS satırda
+        bir kodlanmış parça olarak döner; bellek kullanımı satır sayısıyla artmaz.
+        """
+        encoder = codecs.getincrementalencoder(file_format)(errors='replace')
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        
+        rows = self.analytics_service.iter_export_rows(event_id=event_id, company_id=company_id)
+        for index, row in enumerate(rows, 1):
+            writer.writerow(row)
+            if index % CSV_CHUNK_ROWS == 0:
+                yield encoder.encode(buffer.getvalue())
+                buffer.seek(0)
+                buffer.truncate()
+        
+        yield encoder.encode(buffer.getvalue(), final=True)
+    
     def export_to_excel(self, event_id, include_analytics=True):
-        """Excel formatında dışa aktar"""
+        """Excel formatında dışa aktar (geçici dosya üzerinden gönderilir)"""
+        output = tempfile.TemporaryFile()
+        filename = self._write_excel(output, event_id, include_analytics)
+        output.seek(0)
+        return send_file(
+            output,
+            mimetype=XLSX_MIMETYPE,
+            as_attachment=True,
+            download_name=filename
+        )
+    
+    def build_excel(self, event_id, include_analytics=True):
+        """Excel içeriğini üretir (arka plan işleri için) -> (bytes, dosya adı)"""
+        output = BytesIO()
+        filename = self._write_excel(output, event_id, include_analytics)
+        return output.getvalue(), filename
+    
+    def _write_excel(self, output, event_id, include_analytics=True):
+        """
+        Excel'i write-only çalışma kitabıyla yazar, dosya adını döner
+        
+        Write-only modda satırlar diske akıtılır; hücre nesneleri bellekte
+        tutulmadığından sütun genişlikleri ve başlık stili baştan verilir.
+        """
         try:
-            workbook = Workbook()
+            workbook = openpyxl.Workbook(write_only=True)
             
             # Ana sayfa - Rezervasyonlar
-            ws_reservations = workbook.active
-            ws_reservations.title = "Rezervasyonlar"
-            
-            # Verileri al
-            df = self.analytics_service.export_data_to_dataframe(event_id)
-            
-            # Başlıklar ve veriler
-            for r in dataframe_to_rows(df, index=False, header=True):
-                ws_reservations.append(r)
+            ws_reservations = workbook.create_sheet("Rezervasyonlar")
+            self._append_header(ws_reservations, EXPORT_COLUMNS, widths=EXPORT_COLUMN_WIDTHS)
             
-            # Stil uygula
-            self._style_excel_sheet(ws_reservations, "Rezervasyonlar")
+            for row in self.analytics_service.iter_export_rows(event_id=event_id):
+                ws_reservations.append(row)
             
             # Analitik sayfaları
             if include_analytics:
                 self._add_analytics_sheets(workbook, event_id)
             
-            # Excel dosyasını oluştur
-            output = BytesIO()
             workbook.save(output)
-            output.seek(0)
             
             # Dosya adı
             event_name = self._get_event_name(event_id)
-            filename = f"detayli_rapor_{event_name}_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
-            
-            return send_file(
-                output,
-                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                as_attachment=True,
-                download_name=filename
-            )
+            return f"detayli_rapor_{event_name}_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
             
         except Exception as e:
             raise Exception(f"Excel export hatası: {str(e)}")
     
     def export_to_pdf(self, event_id, report_type='comprehensive'):
         """PDF formatında dışa aktar"""
+        data, filename = self.build_pdf(event_id, report_type)
+        return self._send(data, filename, PDF_MIMETYPE)
+    
+    def build_pdf(self, event_id, report_type='comprehensive'):
+        """PDF içeriğini üretir (arka plan işleri için) -> (bytes, dosya adı)"""
         try:
             output = BytesIO()
-            doc = SimpleDocTemplate(output, pagesize=A4)
-            styles = getSampleStyleSheet()
+            doc = platypus.SimpleDocTemplate(output, pagesize=pagesizes.A4)
+            styles = rl_styles.getSampleStyleSheet()
             story = []
             
             # Başlık stili
-            title_style = ParagraphStyle(
+            title_style = rl_styles.ParagraphStyle(
                 'CustomTitle',
                 parent=styles['Heading1'],
                 fontSize=18,
@@ -115,20 +162,20 @@ class ExportService:
             event = self._get_event(event_id)
             
             # PDF Başlığı
-            title = Paragraph(f"Etkinlik Raporu: {event.name}", title_style)
+            title = platypus.Paragraph(f"Etkinlik Raporu: {event.name}", title_style)
             story.append(title)
-            story.append(Spacer(1, 12))
+            story.append(platypus.Spacer(1, 12))
             
             # Tarih
-            date_style = ParagraphStyle(
+            date_style = rl_styles.ParagraphStyle(
                 'DateStyle',
                 parent=styles['Normal'],
                 fontSize=12,
                 alignment=1
             )
-            date_text = Paragraph(f"Tarih: {datetime.now().strftime('%d.%m.%Y %H:%M')}", date_style)
+            date_text = platypus.Paragraph(f"Tarih: {datetime.now().strftime('%d.%m.%Y %H:%M')}", date_style)
             story.append(date_text)
-            story.append(Spacer(1, 20))
+            story.append(platypus.Spacer(1, 20))
             
             if report_type == 'comprehensive':
                 # Kapsamlı rapor
@@ -147,58 +194,40 @@ class ExportService:
             
             # PDF oluştur
             doc.build(story)
-            output.seek(0)
             
             # Dosya adı
             event_name = self._get_event_name(event_id)
             filename = f"pdf_rapor_{event_name}_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
             
-            return send_file(
-                output,
-                mimetype='application/pdf',
-                as_attachment=True,
-                download_name=filename
-            )
+            return output.getvalue(), filename
             
         except Exception as e:
             raise Exception(f"PDF export hatası: {str(e)}")
     
-    def _style_excel_sheet(self, worksheet, sheet_name):
-        """Excel sayfasına stil uygula"""
-        # Başlık stili
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+    def _append_header(self, worksheet, headers, widths=None):
+        """
+        Write-only sayfaya stilli başlık satırı ekler
+        
+        Sütun genişlikleri yalnızca ilk satırdan önce verilebilir.
+        """
+        for index, width in enumerate(widths or [], 1):
+            worksheet.column_dimensions[xl_utils.get_column_letter(index)].width = width
         
-        # Başlık satırı
-        for cell in worksheet[1]:
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.border = thin_border
-            cell.alignment = Alignment(horizontal='center')
-        
-        # Veri satırları
-        for row in worksheet.iter_rows(min_row=2):
-            for cell in row:
-                cell.border = thin_border
-        
-        # Sütun genişlikleri
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+        thin = xl_styles.Side(style='thin')
+        font = xl_styles.Font(bold=True, color="FFFFFF")
+        fill = xl_styles.PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        border = xl_styles.Border(left=thin, right=thin, top=thin, bottom=thin)
+        alignment = xl_styles.Alignment(horizontal='center')
+        
+        cells = []
+        for value in headers:
+            cell = xl_cell.WriteOnlyCell(worksheet, value=value)
+            cell.font = font
+            cell.fill = fill
+            cell.border = border
+            cell.alignment = alignment
+            cells.append(cell)
+        worksheet.append(cells)
     
     def _add_analytics_sheets(self, workbook, event_id):
         """Excel'e analitik sayfaları ekle"""
@@ -208,7 +237,7 @@ class ExportService:
         
         # Başlıklar
         headers = ['Oturum No', 'Oturum Tip', 'Kapasite', 'Rezervasyon', 'Doluluk %', 'Durum']
-        ws_seating.append(headers)
+        self._append_header(ws_seating, headers, widths=[14, 16, 10, 12, 12, 12])
         
         # Veriler
         for seating in seating_data:
@@ -221,23 +250,19 @@ class ExportService:
                 seating['status']
             ])
         
-        self._style_excel_sheet(ws_seating, "Oturum Analizi")
-        
         # Müşteri analizi
         ws_customer = workbook.create_sheet("Müşteri Analizi")
         customer_data = self.analytics_service.get_customer_analysis(event_id)
         
         # Müşteri segmentasyonu
-        segments_headers = ['Segment', 'Adet']
-        ws_customer.append(["Müşteri Segmentasyonu", ""])
-        ws_customer.append(segments_headers)
+        self._append_header(ws_customer, ["Müşteri Segmentasyonu", "Adet"], widths=[30, 30, 20, 20])
         
         for segment, count in customer_data['segments'].items():
             ws_customer.append([segment.replace('_', ' ').title(), count])
         
         ws_customer.append([])
-        ws_customer.append(["Müşteri Detayları", ""])
-        ws_customer.append(headers)
+        ws_customer.append(["Müşteri Detayları"])
+        self._append_header(ws_customer, ['Telefon', 'Ad Soyad', 'Rezervasyon', 'Kişi'])
         
         for customer in customer_data['customer_list']:
             ws_customer.append([
@@ -246,16 +271,14 @@ class ExportService:
                 customer['reservation_count'],
                 customer['total_people']
             ])
-        
-        self._style_excel_sheet(ws_customer, "Müşteri Analizi")
     
     def _add_pdf_overview(self, story, event_id, styles):
         """PDF'e genel bakış ekle"""
         analytics = self.analytics_service.get_event_overview_analytics(event_id)
         
         # Başlık
-        story.append(Paragraph("Genel Bakış", styles['Heading2']))
-        story.append(Spacer(1, 12))
+        story.append(platypus.Paragraph("Genel Bakış", styles['Heading2']))
+        story.append(platypus.Spacer(1, 12))
         
         # Veri tablosu
         data = [
@@ -267,8 +290,8 @@ class ExportService:
             ['Check-in Oranı', f"{analytics['reservation_metrics']['checkin_rate']}%"]
         ]
         
-        table = Table(data)
-        table.setStyle(TableStyle([
+        table = platypus.Table(data)
+        table.setStyle(platypus.TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
@@ -280,14 +303,14 @@ class ExportService:
         ]))
         
         story.append(table)
-        story.append(Spacer(1, 20))
+        story.append(platypus.Spacer(1, 20))
     
     def _add_pdf_trends(self, story, event_id, styles):
         """PDF'e trend analizi ekle"""
         trends = self.analytics_service.get_reservation_trends(event_id, days=7)
         
-        story.append(Paragraph("Rezervasyon Trendleri (Son 7 Gün)", styles['Heading2']))
-        story.append(Spacer(1, 12))
+        story.append(platypus.Paragraph("Rezervasyon Trendleri (Son 7 Gün)", styles['Heading2']))
+        story.append(platypus.Spacer(1, 12))
         
         if trends['daily_trends']:
             data = [['Tarih', 'Rezervasyon', 'Check-in']]
@@ -298,8 +321,8 @@ class ExportService:
                     str(trend['checkins'])
                 ])
             
-            table = Table(data)
-            table.setStyle(TableStyle([
+            table = platypus.Table(data)
+            table.setStyle(platypus.TableStyle([
                 ('BACKGROUND', (0, 0), (-1, 0), colors.blue),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
                 ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
@@ -311,16 +334,16 @@ class ExportService:
             
             story.append(table)
         else:
-            story.append(Paragraph("Veri bulunamadı", styles['Normal']))
+            story.append(platypus.Paragraph("Veri bulunamadı", styles['Normal']))
         
-        story.append(Spacer(1, 20))
+        story.append(platypus.Spacer(1, 20))
     
     def _add_pdf_seating_analysis(self, story, event_id, styles):
         """PDF'e oturum analizi ekle"""
         seating = self.analytics_service.get_seating_analysis(event_id)
         
-        story.append(Paragraph("Oturum Doluluk Analizi", styles['Heading2']))
-        story.append(Spacer(1, 12))
+        story.append(platypus.Paragraph("Oturum Doluluk Analizi", styles['Heading2']))
+        story.append(platypus.Spacer(1, 12))
         
         if seating:
             data = [['Oturum No', 'Tip', 'Kapasite', 'Rezervasyon', 'Doluluk %']]
@@ -333,8 +356,8 @@ class ExportService:
                     f"{seat['occupancy_rate']:.1f}%"
                 ])
             
-            table = Table(data)
-            table.setStyle(TableStyle([
+            table = platypus.Table(data)
+            table.setStyle(platypus.TableStyle([
                 ('BACKGROUND', (0, 0), (-1, 0), colors.green),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
                 ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
@@ -346,19 +369,19 @@ class ExportService:
             
             story.append(table)
         else:
-            story.append(Paragraph("Oturum verisi bulunamadı", styles['Normal']))
+            story.append(platypus.Paragraph("Oturum verisi bulunamadı", styles['Normal']))
         
-        story.append(Spacer(1, 20))
+        story.append(platypus.Spacer(1, 20))
     
     def _add_pdf_customer_analysis(self, story, event_id, styles):
         """PDF'e müşteri analizi ekle"""
         customers = self.analytics_service.get_customer_analysis(event_id)
         
-        story.append(Paragraph("Müşteri Analizi", styles['Heading2']))
-        story.append(Spacer(1, 12))
+        story.append(platypus.Paragraph("Müşteri Analizi", styles['Heading2']))
+        story.append(platypus.Spacer(1, 12))
         
         # Segmentasyon
-        story.append(Paragraph("Müşteri Segmentasyonu:", styles['Heading3']))
+        story.append(platypus.Paragraph("Müşteri Segmentasyonu:", styles['Heading3']))
         segments_text = f"""
         Yeni Müşteriler: {customers['segments']['new_customers']}<br/>
         Tekrar Eden Müşteriler: {customers['segments']['returning_customers']}<br/>
@@ -366,16 +389,16 @@ class ExportService:
         Bireysel Rezervasyonlar: {customers['segments']['individual_bookings']}<br/>
         Toplam Benzersiz Müşteri: {customers['total_unique_customers']}
         """
-        story.append(Paragraph(segments_text, styles['Normal']))
-        story.append(Spacer(1, 20))
+        story.append(platypus.Paragraph(segments_text, styles['Normal']))
+        story.append(platypus.Spacer(1, 20))
     
     def _add_pdf_summary(self, story, event_id, styles):
         """PDF'e özet ekle"""
         # Kısa özet rapor
         analytics = self.analytics_service.get_event_overview_analytics(event_id)
         
-        story.append(Paragraph("Özet Rapor", styles['Heading2']))
-        story.append(Spacer(1, 12))
+        story.append(platypus.Paragraph("Özet Rapor", styles['Heading2']))
+        story.append(platypus.Spacer(1, 12))
         
         summary_text = f"""
         <b>Etkinlik:</b> {analytics['event_info']['name']}<br/>
@@ -385,31 +408,32 @@ class ExportService:
         <b>Check-in Oranı:</b> {analytics['reservation_metrics']['checkin_rate']}%
         """
         
-        story.append(Paragraph(summary_text, styles['Normal']))
+        story.append(platypus.Paragraph(summary_text, styles['Normal']))
     
     def _add_pdf_reservations(self, story, event_id, styles):
         """PDF'e rezervasyon listesi ekle"""
-        df = self.analytics_service.export_data_to_dataframe(event_id)
+        from app.models import Reservation
         
-        story.append(Paragraph("Rezervasyon Listesi", styles['Heading2']))
-        story.append(Spacer(1, 12))
+        # İlk 20 rezervasyon
+        rows = list(self.analytics_service.iter_export_rows(event_id=event_id, limit=20))
+        total = Reservation.query.filter_by(event_id=event_id).count()
         
-        if not df.empty:
-            # İlk 20 rezervasyon
-            limited_df = df.head(20)
-            
+        story.append(platypus.Paragraph("Rezervasyon Listesi", styles['Heading2']))
+        story.append(platypus.Spacer(1, 12))
+        
+        if rows:
             data = [['Ad Soyad', 'Telefon', 'Kişi Sayısı', 'Durum', 'Check-in']]
-            for _, row in limited_df.iterrows():
+            for row in rows:
                 data.append([
-                    f"{row['Ad']} {row['Soyad']}",
-                    row['Telefon'],
-                    str(row['Kisi_Sayisi']),
-                    row['Durum'],
-                    row['Check_in']
+                    f"{row.Ad} {row.Soyad}",
+                    row.Telefon,
+                    str(row.Kisi_Sayisi),
+                    row.Durum,
+                    row.Check_in
                 ])
             
-            table = Table(data)
-            table.setStyle(TableStyle([
+            table = platypus.Table(data)
+            table.setStyle(platypus.TableStyle([
                 ('BACKGROUND', (0, 0), (-1, 0), colors.purple),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
                 ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
@@ -421,7 +445,7 @@ class ExportService:
             
             story.append(table)
         
-        story.append(Paragraph(f"Toplam {len(df)} rezervasyon", styles['Normal']))
+        story.append(platypus.Paragraph(f"Toplam {total} rezervasyon", styles['Normal']))
     
     def _get_event(self, event_id):
         """Etkinlik bilgisini al"""
@@ -437,6 +461,11 @@ class ExportService:
     
     def create_json_export(self, event_id):
         """JSON formatında tam veri export"""
+        data, filename = self.build_json(event_id)
+        return self._send(data, filename, JSON_MIMETYPE)
+    
+    def build_json(self, event_id):
+        """JSON içeriğini üretir (arka plan işleri için) -> (bytes, dosya adı)"""
         try:
             # Tüm analitik verileri topla
             overview = self.analytics_service.get_event_overview_analytics(event_id)
@@ -459,22 +488,37 @@ class ExportService:
                 'timing_analysis': timing
             }
             
-            # JSON dosyası oluştur
-            output = BytesIO()
+            # JSON içeriği oluştur
             json_data = json.dumps(export_data, ensure_ascii=False, indent=2, default=str)
-            output.write(json_data.encode('utf-8'))
-            output.seek(0)
             
             # Dosya adı
             event_name = self._get_event_name(event_id)
             filename = f"tam_veri_{event_name}_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
             
-            return send_file(
-                output,
-                mimetype='application/json',
-                as_attachment=True,
-                download_name=filename
-            )
+            return json_data.encode('utf-8'), filename
             
         except Exception as e:
             raise Exception(f"JSON export hatası: {str(e)}")
+    
+    def _stream(self, chunks, filename, mimetype):
+        """Parça üreticisini indirme yanıtı olarak akıtır"""
+        response = Response(stream_with_context(chunks), mimetype=mimetype)
+        
+        # send_file ile aynı: ASCII olmayan adlar için filename* eklenir
+        try:
+            filename.encode('ascii')
+            options = {'filename': filename}
+        except UnicodeEncodeError:
+            simple = unicodedata.normalize('NFKD', filename).encode('ascii', 'ignore').decode('ascii')
+            options = {'filename': simple, 'filename*': f"UTF-8''{quote(filename, safe='!#$&+-.^_`|~')}"}
+        response.headers.set('Content-Disposition', 'attachment', **options)
+        return response
+    
+    def _send(self, data, filename, mimetype):
+        """Üretilen içeriği indirme yanıtı olarak döner"""
+        return send_file(
+            BytesIO(data),
+            mimetype=mimetype,
+            as_attachment=True,
+            download_name=filename
+        )
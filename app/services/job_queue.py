@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""
+Arka Plan İş Kuyruğu
+QR üretimi, Excel/PDF export gibi yavaş işleri istek thread'i dışında çalıştırır.
+
+Backend'ler:
+- thread: Süreç içi thread havuzu (varsayılan); iş durumu ve sonucu
+          background_jobs tablosunda tutulur, böylece durum/indirme istekleri
+          hangi gunicorn worker'ına düşerse düşsün işi görür
+- redis:  İşler Redis listesine yazılır, `python run_jobs.py` worker'ı çalıştırır
+- eager:  İş enqueue anında aynı thread'de çalışır (testler)
+
+Görevler `@job_queue.task('ad')` ile kaydedilir, uygulama bağlamında çalışır ve
+dosya üreten görevler {'data': bytes, 'filename': ..., 'mimetype': ...} döner.
+"""
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import delete, insert, select, update
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_FINISHED = 'finished'
+JOB_FAILED = 'failed'
+
+
+class _MemoryStore:
+    """İş durumlarını süreç belleğinde tutar (eager backend, tek süreç)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._results: Dict[str, bytes] = {}
+
+    def save(self, job: Dict[str, Any], ttl: int) -> None:
+        with self._lock:
+            self._jobs[job['id']] = dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def set_result(self, job_id: str, data: bytes, ttl: int) -> None:
+        with self._lock:
+            self._results[job_id] = data
+
+    def get_result(self, job_id: str) -> Optional[bytes]:
+        with self._lock:
+            return self._results.get(job_id)
+
+    def prune(self, ttl: int) -> None:
+        """Süresi dolan bitmiş işleri siler"""
+        cutoff = time.time() - ttl
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job['status'] in (JOB_FINISHED, JOB_FAILED) and job.get('finished_ts', 0) < cutoff
+            ]
+            for job_id in expired:
+                self._jobs.pop(job_id, None)
+                self._results.pop(job_id, None)
+
+
+class _RedisStore:
+    """İş durumlarını Redis'te tutar (süre sonunda Redis siler)"""
+
+    def __init__(self, client, prefix: str):
+        self.client = client
+        self.prefix = prefix
+
+    def save(self, job: Dict[str, Any], ttl: int) -> None:
+        self.client.set(f'{self.prefix}{job["id"]}', json.dumps(job, default=str), ex=ttl)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = self.client.get(f'{self.prefix}{job_id}')
+        return json.loads(raw) if raw else None
+
+    def set_result(self, job_id: str, data: bytes, ttl: int) -> None:
+        self.client.set(f'{self.prefix}{job_id}:result', data, ex=ttl)
+
+    def get_result(self, job_id: str) -> Optional[bytes]:
+        return self.client.get(f'{self.prefix}{job_id}:result')
+
+    def prune(self, ttl: int) -> None:
+        pass
+
+
+class _DatabaseStore:
+    """
+    İş durumlarını background_jobs tablosunda tutar (tüm worker'lar paylaşır)
+
+    Kayıtlar isteğin session'ından bağımsız, kendi kısa transaction'larında
+    yazılır; iş thread'i ve diğer worker'lar kaydı hemen görür. Süre her
+    kayıtta uzatılır, süresi dolanlar prune ile silinir.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._engine = None
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from app import db
+            with self.app.app_context():
+                self._engine = db.engine
+        return self._engine
+
+    @property
+    def table(self):
+        from app.models import BackgroundJob
+        return BackgroundJob.__table__
+
+    def save(self, job: Dict[str, Any], ttl: int) -> None:
+        table = self.table
+        values = {
+            'status': job['status'],
+            'payload': json.dumps(job, default=str),
+            'expires_at': datetime.utcnow() + timedelta(seconds=ttl)
+        }
+        with self.engine.begin() as connection:
+            result = connection.execute(update(table).where(table.c.id == job['id']).values(**values))
+            if result.rowcount == 0:
+                connection.execute(insert(table).values(
+                    id=job['id'],
+                    name=job['name'],
+                    company_id=job.get('company_id'),
+                    created_at=datetime.utcnow(),
+                    **values
+                ))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        table = self.table
+        with self.engine.connect() as connection:
+            payload = connection.execute(
+                select(table.c.payload).where(table.c.id == job_id, table.c.expires_at >= datetime.utcnow())
+            ).scalar()
+        return json.loads(payload) if payload else None
+
+    def set_result(self, job_id: str, data: bytes, ttl: int) -> None:
+        table = self.table
+        with self.engine.begin() as connection:
+            connection.execute(update(table).where(table.c.id == job_id).values(
+                result_data=data,
+                expires_at=datetime.utcnow() + timedelta(seconds=ttl)
+            ))
+
+    def get_result(self, job_id: str) -> Optional[bytes]:
+        table = self.table
+        with self.engine.connect() as connection:
+            return connection.execute(
+                select(table.c.result_data).where(table.c.id == job_id, table.c.expires_at >= datetime.utcnow())
+            ).scalar()
+
+    def prune(self, ttl: int) -> None:
+        """Süresi dolan işleri siler"""
+        table = self.table
+        with self.engine.begin() as connection:
+            connection.execute(delete(table).where(table.c.expires_at < datetime.utcnow()))
+
+
+class JobQueue:
+    """Tak-çıkar backend'li iş kuyruğu"""
+
+    def __init__(self, app=None):
+        self.app = None
+        self.backend = 'thread'
+        self.store = _MemoryStore()
+        self.result_ttl = 3600
+        self.redis = None
+        self.queue_key = 'rezervation:jobs:queue'
+        self._executor = None
+        self._tasks: Dict[str, Callable[..., Any]] = {}
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """İş kuyruğunu Flask app ile başlatır"""
+        self.app = app
+        self.result_ttl = app.config.get('JOB_RESULT_TTL', 3600)
+        self.backend = app.config.get('JOB_QUEUE_BACKEND', 'thread')
+        self.store = _MemoryStore()
+        self.redis = None
+
+        if self.backend == 'redis':
+            try:
+                import redis
+                client = redis.from_url(app.config['REDIS_URL'])
+                client.ping()
+                self.redis = client
+                self.store = _RedisStore(client, 'rezervation:jobs:')
+                app.logger.info('✅ Redis job queue initialized')
+            except Exception as e:
+                app.logger.error(f'❌ Redis job queue failed: {e}')
+                app.logger.error('🧵 Falling back to in-process thread pool (job state in database)')
+                self.backend = 'thread'
+
+        if self.backend == 'thread':
+            # Durum sorguları başka worker'a düşebilir: bellek yerine veritabanı
+            self.store = _DatabaseStore(app)
+            self._executor = ThreadPoolExecutor(
+                max_workers=app.config.get('JOB_QUEUE_WORKERS', 2),
+                thread_name_prefix='job'
+            )
+
+    def task(self, name: str):
+        """Görev kaydı dekoratörü"""
+        def decorator(func):
+            self._tasks[name] = func
+            return func
+        return decorator
+
+    def enqueue(self, name: str, company_id: Optional[int] = None,
+                user_id: Optional[int] = None, **kwargs) -> str:
+        """
+        Görevi kuyruğa ekler
+
+        Args:
+            name: Kayıtlı görev adı
+            company_id: Sahip şirket (indirme yetkisi için)
+            user_id: İşi başlatan kullanıcı
+            **kwargs: Görev parametreleri (JSON'a çevrilebilir olmalı)
+
+        Returns:
+            str: İş ID'si
+        """
+        if name not in self._tasks:
+            raise ValueError(f'Bilinmeyen görev: {name}')
+
+        job = {
+            'id': uuid.uuid4().hex,
+            'name': name,
+            'status': JOB_QUEUED,
+            'company_id': company_id,
+            'user_id': user_id,
+            'kwargs': kwargs,
+            'created_at': datetime.utcnow().isoformat(),
+            'finished_at': None,
+            'error': None,
+            'filename': None,
+            'mimetype': None,
+            'result': None
+        }
+        self.store.prune(self.result_ttl)
+        self.store.save(job, self.result_ttl)
+
+        if self.backend == 'redis':
+            self.redis.lpush(self.queue_key, job['id'])
+        elif self.backend == 'thread':
+            self._executor.submit(self.run_job, job['id'])
+        else:
+            self.run_job(job['id'])
+
+        return job['id']
+
+    def run_job(self, job_id: str) -> None:
+        """İşi uygulama bağlamında çalıştırır ve sonucu kaydeder"""
+        from app import db
+
+        job = self.store.get(job_id)
+        if job is None:
+            return
+
+        job['status'] = JOB_RUNNING
+        self.store.save(job, self.result_ttl)
+
+        with self.app.app_context():
+            try:
+                result = self._tasks[job['name']](**job['kwargs'])
+                if isinstance(result, dict) and isinstance(result.get('data'), bytes):
+                    self.store.set_result(job_id, result['data'], self.result_ttl)
+                    job['filename'] = result.get('filename')
+                    job['mimetype'] = result.get('mimetype', 'application/octet-stream')
+                else:
+                    job['result'] = result
+                job['status'] = JOB_FINISHED
+            except Exception as e:
+                db.session.rollback()
+                self.app.logger.error(f"Job {job['name']} ({job_id}) failed: {e}")
+                job['status'] = JOB_FAILED
+                job['error'] = str(e)
+            finally:
+                db.session.remove()
+
+        job['finished_at'] = datetime.utcnow().isoformat()
+        job['finished_ts'] = time.time()
+        self.store.save(job, self.result_ttl)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """İş durumunu getirir (görev parametreleri hariç)"""
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        job.pop('kwargs', None)
+        job.pop('finished_ts', None)
+        return job
+
+    def get_result(self, job_id: str) -> Optional[bytes]:
+        """Bitmiş işin dosya içeriğini getirir"""
+        return self.store.get_result(job_id)
+
+    def work(self, poll_timeout: int = 5) -> None:
+        """Redis worker döngüsü (run_jobs.py tarafından çağrılır)"""
+        if self.backend != 'redis':
+            raise RuntimeError('Worker sadece redis backend ile çalışır')
+
+        while True:
+            item = self.redis.brpop(self.queue_key, timeout=poll_timeout)
+            if item is None:
+                continue
+            self.run_job(item[1].decode() if isinstance(item[1], bytes) else item[1])
+
+
+job_queue = JobQueue()
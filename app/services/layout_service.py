@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+Yerleşim Kaydetme Servisi
+Görsel editörün kaydettiği oturumları mevcut oturumlarla karşılaştırır ve
+yalnızca farkı uygular: yeni oturumlar tek INSERT (executemany), taşınan veya
+değişen oturumlar birincil anahtarla toplu UPDATE, kaldırılanlar tek DELETE.
+Değişmeyen oturumlara dokunulmaz; ID'ler ve Reservation.seating_id
+referansları korunur.
+
+Editör ya değişiklik kümesini (added / updated / deleted) gönderir ya da
+tüm oturum listesini; ikinci durumda fark sunucuda hesaplanır. Oturumlar
+önce `id`, yoksa `seat_number` ile eşleştirilir.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, insert, or_, select, update
+from app import db
+from app.models import EventSeating, Reservation
+from app.models.reservation import ReservationStatus
+from app.models.seating import SeatStatus
+
+# Oturumun editörden gelen ve karşılaştırılan alanları
+LAYOUT_FIELDS = ('seating_type_id', 'seat_number', 'position_x', 'position_y',
+                 'width', 'height', 'color_code')
+
+
+class ReservedSeatDeletionError(ValueError):
+    """Aktif rezervasyonu olan oturumlar silinemez"""
+
+    def __init__(self, seat_numbers: List[str]):
+        self.seat_numbers = seat_numbers
+        super().__init__(
+            'Rezervasyonu olan oturumlar silinemez: ' + ', '.join(seat_numbers)
+        )
+
+
+class LayoutChanges:
+    """Uygulanacak yerleşim farkı"""
+
+    def __init__(self, added: Optional[List[Dict[str, Any]]] = None,
+                 updated: Optional[List[Dict[str, Any]]] = None,
+                 deleted: Optional[Iterable[int]] = None):
+        self.added = added or []
+        self.updated = updated or []
+        self.deleted = sorted(set(deleted or []))
+
+    def __bool__(self):
+        return bool(self.added or self.updated or self.deleted)
+
+
+def _seat_values(seat_data: Dict[str, Any], partial: bool = False) -> Dict[str, Any]:
+    """
+    Editör verisini sütun değerlerine çevirir
+
+    Raises:
+        ValueError: Zorunlu alan eksik veya değer geçersiz
+    """
+    values = {}
+    try:
+        if not partial or 'seating_type_id' in seat_data:
+            values['seating_type_id'] = int(seat_data['seating_type_id'])
+        if not partial or 'seat_number' in seat_data:
+            values['seat_number'] = str(seat_data['seat_number'])
+        for field in ('position_x', 'position_y'):
+            if not partial or field in seat_data:
+                values[field] = float(seat_data[field])
+        for field, default in (('width', 60), ('height', 40)):
+            if not partial or field in seat_data:
+                values[field] = float(seat_data.get(field, default))
+        if not partial or 'color_code' in seat_data:
+            values['color_code'] = seat_data.get('color_code', '#3498db')
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f'Geçersiz oturum verisi: {seat_data.get("seat_number", "?")} ({e})') from e
+    return values
+
+
+def _seat_id(seat_data: Dict[str, Any]) -> Optional[int]:
+    try:
+        return int(seat_data['id'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class LayoutService:
+    """Etkinlik oturum yerleşimini fark bazlı kaydeden servis sınıfı"""
+
+    def __init__(self, event_id: int):
+        self.event_id = event_id
+
+    def diff(self, seats: List[Dict[str, Any]]) -> LayoutChanges:
+        """
+        Tam oturum listesini mevcut yerleşimle karşılaştırır
+
+        Args:
+            seats: Editördeki tüm oturumlar
+
+        Returns:
+            LayoutChanges: Eklenen, değişen ve silinen oturumlar
+        """
+        rows = db.session.execute(
+            select(EventSeating.id, *(getattr(EventSeating, f) for f in LAYOUT_FIELDS))
+            .where(EventSeating.event_id == self.event_id)
+        ).all()
+        existing = {row.id: row for row in rows}
+        by_number = {}
+        for row in rows:
+            by_number.setdefault(row.seat_number, row.id)
+
+        incoming = [(_seat_id(seat_data), _seat_values(seat_data)) for seat_data in seats]
+
+        # Önce ID ile, sonra kalanlar arasında koltuk numarasıyla eşleştir
+        matched = {seat_id for seat_id, _ in incoming if seat_id in existing}
+        changes = LayoutChanges()
+        for seat_id, values in incoming:
+            if seat_id not in existing:
+                seat_id = by_number.get(values['seat_number'])
+                if seat_id is None or seat_id in matched:
+                    changes.added.append(values)
+                    continue
+                matched.add(seat_id)
+
+            row = existing[seat_id]
+            changed = {field: value for field, value in values.items() if getattr(row, field) != value}
+            if changed:
+                changes.updated.append({'id': seat_id, **changed})
+
+        changes.deleted = sorted(set(existing) - matched)
+        return changes
+
+    def changes_from_payload(self, payload: Dict[str, Any]) -> LayoutChanges:
+        """
+        Editörün gönderdiği değişiklik kümesini doğrular
+
+        Args:
+            payload: {'added': [...], 'updated': [{'id': ..., alanlar}], 'deleted': [id, ...]}
+
+        Raises:
+            ValueError: Kayıt bu etkinliğe ait değil veya veri geçersiz
+        """
+        updated = []
+        for seat_data in payload.get('updated') or []:
+            seat_id = _seat_id(seat_data)
+            if seat_id is None:
+                raise ValueError('Güncellenen oturum için id gerekli')
+            values = _seat_values(seat_data, partial=True)
+            if values:
+                updated.append({'id': seat_id, **values})
+
+        try:
+            deleted = [int(seat_id) for seat_id in payload.get('deleted') or []]
+        except (TypeError, ValueError) as e:
+            raise ValueError('Geçersiz silinecek oturum listesi') from e
+
+        changes = LayoutChanges(
+            added=[_seat_values(seat_data) for seat_data in payload.get('added') or []],
+            updated=updated,
+            deleted=deleted
+        )
+
+        referenced = {row['id'] for row in changes.updated} | set(changes.deleted)
+        if referenced:
+            owned = set(db.session.scalars(
+                select(EventSeating.id).where(
+                    EventSeating.event_id == self.event_id,
+                    EventSeating.id.in_(referenced)
+                )
+            ))
+            if referenced - owned:
+                raise ValueError('Bu etkinliğe ait olmayan oturum: '
+                                 + ', '.join(str(i) for i in sorted(referenced - owned)))
+        return changes
+
+    def apply(self, changes: LayoutChanges) -> Dict[str, Any]:
+        """
+        Farkı toplu ifadelerle uygular (commit çağıranındır)
+
+        Returns:
+            Dict: added, updated, deleted sayıları ve yeni oturumların ID'leri
+
+        Raises:
+            ReservedSeatDeletionError: Silinecek oturumlardan biri rezerve (kontrolden
+                sonra eşzamanlı olarak rezerve edilenler dahil)
+        """
+        if changes.deleted:
+            self._check_deletable(changes.deleted)
+            # Kontrolden sonra eşzamanlı bir talep gelmiş olabilir: yalnızca aktif
+            # olmayan (iptal edilmiş geçmiş) rezervasyonlar oturumdan ayrılır ve
+            # yalnızca hâlâ boş olan oturumlar silinir
+            db.session.execute(
+                update(Reservation)
+                .where(
+                    Reservation.seating_id.in_(changes.deleted),
+                    Reservation.status.is_distinct_from(ReservationStatus.ACTIVE)
+                )
+                .values(seating_id=None)
+                .execution_options(synchronize_session=False)
+            )
+            result = db.session.execute(
+                delete(EventSeating).where(
+                    EventSeating.event_id == self.event_id,
+                    EventSeating.id.in_(changes.deleted),
+                    EventSeating.status.is_distinct_from(SeatStatus.RESERVED),
+                    EventSeating.id.not_in(self._active_seat_ids(changes.deleted))
+                ).execution_options(synchronize_session=False)
+            )
+            if result.rowcount < len(changes.deleted):
+                self._check_deletable(changes.deleted)
+                raise ReservedSeatDeletionError(list(db.session.scalars(
+                    select(EventSeating.seat_number)
+                    .where(EventSeating.id.in_(changes.deleted))
+                    .order_by(EventSeating.seat_number)
+                )))
+
+        if changes.updated:
+            db.session.execute(update(EventSeating), changes.updated)
+
+        added_ids = []
+        if changes.added:
+            added_ids = list(db.session.scalars(
+                insert(EventSeating).returning(EventSeating.id, sort_by_parameter_order=True),
+                [{'event_id': self.event_id, **values} for values in changes.added]
+            ))
+
+        return {
+            'added': len(changes.added),
+            'updated': len(changes.updated),
+            'deleted': len(changes.deleted),
+            'added_ids': [
+                {'id': seat_id, 'seat_number': values['seat_number']}
+                for seat_id, values in zip(added_ids, changes.added)
+            ]
+        }
+
+    def _check_deletable(self, seat_ids: List[int]) -> None:
+        """Rezerve veya aktif rezervasyonu olan oturumlar silinmek isteniyorsa hata verir"""
+        reserved = db.session.scalars(
+            select(EventSeating.seat_number).where(
+                EventSeating.id.in_(seat_ids),
+                or_(EventSeating.status == SeatStatus.RESERVED,
+                    EventSeating.id.in_(self._active_seat_ids(seat_ids)))
+            ).order_by(EventSeating.seat_number)
+        ).all()
+        if reserved:
+            raise ReservedSeatDeletionError(list(reserved))
+
+    @staticmethod
+    def _active_seat_ids(seat_ids: List[int]):
+        """Aktif rezervasyonu olan oturum ID'leri (alt sorgu)"""
+        return select(Reservation.seating_id).where(
+            Reservation.seating_id.in_(seat_ids),
+            Reservation.status == ReservationStatus.ACTIVE
+        )
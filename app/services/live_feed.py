@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+"""
+Canlı Akış (Live Feed) Servisi
+Check-in, rezervasyon ve iptal değişikliklerini commit edildikleri anda
+Server-Sent Events ile dashboard'lara iletir.
+
+Varsayılan olarak süreç içi (in-process) pub/sub kullanılır; REDIS_ENABLED ve
+REDIS_URL tanımlıysa Redis pub/sub'a geçilir, böylece birden fazla worker
+aynı akışı görür.
+
+Her açık akış bir worker bağlantısını `LIVE_FEED_MAX_AGE` saniye tutar. Akışlar
+gevent worker'ı ile sunulmalıdır (Dockerfile.prod, railway-start.sh); thread
+veya sync worker'larda birkaç açık ekran tüm istek slotlarını doldurur. Bu
+yüzden worker başına eşzamanlı akış sayısı sınırlıdır: sınır aşılınca 503 ve
+`retry:` döner, istemci bekleyip yeniden bağlanır.
+"""
+import json
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from flask import Response, stream_with_context
+from sqlalchemy import event as sa_event
+
+PENDING_KEY = 'live_feed_pending'
+
+# Sınır aşıldığında istemcinin yeniden denemeden önce beklediği süre (ms)
+BUSY_RETRY_MS = 15000
+
+
+def _green_worker() -> bool:
+    """Süreç gevent ile monkey-patch edilmiş mi (gunicorn gevent worker'ı)"""
+    monkey = sys.modules.get('gevent.monkey')
+    return bool(monkey and monkey.is_module_patched('socket'))
+
+
+def default_max_streams() -> int:
+    """
+    Worker başına varsayılan akış sınırı
+
+    gevent'te akış yalnızca bir greenlet tutar; thread/sync worker'larda en
+    fazla bir istek slotu akışlara ayrılır.
+    """
+    return 500 if _green_worker() else 1
+
+
+def event_channel(event_id: int) -> str:
+    """Etkinlik kanalı adı"""
+    return f'event:{event_id}'
+
+
+def company_channel(company_id: int) -> str:
+    """Şirket kanalı adı (admin dashboard)"""
+    return f'company:{company_id}'
+
+
+class _MemorySubscription:
+    """Süreç içi abonelik"""
+
+    def __init__(self, backend: '_MemoryBackend', channel: str, maxsize: int):
+        self.backend = backend
+        self.channel = channel
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self.backend.unsubscribe(self)
+
+
+class _MemoryBackend:
+    """Tek worker içinde çalışan pub/sub"""
+
+    name = 'memory'
+
+    def __init__(self, maxsize: int = 1000):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.queue.put_nowait(message)
+            except queue.Full:
+                # Yavaş istemci: mesaj atlanır, istemci snapshot ile toparlanır
+                pass
+
+    def subscribe(self, channel: str) -> _MemorySubscription:
+        subscription = _MemorySubscription(self, channel, self.maxsize)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: _MemorySubscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+    def subscriber_count(self, channel: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(channel, ()))
+
+
+class _RedisSubscription:
+    """Redis pub/sub aboneliği"""
+
+    def __init__(self, pubsub, channel: str):
+        self.pubsub = pubsub
+        self.channel = channel
+
+    def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        message = self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if not message or message.get('type') != 'message':
+            return None
+        return json.loads(message['data'])
+
+    def close(self) -> None:
+        try:
+            self.pubsub.unsubscribe()
+            self.pubsub.close()
+        except Exception:
+            pass
+
+
+class _RedisBackend:
+    """Worker'lar arası Redis pub/sub"""
+
+    name = 'redis'
+
+    def __init__(self, client, prefix: str = 'rezervation:live:'):
+        self.client = client
+        self.prefix = prefix
+
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        self.client.publish(self.prefix + channel, json.dumps(message, default=str))
+
+    def subscribe(self, channel: str) -> _RedisSubscription:
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.prefix + channel)
+        return _RedisSubscription(pubsub, channel)
+
+    def subscriber_count(self, channel: str) -> int:
+        result = self.client.pubsub_numsub(self.prefix + channel)
+        return int(result[0][1]) if result else 0
+
+
+class LiveFeed:
+    """Canlı akış yayıncısı"""
+
+    def __init__(self, app=None):
+        self.backend = _MemoryBackend()
+        self.heartbeat = 15
+        self.max_age = 300
+        self.max_streams = 1
+        self.logger = None
+        self._streams = 0
+        self._streams_lock = threading.Lock()
+        self._listeners_registered = False
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Live feed'i Flask app ile başlatır"""
+        self.logger = app.logger
+        self.heartbeat = app.config.get('LIVE_FEED_HEARTBEAT', 15)
+        self.max_age = app.config.get('LIVE_FEED_MAX_AGE', 300)
+        self.max_streams = app.config.get('LIVE_FEED_MAX_STREAMS') or default_max_streams()
+        self._streams = 0
+        self.backend = _MemoryBackend()
+        if not _green_worker() and not app.config.get('TESTING'):
+            app.logger.warning(
+                f'⚠️ Live feed without gevent worker: at most {self.max_streams} '
+                'stream(s) per worker (use --worker-class gevent)'
+            )
+
+        redis_url = app.config.get('REDIS_URL')
+        if app.config.get('REDIS_ENABLED') and redis_url and not app.config.get('TESTING'):
+            try:
+                import redis
+                client = redis.from_url(redis_url)
+                client.ping()
+                self.backend = _RedisBackend(client)
+                app.logger.info('✅ Redis live feed initialized')
+            except Exception as e:
+                app.logger.warning(f'⚠️ Redis live feed failed: {e}')
+                app.logger.warning('💾 Falling back to in-process live feed')
+
+        self._register_session_listeners()
+
+    def _register_session_listeners(self):
+        """Mesajları yalnızca commit sonrasında yayınlar, rollback'te atar"""
+        if self._listeners_registered:
+            return
+
+        from app import db
+
+        @sa_event.listens_for(db.session, 'after_commit')
+        def _publish_pending(session):
+            pending = session.info.pop(PENDING_KEY, None)
+            for channel, message in pending or ():
+                self.publish(channel, message)
+
+        @sa_event.listens_for(db.session, 'after_rollback')
+        def _discard_pending(session):
+            session.info.pop(PENDING_KEY, None)
+
+        self._listeners_registered = True
+
+    def queue(self, session, message: Dict[str, Any], event_id: int,
+              company_id: Optional[int] = None) -> None:
+        """
+        Mesajı mevcut transaction commit edildiğinde yayınlanmak üzere sıraya alır
+
+        Args:
+            session: SQLAlchemy session
+            message: Yayınlanacak mesaj (type, event_id, delta, ...)
+            event_id: Etkinlik ID'si
+            company_id: Şirket ID'si (admin kanalı için)
+        """
+        message.setdefault('event_id', event_id)
+        message.setdefault('at', datetime.utcnow().isoformat())
+
+        pending = session.info.setdefault(PENDING_KEY, [])
+        pending.append((event_channel(event_id), message))
+        if company_id is not None:
+            pending.append((company_channel(company_id), message))
+
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        """Mesajı kanala hemen yayınlar (yayın hatası isteği bozmaz)"""
+        try:
+            self.backend.publish(channel, message)
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f'Live feed publish failed: {e}')
+
+    def subscribe(self, channel: str):
+        """Kanala abone olur; dönen nesnenin close() metodu çağrılmalıdır"""
+        return self.backend.subscribe(channel)
+
+    def stream(self, channel: str, snapshot: Dict[str, Any]) -> Response:
+        """
+        Kanal için SSE yanıtı üretir
+
+        Abonelik snapshot'tan önce açılır; böylece snapshot ile ilk mesaj
+        arasında gelen değişiklikler kaçırılmaz. Bağlantı max_age saniye sonra
+        kapatılır, EventSource otomatik yeniden bağlanır. Worker'daki açık akış
+        sayısı max_streams'e ulaştıysa 503 döner.
+
+        Args:
+            channel: Kanal adı
+            snapshot: İlk gönderilecek sayaç durumu
+
+        Returns:
+            Response: text/event-stream yanıtı veya 503
+        """
+        from app import db
+
+        release = self._acquire_slot()
+        if release is None:
+            return self._busy_response()
+
+        try:
+            subscription = self.subscribe(channel)
+        except Exception:
+            release()
+            raise
+        # Uzun süren akış boyunca veritabanı bağlantısı tutulmasın
+        db.session.close()
+        heartbeat = self.heartbeat
+        max_age = self.max_age
+
+        def close():
+            subscription.close()
+            release()
+
+        def generate():
+            try:
+                yield 'retry: 3000\n\n'
+                yield _format_sse('snapshot', snapshot)
+
+                started = time.monotonic()
+                while time.monotonic() - started < max_age:
+                    message = subscription.get(timeout=heartbeat)
+                    if message is None:
+                        yield ': heartbeat\n\n'
+                        continue
+                    yield _format_sse(message.get('type', 'message'), message)
+            finally:
+                close()
+
+        response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+        # Akış hiç başlamadan bağlantı koparsa da abonelik ve slot bırakılsın
+        response.call_on_close(close)
+        response.headers['Cache-Control'] = 'no-cache'
+        # nginx proxy_buffering açık; SSE için kapatılmalı
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+
+    def active_streams(self) -> int:
+        """Bu worker'daki açık akış sayısı"""
+        return self._streams
+
+    def _acquire_slot(self):
+        """Akış slotu ayırır; sınır doluysa None, değilse bir kez çalışan bırakma fonksiyonu döner"""
+        with self._streams_lock:
+            if self._streams >= self.max_streams:
+                return None
+            self._streams += 1
+
+        released = []
+
+        def release():
+            with self._streams_lock:
+                if not released:
+                    released.append(True)
+                    self._streams -= 1
+        return release
+
+    def _busy_response(self) -> Response:
+        """Akış sınırı doluyken: istemci retry süresi sonra yeniden dener"""
+        if self.logger:
+            self.logger.warning(f'Live feed stream limit reached ({self.max_streams})')
+        response = Response(f'retry: {BUSY_RETRY_MS}\n\n', status=503, mimetype='text/event-stream')
+        response.headers['Retry-After'] = str(BUSY_RETRY_MS // 1000)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+
+def _format_sse(event_type: str, data: Dict[str, Any]) -> str:
+    """Tek bir SSE mesajı oluşturur"""
+    return f'event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n'
+
+
+live_feed = LiveFeed()
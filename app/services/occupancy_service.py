@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+Doluluk Sayaç Servisi
+Etkinlik başına kapasite, rezervasyon ve check-in sayaçlarını artımlı olarak
+günceller; dashboard'lar tam tablo toplamı yerine bu sayaçları okur.
+"""
+from typing import Dict, List, Any, Optional
+from datetime import datetime
+from sqlalchemy import func, case, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import Event, EventSeating, SeatingType, Reservation, EventOccupancy
+from app.models.reservation import ReservationStatus
+
+
+COUNTER_FIELDS = (
+    'total_capacity',
+    'reserved_people',
+    'active_reservations',
+    'total_reservations',
+    'checked_in_count',
+)
+
+# Çakışmada hiçbir şey yapmayan INSERT destekleyen veritabanları
+_UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+class OccupancyService:
+    """Etkinlik doluluk sayaçlarını yöneten servis sınıfı"""
+
+    @staticmethod
+    def apply_delta(event_id: int, **deltas: int) -> None:
+        """
+        Sayaçlara artımlı değişiklik uygular (çağıranın transaction'ı içinde).
+
+        Sayaç satırı yoksa temel tablolardan oluşturulur; bu yüzden çağıran
+        değişikliklerini önce flush etmiş olmalıdır.
+
+        Args:
+            event_id: Etkinlik ID'si
+            **deltas: Alan adı -> artış miktarı (ör. reserved_people=4)
+        """
+        values = {
+            field: getattr(EventOccupancy, field) + delta
+            for field, delta in deltas.items()
+            if field in COUNTER_FIELDS and delta
+        }
+        if not values:
+            return
+
+        if OccupancyService._update(event_id, **values):
+            return
+
+        # İlk kullanım: sayaçları temel tablolardan oluştur (değişiklik dahil);
+        # eşzamanlı bir istek satırı önce oluşturduysa değişiklik ona uygulanır
+        if not OccupancyService._insert(event_id, OccupancyService.compute_from_base_tables(event_id)):
+            OccupancyService._update(event_id, **values)
+
+    @staticmethod
+    def refresh_capacity(event_id: int) -> int:
+        """Yerleşim planı değiştiğinde kapasite sayacını yeniden hesaplar, yeni kapasiteyi döner"""
+        capacity = OccupancyService._compute_capacity(event_id)
+        if not OccupancyService._update(event_id, total_capacity=capacity):
+            if not OccupancyService._insert(event_id, OccupancyService.compute_from_base_tables(event_id)):
+                OccupancyService._update(event_id, total_capacity=capacity)
+
+        return capacity
+
+    @staticmethod
+    def get_counters(event_id: int) -> EventOccupancy:
+        """
+        Etkinlik sayaçlarını getirir, yoksa oluşturur (commit etmez)
+
+        Args:
+            event_id: Etkinlik ID'si
+
+        Returns:
+            EventOccupancy: Sayaç satırı
+        """
+        counters = db.session.get(EventOccupancy, event_id)
+        if counters is None:
+            counters = OccupancyService.rebuild(event_id)
+        return counters
+
+    @staticmethod
+    def get_company_totals(company_id: int) -> Dict[str, int]:
+        """
+        Şirketin tüm etkinlikleri için sayaç toplamlarını getirir (commit etmez)
+
+        Args:
+            company_id: Şirket ID'si
+
+        Returns:
+            Dict: Toplam sayaç değerleri
+        """
+        # Sayacı olmayan etkinlikler (ilk kullanım) için satır oluştur
+        missing = db.session.query(Event.id).outerjoin(
+            EventOccupancy, EventOccupancy.event_id == Event.id
+        ).filter(
+            Event.company_id == company_id,
+            EventOccupancy.event_id.is_(None)
+        ).all()
+        for (event_id,) in missing:
+            OccupancyService.rebuild(event_id)
+
+        row = db.session.query(
+            *[func.coalesce(func.sum(getattr(EventOccupancy, field)), 0).label(field)
+              for field in COUNTER_FIELDS]
+        ).join(
+            Event, EventOccupancy.event_id == Event.id
+        ).filter(
+            Event.company_id == company_id
+        ).one()
+
+        return {field: int(getattr(row, field)) for field in COUNTER_FIELDS}
+
+    @staticmethod
+    def capacity_by_event(event_ids: List[int]) -> Dict[int, int]:
+        """
+        Verilen etkinliklerin kapasitelerini tek gruplu sorguyla hesaplar
+
+        Args:
+            event_ids: Etkinlik ID'leri (liste sayfası)
+
+        Returns:
+            Dict: Etkinlik ID -> kapasite (oturumu olmayanlar 0)
+        """
+        if not event_ids:
+            return {}
+
+        rows = db.session.query(
+            EventSeating.event_id,
+            func.coalesce(func.sum(SeatingType.capacity), 0)
+        ).join(
+            SeatingType, EventSeating.seating_type_id == SeatingType.id
+        ).filter(
+            EventSeating.event_id.in_(set(event_ids))
+        ).group_by(EventSeating.event_id).all()
+
+        capacities = dict.fromkeys(event_ids, 0)
+        capacities.update({event_id: int(capacity) for event_id, capacity in rows})
+        return capacities
+
+    @staticmethod
+    def compute_from_base_tables(event_id: int) -> Dict[str, int]:
+        """Sayaç değerlerini temel tablolardan hesaplar"""
+        totals = db.session.query(
+            func.count(Reservation.id).label('total_reservations'),
+            func.coalesce(func.sum(case(
+                (Reservation.status == ReservationStatus.ACTIVE, 1),
+                else_=0
+            )), 0).label('active_reservations'),
+            func.coalesce(func.sum(case(
+                (Reservation.status == ReservationStatus.ACTIVE, Reservation.number_of_people),
+                else_=0
+            )), 0).label('reserved_people'),
+            func.coalesce(func.sum(case(
+                (Reservation.checked_in == True, 1),
+                else_=0
+            )), 0).label('checked_in_count')
+        ).filter(
+            Reservation.event_id == event_id
+        ).one()
+
+        return {
+            'total_capacity': OccupancyService._compute_capacity(event_id),
+            'reserved_people': int(totals.reserved_people or 0),
+            'active_reservations': int(totals.active_reservations or 0),
+            'total_reservations': int(totals.total_reservations or 0),
+            'checked_in_count': int(totals.checked_in_count or 0),
+        }
+
+    @staticmethod
+    def rebuild(event_id: int) -> EventOccupancy:
+        """Etkinlik sayaçlarını temel tablolardan yeniden oluşturur (commit etmez)"""
+        values = OccupancyService.compute_from_base_tables(event_id)
+
+        counters = db.session.get(EventOccupancy, event_id)
+        if counters is None:
+            if OccupancyService._insert(event_id, values):
+                return db.session.get(EventOccupancy, event_id)
+            # Eşzamanlı bir istek satırı önce oluşturdu; değerlerin üzerine yaz
+            counters = db.session.get(EventOccupancy, event_id)
+
+        for field, value in values.items():
+            setattr(counters, field, value)
+        counters.updated_at = datetime.utcnow()
+        db.session.flush()
+
+        return counters
+
+    @staticmethod
+    def reconcile(company_id: Optional[int] = None, fix: bool = True) -> List[Dict[str, Any]]:
+        """
+        Sayaçları temel tablolarla karşılaştırır ve sapmaları raporlar
+
+        Args:
+            company_id: Sadece bu şirketin etkinlikleri (None ise tümü)
+            fix: True ise sapan sayaçlar düzeltilir
+
+        Returns:
+            List[Dict]: Sapma raporu (etkinlik, alan, sayaç, gerçek değer)
+        """
+        query = db.session.query(Event.id)
+        if company_id is not None:
+            query = query.filter(Event.company_id == company_id)
+
+        drift = []
+        for (event_id,) in query.order_by(Event.id).all():
+            expected = OccupancyService.compute_from_base_tables(event_id)
+            counters = db.session.get(EventOccupancy, event_id)
+
+            for field, value in expected.items():
+                current = getattr(counters, field) if counters is not None else None
+                if current != value:
+                    drift.append({
+                        'event_id': event_id,
+                        'field': field,
+                        'counter': current,
+                        'actual': value
+                    })
+
+            if fix and (counters is None or any(d['event_id'] == event_id for d in drift)):
+                OccupancyService.rebuild(event_id)
+
+        if fix:
+            db.session.commit()
+
+        return drift
+
+    @staticmethod
+    def _update(event_id: int, **values: Any) -> bool:
+        """Sayaç satırını günceller; satır yoksa False döner"""
+        values['updated_at'] = datetime.utcnow()
+        result = db.session.execute(
+            update(EventOccupancy)
+            .where(EventOccupancy.event_id == event_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
+    @staticmethod
+    def _insert(event_id: int, values: Dict[str, int]) -> bool:
+        """
+        Sayaç satırını idempotent olarak ekler
+
+        Aynı etkinliğin ilk okuması/değişikliği eşzamanlı gelirse ikinci ekleme
+        çakışmada hiçbir şey yapmaz (INSERT ... ON CONFLICT DO NOTHING) ve False
+        döner; çağıranın transaction'ı bozulmaz.
+        """
+        row = dict(values, event_id=event_id, updated_at=datetime.utcnow())
+        dialect = db.session.get_bind().dialect.name
+        if dialect in _UPSERT_INSERTS:
+            result = db.session.execute(
+                _UPSERT_INSERTS[dialect](EventOccupancy).values(**row)
+                .on_conflict_do_nothing(index_elements=['event_id'])
+            )
+            return result.rowcount > 0
+
+        try:
+            with db.session.begin_nested():
+                db.session.add(EventOccupancy(**row))
+        except IntegrityError:
+            return False
+        return True
+
+    @staticmethod
+    def _compute_capacity(event_id: int) -> int:
+        """Etkinlik kapasitesini oturum tiplerinden hesaplar"""
+        return int(db.session.query(
+            func.coalesce(func.sum(SeatingType.capacity), 0)
+        ).join(
+            EventSeating, EventSeating.seating_type_id == SeatingType.id
+        ).filter(
+            EventSeating.event_id == event_id
+        ).scalar() or 0)
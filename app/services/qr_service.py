@@ -1,19 +1,283 @@
-import qrcode
+# -*- coding: utf-8 -*-
+"""
+QR Kod Servisi
+Rezervasyon kodlarının QR görsellerini (PNG/SVG) bir kez üretir ve boyutu
+sınırlı bir LRU önbellekte tutar. Görsel yalnızca koda, formata ve boyuta
+bağlı olduğundan ETag içerik özetidir; istemci bir kez indirdiği görseli
+tekrar istemez.
+"""
+import hashlib
 import os
-from uuid import uuid4
-
-def generate_qr_code(reservation_id, reservation_code):
-    qr = qrcode.QRCode(version=1, box_size=10, border=4)
-    qr.add_data(f"RES-{reservation_code}")
-    qr.make(fit=True)
-    
-    img = qr.make_image(fill_color="black", back_color="white")
-    
-    upload_dir = 'app/static/uploads/qr'
-    os.makedirs(upload_dir, exist_ok=True)
-    
-    filename = f"{reservation_id}.png"
-    filepath = os.path.join(upload_dir, filename)
-    img.save(filepath)
-    
-    return f"uploads/qr/{filename}"
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Callable, Dict, List, Optional, Tuple
+
+from flask import current_app
+from app.utils.lazy_imports import lazy_import
+
+# qrcode (ve Pillow) ilk görsel üretiminde yüklenir
+qrcode = lazy_import('qrcode')
+
+QR_FORMATS: Dict[str, str] = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml'
+}
+DEFAULT_BOX_SIZE = 10
+MAX_BOX_SIZE = 20
+QR_BORDER = 4
+
+
+class QRImage:
+    """Önbellekteki tek bir QR görseli"""
+
+    __slots__ = ('data', 'etag', 'mimetype')
+
+    def __init__(self, data: bytes, mimetype: str):
+        self.data = data
+        self.etag = hashlib.sha1(data).hexdigest()
+        self.mimetype = mimetype
+
+
+class QRCodeService:
+    """QR görsellerini üreten ve toplam bayt sınırıyla önbelleğe alan servis"""
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._images: 'OrderedDict[Tuple[str, str, int], QRImage]' = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, code: str, fmt: str = 'png', box_size: int = DEFAULT_BOX_SIZE) -> QRImage:
+        """
+        QR görselini önbellekten getirir, yoksa üretip ekler
+
+        Args:
+            code: Rezervasyon kodu (QR içeriği)
+            fmt: 'png' veya 'svg'
+            box_size: Modül başına piksel
+
+        Returns:
+            QRImage: Görsel baytları, ETag ve MIME tipi
+        """
+        if fmt not in QR_FORMATS:
+            raise ValueError(f'Desteklenmeyen QR formatı: {fmt}')
+
+        key = (code, fmt, box_size)
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return image
+            self.misses += 1
+
+        # Üretim kilit dışında yapılır; aynı kodu iki thread üretirse sonuç aynıdır
+        image = QRImage(self._render(code, fmt, box_size), QR_FORMATS[fmt])
+
+        with self._lock:
+            if key not in self._images:
+                self._images[key] = image
+                self._size += len(image.data)
+                self._evict()
+        return image
+
+    def png_bytes(self, code: str, box_size: int = DEFAULT_BOX_SIZE) -> bytes:
+        """PNG baytlarını döner"""
+        return self.get(code, 'png', box_size).data
+
+    def svg_bytes(self, code: str, box_size: int = DEFAULT_BOX_SIZE) -> bytes:
+        """Baskı için SVG baytlarını döner"""
+        return self.get(code, 'svg', box_size).data
+
+    def save_png(self, code: str, save_path: str) -> str:
+        """PNG'yi `<save_path>/<code>.png` olarak yazar, dosya yolunu döner"""
+        os.makedirs(save_path, exist_ok=True)
+        filepath = os.path.join(save_path, f'{code}.png')
+        with open(filepath, 'wb') as f:
+            f.write(self.png_bytes(code))
+        return filepath
+
+    def stats(self) -> Dict[str, int]:
+        """Önbellek istatistikleri"""
+        with self._lock:
+            return {
+                'entries': len(self._images),
+                'bytes': self._size,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def clear(self) -> None:
+        """Önbelleği boşaltır"""
+        with self._lock:
+            self._images.clear()
+            self._size = 0
+
+    def _evict(self) -> None:
+        """Bayt sınırı aşıldıysa en eski görselleri çıkarır (kilit altında)"""
+        while self._size > self.max_bytes and len(self._images) > 1:
+            _, image = self._images.popitem(last=False)
+            self._size -= len(image.data)
+
+    @staticmethod
+    def _render(code: str, fmt: str, box_size: int) -> bytes:
+        """QR matrisini oluşturup istenen formatta kodlar"""
+        qr = qrcode.QRCode(
+            version=1,
+            error_correction=qrcode.ERROR_CORRECT_L,
+            box_size=box_size,
+            border=QR_BORDER,
+        )
+        qr.add_data(code)
+        qr.make(fit=True)
+
+        if fmt == 'svg':
+            from qrcode.image.svg import SvgPathImage
+            return qr.make_image(image_factory=SvgPathImage).to_string(encoding='UTF-8')
+
+        img = qr.make_image(fill_color="black", back_color="white")
+        buffer = BytesIO()
+        img.save(buffer)
+        return buffer.getvalue()
+
+
+def _write_atomic(filepath: str, data: bytes) -> None:
+    """Dosyayı geçici dosya üzerinden yazar; hedefte ya eski ya tam yeni içerik olur"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def render_png_files(codes: List[str], save_path: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    Kod listesinin PNG dosyalarını yazar (süreç havuzunda çalışır)
+
+    Dosyası zaten olan kodlar yeniden üretilmez. Görsel aynı klasörde geçici
+    bir dosyaya yazılıp os.replace ile yerine taşınır; yarıda kesilen bir
+    çalışma yarım PNG bırakmaz.
+
+    Returns:
+        List: (kod, hata mesajı veya None)
+    """
+    os.makedirs(save_path, exist_ok=True)
+    results = []
+    for code in codes:
+        filepath = os.path.join(save_path, f'{code}.png')
+        try:
+            if not os.path.exists(filepath):
+                data = QRCodeService._render(code, 'png', DEFAULT_BOX_SIZE)
+                _write_atomic(filepath, data)
+            results.append((code, None))
+        except Exception as e:
+            results.append((code, str(e)))
+    return results
+
+
+def backfill_qr_files(save_path: str = 'app/static/uploads/qr', workers: Optional[int] = None,
+                      chunk_size: int = 1000, batch_size: int = 50,
+                      progress: Optional[Callable[[Dict[str, float]], None]] = None) -> Dict[str, float]:
+    """
+    QR dosyası olmayan aktif rezervasyonların PNG'lerini paralel üretir
+
+    Rezervasyonlar id sırasıyla chunk'lar halinde okunur; her chunk'ın
+    görselleri süreç havuzunda `batch_size`'lık gruplarla yazılır ve
+    qr_code_path tek bir UPDATE ile güncellenir. Yarıda kesilirse tekrar
+    çalıştırmak kaldığı yerden devam eder.
+
+    Args:
+        save_path: PNG klasörü
+        workers: Süreç sayısı (None: CPU sayısı, 1: aynı süreçte)
+        chunk_size: UPDATE başına rezervasyon
+        batch_size: Süreç görevi başına kod
+        progress: Her chunk sonrası istatistiklerle çağrılır
+
+    Returns:
+        Dict: total, generated, failed, seconds, per_second
+    """
+    from sqlalchemy import update
+    from app import db
+    from app.models import Reservation
+    from app.models.reservation import ReservationStatus
+
+    pending = Reservation.query.filter(
+        Reservation.qr_code_path.is_(None),
+        Reservation.status == ReservationStatus.ACTIVE
+    )
+    stats = {'total': pending.count(), 'generated': 0, 'failed': 0, 'seconds': 0.0, 'per_second': 0.0}
+    started = time.perf_counter()
+    last_id = 0
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+    try:
+        while True:
+            rows = db.session.query(Reservation.id, Reservation.reservation_code).filter(
+                Reservation.qr_code_path.is_(None),
+                Reservation.status == ReservationStatus.ACTIVE,
+                Reservation.id > last_id
+            ).order_by(Reservation.id).limit(chunk_size).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            codes = [row.reservation_code for row in rows]
+            batches = [codes[i:i + batch_size] for i in range(0, len(codes), batch_size)]
+            if executor is None:
+                results = [render_png_files(batch, save_path) for batch in batches]
+            else:
+                results = executor.map(render_png_files, batches, [save_path] * len(batches))
+
+            errors = {code: error for batch in results for code, error in batch if error}
+            done_ids = [row.id for row in rows if row.reservation_code not in errors]
+
+            if done_ids:
+                db.session.execute(
+                    update(Reservation)
+                    .where(Reservation.id.in_(done_ids))
+                    .values(qr_code_path='uploads/qr/' + Reservation.reservation_code + '.png'),
+                    execution_options={'synchronize_session': False}
+                )
+                db.session.commit()
+
+            stats['generated'] += len(done_ids)
+            stats['failed'] += len(errors)
+            stats['seconds'] = time.perf_counter() - started
+            stats['per_second'] = stats['generated'] / stats['seconds'] if stats['seconds'] else 0.0
+            if progress:
+                progress(dict(stats, errors=errors))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return stats
+
+
+def get_qr_service() -> QRCodeService:
+    """Uygulamaya ait QR servisini getirir, yoksa oluşturur"""
+    service = current_app.extensions.get('qr_service')
+    if service is None:
+        service = QRCodeService(
+            max_bytes=current_app.config.get('QR_CACHE_MAX_BYTES', 8 * 1024 * 1024)
+        )
+        current_app.extensions['qr_service'] = service
+    return service
+
+
+def parse_box_size(value: Optional[str]) -> int:
+    """`size` sorgu parametresini 1..MAX_BOX_SIZE aralığına sıkıştırır"""
+    try:
+        size = int(value) if value else DEFAULT_BOX_SIZE
+    except ValueError:
+        return DEFAULT_BOX_SIZE
+    return max(1, min(size, MAX_BOX_SIZE))
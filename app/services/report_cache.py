@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+Rapor Sonuç Önbelleği
+Özet, rezervasyon, doluluk ve müşteri raporları ile etkinlik analitikleri
+şirket, rapor tipi ve parametreler (tarih aralığı vb.) ile anahtarlanıp TTL
+süresince saklanır.
+
+Geçersizleştirme nesil (generation) sayaçlarıyla yapılır: her anahtar ilgili
+etkinliğin veya şirketin o anki neslini içerir. Bir etkinliğin rezervasyonu,
+oturumu veya kendisi değişip commit edildiğinde etkinliğin ve şirketinin nesli
+artırılır; eski kayıtlar bir daha okunmaz ve TTL ile düşer.
+
+Varsayılan olarak süreç içi bellek kullanılır; REDIS_ENABLED ve REDIS_URL
+tanımlıysa Redis'e geçilir, böylece tüm worker'lar aynı önbelleği paylaşır.
+Bellek arka ucunun nesil sayaçları da süreç içidir: bir worker'daki yazma
+diğer worker'ların kayıtlarını geçersiz kılamaz. Bu yüzden Redis yokken
+birden fazla worker çalışıyorsa (WEB_CONCURRENCY > 1) önbellek kapatılır.
+"""
+import copy
+import hashlib
+import json
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event as sa_event, select
+
+PENDING_KEY = 'report_cache_pending'
+
+
+class _MemoryBackend:
+    """Tek worker içinde çalışan, kayıt sayısıyla sınırlı TTL önbelleği"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._generations: Dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Çağıran sonucu değiştirse bile önbellekteki kopya bozulmasın
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generations(self, names: Iterable[str]) -> Tuple[int, ...]:
+        with self._lock:
+            return tuple(self._generations.get(name, 0) for name in names)
+
+    def bump(self, names: Iterable[str]) -> None:
+        with self._lock:
+            for name in names:
+                self._generations[name] = self._generations.get(name, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class _RedisBackend:
+    """Worker'lar arası Redis önbelleği (süre sonunda Redis siler)"""
+
+    name = 'redis'
+
+    def __init__(self, client, prefix: str = 'rezervation:reports:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=ttl)
+
+    def generations(self, names: Iterable[str]) -> Tuple[int, ...]:
+        names = list(names)
+        values = self.client.mget([f'{self.prefix}gen:{name}' for name in names]) if names else []
+        return tuple(int(value or 0) for value in values)
+
+    def bump(self, names: Iterable[str]) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for name in names:
+            pipe.incr(f'{self.prefix}gen:{name}')
+        pipe.execute()
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(f'{self.prefix}*'):
+            self.client.delete(key)
+
+    def size(self) -> int:
+        return sum(1 for _ in self.client.scan_iter(f'{self.prefix}*'))
+
+
+def event_scope(event_id: int) -> str:
+    """Etkinlik nesil sayacı adı"""
+    return f'event:{event_id}'
+
+
+def company_scope(company_id: int) -> str:
+    """Şirket nesil sayacı adı (şirket geneli raporlar)"""
+    return f'company:{company_id}'
+
+
+class ReportCache:
+    """Rapor sonuçlarını nesil sayaçlarıyla geçersizleştirilen önbellek"""
+
+    def __init__(self, app=None):
+        self.backend = _MemoryBackend()
+        self.ttl = 300
+        self.logger = None
+        self.hits = 0
+        self.misses = 0
+        self._listeners_registered = False
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Rapor önbelleğini Flask app ile başlatır"""
+        self.logger = app.logger
+        self.ttl = app.config.get('REPORT_CACHE_TTL', 300)
+        self.backend = _MemoryBackend(app.config.get('REPORT_CACHE_MAX_ENTRIES', 512))
+        self.hits = 0
+        self.misses = 0
+
+        redis_url = app.config.get('REDIS_URL')
+        if app.config.get('REDIS_ENABLED') and redis_url and not app.config.get('TESTING'):
+            try:
+                import redis
+                client = redis.from_url(redis_url)
+                client.ping()
+                self.backend = _RedisBackend(client)
+                app.logger.info('✅ Redis report cache initialized')
+            except Exception as e:
+                app.logger.warning(f'⚠️ Redis report cache failed: {e}')
+                app.logger.warning('💾 Falling back to in-process report cache')
+
+        workers = app.config.get('WEB_CONCURRENCY', 1)
+        if self.backend.name == 'memory' and self.ttl and workers > 1:
+            app.logger.warning(
+                f'⚠️ In-process report cache disabled: {workers} workers cannot share invalidations'
+            )
+            self.ttl = 0
+
+        self._register_session_listeners()
+
+    def _register_session_listeners(self):
+        """ORM değişikliklerini toplar, geçersizleştirmeyi commit sonrasına bırakır"""
+        if self._listeners_registered:
+            return
+
+        from app import db
+
+        @sa_event.listens_for(db.session, 'after_flush')
+        def _collect_changes(session, flush_context):
+            self._collect(session)
+
+        @sa_event.listens_for(db.session, 'after_commit')
+        def _apply_pending(session):
+            pending = session.info.pop(PENDING_KEY, None)
+            if pending:
+                self.invalidate(pending)
+
+        @sa_event.listens_for(db.session, 'after_rollback')
+        def _discard_pending(session):
+            session.info.pop(PENDING_KEY, None)
+
+        self._listeners_registered = True
+
+    def get_or_compute(self, report_type: str, compute: Callable[[], Any],
+                       company_id: int, event_id: Optional[int] = None,
+                       params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Önbellekteki raporu döner, yoksa hesaplayıp saklar
+
+        Args:
+            report_type: Rapor tipi ('summary', 'event_analytics:overview', ...)
+            compute: Raporu üreten fonksiyon
+            company_id: Şirket ID'si
+            event_id: Rapor tek etkinliğe aitse etkinlik ID'si; None ise
+                şirketin herhangi bir etkinliği değiştiğinde geçersizleşir
+            params: Anahtara katılacak parametreler (tarih aralığı vb.)
+
+        Returns:
+            Any: Rapor verisi ('error' içeren sonuçlar saklanmaz)
+        """
+        if not self.ttl:
+            return compute()
+
+        scope = event_scope(event_id) if event_id is not None else company_scope(company_id)
+        try:
+            key = self._key(report_type, company_id, scope, params)
+            cached = self.backend.get(key)
+        except Exception as e:
+            self._warn(f'Report cache read failed: {e}')
+            return compute()
+
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        result = compute()
+        if not (isinstance(result, dict) and 'error' in result):
+            try:
+                self.backend.set(key, result, self.ttl)
+            except Exception as e:
+                self._warn(f'Report cache write failed: {e}')
+        return result
+
+    def queue_invalidation(self, session, event_id: int, company_id: Optional[int] = None) -> None:
+        """
+        Etkinliğin raporlarını mevcut transaction commit edildiğinde geçersiz kılar
+
+        Args:
+            session: SQLAlchemy session
+            event_id: Değişen etkinlik
+            company_id: Etkinliğin şirketi (şirket geneli raporlar için)
+        """
+        pending = session.info.setdefault(PENDING_KEY, {})
+        if pending.get(event_id) is None:
+            pending[event_id] = company_id
+
+    def invalidate(self, events: Dict[int, Optional[int]]) -> None:
+        """Verilen etkinliklerin ve şirketlerinin nesillerini hemen artırır"""
+        names = {event_scope(event_id) for event_id in events}
+        names.update(company_scope(company_id) for company_id in events.values() if company_id is not None)
+        try:
+            self.backend.bump(sorted(names))
+        except Exception as e:
+            self._warn(f'Report cache invalidation failed: {e}')
+
+    def clear(self) -> None:
+        """Tüm kayıtları siler"""
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Önbellek istatistikleri"""
+        return {
+            'backend': self.backend.name,
+            'entries': self.backend.size(),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def _key(self, report_type: str, company_id: int, scope: str,
+             params: Optional[Dict[str, Any]]) -> str:
+        """Rapor anahtarı: kapsamın o anki nesli anahtarın parçasıdır"""
+        generation, = self.backend.generations([scope])
+        digest = hashlib.sha1(
+            json.dumps(params or {}, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()[:16]
+        return f'{company_id}:{report_type}:{scope}@{generation}:{digest}'
+
+    def _collect(self, session) -> None:
+        """Flush edilen rezervasyon, oturum ve etkinlik değişikliklerini sıraya alır"""
+        from app.models import Event, EventSeating, Reservation
+
+        pending = {}
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            if isinstance(obj, Event):
+                if obj.id is not None:
+                    pending[obj.id] = obj.company_id
+            elif isinstance(obj, (Reservation, EventSeating)) and obj.event_id is not None:
+                pending.setdefault(obj.event_id, None)
+
+        if not pending:
+            return
+
+        unresolved = [event_id for event_id, company_id in pending.items() if company_id is None]
+        if unresolved:
+            with session.no_autoflush:
+                rows = session.execute(
+                    select(Event.id, Event.company_id).where(Event.id.in_(unresolved))
+                )
+                pending.update({row.id: row.company_id for row in rows})
+
+        for event_id, company_id in pending.items():
+            self.queue_invalidation(session, event_id, company_id)
+
+    def _warn(self, message: str) -> None:
+        if self.logger:
+            self.logger.warning(message)
+
+
+report_cache = ReportCache()
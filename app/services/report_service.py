@@ -3,14 +3,18 @@
 Raporlama Servisi
 Gelişmiş raporlama sistemi için gerekli fonksiyonları içerir.
 """
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from datetime import date, datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
 from flask import current_app
 from app import db
-from app.models import Event, Reservation, User, Company
-from sqlalchemy import func, and_, or_, desc, asc
+from app.models import Event, Reservation, User, Company, ReservationDailyRollup
+from app.models.reservation import ReservationStatus
+from app.services.rollup_service import RollupService
+from sqlalchemy import func, and_, or_, desc, asc, case, select
 import json
-import pandas as pd
+
+# Doluluk raporunda sayfa başına etkinlik
+EVENT_OCCUPANCY_PAGE_SIZE = 50
 
 
 class ReportService:
@@ -18,6 +22,7 @@ class ReportService:
     
     def __init__(self, company_id: int):
         self.company_id = company_id
+        self._rollup_ready = None
     
     def get_summary_report(self, start_date: Optional[datetime] = None, 
                           end_date: Optional[datetime] = None) -> Dict[str, Any]:
@@ -160,13 +165,15 @@ class ReportService:
             return {'error': str(e)}
     
     def get_occupancy_analysis_report(self, start_date: Optional[datetime] = None,
-                                    end_date: Optional[datetime] = None) -> Dict[str, Any]:
+                                    end_date: Optional[datetime] = None,
+                                    page: int = 1) -> Dict[str, Any]:
         """
         Doluluk analiz raporu oluşturur
         
         Args:
             start_date: Başlangıç tarihi
             end_date: Bitiş tarihi
+            page: Etkinlik doluluk listesinin sayfası
             
         Returns:
             Dict: Doluluk analiz raporu
@@ -175,7 +182,7 @@ class ReportService:
             date_filter = self._build_date_filter(start_date, end_date)
             
             # Etkinlik bazlı doluluk oranları
-            event_occupancy = self._get_event_occupancy(date_filter)
+            event_occupancy, event_occupancy_pagination = self._get_event_occupancy(date_filter, page)
             
             # Oturum tipi popülerliği
             seating_type_popularity = self._get_seating_type_popularity(date_filter)
@@ -188,6 +195,7 @@ class ReportService:
             
             return {
                 'event_occupancy': event_occupancy,
+                'event_occupancy_pagination': event_occupancy_pagination,
                 'seating_type_popularity': seating_type_popularity,
                 'occupancy_time_series': occupancy_time_series,
                 'empty_seats_analysis': empty_seats_analysis
@@ -247,74 +255,87 @@ class ReportService:
             str: Excel dosyası yolu
         """
         try:
-            import openpyxl
-            from openpyxl.styles import Font, PatternFill, Alignment
-            from openpyxl.utils import get_column_letter
-            
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = f"{report_type.title()} Raporu"
-            
-            # Başlık formatı
-            header_font = Font(bold=True, size=12)
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            
-            row = 1
-            for key, value in report_data.items():
-                ws[f'A{row}'] = key.replace('_', ' ').title()
-                ws[f'B{row}'] = str(value) if not isinstance(value, (dict, list)) else str(value)[:50] + "..."
-                
-                # Header formatı uygula
-                if row == 1:
-                    ws[f'A{row}'].font = header_font
-                    ws[f'B{row}'].font = header_font
-                    ws[f'A{row}'].fill = header_fill
-                    ws[f'B{row}'].fill = header_fill
-                
-                row += 1
-            
-            # Sütun genişliklerini ayarla
-            for col in range(1, 3):
-                ws.column_dimensions[get_column_letter(col)].width = 30
-            
-            filename = f"report_{report_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+            data, filename = self.build_excel(report_data, report_type)
             filepath = f"app/static/uploads/reports/{filename}"
             
-            wb.save(filepath)
+            import os
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, 'wb') as f:
+                f.write(data)
             return filepath
             
         except Exception as e:
             current_app.logger.error(f"Excel export error: {str(e)}")
             raise
     
-    def export_to_csv(self, data: List[Dict[str, Any]], filename: str) -> str:
+    def build_excel(self, report_data: Dict[str, Any], report_type: str) -> Tuple[bytes, str]:
         """
-        Veriyi CSV formatında aktarır
+        Rapor Excel içeriğini üretir (arka plan işleri için)
         
         Args:
-            data: Aktarılacak veri
-            filename: Dosya adı
+            report_data: Rapor verileri
+            report_type: Rapor tipi
             
         Returns:
-            str: CSV dosyası yolu
+            Tuple[bytes, str]: Excel içeriği ve dosya adı
         """
-        try:
-            df = pd.DataFrame(data)
-            filepath = f"app/static/uploads/reports/{filename}"
-            
-            # Klasörü oluştur
-            import os
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        import openpyxl
+        from io import BytesIO
+        from openpyxl.styles import Font, PatternFill, Alignment
+        from openpyxl.utils import get_column_letter
+        
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = f"{report_type.title()} Raporu"
+        
+        # Başlık formatı
+        header_font = Font(bold=True, size=12)
+        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        
+        row = 1
+        for key, value in report_data.items():
+            ws[f'A{row}'] = key.replace('_', ' ').title()
+            ws[f'B{row}'] = str(value) if not isinstance(value, (dict, list)) else str(value)[:50] + "..."
             
-            # UTF-8 encoding ile kaydet
-            df.to_csv(filepath, index=False, encoding='utf-8-sig')
-            return filepath
+            # Header formatı uygula
+            if row == 1:
+                ws[f'A{row}'].font = header_font
+                ws[f'B{row}'].font = header_font
+                ws[f'A{row}'].fill = header_fill
+                ws[f'B{row}'].fill = header_fill
             
-        except Exception as e:
-            current_app.logger.error(f"CSV export error: {str(e)}")
-            raise
+            row += 1
+        
+        # Sütun genişliklerini ayarla
+        for col in range(1, 3):
+            ws.column_dimensions[get_column_letter(col)].width = 30
+        
+        filename = f"report_{report_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        
+        output = BytesIO()
+        wb.save(output)
+        return output.getvalue(), filename
     
     # Private helper methods
+    def _use_rollup(self) -> bool:
+        """Etkinlik tarihine göre filtrelenen sorgular rollup tablosundan okunabilir mi"""
+        if self._rollup_ready is None:
+            self._rollup_ready = RollupService.covers(self.company_id)
+        return self._rollup_ready
+    
+    def _rollup_query(self, *columns, date_filter: Optional[and_] = None):
+        """Şirketin rollup satırları üzerinde (etkinlik tarihi filtresiyle) sorgu"""
+        query = db.session.query(*columns).select_from(ReservationDailyRollup).join(
+            Event, ReservationDailyRollup.event_id == Event.id
+        ).filter(ReservationDailyRollup.company_id == self.company_id)
+        if date_filter is not None:
+            query = query.filter(date_filter)
+        return query
+    
+    def _rollup_sum(self, column, date_filter: Optional[and_]) -> int:
+        """Rollup sütununun toplamı"""
+        return int(self._rollup_query(func.coalesce(func.sum(column), 0), date_filter=date_filter).scalar())
+    
     def _build_date_filter(self, start_date: Optional[datetime], 
                           end_date: Optional[datetime]) -> Optional[and_]:
         """Tarih filtresi oluşturur"""
@@ -332,33 +353,41 @@ class ReportService:
     def _get_total_events(self, date_filter: Optional[and_]) -> int:
         """Toplam etkinlik sayısını getirir"""
         query = Event.query.filter_by(company_id=self.company_id)
-        if date_filter:
+        if date_filter is not None:
             query = query.filter(date_filter)
         return query.count()
     
     def _get_total_reservations(self, date_filter: Optional[and_]) -> int:
         """Toplam rezervasyon sayısını getirir"""
+        if self._use_rollup():
+            return self._rollup_sum(ReservationDailyRollup.created, date_filter)
+        
         query = Reservation.query.join(Event).filter(Event.company_id == self.company_id)
-        if date_filter:
+        if date_filter is not None:
             query = query.filter(date_filter)
         return query.count()
     
     def _get_total_capacity(self, date_filter: Optional[and_]) -> int:
         """Toplam kapasiteyi hesaplar"""
-        query = db.session.query(func.sum(EventSeating.capacity)).join(Event)
+        query = db.session.query(func.sum(SeatingType.capacity)).select_from(EventSeating).join(
+            SeatingType, EventSeating.seating_type_id == SeatingType.id
+        ).join(Event, EventSeating.event_id == Event.id)
         query = query.filter(Event.company_id == self.company_id)
-        if date_filter:
+        if date_filter is not None:
             query = query.filter(date_filter)
         return query.scalar() or 0
     
     def _get_checked_in_count(self, date_filter: Optional[and_]) -> int:
         """Check-in sayısını getirir"""
+        if self._use_rollup():
+            return self._rollup_sum(ReservationDailyRollup.checked_in, date_filter)
+        
         query = db.session.query(func.count(Reservation.id))
         query = query.join(Event).filter(
             Event.company_id == self.company_id,
             Reservation.checked_in == True
         )
-        if date_filter:
+        if date_filter is not None:
             query = query.filter(date_filter)
         return query.scalar() or 0
     
@@ -375,7 +404,7 @@ class ReportService:
             func.count(Event.id).label('count')
         ).filter(Event.company_id == self.company_id)
         
-        if date_filter:
+        if date_filter is not None:
             query = query.filter(date_filter)
         
         query = query.group_by(Event.event_type).all()
@@ -384,16 +413,22 @@ class ReportService:
     
     def _get_occupancy_trends(self, date_filter: Optional[and_]) -> List[Dict]:
         """Doluluk trendlerini getirir"""
-        query = db.session.query(
-            Event.event_date,
-            func.count(Reservation.id).label('reservations')
-        ).join(Reservation).filter(Event.company_id == self.company_id)
-        
-        if date_filter:
-            query = query.filter(date_filter)
-        
-        query = query.group_by(Event.event_date).order_by(Event.event_date)
-        results = query.all()
+        if self._use_rollup():
+            reservations = func.sum(ReservationDailyRollup.created)
+            results = self._rollup_query(
+                Event.event_date, reservations.label('reservations'), date_filter=date_filter
+            ).group_by(Event.event_date).having(reservations > 0).order_by(Event.event_date).all()
+        else:
+            query = db.session.query(
+                Event.event_date,
+                func.count(Reservation.id).label('reservations')
+            ).join(Reservation).filter(Event.company_id == self.company_id)
+            
+            if date_filter is not None:
+                query = query.filter(date_filter)
+            
+            query = query.group_by(Event.event_date).order_by(Event.event_date)
+            results = query.all()
         
         return [
             {
@@ -471,42 +506,55 @@ class ReportService:
         """Rezervasyon trendlerini getirir"""
         # Implementation depends on group_by parameter
         # This is a simplified version
-        query = db.session.query(
-            func.date(Reservation.created_at).label('date'),
-            func.count(Reservation.id).label('count')
-        ).join(Event).filter(Event.company_id == self.company_id)
-        
-        if date_filter:
-            query = query.filter(date_filter)
-        
-        query = query.group_by('date').order_by('date')
-        results = query.all()
+        if self._use_rollup():
+            count = func.sum(ReservationDailyRollup.created)
+            results = self._rollup_query(
+                ReservationDailyRollup.day.label('date'), count.label('count'), date_filter=date_filter
+            ).group_by(ReservationDailyRollup.day).having(count > 0).order_by(ReservationDailyRollup.day).all()
+        else:
+            query = db.session.query(
+                func.date(Reservation.created_at).label('date'),
+                func.count(Reservation.id).label('count')
+            ).join(Event).filter(Event.company_id == self.company_id)
+            
+            if date_filter is not None:
+                query = query.filter(date_filter)
+            
+            query = query.group_by('date').order_by('date')
+            results = query.all()
         
         return [
             {
-                'date': row.date.isoformat(),
-                'count': row.count
+                'date': _as_date(row.date).isoformat(),
+                'count': int(row.count)
             }
             for row in results
         ]
     
     def _get_popular_times(self, date_filter: Optional[and_]) -> List[Dict]:
         """En popüler zamanları getirir"""
-        query = db.session.query(
-            func.hour(Reservation.created_at).label('hour'),
-            func.count(Reservation.id).label('count')
-        ).join(Event).filter(Event.company_id == self.company_id)
+        if self._use_rollup():
+            count = func.sum(ReservationDailyRollup.created)
+            query = self._rollup_query(
+                ReservationDailyRollup.hour.label('hour'), count.label('count'), date_filter=date_filter
+            ).group_by(ReservationDailyRollup.hour).having(count > 0)
+        else:
+            query = db.session.query(
+                func.extract('hour', Reservation.created_at).label('hour'),
+                func.count(Reservation.id).label('count')
+            ).join(Event).filter(Event.company_id == self.company_id)
+            
+            if date_filter is not None:
+                query = query.filter(date_filter)
+            
+            query = query.group_by('hour')
         
-        if date_filter:
-            query = query.filter(date_filter)
-        
-        query = query.group_by('hour').order_by(desc('count')).limit(10)
-        results = query.all()
+        results = query.order_by(desc('count'), asc('hour')).limit(10).all()
         
         return [
             {
-                'hour': f"{row.hour:02d}:00",
-                'count': row.count
+                'hour': f"{int(row.hour):02d}:00",
+                'count': int(row.count)
             }
             for row in results
         ]
@@ -517,7 +565,7 @@ class ReportService:
             func.avg(Event.event_date - Reservation.created_at.cast(db.Date))
         ).join(Reservation).filter(Event.company_id == self.company_id)
         
-        if date_filter:
+        if date_filter is not None:
             query = query.filter(date_filter)
         
         result = query.scalar()
@@ -526,15 +574,18 @@ class ReportService:
     def _get_cancellation_rates(self, date_filter: Optional[and_]) -> Dict[str, float]:
         """İptal oranlarını hesaplar"""
         total = self._get_total_reservations(date_filter)
-        cancelled = db.session.query(func.count(Reservation.id)).join(Event).filter(
-            Event.company_id == self.company_id,
-            Reservation.status == 'cancelled'
-        )
-        
-        if date_filter:
-            cancelled = cancelled.filter(date_filter)
-        
-        cancelled_count = cancelled.scalar() or 0
+        if self._use_rollup():
+            cancelled_count = self._rollup_sum(ReservationDailyRollup.cancelled, date_filter)
+        else:
+            cancelled = db.session.query(func.count(Reservation.id)).join(Event).filter(
+                Event.company_id == self.company_id,
+                Reservation.status == ReservationStatus.CANCELLED
+            )
+            
+            if date_filter is not None:
+                cancelled = cancelled.filter(date_filter)
+            
+            cancelled_count = cancelled.scalar() or 0
         
         return {
             'total': total,
@@ -542,40 +593,122 @@ class ReportService:
             'rate': (cancelled_count / total * 100) if total > 0 else 0
         }
     
-    def _get_event_occupancy(self, date_filter: Optional[and_]) -> List[Dict]:
-        """Etkinlik bazlı doluluk oranlarını getirir"""
-        # Simplified implementation
-        events = Event.query.filter_by(company_id=self.company_id)
-        if date_filter:
+    def _get_event_occupancy(self, date_filter: Optional[and_], page: int = 1,
+                             per_page: int = EVENT_OCCUPANCY_PAGE_SIZE) -> Tuple[List[Dict], Dict[str, int]]:
+        """
+        Etkinlik bazlı doluluk oranlarını sayfa sayfa getirir
+
+        Önce sayfadaki etkinlikler seçilir (alt sorgu); kapasite ve rezervasyon
+        toplamları yalnızca bu etkinlikler için gruplanır. Böylece sayfa
+        maliyeti tüm veritabanına değil sayfa boyutuna bağlıdır ve sayfa başına
+        bir veri ve bir sayım sorgusu çalışır.
+
+        Args:
+            date_filter: Etkinlik tarihi filtresi
+            page: Sayfa numarası (1'den başlar)
+            per_page: Sayfa başına etkinlik
+
+        Returns:
+            Tuple[List[Dict], Dict]: Sayfadaki etkinlikler ve sayfalama bilgisi
+        """
+        events = db.session.query(Event.id).filter(Event.company_id == self.company_id)
+        if date_filter is not None:
             events = events.filter(date_filter)
+        total = events.count()
+        
+        page = max(page, 1)
+        page_events = db.session.query(
+            Event.id.label('id'),
+            Event.name.label('name'),
+            Event.event_date.label('event_date')
+        ).filter(Event.company_id == self.company_id)
+        if date_filter is not None:
+            page_events = page_events.filter(date_filter)
+        page_events = page_events.order_by(
+            Event.event_date.desc(), Event.id.desc()
+        ).limit(per_page).offset((page - 1) * per_page).subquery()
+        page_ids = select(page_events.c.id)
+        
+        capacity = db.session.query(
+            EventSeating.event_id.label('event_id'),
+            func.count(EventSeating.id).label('total_seats'),
+            func.coalesce(func.sum(SeatingType.capacity), 0).label('total_capacity')
+        ).outerjoin(
+            SeatingType, EventSeating.seating_type_id == SeatingType.id
+        ).filter(
+            EventSeating.event_id.in_(page_ids)
+        ).group_by(EventSeating.event_id).subquery()
+        
+        active = Reservation.status == ReservationStatus.ACTIVE
+        reservations = db.session.query(
+            Reservation.event_id.label('event_id'),
+            func.sum(case((active, 1), else_=0)).label('reserved_seats'),
+            func.sum(case((active, Reservation.number_of_people), else_=0)).label('reserved_people'),
+            func.sum(case((Reservation.checked_in == True, 1), else_=0)).label('checked_in')  # noqa: E712
+        ).filter(
+            Reservation.event_id.in_(page_ids)
+        ).group_by(Reservation.event_id).subquery()
+        
+        rows = db.session.query(
+            page_events.c.id,
+            page_events.c.name,
+            page_events.c.event_date,
+            func.coalesce(capacity.c.total_seats, 0).label('total_seats'),
+            func.coalesce(capacity.c.total_capacity, 0).label('total_capacity'),
+            func.coalesce(reservations.c.reserved_seats, 0).label('reserved_seats'),
+            func.coalesce(reservations.c.reserved_people, 0).label('reserved_people'),
+            func.coalesce(reservations.c.checked_in, 0).label('checked_in')
+        ).outerjoin(
+            capacity, capacity.c.event_id == page_events.c.id
+        ).outerjoin(
+            reservations, reservations.c.event_id == page_events.c.id
+        ).order_by(
+            page_events.c.event_date.desc(), page_events.c.id.desc()
+        )
         
         results = []
-        for event in events:
-            total_seats = event.seatings.count() if event.seatings else 0
-            reserved_seats = event.reservations.filter_by(status='active').count()
-            occupancy_rate = (reserved_seats / total_seats * 100) if total_seats > 0 else 0
+        for row in rows:
+            total_capacity = int(row.total_capacity)
+            reserved_people = int(row.reserved_people)
+            occupancy_rate = (reserved_people / total_capacity * 100) if total_capacity > 0 else 0
             
             results.append({
-                'event_name': event.name,
-                'event_date': event.event_date.isoformat(),
-                'total_seats': total_seats,
-                'reserved_seats': reserved_seats,
+                'event_id': row.id,
+                'event_name': row.name,
+                'event_date': row.event_date.isoformat(),
+                'total_seats': int(row.total_seats),
+                'total_capacity': total_capacity,
+                'reserved_seats': int(row.reserved_seats),
+                'reserved_people': reserved_people,
+                'checked_in': int(row.checked_in),
                 'occupancy_rate': round(occupancy_rate, 2)
             })
         
-        return results
+        pagination = {
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'pages': (total + per_page - 1) // per_page
+        }
+        return results, pagination
     
     def _get_seating_type_popularity(self, date_filter: Optional[and_]) -> List[Dict]:
         """Oturum tipi popülerliğini getirir"""
         query = db.session.query(
             SeatingType.name,
             func.count(Reservation.id).label('reservations')
-        ).join(EventSeating, Reservation).join(Event).filter(
+        ).select_from(Reservation).join(
+            EventSeating, Reservation.seating_id == EventSeating.id
+        ).join(
+            SeatingType, EventSeating.seating_type_id == SeatingType.id
+        ).join(
+            Event, Reservation.event_id == Event.id
+        ).filter(
             Event.company_id == self.company_id,
-            Reservation.status == 'active'
+            Reservation.status == ReservationStatus.ACTIVE
         )
         
-        if date_filter:
+        if date_filter is not None:
             query = query.filter(date_filter)
         
         query = query.group_by(SeatingType.name).order_by(desc('reservations'))
@@ -607,7 +740,7 @@ class ReportService:
             func.count(Reservation.id).label('visit_count')
         ).join(Event).filter(Event.company_id == self.company_id)
         
-        if date_filter:
+        if date_filter is not None:
             query = query.filter(date_filter)
         
         query = query.group_by(Reservation.phone).having(func.count(Reservation.id) > 1)
@@ -629,7 +762,7 @@ class ReportService:
             func.avg(Reservation.number_of_people).label('avg_people')
         ).join(Event).filter(Event.company_id == self.company_id)
         
-        if date_filter:
+        if date_filter is not None:
             query = query.filter(date_filter)
         
         query = query.group_by(Reservation.phone).order_by(desc('reservation_count')).limit(10)
@@ -662,7 +795,7 @@ class ReportService:
             func.sum(func.case([(Reservation.status == 'cancelled', 1)], else_=0)).label('cancellations')
         ).join(Event).filter(Event.company_id == self.company_id)
         
-        if date_filter:
+        if date_filter is not None:
             query = query.filter(date_filter)
         
         query = query.group_by(Reservation.phone).having(
@@ -680,5 +813,11 @@ class ReportService:
         ]
 
 
+
+def _as_date(value):
+    """func.date() sonucunu date'e çevirir (SQLite metin döner)"""
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
 # Import statements for relationships
-from app.models.seating import SeatingType, EventSeating
\ No newline at end of file
+from app.models.seating import SeatingType, EventSeating
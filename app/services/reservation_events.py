@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Rezervasyon Yaşam Döngüsü Kancaları
+Rezervasyon oluşturma, iptal, check-in ve yerleşim değişikliklerinde
+çağrılır. Kancalar çağıranın transaction'ı içinde çalışır; commit çağıranındır.
+Canlı akış mesajları ve rapor önbelleği geçersizleştirmeleri sıraya alınır ve
+yalnızca commit sonrasında uygulanır; etkinliğin sürüm sayacı (ETag) aynı
+transaction içinde artırılır.
+"""
+from typing import Any, Dict, Iterable
+from flask import current_app
+from sqlalchemy import update, exists, and_
+from app import db
+from app.models import Event, EventSeating, Reservation
+from app.models.reservation import ReservationStatus
+from app.models.seating import SeatStatus
+from app.services.occupancy_service import OccupancyService
+from app.services.rollup_service import RollupService
+from app.services.live_feed import live_feed
+from app.services.report_cache import report_cache
+from app.services.event_versions import event_versions
+
+
+def on_reservation_created(reservation: Reservation) -> None:
+    """Yeni rezervasyon eklendiğinde çağrılır"""
+    db.session.flush()
+    OccupancyService.apply_delta(
+        reservation.event_id,
+        reserved_people=reservation.number_of_people or 0,
+        active_reservations=1,
+        total_reservations=1
+    )
+    RollupService.record(
+        reservation.event_id,
+        reservation.created_at,
+        created=1,
+        people=reservation.number_of_people or 0
+    )
+    _invalidate_checkin_cache(reservation.event_id)
+    _notify(reservation.event_id, {
+        'type': 'reservation',
+        'delta': {
+            'reserved_people': reservation.number_of_people or 0,
+            'active_reservations': 1,
+            'total_reservations': 1
+        },
+        'reservation': _summary(reservation)
+    })
+
+
+def on_reservations_imported(event_id: int, count: int, people: int) -> None:
+    """Toplu içe aktarmada eklenen rezervasyonlar için tek seferde çağrılır"""
+    if not count:
+        return
+
+    db.session.flush()
+    OccupancyService.apply_delta(
+        event_id,
+        reserved_people=people,
+        active_reservations=count,
+        total_reservations=count
+    )
+    RollupService.record(event_id, created=count, people=people)
+    _invalidate_checkin_cache(event_id)
+    _notify(event_id, {
+        'type': 'reservation',
+        'delta': {
+            'reserved_people': people,
+            'active_reservations': count,
+            'total_reservations': count
+        },
+        'imported': count
+    })
+
+
+def on_reservations_cancelled(event_id: int, reservations: Iterable[Reservation]) -> None:
+    """Bir veya daha fazla aktif rezervasyon iptal edildiğinde çağrılır"""
+    reservations = list(reservations)
+    if not reservations:
+        return
+
+    people = sum(r.number_of_people or 0 for r in reservations)
+
+    db.session.flush()
+    OccupancyService.apply_delta(
+        event_id,
+        reserved_people=-people,
+        active_reservations=-len(reservations)
+    )
+    RollupService.record(event_id, cancelled=len(reservations))
+    _release_seats([r.seating_id for r in reservations if r.seating_id])
+    _invalidate_checkin_cache(event_id)
+    _notify(event_id, {
+        'type': 'cancellation',
+        'delta': {
+            'reserved_people': -people,
+            'active_reservations': -len(reservations)
+        },
+        'reservations': [_summary(r) for r in reservations]
+    })
+
+
+def on_checked_in(reservation: Reservation) -> None:
+    """Rezervasyon check-in yapıldığında çağrılır"""
+    db.session.flush()
+    _invalidate_checkin_cache(reservation.event_id)
+    _record_checkin(reservation.event_id, _summary(reservation))
+
+
+def on_checked_in_entry(entry) -> None:
+    """
+    Check-in servisi koşullu UPDATE ile check-in yaptığında çağrılır
+
+    Args:
+        entry: CheckinEntry (önbellek kaydı; ORM nesnesi yüklenmez)
+    """
+    _record_checkin(entry.event_id, entry.summary())
+
+
+def on_layout_changed(event_id: int) -> None:
+    """Etkinlik oturumları eklendiğinde, silindiğinde veya değiştiğinde çağrılır"""
+    db.session.flush()
+    capacity = OccupancyService.refresh_capacity(event_id)
+    _invalidate_checkin_cache(event_id)
+    _notify(event_id, {'type': 'layout', 'total_capacity': capacity})
+
+
+def _record_checkin(event_id: int, summary: Dict[str, Any]) -> None:
+    """Check-in sayacını artırır ve canlı akışa bildirir"""
+    OccupancyService.apply_delta(event_id, checked_in_count=1)
+    RollupService.record(event_id, checked_in=1)
+    _notify(event_id, {
+        'type': 'checkin',
+        'delta': {'checked_in_count': 1},
+        'reservation': summary
+    })
+
+
+def _release_seats(seating_ids) -> None:
+    """İptal edilen rezervasyonların oturumlarını tekrar müsait yapar"""
+    if not seating_ids:
+        return
+
+    still_reserved = exists().where(and_(
+        Reservation.seating_id == EventSeating.id,
+        Reservation.status == ReservationStatus.ACTIVE
+    ))
+    db.session.execute(
+        update(EventSeating)
+        .where(
+            EventSeating.id.in_(set(seating_ids)),
+            EventSeating.status == SeatStatus.RESERVED,
+            ~still_reserved
+        )
+        .values(status=SeatStatus.AVAILABLE)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _invalidate_checkin_cache(event_id: int) -> None:
+    """Bu süreçteki check-in kod önbelleğini geçersiz kılar"""
+    cache = current_app.extensions.get('checkin_cache')
+    if cache is not None:
+        cache.invalidate(event_id)
+
+
+def _notify(event_id: int, message: Dict[str, Any]) -> None:
+    """Canlı akış mesajını ve rapor geçersizleştirmesini commit sonrası için sıraya alır"""
+    event = db.session.get(Event, event_id)
+    company_id = event.company_id if event is not None else None
+    live_feed.queue(db.session(), message, event_id=event_id, company_id=company_id)
+    # Toplu UPDATE'ler (check-in, içe aktarma) flush dinleyicisine görünmez
+    report_cache.queue_invalidation(db.session(), event_id, company_id)
+    event_versions.touch(db.session(), event_id)
+
+
+def _summary(reservation: Reservation) -> Dict[str, Any]:
+    """Akış mesajı için rezervasyon özeti (ek sorgu çalıştırmaz)"""
+    return {
+        'id': reservation.id,
+        'code': reservation.reservation_code,
+        'name': reservation.customer_name,
+        'people': reservation.number_of_people,
+        'seating_id': reservation.seating_id
+    }
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+Toplu Rezervasyon İçe Aktarma Servisi
+CSV/XLSX misafir listelerini tek geçişte doğrular, oturum atar ve
+rezervasyonları parçalar halinde toplu olarak ekler. QR kodları arka plan iş
+kuyruğunda üretilir.
+"""
+import csv
+import io
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import update, exists, and_
+from app import db
+from app.models import Reservation, EventSeating, SeatingType
+from app.models.reservation import ReservationStatus
+from app.models.seating import SeatStatus
+from app.schemas.reservation_schema import ReservationSchema
+from app.services import reservation_events
+from app.services.reservation_service import SeatUnavailableError
+from app.services.job_queue import job_queue
+from app.utils.search_text import build_search_text
+
+# Tablo başlığı -> alan adı (Türkçe başlıklar da kabul edilir)
+COLUMN_ALIASES = {
+    'phone': 'phone',
+    'telefon': 'phone',
+    'first_name': 'first_name',
+    'ad': 'first_name',
+    'adı': 'first_name',
+    'isim': 'first_name',
+    'last_name': 'last_name',
+    'soyad': 'last_name',
+    'soyadı': 'last_name',
+    'number_of_people': 'number_of_people',
+    'kişi sayısı': 'number_of_people',
+    'kisi sayisi': 'number_of_people',
+    'kişi': 'number_of_people',
+    'notes': 'notes',
+    'not': 'notes',
+    'notlar': 'notes',
+    'seat_number': 'seat_number',
+    'masa': 'seat_number',
+    'oturum': 'seat_number',
+    'masa no': 'seat_number',
+}
+
+SCHEMA_FIELDS = ('phone', 'first_name', 'last_name', 'number_of_people', 'notes')
+
+ALLOWED_EXTENSIONS = ('csv', 'xlsx')
+
+
+class ReservationImportService:
+    """Toplu rezervasyon içe aktarma işlemlerini yöneten servis sınıfı"""
+
+    CHUNK_SIZE = 500
+
+    def __init__(self, event_id: int):
+        self.event_id = event_id
+
+    @staticmethod
+    def read_rows(stream, filename: str) -> List[Dict[str, Any]]:
+        """
+        CSV veya XLSX dosyasını satır sözlüklerine çevirir
+
+        Args:
+            stream: Dosya nesnesi (binary)
+            filename: Uzantı tespiti için dosya adı
+
+        Returns:
+            List[Dict]: Alan adlarıyla normalize edilmiş satırlar
+
+        Raises:
+            ValueError: Desteklenmeyen dosya türü veya eksik telefon sütunu
+        """
+        extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+        if extension not in ALLOWED_EXTENSIONS:
+            raise ValueError('Sadece CSV veya XLSX dosyaları yüklenebilir')
+
+        if extension == 'csv':
+            text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+            sample = text.read(4096)
+            text.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+            except csv.Error:
+                dialect = csv.excel
+            reader = csv.reader(text, dialect)
+            header = next(reader, [])
+            raw_rows = list(reader)
+        else:
+            from openpyxl import load_workbook
+            workbook = load_workbook(stream, read_only=True, data_only=True)
+            sheet_rows = workbook.active.iter_rows(values_only=True)
+            header = next(sheet_rows, ())
+            raw_rows = list(sheet_rows)
+            workbook.close()
+
+        fields = [COLUMN_ALIASES.get(str(h or '').strip().lower()) for h in header]
+        if 'phone' not in fields:
+            raise ValueError('Dosyada telefon (phone) sütunu bulunamadı')
+
+        rows = []
+        for raw in raw_rows:
+            if not any(v not in (None, '') for v in raw):
+                continue
+            rows.append({
+                field: _clean_value(field, value)
+                for field, value in zip(fields, raw)
+                if field is not None
+            })
+        return rows
+
+    def import_rows(self, rows: List[Dict[str, Any]], assign_seats: bool = True,
+                    dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Satırları doğrular, oturum atar ve geçerli olanları toplu ekler
+
+        Geçersiz satırlar atlanır ve raporda döner; geçerli satırlar tek
+        transaction'da eklenir.
+
+        Args:
+            rows: read_rows çıktısı
+            assign_seats: Oturum belirtilmeyen satırlara boş oturum atansın mı
+            dry_run: True ise veritabanına yazılmaz
+
+        Returns:
+            Dict: imported, failed, errors (satır numarası + alan hataları), codes
+
+        Raises:
+            SeatUnavailableError: Atanan oturumlardan biri eşzamanlı olarak alındı
+        """
+        errors = self._validate(rows)
+        seat_assignments = self._assign_seats(rows, errors, assign_seats)
+
+        valid_indexes = [i for i in range(len(rows)) if i not in errors]
+        mappings = []
+        for index in valid_indexes:
+            row = rows[index]
+            phone = ReservationSchema.normalize_turkish_phone(row['phone'])
+            code = str(uuid.uuid4())
+            mappings.append({
+                'event_id': self.event_id,
+                'seating_id': seat_assignments.get(index),
+                'phone': phone,
+                'first_name': row.get('first_name'),
+                'last_name': row.get('last_name'),
+                'number_of_people': int(row.get('number_of_people') or 1),
+                'notes': row.get('notes'),
+                'reservation_code': code,
+                'status': ReservationStatus.ACTIVE,
+                'checked_in': False,
+                # bulk_insert_mappings model olaylarını tetiklemez
+                'search_text': build_search_text(row.get('first_name'), row.get('last_name'), phone, code),
+            })
+
+        report = {
+            'total': len(rows),
+            'imported': 0 if dry_run else len(mappings),
+            'valid': len(mappings),
+            'failed': len(errors),
+            'errors': [
+                # +2: başlık satırı ve 1'den başlayan satır numarası
+                {'row': index + 2, 'errors': errors[index]}
+                for index in sorted(errors)
+            ],
+            'codes': []
+        }
+
+        if dry_run or not mappings:
+            return report
+
+        try:
+            self._claim_seats([m['seating_id'] for m in mappings if m['seating_id']])
+            for start in range(0, len(mappings), self.CHUNK_SIZE):
+                db.session.bulk_insert_mappings(Reservation, mappings[start:start + self.CHUNK_SIZE])
+
+            reservation_events.on_reservations_imported(
+                self.event_id,
+                count=len(mappings),
+                people=sum(m['number_of_people'] for m in mappings)
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        report['codes'] = [m['reservation_code'] for m in mappings]
+        return report
+
+    def queue_qr_generation(self, codes: List[str], company_id: Optional[int] = None,
+                            user_id: Optional[int] = None) -> Optional[str]:
+        """QR kodlarını arka plan iş kuyruğunda üretir, iş ID'sini döner"""
+        if not codes:
+            return None
+        return job_queue.enqueue('qr_codes', company_id=company_id, user_id=user_id, codes=list(codes))
+
+    def _validate(self, rows: List[Dict[str, Any]]) -> Dict[int, Dict[str, List[str]]]:
+        """Tüm satırları ReservationSchema ile tek seferde doğrular"""
+        schema = ReservationSchema(many=True, partial=('event_id', 'event_seating_id'))
+        payload = [
+            {field: row[field] for field in SCHEMA_FIELDS if row.get(field) is not None}
+            for row in rows
+        ]
+        for item in payload:
+            item.setdefault('number_of_people', 1)
+
+        return {int(index): messages for index, messages in schema.validate(payload).items()}
+
+    def _assign_seats(self, rows: List[Dict[str, Any]], errors: Dict[int, Dict[str, List[str]]],
+                      assign_seats: bool) -> Dict[int, int]:
+        """
+        Geçerli satırlara boş oturum atar (hatalı satırları errors'a ekler)
+
+        Belirtilen masa numarası önceliklidir; diğerleri için kişi sayısına
+        yetecek en küçük kapasiteli boş oturum seçilir.
+        """
+        has_active = exists().where(and_(
+            Reservation.seating_id == EventSeating.id,
+            Reservation.status == ReservationStatus.ACTIVE
+        ))
+        free_seats = db.session.query(
+            EventSeating.id, EventSeating.seat_number, SeatingType.capacity
+        ).join(
+            SeatingType, EventSeating.seating_type_id == SeatingType.id
+        ).filter(
+            EventSeating.event_id == self.event_id,
+            EventSeating.status == SeatStatus.AVAILABLE,
+            ~has_active
+        ).order_by(EventSeating.id).all()
+
+        by_number = {seat.seat_number: seat for seat in free_seats}
+        by_capacity = defaultdict(list)
+        for seat in reversed(free_seats):
+            by_capacity[seat.capacity].append(seat)
+        taken = set()
+
+        # Önce masa numarası belirtilen satırlar
+        ordered = sorted(
+            (i for i in range(len(rows)) if i not in errors),
+            key=lambda i: not rows[i].get('seat_number')
+        )
+
+        assignments = {}
+        for index in ordered:
+            row = rows[index]
+            people = int(row.get('number_of_people') or 1)
+            seat_number = row.get('seat_number')
+
+            if seat_number:
+                seat = by_number.get(seat_number)
+                if seat is None or seat.id in taken:
+                    errors[index] = {'seat_number': [f'{seat_number} oturumu müsait değil']}
+                    continue
+                if people > seat.capacity:
+                    errors[index] = {'number_of_people': [
+                        f'Kişi sayısı oturum kapasitesini ({seat.capacity}) aşıyor'
+                    ]}
+                    continue
+            elif assign_seats:
+                seat = self._pop_best_fit(by_capacity, people, taken)
+                if seat is None:
+                    errors[index] = {'seat_number': ['Uygun boş oturum bulunamadı']}
+                    continue
+            else:
+                continue
+
+            taken.add(seat.id)
+            assignments[index] = seat.id
+
+        return assignments
+
+    @staticmethod
+    def _pop_best_fit(by_capacity, people: int, taken: set):
+        for capacity in sorted(c for c in by_capacity if c >= people):
+            seats = by_capacity[capacity]
+            while seats:
+                seat = seats.pop()
+                if seat.id not in taken:
+                    return seat
+        return None
+
+    def _claim_seats(self, seating_ids: List[int]) -> None:
+        """Atanan oturumları parça parça available -> reserved yapar"""
+        for start in range(0, len(seating_ids), self.CHUNK_SIZE):
+            chunk = seating_ids[start:start + self.CHUNK_SIZE]
+            result = db.session.execute(
+                update(EventSeating)
+                .where(
+                    EventSeating.id.in_(chunk),
+                    EventSeating.event_id == self.event_id,
+                    EventSeating.status == SeatStatus.AVAILABLE
+                )
+                .values(status=SeatStatus.RESERVED)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount != len(chunk):
+                raise SeatUnavailableError(
+                    'İçe aktarma sırasında bazı oturumlar başka rezervasyonlarla doldu, tekrar deneyin'
+                )
+
+
+def _clean_value(field: str, value: Any) -> Any:
+    """Hücre değerini normalize eder (boş -> None, sayısal hücre -> metin)"""
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if field == 'number_of_people' and isinstance(value, int):
+        return value
+
+    value = str(value).strip()
+    if field == 'phone' and len(value) == 10 and value.startswith('5'):
+        # Excel sayısal hücrede baştaki sıfırı siler: 5321234567 -> 05321234567
+        value = '0' + value
+    return value or None
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Rezervasyon Servisi
+Oturum rezervasyonunu tek bir koşullu durum geçişiyle (available -> reserved)
+yapar; aynı masayı aynı anda ayırtan iki istekten yalnızca biri kazanır.
+"""
+import uuid
+from typing import Any, Dict
+from sqlalchemy import update, exists, and_
+from app import db
+from app.models import Reservation, EventSeating, SeatingType
+from app.models.reservation import ReservationStatus
+from app.models.seating import SeatStatus
+from app.services import reservation_events
+
+
+class SeatUnavailableError(ValueError):
+    """Oturum başka bir rezervasyon tarafından alınmış veya kullanım dışı"""
+
+
+class ReservationService:
+    """Rezervasyon oluşturma işlemlerini yöneten servis sınıfı"""
+
+    def __init__(self, event_id: int):
+        self.event_id = event_id
+
+    def create_reservation(self, data: Dict[str, Any]) -> Reservation:
+        """
+        Oturumu atomik olarak ayırır ve rezervasyonu oluşturur
+
+        Args:
+            data: phone, first_name, last_name, seating_id, number_of_people, notes
+
+        Returns:
+            Reservation: Oluşturulan rezervasyon
+
+        Raises:
+            ValueError: Geçersiz oturum veya kapasite aşımı
+            SeatUnavailableError: Oturum müsait değil (çakışma)
+        """
+        seating_id = data.get('seating_id')
+        if not seating_id:
+            raise ValueError('Oturum seçilmedi')
+
+        seating = db.session.query(EventSeating.id, SeatingType.capacity).join(
+            SeatingType, EventSeating.seating_type_id == SeatingType.id
+        ).filter(
+            EventSeating.id == seating_id,
+            EventSeating.event_id == self.event_id
+        ).first()
+
+        if not seating:
+            raise ValueError('Geçersiz oturum')
+
+        number_of_people = int(data.get('number_of_people') or 1)
+        if number_of_people > seating.capacity:
+            raise ValueError(f'Kişi sayısı oturum kapasitesini ({seating.capacity}) aşıyor')
+
+        try:
+            self.claim_seat(seating.id)
+
+            reservation = Reservation(
+                event_id=self.event_id,
+                seating_id=seating.id,
+                phone=data['phone'],
+                first_name=data.get('first_name'),
+                last_name=data.get('last_name'),
+                number_of_people=number_of_people,
+                notes=data.get('notes'),
+                reservation_code=str(uuid.uuid4())
+            )
+            db.session.add(reservation)
+            reservation_events.on_reservation_created(reservation)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return reservation
+
+    def claim_seat(self, seating_id: int) -> None:
+        """
+        Oturumu available -> reserved geçişiyle ayırır (commit etmez)
+
+        Tek bir koşullu UPDATE çalışır; etkilenen satır yoksa oturum başka bir
+        istek tarafından alınmıştır. Durumu güncellenmemiş eski verilere karşı
+        oturumda aktif rezervasyon bulunmaması da koşula eklenir.
+
+        Raises:
+            SeatUnavailableError: Oturum müsait değil
+        """
+        active_reservation = exists().where(and_(
+            Reservation.seating_id == seating_id,
+            Reservation.status == ReservationStatus.ACTIVE
+        ))
+
+        result = db.session.execute(
+            update(EventSeating)
+            .where(
+                EventSeating.id == seating_id,
+                EventSeating.event_id == self.event_id,
+                EventSeating.status == SeatStatus.AVAILABLE,
+                ~active_reservation
+            )
+            .values(status=SeatStatus.RESERVED)
+            .execution_options(synchronize_session=False)
+        )
+
+        if result.rowcount != 1:
+            raise SeatUnavailableError('Bu oturum müsait değil')
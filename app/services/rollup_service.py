@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Rapor Rollup Servisi
+Rezervasyon hareketlerini (oluşturma, iptal, check-in) etkinlik/gün/saat
+bazında özetleyen reservation_daily_rollup tablosunu yönetir. Tablo
+rezervasyon kancalarıyla artımlı güncellenir ve gece çalışan
+`python rebuild_report_rollup.py` ile temel tablolardan yeniden kurulur.
+
+Raporlar, istenen aralık kapsam içindeyse reservations tablosunu taramak
+yerine bu tabloyu okur.
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import Event, Reservation, ReservationDailyRollup, ReportRollupCoverage
+from app.models.reservation import ReservationStatus
+
+ROLLUP_FIELDS = ('created', 'cancelled', 'checked_in', 'people')
+
+
+class RollupService:
+    """Günlük rapor rollup tablosunu yöneten servis sınıfı"""
+
+    @staticmethod
+    def record(event_id: int, when: Optional[datetime] = None, **deltas: int) -> None:
+        """
+        Rollup satırına artımlı değişiklik uygular (çağıranın transaction'ı içinde)
+
+        Args:
+            event_id: Etkinlik ID'si
+            when: Hareket zamanı (UTC, varsayılan şimdi)
+            **deltas: Alan adı -> artış (created, cancelled, checked_in, people)
+        """
+        deltas = {field: delta for field, delta in deltas.items() if field in ROLLUP_FIELDS and delta}
+        if not deltas:
+            return
+
+        when = when or datetime.utcnow()
+        key = (event_id, when.date(), when.hour)
+        if RollupService._increment(key, deltas):
+            return
+
+        event = db.session.get(Event, event_id)
+        if event is None:
+            return
+
+        try:
+            # İlk hareket: satırı oluştur (eşzamanlı ekleme olursa artırmaya dön)
+            with db.session.begin_nested():
+                db.session.add(ReservationDailyRollup(
+                    event_id=event_id, day=key[1], hour=key[2], company_id=event.company_id,
+                    **{field: deltas.get(field, 0) for field in ROLLUP_FIELDS}
+                ))
+        except IntegrityError:
+            RollupService._increment(key, deltas)
+
+    @staticmethod
+    def covers(company_id: int, start_day: Optional[date] = None) -> bool:
+        """
+        Rollup istenen aralığı kapsıyor mu
+
+        Args:
+            company_id: Şirket ID'si
+            start_day: Aralık başlangıcı (oluşturma günü); None ise tüm geçmiş
+                gerekir (etkinlik tarihine göre filtrelenen raporlar)
+
+        Returns:
+            bool: True ise rapor rollup'tan okunabilir
+        """
+        coverage = db.session.get(ReportRollupCoverage, company_id)
+        if coverage is None:
+            return False
+        if coverage.covered_from is None:
+            return True
+        return start_day is not None and start_day >= coverage.covered_from
+
+    @staticmethod
+    def rebuild_company(company_id: int, since: Optional[date] = None) -> int:
+        """
+        Şirketin rollup satırlarını temel tablolardan yeniden kurar (commit etmez)
+
+        Rezervasyonlar yield_per ile okunur ve anahtar başına Python'da toplanır;
+        bellek kullanımı rezervasyon sayısıyla değil rollup satırı sayısıyla büyür.
+
+        Args:
+            company_id: Şirket ID'si
+            since: Sadece bu günden itibaren kur (None: tüm geçmiş)
+
+        Returns:
+            int: Yazılan rollup satırı sayısı
+        """
+        totals: Dict[Tuple[int, date, int], Dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(ROLLUP_FIELDS, 0)
+        )
+
+        def add(event_id, when, **deltas):
+            if when is None or (since is not None and when.date() < since):
+                return
+            row = totals[(event_id, when.date(), when.hour)]
+            for field, delta in deltas.items():
+                row[field] += delta
+
+        reservations = db.session.query(
+            Reservation.event_id,
+            Reservation.number_of_people,
+            Reservation.status,
+            Reservation.created_at,
+            Reservation.cancelled_at,
+            Reservation.updated_at,
+            Reservation.checked_in,
+            Reservation.checked_in_at
+        ).join(
+            Event, Reservation.event_id == Event.id
+        ).filter(
+            Event.company_id == company_id
+        )
+        if since is not None:
+            # Bu günden sonra oluşturulan, iptal edilen veya check-in yapılanlar
+            since_at = datetime.combine(since, datetime.min.time())
+            reservations = reservations.filter(or_(
+                Reservation.created_at >= since_at,
+                Reservation.cancelled_at >= since_at,
+                Reservation.checked_in_at >= since_at,
+                Reservation.updated_at >= since_at
+            ))
+        reservations = reservations.execution_options(yield_per=1000)
+
+        for row in reservations:
+            add(row.event_id, row.created_at, created=1, people=row.number_of_people or 0)
+            if row.status == ReservationStatus.CANCELLED:
+                add(row.event_id, row.cancelled_at or row.updated_at or row.created_at, cancelled=1)
+            if row.checked_in:
+                add(row.event_id, row.checked_in_at or row.created_at, checked_in=1)
+
+        stale = ReservationDailyRollup.query.filter(ReservationDailyRollup.company_id == company_id)
+        if since is not None:
+            stale = stale.filter(ReservationDailyRollup.day >= since)
+        stale.delete(synchronize_session=False)
+
+        db.session.bulk_insert_mappings(ReservationDailyRollup, [
+            {'event_id': event_id, 'day': day, 'hour': hour, 'company_id': company_id, **values}
+            for (event_id, day, hour), values in totals.items()
+        ])
+
+        # Kapsam: yeniden kurulan günler ile önceden kapsanan günlerin birleşimi
+        coverage = db.session.get(ReportRollupCoverage, company_id)
+        if coverage is None:
+            coverage = ReportRollupCoverage(company_id=company_id, covered_from=since)
+            db.session.add(coverage)
+        elif since is None or coverage.covered_from is not None:
+            coverage.covered_from = since if since is None else min(coverage.covered_from, since)
+        coverage.built_at = datetime.utcnow()
+        db.session.flush()
+
+        return len(totals)
+
+    @staticmethod
+    def _increment(key: Tuple[int, date, int], deltas: Dict[str, Any]) -> bool:
+        """Var olan satırı artırır; satır yoksa False döner"""
+        event_id, day, hour = key
+        result = db.session.execute(
+            update(ReservationDailyRollup)
+            .where(
+                ReservationDailyRollup.event_id == event_id,
+                ReservationDailyRollup.day == day,
+                ReservationDailyRollup.hour == hour
+            )
+            .values(**{
+                field: getattr(ReservationDailyRollup, field) + delta
+                for field, delta in deltas.items()
+            })
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Rezervasyon Arama Servisi
+Kontrolör listesindeki ve type-ahead aramasındaki `LIKE '%q%'` taramalarının
+yerine geçer. Arama, katlanmış reservations.search_text sütunu üzerinde yapılır
+(app/utils/search_text.py):
+
+- PostgreSQL: pg_trgm GIN indeksi `search_text LIKE '%q%'` sorgusunu karşılar.
+- Diğer veritabanları (SQLite): etkinlik başına bellek içi trigram indeksi
+  aday rezervasyon ID'lerini bulur, filtreler SQL'de `id IN (...)` ile uygulanır.
+
+Bellek içi indeks her aramada yalnızca son yüklenen ID'den sonraki yeni
+rezervasyonları ekler; ad/telefon düzenlemeleri bu süreçte indeksi düşürür,
+diğer worker'lar max_age dolunca yeniden yükler.
+"""
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from flask import current_app, has_app_context
+from app import db
+from app.models import Reservation
+from app.utils.search_text import normalize_query
+
+# Trigram indeksinin kullanılabildiği en kısa ifade
+NGRAM_SIZE = 3
+
+# Bundan fazla aday çıkarsa IN listesi yerine search_text LIKE kullanılır
+SEARCH_ID_LIMIT = 500
+
+
+def _ngrams(text: str):
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class EventSearchIndex:
+    """Bir etkinliğin search_text değerleri için trigram indeksi"""
+
+    def __init__(self):
+        self.ids: List[int] = []
+        self.texts: List[str] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.max_id = 0
+        self.loaded_at = time.monotonic()
+
+    def add(self, reservation_id: int, text: Optional[str]) -> None:
+        """Rezervasyonu indekse ekler"""
+        position = len(self.ids)
+        text = text or ''
+        self.ids.append(reservation_id)
+        self.texts.append(text)
+        for gram in _ngrams(text):
+            self.postings[gram].append(position)
+        self.max_id = max(self.max_id, reservation_id)
+
+    def search(self, term: str) -> List[int]:
+        """
+        Normalize ifadeyi içeren rezervasyon ID'lerini döner (yeniden eskiye)
+
+        En seyrek trigram'ın posting listesi aday kümesidir; her aday alt
+        dize kontrolüyle doğrulanır. Trigram'dan kısa ifadelerde tüm metinler
+        taranır.
+        """
+        if len(term) < NGRAM_SIZE:
+            positions = range(len(self.texts))
+        else:
+            grams = _ngrams(term)
+            if any(gram not in self.postings for gram in grams):
+                return []
+            positions = min((self.postings[gram] for gram in grams), key=len)
+
+        texts, ids = self.texts, self.ids
+        return [ids[position] for position in reversed(positions) if term in texts[position]]
+
+
+class SearchIndexCache:
+    """Uygulama başına etkinlik arama indeksleri"""
+
+    def __init__(self, max_age: float = 300):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._events: Dict[int, EventSearchIndex] = {}
+
+    def get_index(self, event_id: int) -> EventSearchIndex:
+        """Etkinlik indeksini döner; eksik veya eskiyse yükler, yeni kayıtları ekler"""
+        index = self._events.get(event_id)
+        if index is None or time.monotonic() - index.loaded_at > self.max_age:
+            index = EventSearchIndex()
+            self._extend(index, event_id)
+            with self._lock:
+                self._events[event_id] = index
+            return index
+
+        with self._lock:
+            self._extend(index, event_id)
+        return index
+
+    def search(self, event_id: int, term: str) -> List[int]:
+        return self.get_index(event_id).search(term)
+
+    def invalidate(self, event_id: int) -> None:
+        with self._lock:
+            self._events.pop(event_id, None)
+
+    @staticmethod
+    def _extend(index: EventSearchIndex, event_id: int) -> None:
+        """Son yüklenen ID'den sonra eklenen rezervasyonları indekse ekler"""
+        rows = db.session.query(Reservation.id, Reservation.search_text).filter(
+            Reservation.event_id == event_id,
+            Reservation.id > index.max_id
+        ).order_by(Reservation.id).all()
+        for row in rows:
+            index.add(row.id, row.search_text)
+
+
+def get_search_index() -> SearchIndexCache:
+    """Uygulamaya ait arama indeksini getirir, yoksa oluşturur"""
+    cache = current_app.extensions.get('reservation_search')
+    if cache is None:
+        cache = SearchIndexCache(max_age=current_app.config.get('SEARCH_INDEX_MAX_AGE', 300))
+        current_app.extensions['reservation_search'] = cache
+    return cache
+
+
+def invalidate_search_index(event_id: Optional[int]) -> None:
+    """Bu süreçteki etkinlik arama indeksini düşürür"""
+    if event_id is None or not has_app_context():
+        return
+    cache = current_app.extensions.get('reservation_search')
+    if cache is not None:
+        cache.invalidate(event_id)
+
+
+class ReservationSearchService:
+    """Etkinlik rezervasyonlarında ad, soyad, telefon ve kod araması"""
+
+    def __init__(self, event_id: int):
+        self.event_id = event_id
+
+    def filter(self, query, term: Optional[str]):
+        """
+        Rezervasyon sorgusuna arama filtresini ekler
+
+        Args:
+            query: Reservation sorgusu (etkinlik filtresi çağıranda)
+            term: Kullanıcının yazdığı ifade
+
+        Returns:
+            Filtrelenmiş sorgu (ifade boşsa değişmeden)
+        """
+        normalized, _ = normalize_query(term)
+        if not normalized:
+            return query
+
+        if db.session.get_bind().dialect.name != 'postgresql':
+            ids = get_search_index().search(self.event_id, normalized)
+            if len(ids) <= SEARCH_ID_LIMIT:
+                return query.filter(Reservation.id.in_(ids))
+
+        return query.filter(Reservation.search_text.contains(normalized, autoescape=True))
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Oturum Haritası Servisi
+Kontrolör oturum haritası için oturum, tip ve aktif rezervasyon verilerini
+tek sorguda yükler.
+"""
+from typing import Dict, List, Any
+from sqlalchemy import and_
+from app import db
+from app.models import EventSeating, SeatingType, Reservation
+from app.models.reservation import ReservationStatus
+from app.models.seating import SeatStatus
+
+
+class SeatingMapService:
+    """Oturum haritası verilerini hazırlayan servis sınıfı"""
+
+    def __init__(self, event_id: int):
+        self.event_id = event_id
+
+    def get_seating_map(self) -> List[Dict[str, Any]]:
+        """
+        Etkinliğin tüm oturumlarını tipleri ve aktif rezervasyonlarıyla getirir.
+
+        Oturum sayısından bağımsız olarak tek bir JOIN sorgusu çalıştırır.
+
+        Returns:
+            List[Dict]: Oturum haritası verileri
+        """
+        rows = db.session.query(EventSeating, SeatingType, Reservation).join(
+            SeatingType, EventSeating.seating_type_id == SeatingType.id
+        ).outerjoin(
+            Reservation, and_(
+                Reservation.seating_id == EventSeating.id,
+                Reservation.status == ReservationStatus.ACTIVE
+            )
+        ).filter(
+            EventSeating.event_id == self.event_id
+        ).order_by(EventSeating.id).all()
+
+        seating_data = []
+        seen = set()
+        for seating, seating_type, reservation in rows:
+            # Aynı oturumda birden fazla aktif kayıt varsa ilkini kullan
+            if seating.id in seen:
+                continue
+            seen.add(seating.id)
+            seating_data.append(self._serialize(seating, seating_type, reservation))
+
+        return seating_data
+
+    def _serialize(self, seating: EventSeating, seating_type: SeatingType,
+                   reservation: Reservation) -> Dict[str, Any]:
+        """Tek bir oturum satırını harita formatına çevirir"""
+        if reservation is not None:
+            status = 'reserved'
+        elif seating.status == SeatStatus.DISABLED:
+            status = 'disabled'
+        else:
+            status = 'available'
+
+        return {
+            'id': seating.id,
+            'number': seating.seat_number,
+            'type': seating_type.name,
+            'capacity': seating_type.capacity,
+            'status': status,
+            'position_x': seating.position_x,
+            'position_y': seating.position_y,
+            'width': seating.width or 60,
+            'height': seating.height or 40,
+            'color': seating.color_code or seating_type.color_code,
+            'reservation': {
+                'name': reservation.customer_name,
+                'phone': reservation.phone,
+                'people': reservation.number_of_people,
+                'checked_in': reservation.checked_in
+            } if reservation is not None else None
+        }
@@ -3,9 +3,9 @@
 Oturum Yönetim Servisi
 Dinamik oturum ekleme, düzenleme işlemlerini yönetir
 """
-import json
+import math
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from flask import current_app
 from app import db
 from app.models import (
@@ -15,7 +15,14 @@ from app.models import (
     SeatingType,
     Reservation
 )
-from sqlalchemy import and_
+from sqlalchemy import and_, insert, select
+from app.services import reservation_events
+from app.services.seating_type_registry import seating_type_registry
+from app.utils.layout_codec import dumps_layout, pack_seatings
+from app.utils.spatial_grid import find_layout_problems
+
+# Tek konfigürasyonla üretilebilecek en fazla oturum
+MAX_GENERATED_SEATS = 5000
 
 
 class SeatingService:
@@ -23,6 +30,7 @@ class SeatingService:
     
     def __init__(self, company_id: int):
         self.company_id = company_id
+        self._defaults_by_shape = None
     
     def get_default_seating_types(self) -> List[Dict[str, Any]]:
         """
@@ -160,7 +168,7 @@ class SeatingService:
             default_types = self.get_default_seating_types()
             
             # Şirketin özel tiplerini dahil et
-            custom_types = SeatingType.query.all()
+            custom_types = seating_type_registry.all()
             
             result = []
             
@@ -200,6 +208,11 @@ class SeatingService:
         """
         Etkinliğe dinamik oturum ekler
         
+        Her konfigürasyon `count` adet oturumu bir düzene göre yerleştirir
+        (arrangement: 'grid' varsayılan, 'rows' koridorlu sıralar, 'circle'
+        daire). Mevcut en büyük koltuk numarası bir kez okunur, satırlar düz
+        sözlük olarak üretilir ve tek executemany INSERT ile eklenir.
+        
         Args:
             event_id: Etkinlik ID'si
             seating_configs: Oturum konfigürasyonları
@@ -213,47 +226,51 @@ class SeatingService:
                 company_id=self.company_id
             ).first_or_404()
             
-            created_count = 0
             errors = []
+            rows = []
+            seating_types = {}
+            next_number = self._max_seat_number(event.id) + 1
             
             for config in seating_configs:
                 try:
                     # Oturum tipi ID'sini al
-                    seating_type_id = self._get_or_create_seating_type(config)
+                    seating_type_id = self._get_or_create_seating_type(config, seating_types)
                     
                     # Kaç adet oluşturulacak
-                    count = config.get('count', 1)
-                    
-                    # Mevcut oturum sayısını al
-                    existing_count = EventSeating.query.filter_by(
-                        event_id=event_id
-                    ).count()
+                    count = int(config.get('count', 1))
+                    if count < 1 or count > MAX_GENERATED_SEATS:
+                        raise ValueError(f'Adet 1-{MAX_GENERATED_SEATS} arasında olmalı: {count}')
                     
-                    # Yeni oturumları oluştur
-                    for i in range(count):
-                        new_seating = EventSeating()
-                        new_seating.event_id = event_id
-                        new_seating.seating_type_id = seating_type_id
-                        new_seating.seat_number = self._generate_seat_number(
-                            event_id, existing_count + i + 1
-                        )
-                        new_seating.position_x = config.get('position_x', 100)
-                        new_seating.position_y = config.get('position_y', 100)
-                        new_seating.color_code = config.get('color_code')
-                        
-                        db.session.add(new_seating)
-                        created_count += 1
-                
+                    width = float(config.get('width', 60))
+                    height = float(config.get('height', 40))
+                    positions = self._arrange_positions(config, count, width, height)
                 except Exception as e:
                     errors.append(f"Oturum ekleme hatası: {str(e)}")
-            
+                    continue
+                
+                for x, y in positions:
+                    rows.append({
+                        'event_id': event.id,
+                        'seating_type_id': seating_type_id,
+                        'seat_number': self._generate_seat_number(event.id, next_number),
+                        'position_x': x,
+                        'position_y': y,
+                        'width': width,
+                        'height': height,
+                        'color_code': config.get('color_code')
+                    })
+                    next_number += 1
+            
+            if rows:
+                db.session.execute(insert(EventSeating), rows)
+                reservation_events.on_layout_changed(event.id)
             db.session.commit()
             
             return {
                 'success': True,
-                'created_count': created_count,
+                'created_count': len(rows),
                 'errors': errors,
-                'message': f'{created_count} oturum başarıyla eklendi'
+                'message': f'{len(rows)} oturum başarıyla eklendi'
             }
             
         except Exception as e:
@@ -291,6 +308,7 @@ class SeatingService:
             ).first_or_404()
             
             db.session.delete(seating)
+            reservation_events.on_layout_changed(event_id)
             db.session.commit()
             
             return {
@@ -361,8 +379,9 @@ class SeatingService:
             seatings = EventSeating.query.filter_by(event_id=event_id).all()
             
             for seating in seatings:
-                type_name = seating.seating_type.name
-                capacity = seating.seating_type.capacity
+                seating_type = seating_type_registry.get(seating.seating_type_id)
+                type_name = seating_type.name if seating_type else 'Bilinmeyen'
+                capacity = seating_type.capacity if seating_type else 0
                 
                 if type_name not in seating_summary:
                     seating_summary[type_name] = {
@@ -411,47 +430,89 @@ class SeatingService:
         """
         Oturum düzenini validate eder
         
+        Gelen oturumlar etkinliğin kayıtlı oturumlarıyla birlikte (aynı id veya
+        koltuk numarasına sahip kayıtlı oturumun yerine geçerek) tek bir
+        uzamsal ızgarada toplanır; tüm çakışan çiftler ve tuval dışına taşan
+        oturumlar tek geçişte bulunur.
+        
         Args:
             event_id: Etkinlik ID'si
             seating_configs: Oturum konfigürasyonları
             
         Returns:
-            Dict: Validation sonucu
+            Dict: Validation sonucu (overlaps: çakışan isim çiftleri,
+                out_of_bounds: tuval dışındaki oturum isimleri)
         """
         try:
             issues = []
             warnings = []
             
-            for config in seating_configs:
+            event = Event.query.filter_by(id=event_id, company_id=self.company_id).first()
+            canvas_width = (event.canvas_width if event else None) or 800
+            canvas_height = (event.canvas_height if event else None) or 600
+            grid_size = (event.grid_size if event else None) or 20
+            
+            rects = []
+            replaced_ids, replaced_numbers = set(), set()
+            for index, config in enumerate(seating_configs):
+                name = config.get('name') or config.get('seat_number') or 'Bilinmeyen'
+                
                 # Kapasite kontrolü
                 if config.get('capacity', 0) <= 0:
-                    issues.append(f"Geçersiz kapasite: {config.get('name', 'Bilinmeyen')}")
+                    issues.append(f"Geçersiz kapasite: {name}")
                 
                 # Konum kontrolü
                 x = config.get('position_x', 0)
                 y = config.get('position_y', 0)
-                width = config.get('width', 60)
-                height = config.get('height', 40)
                 
                 if x < 0 or y < 0:
-                    issues.append(f"Negatif pozisyon: {config.get('name', 'Bilinmeyen')}")
-                
-                # Sınır kontrolü
-                canvas_width = 800
-                canvas_height = 600
+                    issues.append(f"Negatif pozisyon: {name}")
                 
-                if x + width > canvas_width or y + height > canvas_height:
-                    warnings.append(f"Canvas sınırı aşılıyor: {config.get('name', 'Bilinmeyen')}")
-                
-                # Çakışma kontrolü
-                overlaps = self._check_overlaps(event_id, x, y, width, height, config)
-                if overlaps:
-                    warnings.append(f"Diğer oturumlarla çakışma: {config.get('name', 'Bilinmeyen')}")
+                rects.append((('new', index), x, y, config.get('width', 60), config.get('height', 40)))
+                if config.get('id') is not None:
+                    replaced_ids.add(config['id'])
+                if config.get('seat_number'):
+                    replaced_numbers.add(str(config['seat_number']))
+            
+            # Kayıtlı oturumlar tek sorguda; düzenlenenlerin eski hali atlanır
+            existing = db.session.query(
+                EventSeating.id,
+                EventSeating.seat_number,
+                EventSeating.position_x,
+                EventSeating.position_y,
+                EventSeating.width,
+                EventSeating.height
+            ).filter(EventSeating.event_id == event_id).all()
+            names = {}
+            for seating in existing:
+                if seating.id in replaced_ids or seating.seat_number in replaced_numbers:
+                    continue
+                names[('saved', seating.id)] = seating.seat_number
+                rects.append((('saved', seating.id), seating.position_x, seating.position_y,
+                              seating.width or 60, seating.height or 40))
+            
+            def label(key):
+                kind, value = key
+                if kind == 'saved':
+                    return names[key]
+                config = seating_configs[value]
+                return config.get('name') or config.get('seat_number') or 'Bilinmeyen'
+            
+            problems = find_layout_problems(rects, canvas_width, canvas_height, grid_size)
+            overlaps = [(label(a), label(b)) for a, b in problems['overlaps']]
+            out_of_bounds = [label(key) for key in problems['out_of_bounds']]
+            
+            for name in out_of_bounds:
+                warnings.append(f"Canvas sınırı aşılıyor: {name}")
+            for first, second in overlaps:
+                warnings.append(f"Diğer oturumlarla çakışma: {first} - {second}")
             
             return {
                 'valid': len(issues) == 0,
                 'issues': issues,
-                'warnings': warnings
+                'warnings': warnings,
+                'overlaps': overlaps,
+                'out_of_bounds': out_of_bounds
             }
             
         except Exception as e:
@@ -462,48 +523,126 @@ class SeatingService:
                 'warnings': []
             }
     
-    def _get_or_create_seating_type(self, config: Dict[str, Any]) -> int:
-        """Oturum tipi ID'sini alır veya oluşturur"""
-        # Varsayılan tipler
-        default_types = self.get_default_seating_types()
-        for default in default_types:
-            if (default['capacity'] == config.get('capacity') and 
-                default['seat_type'] == config.get('seat_type')):
-                # Varsayılan tip için sanal ID oluştur
-                return int(f"{default['capacity']}_{default['seat_type']}")
+    def _get_or_create_seating_type(self, config: Dict[str, Any],
+                                    resolved: Optional[Dict[Any, int]] = None) -> int:
+        """
+        Oturum tipi ID'sini alır veya oluşturur
         
-        # Özel tip oluştur
-        seating_type = SeatingType(
-            name=config.get('name', f'Özel Tip - {config.get("capacity", 0)} kişi'),
-            seat_type=config.get('seat_type', 'table'),
-            capacity=config.get('capacity', 4),
-            icon=config.get('icon', '🪑'),
-            color_code=config.get('color', '#3498db')
-        )
+        Args:
+            config: seating_type_id ya da name/capacity/seat_type
+            resolved: Aynı çağrıda oluşturulan tipler (kayıt commit'e kadar görmez)
+        """
+        resolved = resolved if resolved is not None else {}
         
-        db.session.add(seating_type)
-        db.session.flush()  # ID almak için
+        if config.get('seating_type_id'):
+            seating_type_id = int(config['seating_type_id'])
+            if seating_type_registry.get(seating_type_id) is None:
+                raise ValueError(f'Oturum tipi bulunamadı: {seating_type_id}')
+            return seating_type_id
         
+        capacity = int(config.get('capacity', 4))
+        seat_type = config.get('seat_type', 'table')
+        
+        # Varsayılan tiplerden eşleşen varsa onun adı ve görünümü kullanılır
+        default = self._default_types_by_shape().get((capacity, seat_type), {})
+        name = config.get('name') or default.get('name') or f'Özel Tip - {capacity} kişi'
+        
+        key = (name, capacity, seat_type)
+        if key in resolved:
+            return resolved[key]
+        
+        seating_type = seating_type_registry.find(name, capacity, seat_type)
+        if seating_type is None:
+            seating_type = SeatingType(
+                name=name,
+                seat_type=seat_type,
+                capacity=capacity,
+                icon=config.get('icon', default.get('icon', '🪑')),
+                color_code=config.get('color', default.get('color', '#3498db'))
+            )
+            db.session.add(seating_type)
+            db.session.flush()  # ID almak için
+        
+        resolved[key] = seating_type.id
         return seating_type.id
     
+    def _default_types_by_shape(self) -> Dict[Tuple[int, str], Dict[str, Any]]:
+        """(kapasite, tip) -> varsayılan oturum tipi; servis ömrü boyunca bir kez kurulur"""
+        if self._defaults_by_shape is None:
+            self._defaults_by_shape = {
+                (default['capacity'], default['seat_type']): default
+                for default in self.get_default_seating_types()
+            }
+        return self._defaults_by_shape
+    
+    def _max_seat_number(self, event_id: int) -> int:
+        """Etkinlikteki en büyük M### koltuk numarası (yoksa 0)"""
+        numbers = db.session.scalars(
+            select(EventSeating.seat_number).where(
+                EventSeating.event_id == event_id,
+                EventSeating.seat_number.like('M%')
+            )
+        )
+        return max((int(number[1:]) for number in numbers if number[1:].isdigit()), default=0)
+    
+    def _arrange_positions(self, config: Dict[str, Any], count: int,
+                           width: float, height: float) -> List[Tuple[float, float]]:
+        """
+        Oturumların sol üst köşe konumlarını düzene göre üretir
+        
+        - grid: `columns` sütunlu ızgara (varsayılan karekök)
+        - rows: `per_row` oturumlu sıralar, her `aisle_every` oturumda koridor
+        - circle: (`center_x`, `center_y`) merkezli, `radius` yarıçaplı daire
+        """
+        x0 = float(config.get('position_x', 100))
+        y0 = float(config.get('position_y', 100))
+        gap = float(config.get('gap', 20))
+        arrangement = config.get('arrangement', 'grid')
+        
+        if arrangement == 'grid':
+            columns = int(config.get('columns') or math.ceil(math.sqrt(count)))
+            return [
+                (x0 + (i % columns) * (width + gap), y0 + (i // columns) * (height + gap))
+                for i in range(count)
+            ]
+        
+        if arrangement == 'rows':
+            per_row = int(config.get('per_row', 10))
+            aisle_every = int(config.get('aisle_every', 0))
+            aisle_width = float(config.get('aisle_width', width))
+            row_gap = float(config.get('row_gap', gap * 2))
+            positions = []
+            for i in range(count):
+                column = i % per_row
+                aisles = column // aisle_every if aisle_every else 0
+                positions.append((
+                    x0 + column * (width + gap) + aisles * aisle_width,
+                    y0 + (i // per_row) * (height + row_gap)
+                ))
+            return positions
+        
+        if arrangement == 'circle':
+            # Varsayılan yarıçap: oturumlar çevrede birbirine değmeyecek kadar
+            radius = float(config.get('radius') or max(
+                (max(width, height) + gap) * count / (2 * math.pi), max(width, height)
+            ))
+            center_x = float(config.get('center_x', x0 + radius))
+            center_y = float(config.get('center_y', y0 + radius))
+            return [
+                (
+                    round(center_x + radius * math.cos(2 * math.pi * i / count) - width / 2, 2),
+                    round(center_y + radius * math.sin(2 * math.pi * i / count) - height / 2, 2)
+                )
+                for i in range(count)
+            ]
+        
+        raise ValueError(f'Bilinmeyen yerleşim düzeni: {arrangement}')
+    
     def _generate_seat_number(self, event_id: int, index: int) -> str:
         """Oturum numarası oluşturur"""
         # M tipi masa, K tipi koltuk, V tipi VIP için
         return f"M{index:03d}"  # M001, M002, vb.
     
-    def _check_overlaps(self, event_id: int, x: float, y: float, width: float, height: float, config: Dict[str, Any]) -> bool:
-        """Oturum çakışmalarını kontrol eder"""
-        existing_seatings = EventSeating.query.filter_by(event_id=event_id).all()
-        
-        for seating in existing_seatings:
-            if (x < seating.position_x + 60 and  # 60 genişlik varsayımı
-                x + width > seating.position_x and
-                y < seating.position_y + 40 and  # 40 yükseklik varsayımı
-                y + height > seating.position_y):
-                return True
-        
-        return False
-    
     def save_seating_layout(self, event_id: int, layout_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Oturum düzenini kaydeder
@@ -528,6 +667,8 @@ class SeatingService:
             ).delete()
             
             # Yeni oturumları oluştur
+            seating_types = {}
+            created = []
             for seating_data in layout_data.get('seatings', []):
                 seating = EventSeating()
                 seating.event_id = event_id
@@ -536,24 +677,20 @@ class SeatingService:
                 seating.position_y = seating_data.get('y', 0)
                 seating.color_code = seating_data.get('color', '#3498db')
                 
-                # Oturum tipi
-                if seating_data.get('seating_type_id'):
-                    seating.seating_type_id = seating_data.get('seating_type_id')
-                else:
-                    # Varsayılan tip
-                    default_types = self.get_default_seating_types()
-                    for default in default_types:
-                        if (default['capacity'] == seating_data.get('capacity', 4) and 
-                            default['seat_type'] == seating_data.get('seat_type', 'table')):
-                            seating.seating_type_id = int(f"{default['capacity']}_{default['seat_type']}")
-                            break
+                # Oturum tipi (varsayılan tipler gerçek kayda dönüştürülür)
+                seating.seating_type_id = self._get_or_create_seating_type(seating_data, seating_types)
                 
                 db.session.add(seating)
+                created.append(seating)
             
-            # Düzen metadatasını kaydet
-            event.seating_config = json.dumps(layout_data)
+            # Düzen metadatasını kaydet (oturumlar sütunlu biçimde)
+            event.seating_config = dumps_layout({
+                **{key: value for key, value in layout_data.items() if key != 'seatings'},
+                'layout': pack_seatings(created, seating_type_registry.all(), include_ids=False)
+            })
             event.updated_at = datetime.utcnow()
             
+            reservation_events.on_layout_changed(event_id)
             db.session.commit()
             
             return {
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Oturum Tipi Kaydı
+Oturum tipleri (id -> ad, tip, kapasite, renk, ikon) nadiren değişir; her
+istekte `SeatingType.query.all()` veya oturum başına lazy `seating.seating_type`
+yüklemek yerine süreç içinde tutulur.
+
+Tutarlılık cache_versions tablosundaki 'seating_types' sayacıyla sağlanır:
+SeatingType ekleyen, değiştiren veya silen her flush sayacı aynı transaction
+içinde artırır. Değişikliği yapan süreç kaydı commit sonrasında hemen düşürür;
+diğer worker'lar sayacı en fazla `SEATING_TYPE_REGISTRY_CHECK_INTERVAL`
+saniyede bir okuyup sürüm değiştiyse yeniden yükler.
+"""
+import threading
+import time
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+from sqlalchemy import event as sa_event
+
+VERSION_NAME = 'seating_types'
+CHANGED_KEY = 'seating_types_changed'
+
+SeatingTypeInfo = namedtuple(
+    'SeatingTypeInfo', ['id', 'name', 'seat_type', 'capacity', 'icon', 'color_code']
+)
+
+
+class SeatingTypeRegistry:
+    """Sürüm damgasıyla tazelenen süreç içi oturum tipi kaydı"""
+
+    def __init__(self, app=None):
+        self.check_interval = 5
+        self._lock = threading.Lock()
+        self._types: Optional[Dict[int, SeatingTypeInfo]] = None
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._listeners_registered = False
+        if app:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Kaydı Flask app ile başlatır"""
+        self.check_interval = app.config.get('SEATING_TYPE_REGISTRY_CHECK_INTERVAL', 5)
+        self.clear()
+        self._register_session_listeners()
+
+    def _register_session_listeners(self):
+        """SeatingType değişikliklerinde sayacı artırır, commit sonrası kaydı düşürür"""
+        if self._listeners_registered:
+            return
+
+        from app import db
+        from app.models import SeatingType
+        from app.services.cache_versions import bump_version
+
+        @sa_event.listens_for(db.session, 'after_flush')
+        def _bump_on_change(session, flush_context):
+            changed = any(
+                isinstance(obj, SeatingType)
+                for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+            )
+            if changed:
+                bump_version(session.connection(), VERSION_NAME)
+                session.info[CHANGED_KEY] = True
+
+        @sa_event.listens_for(db.session, 'after_commit')
+        def _drop_on_commit(session):
+            if session.info.pop(CHANGED_KEY, False):
+                self.clear()
+
+        @sa_event.listens_for(db.session, 'after_rollback')
+        def _discard_on_rollback(session):
+            # Geri alınan transaction içinde yüklenmiş olabilecek kaydı da düşür
+            if session.info.pop(CHANGED_KEY, False):
+                self.clear()
+
+        self._listeners_registered = True
+
+    def all(self) -> List[SeatingTypeInfo]:
+        """Tüm oturum tipleri (ID sırasıyla)"""
+        return list(self._snapshot().values())
+
+    def get(self, seating_type_id: Optional[int]) -> Optional[SeatingTypeInfo]:
+        """ID'ye göre oturum tipi; yoksa None"""
+        if seating_type_id is None:
+            return None
+        return self._snapshot().get(seating_type_id)
+
+    def capacity(self, seating_type_id: Optional[int], default: int = 0) -> int:
+        """Oturum tipinin kapasitesi"""
+        info = self.get(seating_type_id)
+        return info.capacity if info else default
+
+    def find(self, name: str, capacity: int, seat_type: str) -> Optional[SeatingTypeInfo]:
+        """Ad, kapasite ve tipi eşleşen ilk oturum tipi"""
+        for info in self._snapshot().values():
+            if info.name == name and info.capacity == capacity and info.seat_type == seat_type:
+                return info
+        return None
+
+    def clear(self) -> None:
+        """Kaydı düşürür; sonraki okuma yeniden yükler"""
+        with self._lock:
+            self._types = None
+            self._version = None
+            self._checked_at = 0.0
+
+    def _snapshot(self) -> Dict[int, SeatingTypeInfo]:
+        """Güncel kayıt; kontrol süresi dolduysa sürüm damgasını karşılaştırır"""
+        types = self._types
+        if types is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return types
+
+        from app import db
+        from app.models import SeatingType
+        from app.services.cache_versions import read_version
+
+        # Önce sürüm okunur: arada gelen değişiklik bir sonraki kontrolde tekrar yükletir
+        version = read_version(VERSION_NAME)
+        with self._lock:
+            if self._types is None or version != self._version:
+                rows = db.session.query(
+                    SeatingType.id,
+                    SeatingType.name,
+                    SeatingType.seat_type,
+                    SeatingType.capacity,
+                    SeatingType.icon,
+                    SeatingType.color_code
+                ).order_by(SeatingType.id).all()
+                self._types = {row.id: SeatingTypeInfo(*row) for row in rows}
+                self._version = version
+            self._checked_at = time.monotonic()
+            return self._types
+
+
+seating_type_registry = SeatingTypeRegistry()
@@ -17,6 +17,7 @@ from app.models import (
     User
 )
 from marshmallow import ValidationError
+from app.utils.layout_codec import load_configuration, pack_configuration
 
 
 class TemplateService:
@@ -53,7 +54,7 @@ class TemplateService:
                     'description': template.description,
                     'category': template.category,
                     'stage_position': template.stage_position,
-                    'configuration': json.loads(template.configuration) if template.configuration else {},
+                    'configuration': load_configuration(template.configuration),
                     'is_favorite': template.is_favorite
                 }
             }
@@ -94,7 +95,7 @@ class TemplateService:
                         'description': seating_template.description,
                         'category': seating_template.category,
                         'stage_position': seating_template.stage_position,
-                        'configuration': json.loads(seating_template.configuration) if seating_template.configuration else {}
+                        'configuration': load_configuration(seating_template.configuration)
                     }
             
             # Şablon verilerini hazırla
@@ -150,7 +151,7 @@ class TemplateService:
             template.description = template_data.get('description', '')
             template.category = template_data.get('category', 'genel')
             template.stage_position = template_data.get('stage_position', 'top')
-            template.configuration = json.dumps(template_data.get('configuration', {}))
+            template.configuration = pack_configuration(template_data.get('configuration', {}))
             template.is_favorite = template_data.get('is_favorite', False)
             
             # Kullanım sayacı
@@ -261,7 +262,7 @@ class TemplateService:
                     'description': template.description,
                     'category': template.category,
                     'stage_position': template.stage_position,
-                    'configuration': json.loads(template.configuration) if template.configuration else {},
+                    'configuration': load_configuration(template.configuration),
                     'is_favorite': template.is_favorite,
                     'usage_count': template.usage_count
                 })
@@ -277,7 +278,7 @@ class TemplateService:
                             'description': seating_template.description,
                             'category': seating_template.category,
                             'stage_position': seating_template.stage_position,
-                            'configuration': json.loads(seating_template.configuration) if seating_template.configuration else {}
+                            'configuration': load_configuration(seating_template.configuration)
                         }
                 
                 export_data['event_templates'].append({
@@ -332,7 +333,7 @@ class TemplateService:
                     template.description = template_data.get('description', '')
                     template.category = template_data.get('category', 'genel')
                     template.stage_position = template_data.get('stage_position', 'top')
-                    template.configuration = json.dumps(template_data.get('configuration', {}))
+                    template.configuration = pack_configuration(template_data.get('configuration', {}))
                     template.is_favorite = template_data.get('is_favorite', False)
                     template.usage_count = template_data.get('usage_count', 0)
                     
@@ -537,7 +538,7 @@ class TemplateService:
             template.description = layout_data.get('description', '')
             template.category = layout_data.get('category', 'genel')
             template.stage_position = layout_data.get('stage_position', 'top')
-            template.configuration = json.dumps(layout_data.get('configuration', {}))
+            template.configuration = pack_configuration(layout_data.get('configuration', {}))
             template.is_favorite = False
             
             db.session.add(template)
@@ -0,0 +1,112 @@
+/**
+ * EventFlow Live Feed
+ * Server-Sent Events ile dashboard sayaçlarını canlı günceller.
+ *
+ * Kullanım: <section data-live-feed="/api/events/1/live"> içinde
+ * data-live-counter="checked_in_count" gibi elemanlar ve isteğe bağlı
+ * data-live-activity listesi bulunur.
+ */
+
+class LiveFeedClient {
+    static BUSY_RETRY_MS = 15000;
+
+    constructor(root) {
+        this.root = root;
+        this.url = root.dataset.liveFeed;
+        this.counters = {};
+        this.activity = root.querySelector('[data-live-activity]');
+        this.status = root.querySelector('[data-live-status]');
+        this.connect();
+    }
+
+    connect() {
+        if (!window.EventSource || !this.url) return;
+
+        this.source = new EventSource(this.url);
+        this.source.addEventListener('open', () => this.setStatus(true));
+        this.source.addEventListener('error', () => {
+            this.setStatus(false);
+            // Sunucu doluyken 503 döner; EventSource bu durumda kendisi bağlanmaz
+            if (this.source.readyState === EventSource.CLOSED) {
+                clearTimeout(this.retryTimer);
+                this.retryTimer = setTimeout(() => this.connect(), LiveFeedClient.BUSY_RETRY_MS);
+            }
+        });
+        this.source.addEventListener('snapshot', (e) => {
+            this.counters = JSON.parse(e.data);
+            this.render();
+        });
+        ['reservation', 'cancellation', 'checkin'].forEach((type) => {
+            this.source.addEventListener(type, (e) => this.applyDelta(JSON.parse(e.data)));
+        });
+        this.source.addEventListener('layout', (e) => {
+            const message = JSON.parse(e.data);
+            // Şirket kanalında kapasite mutlak değil, snapshot ile yenilenir
+            if (this.root.dataset.liveScope === 'event' && message.total_capacity !== undefined) {
+                this.counters.total_capacity = message.total_capacity;
+                this.render();
+            }
+        });
+    }
+
+    applyDelta(message) {
+        Object.entries(message.delta || {}).forEach(([field, value]) => {
+            this.counters[field] = (this.counters[field] || 0) + value;
+        });
+        this.render();
+        this.addActivity(message);
+    }
+
+    render() {
+        const c = this.counters;
+        if (c.total_capacity !== undefined && c.reserved_people !== undefined) {
+            c.available_seats = c.total_capacity - c.reserved_people;
+            c.occupancy_rate = c.total_capacity > 0
+                ? Math.round(c.reserved_people / c.total_capacity * 1000) / 10
+                : 0;
+        }
+
+        this.root.querySelectorAll('[data-live-counter]').forEach((el) => {
+            const value = c[el.dataset.liveCounter];
+            if (value !== undefined) {
+                el.textContent = el.dataset.liveSuffix ? `${value}${el.dataset.liveSuffix}` : value;
+            }
+        });
+    }
+
+    addActivity(message) {
+        if (!this.activity) return;
+
+        const labels = {
+            reservation: 'Yeni rezervasyon',
+            cancellation: 'İptal',
+            checkin: 'Check-in'
+        };
+        const reservation = message.reservation || (message.reservations || [])[0] || {};
+        const item = document.createElement('li');
+        item.className = 'flex items-center justify-between gap-2';
+
+        const label = document.createElement('span');
+        label.textContent = `${labels[message.type] || message.type}: ${reservation.name || '-'}`;
+        const time = document.createElement('span');
+        time.className = 'text-xs text-slate-400';
+        time.textContent = new Date().toLocaleTimeString('tr-TR');
+
+        item.append(label, time);
+        this.activity.prepend(item);
+        while (this.activity.children.length > 10) {
+            this.activity.lastElementChild.remove();
+        }
+    }
+
+    setStatus(connected) {
+        if (!this.status) return;
+        this.status.textContent = connected ? 'Canlı' : 'Yeniden bağlanıyor...';
+        this.status.classList.toggle('text-emerald-500', connected);
+        this.status.classList.toggle('text-amber-500', !connected);
+    }
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('[data-live-feed]').forEach((root) => new LiveFeedClient(root));
+});
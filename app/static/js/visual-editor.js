@@ -282,7 +282,11 @@ class VisualSeatingEditor {
             name: config.name || `M${this.seatings.length + 1}`,
             color: config.color || '#3498db',
             icon: config.icon || '🪑',
-            reserved: false
+            serverId: config.serverId || null, // EventSeating.id (kayıtlı oturum)
+            seatingTypeId: config.seatingTypeId || null,
+            // Kayıtlı renk; null ise oturum tipinin rengiyle çizilir
+            ownColor: config.ownColor !== undefined ? config.ownColor : (config.color || '#3498db'),
+            reserved: !!config.reserved
         };
         
         // Boundary check
@@ -1319,10 +1323,121 @@ class VisualSeatingEditor {
             height: seating.height,
             capacity: seating.capacity,
             color: seating.color,
-            icon: seating.icon
+            icon: seating.icon,
+            serverId: seating.serverId,
+            seatingTypeId: seating.seatingTypeId,
+            reserved: seating.reserved
         }));
     }
     
+    // ==================== Sütunlu Yerleşim (sunucu biçimi) ====================
+    // Sunucu yerleşimi paralel dizilerle gönderir/alır: columns.x[i], columns.y[i] ...
+    // ve oturum tipleri için ortak bir tablo (columns.type[i] -> types[index]).
+    
+    static unpackLayout(layout) {
+        const columns = layout.columns;
+        const seatings = [];
+        for (let i = 0; i < layout.count; i++) {
+            const type = layout.types[columns.type[i]] || {};
+            seatings.push({
+                serverId: columns.id ? columns.id[i] : null,
+                seatingTypeId: type.id,
+                name: columns.seat_number[i],
+                type: type.seat_type || 'table',
+                x: columns.x[i],
+                y: columns.y[i],
+                width: columns.w[i],
+                height: columns.h[i],
+                capacity: type.capacity || 4,
+                color: (columns.color && columns.color[i]) || type.color_code || '#3498db',
+                ownColor: columns.color ? columns.color[i] : null,
+                icon: type.icon || '🪑',
+                reserved: columns.status ? columns.status[i] === 'reserved' : false
+            });
+        }
+        return seatings;
+    }
+    
+    packLayout() {
+        const types = [];
+        const typeIndex = new Map();
+        const columns = { id: [], seat_number: [], x: [], y: [], w: [], h: [], type: [], color: [] };
+        
+        this.seatings.forEach(seating => {
+            if (!typeIndex.has(seating.seatingTypeId)) {
+                typeIndex.set(seating.seatingTypeId, types.length);
+                types.push({ id: seating.seatingTypeId });
+            }
+            columns.id.push(seating.serverId);
+            columns.seat_number.push(seating.name);
+            columns.x.push(Math.round(seating.x));
+            columns.y.push(Math.round(seating.y));
+            columns.w.push(Math.round(seating.width));
+            columns.h.push(Math.round(seating.height));
+            columns.type.push(typeIndex.get(seating.seatingTypeId));
+            columns.color.push(seating.ownColor);
+        });
+        
+        return { format: 'columnar-v1', count: this.seatings.length, types: types, columns: columns };
+    }
+    
+    // Yerleşimi sunucudan yükler (gzip ve ETag yeniden doğrulamasını tarayıcı yapar)
+    async loadFromServer(url) {
+        const response = await fetch(url, { credentials: 'same-origin' });
+        if (!response.ok) {
+            throw new Error(`Yerleşim yüklenemedi: ${response.status}`);
+        }
+        const data = await response.json();
+        
+        this.config.width = data.canvas.width;
+        this.config.height = data.canvas.height;
+        this.config.gridSize = data.canvas.grid_size;
+        this.config.stagePosition = data.stage.position;
+        this.loadSeatingsData(VisualSeatingEditor.unpackLayout(data.layout));
+        return data;
+    }
+    
+    // Yerleşimi sütunlu biçimde kaydeder; tarayıcı destekliyorsa gövde gzip'lenir
+    async saveToServer(url) {
+        const body = JSON.stringify({
+            layout: this.packLayout(),
+            stage_position: this.config.stagePosition,
+            canvas_width: this.config.width,
+            canvas_height: this.config.height,
+            grid_size: this.config.gridSize
+        });
+        const headers = { 'Content-Type': 'application/json' };
+        
+        let payload = body;
+        if (typeof CompressionStream !== 'undefined') {
+            const stream = new Blob([body]).stream().pipeThrough(new CompressionStream('gzip'));
+            payload = await new Response(stream).blob();
+            headers['Content-Encoding'] = 'gzip';
+        }
+        
+        const response = await fetch(url, {
+            method: 'POST',
+            credentials: 'same-origin',
+            headers: headers,
+            body: payload
+        });
+        const result = await response.json();
+        if (!result.success) {
+            throw new Error(result.message || 'Yerleşim kaydedilemedi');
+        }
+        
+        // Yeni eklenen oturumların sunucu ID'lerini eşle (sonraki kayıtlar fark olarak gider)
+        const added = new Map((result.added_ids || []).map(item => [item.seat_number, item.id]));
+        this.seatings.forEach(seating => {
+            if (!seating.serverId && added.has(seating.name)) {
+                seating.serverId = added.get(seating.name);
+            }
+        });
+        this.hasUnsavedChanges = false;
+        this.lastSaveTime = Date.now();
+        return result;
+    }
+    
     loadSeatingsData(seatingsData) {
         console.log('📥 Loading seatings data:', seatingsData.length, 'items');
         this.seatings = [];
@@ -1360,7 +1475,9 @@ class VisualSeatingEditor {
             this.positionStage();
         }
         
-        if (config.seatings) {
+        if (config.layout) {
+            this.loadSeatingsData(VisualSeatingEditor.unpackLayout(config.layout));
+        } else if (config.seatings) {
             this.loadSeatingsData(config.seatings);
         }
         
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Sıkıştırılmış JSON Yanıtları ve İstekleri
+Büyük JSON yanıtları (yerleşim planları) ETag ile koşullu sunulur ve istemci
+destekliyorsa gzip/deflate ile sıkıştırılır. İstemci gövdesi değişmediyse
+If-None-Match ile 304 alır; gövde ne üretilir ne de gönderilir.
+
+ETag zayıftır (W/"..."): aynı içerik farklı kodlamalarla gönderildiğinden
+bayt bazında eşitlik iddia edilmez.
+
+Editör büyük gövdeleri `Content-Encoding: gzip` ile gönderebilir;
+`get_request_json` açılmış boyutu sınırlayarak çözer.
+"""
+import gzip
+import hashlib
+import json
+import zlib
+from typing import Any, Callable, Optional, Union
+
+from flask import current_app, request
+
+# Bundan küçük gövdeler sıkıştırılmaz
+MIN_COMPRESS_SIZE = 1024
+
+# Sıkıştırılmış istek gövdesinin açılmış hali için üst sınır
+MAX_DECOMPRESSED_SIZE = 32 * 1024 * 1024
+
+_ENCODINGS = ('gzip', 'deflate')
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6)
+    return zlib.compress(body, 6)
+
+
+def json_response(payload: Union[Any, Callable[[], Any]], etag: Optional[str] = None,
+                  max_age: int = 0):
+    """
+    JSON yanıtı: ETag ile koşullu, kabul ediliyorsa sıkıştırılmış
+
+    Args:
+        payload: Yanıt verisi veya veriyi üreten fonksiyon (etag verildiyse
+            ve istemcinin kopyası güncelse hiç çağrılmaz)
+        etag: Sürüm damgası; None ise gövdenin özeti kullanılır
+        max_age: Tarayıcının yeniden doğrulamadan kullanabileceği süre
+
+    Returns:
+        Response: 200 (gzip/deflate/ham) veya 304
+    """
+    response_class = current_app.response_class
+
+    if etag is not None and request.if_none_match.contains_weak(etag):
+        response = response_class(status=304)
+        _cache_headers(response, etag, max_age)
+        return response
+
+    data = payload() if callable(payload) else payload
+    body = json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+    etag = etag or hashlib.sha1(body).hexdigest()
+
+    response = response_class(body, mimetype='application/json')
+    _cache_headers(response, etag, max_age)
+    response = response.make_conditional(request)
+    if response.status_code != 200 or len(body) < MIN_COMPRESS_SIZE:
+        return response
+
+    encoding = request.accept_encodings.best_match(_ENCODINGS)
+    if encoding:
+        response.set_data(_compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def _cache_headers(response, etag: str, max_age: int) -> None:
+    response.set_etag(etag, weak=True)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.private = True
+    if max_age:
+        response.cache_control.max_age = max_age
+    else:
+        response.cache_control.no_cache = True
+
+
+def get_request_json() -> Optional[Any]:
+    """
+    İstek gövdesini JSON olarak okur; gzip/deflate ile gönderildiyse açar
+
+    Returns:
+        Çözülen veri; gövde boş veya geçersizse None
+
+    Raises:
+        ValueError: Sıkıştırılmış gövde açılamıyor veya sınırı aşıyor
+    """
+    encoding = (request.headers.get('Content-Encoding') or '').strip().lower()
+    if encoding not in _ENCODINGS:
+        return request.get_json(silent=True)
+
+    # gzip başlıklı veya ham zlib akışı; açılmış boyut sınırlı
+    wbits = 16 + zlib.MAX_WBITS if encoding == 'gzip' else zlib.MAX_WBITS
+    decompressor = zlib.decompressobj(wbits)
+    try:
+        body = decompressor.decompress(request.get_data(cache=False), MAX_DECOMPRESSED_SIZE)
+    except zlib.error as e:
+        raise ValueError(f'Sıkıştırılmış gövde açılamadı: {e}') from e
+    if decompressor.unconsumed_tail:
+        raise ValueError('Sıkıştırılmış gövde izin verilen boyutu aşıyor')
+
+    try:
+        return json.loads(body) if body else None
+    except ValueError:
+        return None
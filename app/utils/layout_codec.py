@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Sütunlu Yerleşim Formatı
+Oturum başına bir JSON sözlüğü yerine yerleşim paralel dizilerle taşınır ve
+saklanır; oturum tipleri ayrı bir tabloda bir kez yazılır, oturumlar tabloya
+indeksle bağlanır:
+
+    {
+        "format": "columnar-v1",
+        "count": 3,
+        "types": [{"id": 4, "name": "Masa - 4 Kişilik", "capacity": 4, ...}],
+        "columns": {
+            "id": [11, 12, 13],            # şablonlarda yok
+            "seat_number": ["M001", "M002", "M003"],
+            "x": [0, 80, 160], "y": [100, 100, 100],
+            "w": [60, 60, 60], "h": [40, 40, 40],
+            "type": [0, 0, 0],
+            "color": [null, "#e74c3c", null],  # null: renk yok, tipin rengi
+            "status": ["available", "reserved", "available"]  # isteğe bağlı
+        }
+    }
+
+Tamsayı koordinatlar tamsayı yazılır; tekrar eden değerler (tip indeksi,
+renk, boyut) gzip ile iyi sıkışır. Değerler birebir geri çözülür, böylece
+kaydedilen yerleşim sahte güncelleme üretmez. Eski (oturum listesi) biçimindeki şablonlar okunurken tanınır.
+"""
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+LAYOUT_FORMAT = 'columnar-v1'
+
+# Zorunlu sütunlar ve çözümlenmiş oturum alanları
+_REQUIRED_COLUMNS = ('seat_number', 'x', 'y', 'w', 'h', 'type')
+_FIELD_COLUMNS = (
+    ('position_x', 'x'),
+    ('position_y', 'y'),
+    ('width', 'w'),
+    ('height', 'h'),
+)
+
+
+def _number(value: Optional[float]) -> Optional[float]:
+    """Tam sayı değerli float'ları int yazar (daha kısa JSON)"""
+    if value is None:
+        return None
+    value = float(value)
+    return int(value) if value.is_integer() else round(value, 2)
+
+
+def _get(seat: Any, field: str, default: Any = None) -> Any:
+    if isinstance(seat, dict):
+        return seat.get(field, default)
+    return getattr(seat, field, default)
+
+
+def is_packed(payload: Any) -> bool:
+    """Veri sütunlu yerleşim mi"""
+    return isinstance(payload, dict) and payload.get('format') == LAYOUT_FORMAT
+
+
+def pack_seatings(seatings: Iterable[Any], types: Iterable[Any] = (),
+                  include_ids: bool = True, include_status: bool = False) -> Dict[str, Any]:
+    """
+    Oturumları sütunlu biçime çevirir
+
+    Args:
+        seatings: EventSeating nesneleri veya aynı alanlara sahip sözlükler
+        types: Oturum tipleri (id, name, seat_type, capacity, icon, color_code);
+            listede olmayan tipler yalnızca id ile tabloya eklenir
+        include_ids: Oturum ID sütunu yazılsın mı (şablonlarda yazılmaz)
+        include_status: Durum sütunu yazılsın mı
+
+    Returns:
+        Dict: Sütunlu yerleşim
+    """
+    known = {_get(t, 'id'): t for t in types}
+    type_table: List[Dict[str, Any]] = []
+    type_index: Dict[Any, int] = {}
+
+    columns: Dict[str, List[Any]] = {name: [] for name in ('seat_number', 'x', 'y', 'w', 'h', 'type', 'color')}
+    if include_ids:
+        columns['id'] = []
+    if include_status:
+        columns['status'] = []
+
+    for seat in seatings:
+        type_id = _get(seat, 'seating_type_id')
+        if type_id not in type_index:
+            info = known.get(type_id)
+            type_index[type_id] = len(type_table)
+            type_table.append({
+                'id': type_id,
+                'name': _get(info, 'name'),
+                'seat_type': _get(info, 'seat_type'),
+                'capacity': _get(info, 'capacity'),
+                'icon': _get(info, 'icon'),
+                'color_code': _get(info, 'color_code')
+            } if info is not None else {'id': type_id})
+
+        if include_ids:
+            columns['id'].append(_get(seat, 'id'))
+        columns['seat_number'].append(_get(seat, 'seat_number'))
+        columns['x'].append(_number(_get(seat, 'position_x')))
+        columns['y'].append(_number(_get(seat, 'position_y')))
+        columns['w'].append(_number(_get(seat, 'width')))
+        columns['h'].append(_number(_get(seat, 'height')))
+        columns['type'].append(type_index[type_id])
+        columns['color'].append(_get(seat, 'color_code'))
+        if include_status:
+            status = _get(seat, 'status')
+            columns['status'].append(getattr(status, 'value', status))
+
+    return {
+        'format': LAYOUT_FORMAT,
+        'count': len(columns['seat_number']),
+        'types': type_table,
+        'columns': columns
+    }
+
+
+def unpack_seatings(packed: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Sütunlu yerleşimi oturum sözlüklerine çevirir (LayoutService biçimi)
+
+    Raises:
+        ValueError: Biçim, sütun uzunlukları veya tip indeksleri geçersiz
+    """
+    if not is_packed(packed):
+        raise ValueError('Desteklenmeyen yerleşim biçimi')
+
+    columns = packed.get('columns') or {}
+    types = packed.get('types') or []
+    count = packed.get('count')
+    missing = [name for name in _REQUIRED_COLUMNS if name not in columns]
+    if missing:
+        raise ValueError(f'Eksik yerleşim sütunları: {", ".join(missing)}')
+    if not isinstance(count, int) or any(
+        not isinstance(column, list) or len(column) != count for column in columns.values()
+    ):
+        raise ValueError('Yerleşim sütunlarının uzunluğu count ile uyuşmuyor')
+
+    ids = columns.get('id')
+    colors = columns.get('color')
+    statuses = columns.get('status')
+    seats = []
+    for i in range(count):
+        index = columns['type'][i]
+        if not isinstance(index, int) or not 0 <= index < len(types):
+            raise ValueError(f'Geçersiz oturum tipi indeksi: {index}')
+        seat_type = types[index]
+
+        seat = {
+            'seating_type_id': seat_type.get('id'),
+            'seat_number': columns['seat_number'][i],
+            'color_code': colors[i] if colors else None
+        }
+        for field, column in _FIELD_COLUMNS:
+            seat[field] = columns[column][i]
+        if ids is not None and ids[i] is not None:
+            seat['id'] = ids[i]
+        if statuses is not None:
+            seat['status'] = statuses[i]
+        seats.append(seat)
+    return seats
+
+
+def dumps_layout(payload: Dict[str, Any]) -> str:
+    """Yerleşimi boşluksuz JSON metnine çevirir (saklama ve yanıt için)"""
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False)
+
+
+def pack_configuration(configuration: Dict[str, Any]) -> str:
+    """
+    Şablon konfigürasyonunu saklanacak metne çevirir
+
+    'seatings' oturum listesi varsa sütunlu 'layout' alanına dönüştürülür.
+    """
+    configuration = dict(configuration or {})
+    seatings = configuration.pop('seatings', None)
+    if seatings is not None and not is_packed(configuration.get('layout')):
+        configuration['layout'] = pack_seatings(seatings, include_ids=False)
+    return dumps_layout(configuration)
+
+
+def load_configuration(text: Optional[str]) -> Dict[str, Any]:
+    """
+    Saklanan şablon konfigürasyonunu okur (sütunlu veya eski oturum listesi)
+
+    Returns:
+        Dict: Konfigürasyon; oturumlar her zaman sütunlu 'layout' alanındadır
+    """
+    configuration = json.loads(text) if text else {}
+    if not is_packed(configuration.get('layout')):
+        configuration['layout'] = pack_seatings(configuration.pop('seatings', None) or [], include_ids=False)
+    return configuration
+
+
+def layout_seat_count(configuration: Dict[str, Any]) -> int:
+    """Oturumları çözmeden sayar"""
+    layout = configuration.get('layout')
+    if is_packed(layout):
+        return layout.get('count', 0)
+    return len(configuration.get('seatings') or [])
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Tembel Modül Yükleyici
+reportlab, openpyxl, pandas ve qrcode gibi ağır kütüphaneler modül başında
+değil ilk öznitelik erişiminde import edilir. Böylece yalnızca check-in
+okutan worker'lar bu kütüphaneleri belleğe hiç almaz.
+
+Kullanım:
+    platypus = lazy_import('reportlab.platypus')
+    platypus.Paragraph(...)   # reportlab burada yüklenir
+"""
+import importlib
+import threading
+from typing import Dict
+
+_registry: Dict[str, 'LazyModule'] = {}
+_registry_lock = threading.Lock()
+
+
+class LazyModule:
+    """İlk kullanımda gerçek modülü import eden vekil"""
+
+    __slots__ = ('_name', '_module', '_lock')
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Modül import edildi mi"""
+        return self._module is not None
+
+    def load(self):
+        """Modülü import eder (bir kez) ve döner"""
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f'<LazyModule {self._name} ({state})>'
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Verilen modül için paylaşılan tembel vekili döner"""
+    with _registry_lock:
+        module = _registry.get(name)
+        if module is None:
+            module = _registry[name] = LazyModule(name)
+        return module
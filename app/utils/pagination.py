@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Keyset (Cursor) Sayfalama
+Listeler (created_at, id) sırasına göre yeniden eskiye sayfalanır. OFFSET
+yerine son görülen satırın anahtarı cursor olarak taşınır:
+
+    WHERE (created_at, id) < (:cursor_created_at, :cursor_id)
+    ORDER BY created_at DESC, id DESC
+    LIMIT :per_page + 1
+
+Böylece sayfa maliyeti kullanıcının ne kadar derine indiğinden bağımsızdır
+(ilgili (.., created_at, id) indeksleriyle). Cursor, URL'de taşınabilen
+opak bir base64 metnidir.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from flask import request, url_for
+from sqlalchemy import tuple_
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 200
+
+
+class KeysetPage:
+    """Bir sayfa kayıt ve sonraki sayfanın cursor'ı"""
+
+    def __init__(self, items: List[Any], next_cursor: Optional[str], per_page: int):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.per_page = per_page
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def next_url(self) -> Optional[str]:
+        """Mevcut sayfanın filtreleri korunarak sonraki sayfa adresi"""
+        if self.next_cursor is None:
+            return None
+        args = request.args.to_dict()
+        args['cursor'] = self.next_cursor
+        return url_for(request.endpoint, **(request.view_args or {}), **args)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """(created_at, id) anahtarını URL uyumlu cursor'a çevirir"""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Cursor'ı (created_at, id) anahtarına çevirir
+
+    Raises:
+        ValueError: Cursor bozuk veya geçersiz
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f'Geçersiz cursor: {cursor!r}') from e
+
+
+def page_args() -> Tuple[Optional[str], int]:
+    """İstekten cursor ve per_page parametrelerini okur (per_page sınırlanır)"""
+    per_page = request.args.get('per_page', DEFAULT_PER_PAGE, type=int) or DEFAULT_PER_PAGE
+    return request.args.get('cursor') or None, max(1, min(per_page, MAX_PER_PAGE))
+
+
+def keyset_paginate(query, model, cursor: Optional[str] = None,
+                    per_page: int = DEFAULT_PER_PAGE) -> KeysetPage:
+    """
+    Sorguyu (created_at, id) anahtarıyla yeniden eskiye sayfalar
+
+    Args:
+        query: Filtreleri uygulanmış sorgu (sıralama eklenmemiş olmalı)
+        model: created_at ve id sütunları olan model
+        cursor: Önceki sayfanın next_cursor değeri (ilk sayfa için None)
+        per_page: Sayfa başına kayıt
+
+    Returns:
+        KeysetPage
+
+    Raises:
+        ValueError: Cursor geçersiz
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(per_page + 1).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return KeysetPage(rows, next_cursor, per_page)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Arama Metni Normalizasyonu
+Rezervasyon araması için isimler Türkçe karakterler dahil büyük/küçük harf ve
+aksan farkı gözetmeyecek şekilde katlanır (İ/I/ı -> i, ş -> s, ğ -> g ...),
+telefonlar yalnızca rakamlara indirilir. Katlanmış değerler
+reservations.search_text sütununda tutulur ve aynı fonksiyonla katlanan
+arama ifadesiyle karşılaştırılır.
+"""
+import re
+import unicodedata
+from typing import Optional, Tuple
+
+_TURKISH_FOLD = str.maketrans({
+    'İ': 'i', 'I': 'i', 'ı': 'i',
+    'Ş': 's', 'ş': 's',
+    'Ğ': 'g', 'ğ': 'g',
+    'Ü': 'u', 'ü': 'u',
+    'Ö': 'o', 'ö': 'o',
+    'Ç': 'c', 'ç': 'c',
+})
+
+_WHITESPACE = re.compile(r'\s+')
+_PHONE_QUERY = re.compile(r'^[\d\s()+\-.]+$')
+
+# search_text sütun uzunluğu
+SEARCH_TEXT_LENGTH = 400
+
+
+def fold_text(value: Optional[str]) -> str:
+    """Metni küçük harfe çevirir, Türkçe harfleri ve aksanları katlar"""
+    if not value:
+        return ''
+    value = unicodedata.normalize('NFKD', value.translate(_TURKISH_FOLD))
+    value = ''.join(ch for ch in value if not unicodedata.combining(ch)).lower()
+    return _WHITESPACE.sub(' ', value).strip()
+
+
+def phone_digits(value: Optional[str]) -> str:
+    """Telefonu 0 ile başlayan ulusal rakam dizisine indirir (05XXXXXXXXX)"""
+    digits = ''.join(ch for ch in value or '' if ch.isdigit())
+    if len(digits) == 12 and digits.startswith('90'):
+        return '0' + digits[2:]
+    if len(digits) == 10 and digits.startswith('5'):
+        return '0' + digits
+    return digits
+
+
+def build_search_text(first_name: Optional[str], last_name: Optional[str],
+                      phone: Optional[str], reservation_code: Optional[str]) -> str:
+    """reservations.search_text değeri: katlanmış ad, soyad, kod ve telefon rakamları"""
+    parts = (fold_text(first_name), fold_text(last_name), fold_text(reservation_code), phone_digits(phone))
+    return ' '.join(part for part in parts if part)[:SEARCH_TEXT_LENGTH]
+
+
+def normalize_query(query: Optional[str]) -> Tuple[str, bool]:
+    """
+    Arama ifadesini search_text ile karşılaştırılacak biçime getirir
+
+    Returns:
+        Tuple[str, bool]: Normalize ifade ve telefon araması olup olmadığı
+    """
+    query = (query or '').strip()
+    if _PHONE_QUERY.match(query) and any(ch.isdigit() for ch in query):
+        digits = ''.join(ch for ch in query if ch.isdigit())
+        if query.startswith('+90'):
+            digits = '0' + digits[2:]
+        return digits, True
+    return fold_text(query), False
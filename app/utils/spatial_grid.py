@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Uzamsal Izgara İndeksi
+Yerleşim doğrulamasında oturum dikdörtgenlerinin çakışmalarını bulmak için
+tekdüze ızgara. Her dikdörtgen kapladığı hücrelere yazılır; yalnızca aynı
+hücreyi paylaşan dikdörtgenler karşılaştırılır. Hücre boyutu etkinliğin
+ızgara boyutunun katıdır ve tipik oturum boyutundan küçük olmaz, böylece bir
+oturum çoğunlukla 1-4 hücreye düşer ve n oturum için iş O(n) kalır.
+
+Bir çift birden fazla hücreyi paylaşabilir; çift yalnızca kesişim
+alanının sol üst köşesini içeren hücrede raporlanır, tekrar ayıklamak için
+küme tutulmaz.
+"""
+import math
+from collections import defaultdict
+from statistics import median
+from typing import Any, Dict, Hashable, Iterable, List, Sequence, Tuple
+
+# (anahtar, x, y, genişlik, yükseklik)
+Rect = Tuple[Hashable, float, float, float, float]
+
+
+def cell_size_for(rects: Sequence[Rect], grid_size: float = 20) -> float:
+    """Izgara boyutunun, medyan oturum kenarından küçük olmayan en küçük katı"""
+    grid_size = grid_size if grid_size and grid_size > 0 else 20
+    if not rects:
+        return grid_size
+    typical = median(max(width, height) for _, _, _, width, height in rects)
+    return grid_size * max(1, math.ceil(typical / grid_size))
+
+
+class SpatialGrid:
+    """Eksen hizalı dikdörtgenler için tekdüze ızgara indeksi"""
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.rects: List[Rect] = []
+        self.cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+
+    @classmethod
+    def build(cls, rects: Iterable[Rect], grid_size: float = 20) -> 'SpatialGrid':
+        """Dikdörtgenlerden, ızgara boyutuna hizalı bir indeks kurar"""
+        rects = list(rects)
+        grid = cls(cell_size_for(rects, grid_size))
+        for rect in rects:
+            grid.insert(*rect)
+        return grid
+
+    def _cell(self, value: float) -> int:
+        return math.floor(value / self.cell_size)
+
+    def _span(self, start: float, length: float) -> range:
+        """[start, start + length) aralığının kapladığı hücreler (sağ kenar hariç)"""
+        first = self._cell(start)
+        last = math.ceil((start + length) / self.cell_size) - 1
+        return range(first, max(first, last) + 1)
+
+    def insert(self, key: Hashable, x: float, y: float, width: float, height: float) -> None:
+        """Dikdörtgeni kapladığı hücrelere ekler"""
+        index = len(self.rects)
+        self.rects.append((key, x, y, width, height))
+        for cx in self._span(x, width):
+            for cy in self._span(y, height):
+                self.cells[(cx, cy)].append(index)
+
+    def overlapping_pairs(self) -> List[Tuple[Hashable, Hashable]]:
+        """
+        Alanı kesişen tüm dikdörtgen çiftlerini döner (kenar teması çakışma değildir)
+
+        Returns:
+            List[Tuple]: (önce eklenen anahtar, sonra eklenen anahtar) çiftleri,
+            ekleme sırasına göre
+        """
+        rects, pairs = self.rects, []
+        for cell, members in self.cells.items():
+            for position, i in enumerate(members):
+                _, ax, ay, aw, ah = rects[i]
+                for j in members[position + 1:]:
+                    _, bx, by, bw, bh = rects[j]
+                    if ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah:
+                        # Çifti yalnızca kesişimin sol üst köşesinin hücresinde say
+                        if (self._cell(max(ax, bx)), self._cell(max(ay, by))) == cell:
+                            pairs.append((i, j))
+        pairs.sort()
+        return [(rects[i][0], rects[j][0]) for i, j in pairs]
+
+    def outside(self, width: float, height: float) -> List[Hashable]:
+        """(0, 0, width, height) tuvali dışına taşan dikdörtgenlerin anahtarları"""
+        return [
+            key for key, x, y, w, h in self.rects
+            if x < 0 or y < 0 or x + w > width or y + h > height
+        ]
+
+
+def find_layout_problems(rects: Sequence[Rect], canvas_width: float, canvas_height: float,
+                         grid_size: float = 20) -> Dict[str, Any]:
+    """
+    Tek geçişte çakışan çiftleri ve tuval dışındaki dikdörtgenleri bulur
+
+    Returns:
+        Dict: {'overlaps': [(a, b), ...], 'out_of_bounds': [anahtar, ...]}
+    """
+    grid = SpatialGrid.build(rects, grid_size)
+    return {
+        'overlaps': grid.overlapping_pairs(),
+        'out_of_bounds': grid.outside(canvas_width, canvas_height)
+    }
@@ -0,0 +1,59 @@
+"""
+Benchmark seat overlap detection: spatial grid vs. pairwise comparison
+
+Usage: python benchmark_layout_validation.py [sizes...] [--naive-limit=N]
+"""
+import random
+import sys
+import time
+from app.utils.spatial_grid import find_layout_problems
+
+DEFAULT_SIZES = (100, 1000, 10000)
+
+def make_layout(count, grid_size=20, seed=42):
+    """Rows of 50x50 tables 60px apart; about 1% are nudged onto a neighbour"""
+    rng = random.Random(seed)
+    per_row = max(1, int(count ** 0.5))
+    rects = []
+    for i in range(count):
+        x, y = (i % per_row) * 60, (i // per_row) * 60
+        if rng.random() < 0.01:
+            x += rng.choice((-30, 30))
+        rects.append((i, x, y, 50, 50))
+    canvas = per_row * 60 + grid_size
+    return rects, canvas, canvas
+
+def pairwise(rects, canvas_width, canvas_height):
+    """Old approach: compare every seat with every other seat"""
+    overlaps = []
+    for index, (a, ax, ay, aw, ah) in enumerate(rects):
+        for b, bx, by, bw, bh in rects[index + 1:]:
+            if ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah:
+                overlaps.append((a, b))
+    outside = [key for key, x, y, w, h in rects
+               if x < 0 or y < 0 or x + w > canvas_width or y + h > canvas_height]
+    return {'overlaps': overlaps, 'out_of_bounds': outside}
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+def run(sizes, naive_limit=2000):
+    print(f"{'seats':>8} {'grid':>10} {'pairwise':>10} {'overlaps':>9}")
+    for count in sizes:
+        rects, width, height = make_layout(count)
+        grid_result, grid_time = timed(find_layout_problems, rects, width, height, 20)
+
+        naive_time = None
+        if count <= naive_limit:
+            naive_result, naive_time = timed(pairwise, rects, width, height)
+            assert sorted(naive_result['overlaps']) == grid_result['overlaps'], 'results differ'
+
+        naive = f'{naive_time * 1000:8.1f}ms' if naive_time is not None else f"{'-':>10}"
+        print(f"{count:>8} {grid_time * 1000:8.1f}ms {naive} {len(grid_result['overlaps']):>9}")
+
+if __name__ == '__main__':
+    limit = [a for a in sys.argv[1:] if a.startswith('--naive-limit=')]
+    sizes = [int(a) for a in sys.argv[1:] if not a.startswith('--')]
+    run(sizes or DEFAULT_SIZES, int(limit[0].split('=', 1)[1]) if limit else 2000)
@@ -37,6 +37,31 @@ class Config:
     REDIS_ENABLED = os.environ.get('REDIS_ENABLED', 'false').lower() == 'true'
     REDIS_URL = os.environ.get('REDIS_URL', None)
 
+    # Arka plan işleri: thread (süreç içi havuz, iş durumu veritabanında) veya
+    # redis (run_jobs.py worker'ı gerekir)
+    JOB_QUEUE_BACKEND = os.environ.get('JOB_QUEUE_BACKEND', 'thread')
+    JOB_QUEUE_WORKERS = int(os.environ.get('JOB_QUEUE_WORKERS', 2))
+    JOB_RESULT_TTL = int(os.environ.get('JOB_RESULT_TTL', 3600))
+
+    # Canlı akış (SSE): worker başına eşzamanlı akış sınırı; boşsa gevent
+    # worker'ında 500, thread/sync worker'da 1
+    LIVE_FEED_MAX_STREAMS = int(os.environ.get('LIVE_FEED_MAX_STREAMS', 0)) or None
+
+    # Gunicorn worker sayısı (gunicorn da aynı değişkeni okur). Redis yokken
+    # rapor önbelleğinin nesil sayaçları süreç içidir; birden fazla worker'da
+    # önbellek kapatılır
+    WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+    # Rapor önbelleği: 0 kapatır; REDIS_ENABLED ise Redis'te tutulur
+    REPORT_CACHE_TTL = int(os.environ.get('REPORT_CACHE_TTL', 300))
+    REPORT_CACHE_MAX_ENTRIES = int(os.environ.get('REPORT_CACHE_MAX_ENTRIES', 512))
+
+    # Rezervasyon araması (SQLite): bellek içi indeksin yeniden yüklenme süresi
+    SEARCH_INDEX_MAX_AGE = int(os.environ.get('SEARCH_INDEX_MAX_AGE', 300))
+
+    # Oturum tipi kaydı: diğer worker'ların değişikliklerini kontrol aralığı (saniye)
+    SEATING_TYPE_REGISTRY_CHECK_INTERVAL = float(os.environ.get('SEATING_TYPE_REGISTRY_CHECK_INTERVAL', 5))
+
     # Upload
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', 'app/static/uploads')
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16777216))  # 16MB
@@ -134,9 +159,11 @@ class TestingConfig(Config):
     DATABASE_URL = 'sqlite:///:memory:'
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # SQLite StaticPool pool_size/max_overflow desteklemez
     WTF_CSRF_ENABLED = False
     SESSION_COOKIE_SECURE = False
     SESSION_TYPE = 'null'  # Disable session for testing
+    JOB_QUEUE_BACKEND = 'eager'  # İşler enqueue anında çalışır
 
 
 config = {
@@ -1,34 +1,47 @@
 """
 Script to generate QR codes for existing reservations
+
+Usage: python generate_qr_codes.py [--workers=N] [--chunk-size=N]
+
+Images are rendered across CPU cores and qr_code_path is updated once per
+chunk. The script is safe to interrupt and re-run: it resumes with the
+reservations that still have no QR code.
 """
-from app import create_app, db
-from app.models.reservation import Reservation
+import sys
+from app import create_app
+from app.services.qr_service import backfill_qr_files
 
-def generate_all_qr_codes():
+def print_progress(stats):
+    """Print per-chunk progress and throughput"""
+    for code, error in stats['errors'].items():
+        print(f"❌ Error generating QR for {code}: {error}")
+    print(f"✅ {stats['generated']}/{stats['total']} QR codes "
+          f"({stats['per_second']:.0f}/s, {stats['seconds']:.1f}s)")
+
+def generate_all_qr_codes(workers=None, chunk_size=1000):
     """Generate QR codes for all active reservations"""
     app = create_app()
-    
+
     with app.app_context():
-        # Get all active reservations without QR codes
-        reservations = Reservation.query.filter(
-            Reservation.qr_code_path.is_(None),
-            Reservation.status == 'active'
-        ).all()
-        
-        print(f"Found {len(reservations)} reservations without QR codes")
-        
-        generated = 0
-        for reservation in reservations:
-            try:
-                filepath = reservation.generate_qr_code()
-                db.session.commit()
-                print(f"✅ Generated QR code for {reservation.reservation_code}: {filepath}")
-                generated += 1
-            except Exception as e:
-                print(f"❌ Error generating QR for {reservation.reservation_code}: {e}")
-                db.session.rollback()
-        
-        print(f"\n🎉 Successfully generated {generated}/{len(reservations)} QR codes")
+        stats = backfill_qr_files(workers=workers, chunk_size=chunk_size, progress=print_progress)
+
+        if not stats['total']:
+            print("✅ All active reservations already have QR codes")
+            return stats
+
+        print(f"\n🎉 Successfully generated {stats['generated']}/{stats['total']} QR codes "
+              f"in {stats['seconds']:.1f}s ({stats['per_second']:.0f}/s, {stats['failed']} failed)")
+        return stats
+
+def _option(name, default=None):
+    """Read a --name=value option from argv"""
+    for arg in sys.argv[1:]:
+        if arg.startswith(f'--{name}='):
+            return int(arg.split('=', 1)[1])
+    return default
 
 if __name__ == '__main__':
-    generate_all_qr_codes()
+    generate_all_qr_codes(
+        workers=_option('workers'),
+        chunk_size=_option('chunk-size', 1000)
+    )
@@ -0,0 +1,51 @@
+"""
+Script to bulk import reservations for an event from a CSV or XLSX guest list
+
+Usage: python import_reservations.py <event_id> <file> [--dry-run] [--no-seats]
+"""
+import os
+import sys
+from app import create_app
+from app.services.reservation_import_service import ReservationImportService
+from app.services.background_tasks import generate_qr_codes
+
+def import_reservations(event_id, path, dry_run=False, assign_seats=True):
+    """Validate and import a guest list, then generate QR codes for the new reservations"""
+    app = create_app()
+
+    with app.app_context():
+        service = ReservationImportService(event_id)
+
+        with open(path, 'rb') as f:
+            rows = service.read_rows(f, os.path.basename(path))
+
+        report = service.import_rows(rows, assign_seats=assign_seats, dry_run=dry_run)
+
+        for error in report['errors']:
+            details = '; '.join(f"{field}: {', '.join(map(str, messages))}" for field, messages in error['errors'].items())
+            print(f"❌ Row {error['row']}: {details}")
+
+        if dry_run:
+            print(f"\n🔍 Dry run: {report['valid']}/{report['total']} rows valid, {report['failed']} with errors")
+            return report
+
+        print(f"\n✅ Imported {report['imported']}/{report['total']} reservations ({report['failed']} rows skipped)")
+
+        if report['codes']:
+            result = generate_qr_codes(report['codes'])
+            print(f"🎉 Generated {result['generated']}/{result['total']} QR codes")
+
+    return report
+
+if __name__ == '__main__':
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if len(args) != 2:
+        print(__doc__.strip())
+        sys.exit(1)
+
+    import_reservations(
+        int(args[0]),
+        args[1],
+        dry_run='--dry-run' in sys.argv,
+        assign_seats='--no-seats' not in sys.argv
+    )
@@ -0,0 +1,29 @@
+"""seed event cache versions
+
+Revision ID: b3d9f4a2c715
+Revises: a7e3c1f9d062
+Create Date: 2026-10-18 21:02:41.118204
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3d9f4a2c715'
+down_revision = 'a7e3c1f9d062'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Mevcut etkinliklerin sayaç satırları önceden var olsun; ilk değişiklikte
+    # eşzamanlı istekler satırı eklemek için yarışmasın (yeni etkinliklerin
+    # satırı etkinliği oluşturan transaction'da eklenir)
+    op.execute(
+        "INSERT INTO cache_versions (name, version, updated_at) "
+        "SELECT 'event:' || CAST(id AS VARCHAR(20)), 1, CURRENT_TIMESTAMP FROM events"
+    )
+
+
+def downgrade():
+    op.execute("DELETE FROM cache_versions WHERE name LIKE 'event:%'")
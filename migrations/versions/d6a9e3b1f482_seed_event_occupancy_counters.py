@@ -0,0 +1,41 @@
+"""seed event occupancy counters
+
+Revision ID: d6a9e3b1f482
+Revises: c5e8a1d3f927
+Create Date: 2026-10-18 23:14:07.529316
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6a9e3b1f482'
+down_revision = 'c5e8a1d3f927'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Mevcut etkinliklerin sayaçları temel tablolardan önceden oluşturulsun;
+    # dashboard okumaları satırı eklemek için yarışmasın (eksik kalan yeni
+    # etkinlik satırları servis tarafından idempotent olarak eklenir)
+    op.execute(
+        "INSERT INTO event_occupancy (event_id, total_capacity, reserved_people, "
+        "active_reservations, total_reservations, checked_in_count, updated_at) "
+        "SELECT e.id, "
+        "COALESCE((SELECT SUM(st.capacity) FROM event_seatings es "
+        "JOIN seating_types st ON st.id = es.seating_type_id WHERE es.event_id = e.id), 0), "
+        "COALESCE((SELECT SUM(r.number_of_people) FROM reservations r "
+        "WHERE r.event_id = e.id AND r.status = 'ACTIVE'), 0), "
+        "(SELECT COUNT(*) FROM reservations r WHERE r.event_id = e.id AND r.status = 'ACTIVE'), "
+        "(SELECT COUNT(*) FROM reservations r WHERE r.event_id = e.id), "
+        "(SELECT COUNT(*) FROM reservations r WHERE r.event_id = e.id AND r.checked_in = TRUE), "
+        "CURRENT_TIMESTAMP "
+        "FROM events e "
+        "WHERE NOT EXISTS (SELECT 1 FROM event_occupancy o WHERE o.event_id = e.id)"
+    )
+
+
+def downgrade():
+    # Sayaçlar temel tablolardan türetilir; geri alınacak şema değişikliği yok
+    pass
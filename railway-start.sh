@@ -61,15 +61,21 @@ else
     echo "⚠️  Migration failed, but continuing..."
 fi
 
-# Gunicorn ile başlat
+# Gunicorn ile başlat (gevent: canlı akış/SSE bağlantıları istek slotu tüketmez,
+# bkz. LIVE_FEED_MAX_STREAMS)
+# Worker sayısı uygulamaya da bildirilir (Redis yoksa rapor önbelleği
+# birden fazla worker'da kapanır, bkz. WEB_CONCURRENCY)
+export WEB_CONCURRENCY=${WEB_CONCURRENCY:-4}
+
 echo ""
 echo "🌐 Starting Gunicorn server..."
 echo "=================================="
 
 exec gunicorn \
     --bind 0.0.0.0:$PORT \
-    --workers 4 \
-    --threads 2 \
+    --workers $WEB_CONCURRENCY \
+    --worker-class gevent \
+    --worker-connections 1000 \
     --timeout 60 \
     --access-logfile - \
     --error-logfile - \
@@ -0,0 +1,42 @@
+"""
+Script to rebuild the daily report rollup from the base tables (run nightly)
+"""
+import sys
+from datetime import datetime
+from app import create_app, db
+from app.models import Company
+from app.services.rollup_service import RollupService
+
+def rebuild_report_rollup(company_id=None, since=None):
+    """Rebuild reservation_daily_rollup rows for one or all companies"""
+    app = create_app()
+    
+    with app.app_context():
+        query = Company.query.order_by(Company.id)
+        if company_id is not None:
+            query = query.filter(Company.id == company_id)
+        company_ids = [company.id for company in query]
+        
+        total = 0
+        for cid in company_ids:
+            rows = RollupService.rebuild_company(cid, since=since)
+            db.session.commit()
+            total += rows
+            print(f"📊 Company {cid}: {rows} rollup rows")
+        
+        scope = f"since {since}" if since else "full history"
+        print(f"\n✅ Rebuilt {total} rollup rows for {len(company_ids)} companies ({scope})")
+        return total
+
+if __name__ == '__main__':
+    since = None
+    args = []
+    for arg in sys.argv[1:]:
+        if arg.startswith('--since='):
+            since = datetime.strptime(arg.split('=', 1)[1], '%Y-%m-%d').date()
+        else:
+            args.append(arg)
+    rebuild_report_rollup(
+        company_id=int(args[0]) if args else None,
+        since=since
+    )
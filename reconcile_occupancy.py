@@ -0,0 +1,32 @@
+"""
+Script to rebuild event occupancy counters from the base tables and report drift
+"""
+import sys
+from app import create_app
+from app.services.occupancy_service import OccupancyService
+
+def reconcile_occupancy(company_id=None, fix=True):
+    """Compare live occupancy counters with reservations/seatings and fix drift"""
+    app = create_app()
+    
+    with app.app_context():
+        drift = OccupancyService.reconcile(company_id=company_id, fix=fix)
+        
+        if not drift:
+            print("✅ All occupancy counters are in sync")
+            return drift
+        
+        for item in drift:
+            print(f"⚠️ Event {item['event_id']} {item['field']}: counter={item['counter']} actual={item['actual']}")
+        
+        events = len({item['event_id'] for item in drift})
+        action = "rebuilt" if fix else "found (dry run)"
+        print(f"\n🔧 {len(drift)} drifted counters on {events} events {action}")
+        return drift
+
+if __name__ == '__main__':
+    args = [a for a in sys.argv[1:] if a != '--dry-run']
+    reconcile_occupancy(
+        company_id=int(args[0]) if args else None,
+        fix='--dry-run' not in sys.argv
+    )
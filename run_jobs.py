@@ -0,0 +1,26 @@
+"""
+Background job worker for the Redis job queue backend
+
+Usage: JOB_QUEUE_BACKEND=redis REDIS_URL=redis://... python run_jobs.py
+"""
+import os
+from app import create_app
+from app.services.job_queue import job_queue
+
+def run_worker():
+    """Consume queued jobs (QR codes, exports, reports) until interrupted"""
+    # create_app job_queue'yu başlatır; her iş kendi app context'inde çalışır
+    create_app(os.environ.get('FLASK_ENV', 'development'))
+
+    if job_queue.backend != 'redis':
+        print("❌ JOB_QUEUE_BACKEND=redis and a reachable REDIS_URL are required")
+        return
+
+    print("🧵 Job worker started, waiting for jobs...")
+    try:
+        job_queue.work()
+    except KeyboardInterrupt:
+        print("\n👋 Job worker stopped")
+
+if __name__ == '__main__':
+    run_worker()
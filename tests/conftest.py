@@ -69,7 +69,7 @@ def client(app):
 @pytest.fixture
 def authenticated_client(client):
     """Client with authenticated controller user"""
-    client.post('/auth/login', data={
+    client.post('/login', data={
         'username': 'controller',
         'password': 'Controller123!'
     }, follow_redirects=True)
@@ -78,8 +78,72 @@ def authenticated_client(client):
 @pytest.fixture
 def admin_client(client):
     """Client with authenticated admin user"""
-    client.post('/auth/login', data={
+    client.post('/login', data={
         'username': 'admin',
         'password': 'Admin123!'
     }, follow_redirects=True)
     return client
+
+@pytest.fixture
+def query_counter(app):
+    """Count SQL statements executed inside a ``with`` block"""
+    from contextlib import contextmanager
+    from sqlalchemy import event as sa_event
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db.engine
+        sa_event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            sa_event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+    return counter
+
+@pytest.fixture
+def create_seatings(app):
+    """Create ``count`` seats for an event and reserve every ``reserve_every``-th one"""
+    import uuid
+    from app.models import SeatingType, EventSeating, Reservation
+
+    def factory(event, count, reserve_every=2, capacity=4, people=2):
+        seating_type = SeatingType(
+            name=f'Masa - {capacity} Kişilik',
+            seat_type='table',
+            capacity=capacity
+        )
+        db.session.add(seating_type)
+        db.session.flush()
+
+        for i in range(count):
+            seating = EventSeating(
+                event_id=event.id,
+                seating_type_id=seating_type.id,
+                seat_number=f'M{i + 1:03d}',
+                position_x=i * 80,
+                position_y=100
+            )
+            db.session.add(seating)
+            db.session.flush()
+
+            if reserve_every and i % reserve_every == 0:
+                db.session.add(Reservation(
+                    event_id=event.id,
+                    seating_id=seating.id,
+                    phone='05001234567',
+                    first_name='Guest',
+                    last_name=str(i),
+                    number_of_people=people,
+                    reservation_code=str(uuid.uuid4())
+                ))
+
+        db.session.commit()
+        return seating_type
+
+    return factory
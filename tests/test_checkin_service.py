@@ -0,0 +1,144 @@
+"""
+Tests for the cached check-in lookup path
+"""
+import uuid
+from sqlalchemy import update
+from app import db
+from app.models import Event, Reservation, EventOccupancy
+from app.models.reservation import ReservationStatus
+from app.services.checkin_service import (
+    CheckinService,
+    get_checkin_cache,
+    CHECKIN_OK,
+    CHECKIN_DUPLICATE,
+    CHECKIN_CANCELLED,
+    CHECKIN_NOT_FOUND,
+)
+
+
+def add_reservation(event, code=None, **kwargs):
+    reservation = Reservation(
+        event_id=event.id,
+        phone='05001234567',
+        first_name='Gate',
+        last_name='Scan',
+        number_of_people=kwargs.pop('people', 2),
+        reservation_code=code or str(uuid.uuid4()),
+        **kwargs
+    )
+    db.session.add(reservation)
+    db.session.commit()
+    return reservation
+
+
+class TestCheckinService:
+    """Test in-memory code map and conditional check-in"""
+
+    def test_checkin_then_duplicate_without_queries(self, app, query_counter):
+        """Duplicate and unknown scans are answered from memory"""
+        with app.app_context():
+            event = Event.query.first()
+            reservations = [add_reservation(event, code=f'GATE{i}') for i in range(50)]
+            service = CheckinService(event_id=event.id)
+
+            result = service.check_in('GATE7')
+            assert result.status == CHECKIN_OK
+            assert result.entry.name == 'Gate Scan'
+            assert result.event_name == event.name
+
+            with query_counter() as statements:
+                assert service.check_in('GATE7').status == CHECKIN_DUPLICATE
+                assert service.check_in('NOPE').status == CHECKIN_NOT_FOUND
+            assert statements == []
+
+            assert db.session.get(Reservation, reservations[7].id).checked_in is True
+            assert db.session.get(EventOccupancy, event.id).checked_in_count == 1
+
+    def test_concurrent_gate_is_rejected_by_conditional_update(self, app):
+        """A stale cache entry cannot check the same reservation in twice"""
+        with app.app_context():
+            event = Event.query.first()
+            reservation = add_reservation(event, code='RACE1')
+            service = CheckinService(event_id=event.id)
+            get_checkin_cache().load_event(event.id)
+
+            # Another gate (worker) checks the reservation in behind our cache
+            db.session.execute(
+                update(Reservation)
+                .where(Reservation.id == reservation.id)
+                .values(checked_in=True)
+            )
+            db.session.commit()
+
+            result = service.check_in('RACE1')
+            assert result.status == CHECKIN_DUPLICATE
+            assert db.session.get(EventOccupancy, event.id) is None
+
+    def test_cancelled_reservation(self, app):
+        """Cancelled codes are reported as such"""
+        with app.app_context():
+            event = Event.query.first()
+            add_reservation(event, code='CANCEL1', status=ReservationStatus.CANCELLED)
+
+            result = CheckinService(event_id=event.id).check_in('CANCEL1')
+            assert result.status == CHECKIN_CANCELLED
+
+    def test_new_reservation_found_after_reload_interval(self, app):
+        """Codes created by another worker are picked up on a miss"""
+        with app.app_context():
+            event = Event.query.first()
+            service = CheckinService(event_id=event.id)
+            cache = get_checkin_cache()
+            cache.reload_interval = 0
+
+            assert service.check_in('LATE1').status == CHECKIN_NOT_FOUND
+            add_reservation(event, code='LATE1')
+            assert service.check_in('LATE1').status == CHECKIN_OK
+
+    def test_resolved_code_reloads_fresh_event_map(self, app):
+        """A code confirmed in the DB is found even if the event map was just loaded"""
+        with app.app_context():
+            event = Event.query.first()
+            add_reservation(event, code='EARLY1')
+            cache = get_checkin_cache()
+            cache.reload_interval = 60
+
+            assert CheckinService().check_in('EARLY1').status == CHECKIN_OK
+            # Created as if by another worker: this process's map is not invalidated
+            add_reservation(event, code='LATE2')
+            assert CheckinService().check_in('LATE2').status == CHECKIN_OK
+
+    def test_code_scoped_to_event(self, app):
+        """Controller scans only match the active event"""
+        with app.app_context():
+            event = Event.query.first()
+            other = Event(name='Other', event_date=event.event_date, company_id=event.company_id)
+            db.session.add(other)
+            db.session.commit()
+            add_reservation(other, code='OTHER1')
+
+            assert CheckinService(event_id=event.id).check_in('OTHER1').status == CHECKIN_NOT_FOUND
+            assert CheckinService().check_in('OTHER1').status == CHECKIN_OK
+
+
+class TestControllerCheckinApi:
+    """Test controller AJAX check-in through the service"""
+
+    def test_api_checkin_success_and_duplicate(self, authenticated_client, app):
+        with app.app_context():
+            event = Event.query.first()
+            add_reservation(event, code='API1', people=3)
+            event_id = event.id
+
+        authenticated_client.post(f'/select-event/{event_id}')
+
+        response = authenticated_client.post('/api/checkin', json={'code': 'API1'})
+        assert response.status_code == 200
+        assert response.get_json()['reservation']['people_count'] == 3
+
+        response = authenticated_client.post('/api/checkin', json={'code': 'API1'})
+        assert response.status_code == 400
+        assert 'zaten' in response.get_json()['error']
+
+        response = authenticated_client.post('/api/checkin', json={'code': 'MISSING'})
+        assert response.status_code == 404
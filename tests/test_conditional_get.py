@@ -0,0 +1,168 @@
+"""
+Tests for event version counters and conditional GET on polled endpoints
+"""
+import pytest
+from app import db
+from app.models import Event, EventSeating, Reservation, SeatingType, Company
+from app.services.checkin_service import CheckinService, CHECKIN_OK
+from app.services.event_versions import event_versions
+
+
+def setup_event(app, create_seatings, count=4):
+    with app.app_context():
+        event = Event.query.first()
+        create_seatings(event, count, reserve_every=2)
+        return event.id
+
+
+def etag_of(app, event_id, **kwargs):
+    with app.app_context():
+        return event_versions.etag(event_id, **kwargs)
+
+
+class TestEventVersions:
+    """Test version bumps"""
+
+    def test_orm_changes_bump_once_per_transaction(self, app, create_seatings):
+        event_id = setup_event(app, create_seatings)
+        before = etag_of(app, event_id)
+
+        with app.app_context():
+            for seat in EventSeating.query.filter_by(event_id=event_id):
+                seat.position_y = 300
+                db.session.flush()
+            db.session.commit()
+
+        after = etag_of(app, event_id)
+        assert int(after.split('-')[1]) == int(before.split('-')[1]) + 1
+
+    def test_bulk_checkin_bumps_through_hook(self, app, create_seatings):
+        event_id = setup_event(app, create_seatings)
+        with app.app_context():
+            code = Reservation.query.filter_by(event_id=event_id).first().reservation_code
+        before = etag_of(app, event_id)
+
+        with app.app_context():
+            assert CheckinService(event_id=event_id).check_in(code).status == CHECKIN_OK
+
+        assert etag_of(app, event_id) != before
+
+    def test_rollback_does_not_bump(self, app, create_seatings):
+        event_id = setup_event(app, create_seatings)
+        before = etag_of(app, event_id)
+
+        with app.app_context():
+            EventSeating.query.filter_by(event_id=event_id).first().position_x = 999
+            db.session.flush()
+            db.session.rollback()
+
+        assert etag_of(app, event_id) == before
+
+    def test_company_scope_and_missing_event(self, app, create_seatings):
+        event_id = setup_event(app, create_seatings)
+        with app.app_context():
+            company_id = Event.query.first().company_id
+            other = Company(name='Other', email='other@example.com', phone='05000000000')
+            db.session.add(other)
+            db.session.commit()
+            other_id = other.id
+
+        assert etag_of(app, event_id, company_id=company_id) is not None
+        assert etag_of(app, event_id, company_id=other_id) is None
+        assert etag_of(app, 999) is None
+
+
+class TestConditionalEndpoints:
+    """Test 304 answers before the expensive queries"""
+
+    @pytest.mark.parametrize('path', ['/event/{id}/layout', '/event/{id}/seating-config'])
+    def test_not_modified_skips_payload_queries(self, admin_client, app, create_seatings,
+                                                 query_counter, path):
+        event_id = setup_event(app, create_seatings)
+        url = path.format(id=event_id)
+
+        response = admin_client.get(url)
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+
+        with query_counter() as statements:
+            again = admin_client.get(url, headers={'If-None-Match': etag})
+        assert again.status_code == 304
+        assert not any('event_seatings' in statement.split('FROM', 1)[-1] for statement in statements)
+        assert not any('FROM reservations' in statement for statement in statements)
+
+    def test_layout_save_invalidates_etag(self, admin_client, app, create_seatings):
+        event_id = setup_event(app, create_seatings)
+        response = admin_client.get(f'/event/{event_id}/layout')
+        layout, etag = response.get_json()['layout'], response.headers['ETag']
+
+        layout['columns']['x'][1] = 640
+        assert admin_client.post(f'/event/{event_id}/save-layout', json={'layout': layout}).status_code == 200
+
+        again = admin_client.get(f'/event/{event_id}/layout', headers={'If-None-Match': etag})
+        assert again.status_code == 200
+        assert again.get_json()['layout']['columns']['x'][1] == 640
+
+    def test_seating_type_change_invalidates_layout(self, admin_client, app, create_seatings):
+        event_id = setup_event(app, create_seatings)
+        etag = admin_client.get(f'/event/{event_id}/layout').headers['ETag']
+
+        with app.app_context():
+            SeatingType.query.first().color_code = '#000000'
+            db.session.commit()
+
+        response = admin_client.get(f'/event/{event_id}/layout', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+
+    def test_other_company_event_is_not_found(self, admin_client, app):
+        with app.app_context():
+            other = Company(name='Other', email='other@example.com', phone='05000000000')
+            db.session.add(other)
+            db.session.flush()
+            event = Event(name='Foreign', event_date=Event.query.first().event_date, company_id=other.id)
+            db.session.add(event)
+            db.session.commit()
+            event_id = event.id
+
+        assert admin_client.get(f'/event/{event_id}/layout').status_code == 404
+        assert admin_client.get(f'/event/{event_id}/seating-config').status_code == 404
+
+
+class TestControllerPolling:
+    """Test seating status and map polling"""
+
+    def test_seating_status_revalidates(self, authenticated_client, app, create_seatings):
+        event_id = setup_event(app, create_seatings)
+        with app.app_context():
+            seating_id = EventSeating.query.filter_by(event_id=event_id, seat_number='M001').one().id
+            code = Reservation.query.filter_by(seating_id=seating_id).one().reservation_code
+
+        with authenticated_client.session_transaction() as sess:
+            sess['active_event_id'] = event_id
+
+        url = f'/api/seating-status?seating_id={seating_id}'
+        response = authenticated_client.get(url)
+        assert response.get_json()['reservation']['checked_in'] is False
+        etag = response.headers['ETag']
+
+        assert authenticated_client.get(url, headers={'If-None-Match': etag}).status_code == 304
+        other = authenticated_client.get(f'/api/seating-status?seating_id={seating_id + 1}',
+                                         headers={'If-None-Match': etag})
+        assert other.status_code == 200
+
+        with app.app_context():
+            CheckinService(event_id=event_id).check_in(code)
+
+        response = authenticated_client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.get_json()['reservation']['checked_in'] is True
+
+    def test_seating_map_revalidates(self, authenticated_client, app, create_seatings):
+        event_id = setup_event(app, create_seatings)
+        with authenticated_client.session_transaction() as sess:
+            sess['active_event_id'] = event_id
+
+        response = authenticated_client.get('/api/seating-map')
+        assert len(response.get_json()['seatings']) == 4
+        response = authenticated_client.get('/api/seating-map', headers={'If-None-Match': response.headers['ETag']})
+        assert response.status_code == 304
@@ -0,0 +1,59 @@
+"""
+Tests for controller dashboard statistics
+"""
+import pytest
+from datetime import datetime
+from app import db
+from app.models import Event, Reservation
+from app.routes.controller import calculate_dashboard_stats
+
+
+class TestDashboardStats:
+    """Test aggregate-based dashboard statistics"""
+
+    def test_stats_values(self, app, create_seatings):
+        """Capacity, reserved people and check-ins come from aggregates"""
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 4, reserve_every=2, capacity=4, people=3)
+
+            reservation = Reservation.query.first()
+            reservation.checked_in = True
+            reservation.checked_in_at = datetime.utcnow()
+            db.session.commit()
+
+            stats = calculate_dashboard_stats(event)
+
+            assert stats['total_capacity'] == 16
+            assert stats['reserved_seats'] == 6
+            assert stats['empty_seats'] == 10
+            assert stats['occupancy_rate'] == 37.5
+            assert stats['checked_in_count'] == 1
+            assert stats['total_reservations'] == 2
+            assert len(stats['daily_trend']) == 7
+
+    def test_empty_event(self, app):
+        """Events without seats report zero capacity"""
+        with app.app_context():
+            event = Event.query.first()
+
+            stats = calculate_dashboard_stats(event)
+
+            assert stats['total_capacity'] == 0
+            assert stats['occupancy_rate'] == 0
+            assert stats['total_reservations'] == 0
+
+    @pytest.mark.parametrize('seat_count', [20, 200])
+    def test_query_count_is_constant(self, app, query_counter, create_seatings, seat_count):
+        """Dashboard stats use a fixed number of queries regardless of seat count"""
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, seat_count)
+            calculate_dashboard_stats(event)  # builds the occupancy counters once
+            event = Event.query.get(event.id)
+            event.name, event.event_date  # load attributes outside the counter
+
+            with query_counter() as statements:
+                calculate_dashboard_stats(event)
+
+            assert len(statements) == 2
@@ -0,0 +1,51 @@
+"""
+Cold start budget for create_app()
+
+Runs ``python -X importtime`` in a fresh interpreter so heavy libraries pulled
+in at import time show up as a failure instead of slowly growing worker RSS.
+"""
+import os
+import subprocess
+import sys
+
+# Libraries that must only load on first use (see app/utils/lazy_imports.py)
+LAZY_MODULES = ('reportlab', 'openpyxl', 'pandas', 'numpy', 'qrcode', 'PIL')
+
+# Wall-clock budget for import + create_app(); override on slow CI machines
+BUDGET_SECONDS = float(os.environ.get('CREATE_APP_BUDGET_SECONDS', '3.0'))
+
+SCRIPT = (
+    "import time; started = time.perf_counter(); "
+    "from app import create_app; create_app('testing'); "
+    "print(time.perf_counter() - started)"
+)
+
+
+def run_cold_start():
+    """Return (elapsed seconds, {module: cumulative microseconds})"""
+    env = dict(os.environ, FLASK_ENV='testing', PYTHONWARNINGS='ignore')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', SCRIPT],
+        capture_output=True, text=True, env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    assert result.returncode == 0, result.stderr
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        modules[name.strip()] = int(cumulative)
+
+    return float(result.stdout.strip().splitlines()[-1]), modules
+
+
+def test_create_app_cold_start_budget():
+    elapsed, modules = run_cold_start()
+
+    heavy = sorted(name for name in modules if name.split('.')[0] in LAZY_MODULES)
+    assert not heavy, f'Imported at startup: {heavy[:10]}'
+
+    slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:10]
+    assert elapsed < BUDGET_SECONDS, f'create_app() took {elapsed:.2f}s; slowest imports: {slowest}'
@@ -0,0 +1,133 @@
+"""
+Tests for the background job queue
+"""
+import time
+import uuid
+from app import db
+from app.models import Event, Company, Reservation, BackgroundJob
+from app.services.job_queue import JobQueue, job_queue, JOB_FINISHED, JOB_FAILED
+
+
+class TestJobQueue:
+    """Test job execution, status and results"""
+
+    def test_thread_backend_runs_job(self, app):
+        app.config['JOB_QUEUE_BACKEND'] = 'thread'
+        queue = JobQueue(app)
+        queue.task('add')(lambda a, b: a + b)
+
+        job_id = queue.enqueue('add', company_id=1, a=2, b=3)
+        for _ in range(100):
+            if queue.get(job_id)['status'] == JOB_FINISHED:
+                break
+            time.sleep(0.02)
+
+        job = queue.get(job_id)
+        assert job['status'] == JOB_FINISHED
+        assert job['result'] == 5
+        assert 'kwargs' not in job
+
+    def test_thread_backend_state_is_shared_between_workers(self, app):
+        """Status and results are read from the database, not the enqueuing process"""
+        app.config['JOB_QUEUE_BACKEND'] = 'thread'
+        worker_a, worker_b = JobQueue(app), JobQueue(app)
+        worker_a.task('file')(lambda: {'data': b'xyz', 'filename': 'x.csv', 'mimetype': 'text/csv'})
+
+        job_id = worker_a.enqueue('file', company_id=1)
+        for _ in range(100):
+            if worker_b.get(job_id)['status'] == JOB_FINISHED:
+                break
+            time.sleep(0.02)
+
+        job = worker_b.get(job_id)
+        assert job['status'] == JOB_FINISHED
+        assert job['filename'] == 'x.csv' and job['company_id'] == 1
+        assert worker_b.get_result(job_id) == b'xyz'
+
+    def test_thread_backend_expires_jobs(self, app):
+        app.config['JOB_QUEUE_BACKEND'] = 'thread'
+        app.config['JOB_RESULT_TTL'] = -1
+        queue = JobQueue(app)
+        queue.task('noop')(lambda: None)
+
+        job_id = queue.enqueue('noop')
+        time.sleep(0.1)
+        assert queue.get(job_id) is None
+        queue.store.prune(queue.result_ttl)
+        with app.app_context():
+            assert db.session.get(BackgroundJob, job_id) is None
+
+    def test_failed_job_records_error(self, app):
+        queue = JobQueue(app)
+
+        def explode():
+            raise RuntimeError('boom')
+        queue.task('explode')(explode)
+
+        job = queue.get(queue.enqueue('explode'))
+        assert job['status'] == JOB_FAILED
+        assert job['error'] == 'boom'
+
+    def test_file_result_is_stored(self, app):
+        queue = JobQueue(app)
+        queue.task('file')(lambda: {'data': b'abc', 'filename': 'a.txt', 'mimetype': 'text/plain'})
+
+        job_id = queue.enqueue('file')
+        assert queue.get(job_id)['filename'] == 'a.txt'
+        assert queue.get_result(job_id) == b'abc'
+
+    def test_qr_codes_task(self, app, monkeypatch):
+        generated = []
+        monkeypatch.setattr(Reservation, 'generate_qr_code',
+                            lambda self: generated.append(self.reservation_code))
+
+        with app.app_context():
+            event = Event.query.first()
+            codes = [str(uuid.uuid4()) for _ in range(3)]
+            for code in codes:
+                db.session.add(Reservation(event_id=event.id, phone='05001234567',
+                                           first_name='QR', reservation_code=code))
+            db.session.commit()
+
+            job = job_queue.get(job_queue.enqueue('qr_codes', codes=codes))
+
+        assert job['result'] == {'generated': 3, 'total': 3}
+        assert sorted(generated) == sorted(codes)
+
+
+class TestJobRoutes:
+    """Test enqueue, status and download endpoints"""
+
+    def test_event_export_job_download(self, admin_client, app):
+        with app.app_context():
+            event_id = Event.query.first().id
+
+        response = admin_client.post(f'/export/jobs/event/{event_id}', json={'format': 'csv'})
+        assert response.status_code == 202
+        status_url = response.get_json()['status_url']
+
+        job = admin_client.get(status_url).get_json()['job']
+        assert job['status'] == JOB_FINISHED
+        assert job['filename'].endswith('.csv')
+
+        download = admin_client.get(job['download_url'])
+        assert download.status_code == 200
+        assert download.mimetype == 'text/csv'
+
+    def test_rejects_unknown_format(self, admin_client, app):
+        with app.app_context():
+            event_id = Event.query.first().id
+
+        response = admin_client.post(f'/export/jobs/event/{event_id}', json={'format': 'docx'})
+        assert response.status_code == 400
+
+    def test_other_company_cannot_see_job(self, admin_client, app):
+        with app.app_context():
+            other = Company(name='Other', email='other@example.com', phone='05009999999')
+            db.session.add(other)
+            db.session.commit()
+            job_id = job_queue.enqueue('qr_codes', company_id=other.id, codes=[])
+
+        assert admin_client.get(f'/jobs/{job_id}').status_code == 404
+        assert admin_client.get(f'/jobs/{job_id}/download').status_code == 404
+        assert admin_client.get('/jobs/missing').status_code == 404
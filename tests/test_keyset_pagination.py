@@ -0,0 +1,143 @@
+"""
+Tests for keyset (cursor) pagination of listings
+"""
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from app import db
+from app.models import Event, Reservation
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_paginate
+
+
+def add_reservations(event, count, created_at=None):
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    for i in range(count):
+        db.session.add(Reservation(
+            event_id=event.id,
+            phone='05001234567',
+            first_name='Page',
+            last_name=str(i),
+            reservation_code=str(uuid.uuid4()),
+            created_at=created_at or base + timedelta(minutes=i)
+        ))
+    db.session.commit()
+
+
+def walk(client, url):
+    """Follow next_cursor until the end and collect ids"""
+    ids, cursor, requests = [], None, 0
+    while True:
+        response = client.get(url + (f'&cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        data = response.get_json()
+        key = next(k for k in data if k != 'next_cursor')
+        ids.extend(item['id'] for item in data[key])
+        cursor = data['next_cursor']
+        requests += 1
+        if cursor is None:
+            return ids, requests
+
+
+class TestCursor:
+    """Test cursor encoding"""
+
+    def test_round_trip(self):
+        created_at = datetime(2026, 3, 4, 5, 6, 7, 890)
+        assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+    @pytest.mark.parametrize('cursor', ['not-a-cursor', 'W10', encode_cursor(datetime(2026, 1, 1), 1)[:-3]])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+class TestKeysetPaginate:
+    """Test page boundaries"""
+
+    def test_pages_are_disjoint_with_equal_timestamps(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            add_reservations(event, 7, created_at=datetime(2026, 1, 1))
+
+            seen, cursor = [], None
+            while True:
+                page = keyset_paginate(Reservation.query, Reservation, cursor, per_page=3)
+                seen.extend(r.id for r in page)
+                cursor = page.next_cursor
+                if cursor is None:
+                    break
+
+            assert seen == sorted(seen, reverse=True)
+            assert len(seen) == len(set(seen)) == 7
+
+    def test_new_rows_do_not_shift_later_pages(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            add_reservations(event, 6)
+
+            first = keyset_paginate(Reservation.query, Reservation, None, per_page=3)
+            add_reservations(event, 2, created_at=datetime(2026, 6, 1))
+            second = keyset_paginate(Reservation.query, Reservation, first.next_cursor, per_page=3)
+
+            assert [r.last_name for r in second] == ['2', '1', '0']
+            assert not second.has_next
+
+
+class TestListingRoutes:
+    """Test paginated listing endpoints"""
+
+    def test_reservation_api_walks_all_rows(self, admin_client, app):
+        with app.app_context():
+            add_reservations(Event.query.first(), 12)
+
+        ids, requests = walk(admin_client, '/api/reservations?per_page=5')
+        assert len(ids) == len(set(ids)) == 12
+        assert requests == 3
+
+    def test_event_api(self, admin_client, app):
+        with app.app_context():
+            company_id = Event.query.first().company_id
+            for i in range(4):
+                db.session.add(Event(name=f'Event {i}', company_id=company_id,
+                                     event_date=datetime(2026, 5, 1).date()))
+            db.session.commit()
+
+        ids, _ = walk(admin_client, '/event/api/list?per_page=2')
+        assert len(ids) == len(set(ids)) == 5
+
+    def test_user_api(self, admin_client):
+        ids, requests = walk(admin_client, '/api/users?per_page=1')
+        assert len(ids) == len(set(ids)) == 2
+        assert requests == 2
+
+    def test_invalid_cursor_is_bad_request(self, admin_client):
+        assert admin_client.get('/api/reservations?cursor=garbage').status_code == 400
+        assert admin_client.get('/event/?cursor=garbage').status_code == 400
+
+    def test_listing_pages_render_pager(self, admin_client, app):
+        with app.app_context():
+            add_reservations(Event.query.first(), 3)
+
+        response = admin_client.get('/?per_page=2')
+        assert response.status_code == 200
+        assert b'cursor=' in response.data
+
+        for url in ('/event/', '/users'):
+            assert admin_client.get(url).status_code == 200
+
+    def test_deep_page_costs_the_same(self, admin_client, app, query_counter):
+        with app.app_context():
+            add_reservations(Event.query.first(), 30)
+
+        first = admin_client.get('/api/reservations?per_page=5').get_json()
+        cursor = first['next_cursor']
+        for _ in range(4):
+            cursor = admin_client.get(f'/api/reservations?per_page=5&cursor={cursor}').get_json()['next_cursor']
+
+        with query_counter() as shallow:
+            admin_client.get('/api/reservations?per_page=5')
+        with query_counter() as deep:
+            admin_client.get(f'/api/reservations?per_page=5&cursor={cursor}')
+
+        assert len(deep) == len(shallow)
+        assert any('(reservations.created_at, reservations.id) <' in statement for statement in deep)
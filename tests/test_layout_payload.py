@@ -0,0 +1,171 @@
+"""
+Tests for the packed layout format and compressed layout transfer
+"""
+import gzip
+import json
+import pytest
+from app import db
+from app.models import Event, EventSeating, SeatingLayoutTemplate
+from app.utils.layout_codec import (
+    LAYOUT_FORMAT, load_configuration, pack_configuration, pack_seatings, unpack_seatings
+)
+
+
+def event_id_of(app):
+    with app.app_context():
+        return Event.query.first().id
+
+
+def seats(count):
+    return [{
+        'id': i + 1,
+        'seating_type_id': 7 if i % 2 else 8,
+        'seat_number': f'M{i + 1:03d}',
+        'position_x': i * 80.0,
+        'position_y': 100.5,
+        'width': 60,
+        'height': 40,
+        'color_code': '#3498db' if i % 2 else '#e74c3c'
+    } for i in range(count)]
+
+
+class TestLayoutCodec:
+    """Test packing and unpacking"""
+
+    def test_round_trip(self):
+        types = [{'id': 7, 'name': 'Masa', 'seat_type': 'table', 'capacity': 4, 'icon': None, 'color_code': '#3498db'}]
+        packed = pack_seatings(seats(5), types)
+
+        assert packed['format'] == LAYOUT_FORMAT and packed['count'] == 5
+        assert [t['id'] for t in packed['types']] == [8, 7]
+        assert packed['types'][1]['capacity'] == 4 and packed['types'][0] == {'id': 8}
+        assert packed['columns']['type'] == [0, 1, 0, 1, 0]
+        assert packed['columns']['x'][1] == 80 and isinstance(packed['columns']['x'][1], int)
+        assert unpack_seatings(packed) == seats(5)
+
+    def test_packed_is_smaller(self):
+        verbose = json.dumps(seats(2000))
+        packed = json.dumps(pack_seatings(seats(2000)))
+        assert len(packed) < len(verbose) / 2
+
+    @pytest.mark.parametrize('broken', [
+        {'format': 'other'},
+        {'format': LAYOUT_FORMAT, 'count': 2, 'types': [{'id': 1}], 'columns': {
+            'seat_number': ['A'], 'x': [0], 'y': [0], 'w': [1], 'h': [1], 'type': [0]}},
+        {'format': LAYOUT_FORMAT, 'count': 1, 'types': [{'id': 1}], 'columns': {
+            'seat_number': ['A'], 'x': [0], 'y': [0], 'w': [1], 'h': [1], 'type': [3]}},
+        {'format': LAYOUT_FORMAT, 'count': 1, 'types': [], 'columns': {'seat_number': ['A']}},
+    ])
+    def test_rejects_invalid_layouts(self, broken):
+        with pytest.raises(ValueError):
+            unpack_seatings(broken)
+
+    def test_template_configuration_reads_legacy_lists(self):
+        legacy = json.dumps({'stage_config': {'w': 1}, 'seatings': seats(3)})
+        config = load_configuration(legacy)
+        assert config['stage_config'] == {'w': 1}
+        assert config['layout']['count'] == 3
+
+        stored = json.loads(pack_configuration({'stage_config': {}, 'seatings': seats(3)}))
+        assert 'seatings' not in stored
+        assert [s['seat_number'] for s in unpack_seatings(stored['layout'])] == ['M001', 'M002', 'M003']
+
+
+class TestLayoutEndpoint:
+    """Test GET /event/<id>/layout"""
+
+    def test_gzip_and_conditional_get(self, admin_client, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            event_id = event.id
+            create_seatings(event, 50, reserve_every=5)
+
+        response = admin_client.get(f'/event/{event_id}/layout', headers={'Accept-Encoding': 'gzip'})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        data = json.loads(gzip.decompress(response.data))
+        layout = data['layout']
+        assert layout['count'] == 50
+        assert layout['columns']['status'].count('available') == 50
+        assert layout['types'][0]['capacity'] == 4
+
+        etag = response.headers['ETag']
+        again = admin_client.get(f'/event/{event_id}/layout', headers={'If-None-Match': etag})
+        assert again.status_code == 304
+        assert again.data == b''
+
+    def test_etag_changes_with_layout(self, admin_client, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            event_id = event.id
+            create_seatings(event, 3, reserve_every=0)
+
+        etag = admin_client.get(f'/event/{event_id}/layout').headers['ETag']
+        with app.app_context():
+            EventSeating.query.filter_by(seat_number='M001').one().position_x = 500
+            db.session.commit()
+
+        response = admin_client.get(f'/event/{event_id}/layout', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+
+    def test_small_payload_is_not_compressed(self, admin_client, app):
+        response = admin_client.get(f'/event/{event_id_of(app)}/layout', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+
+
+class TestPackedSave:
+    """Test saving packed, gzip-compressed layouts"""
+
+    def test_gzip_packed_save_keeps_ids(self, admin_client, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            event_id = event.id
+            create_seatings(event, 4, reserve_every=0)
+
+        layout = admin_client.get(f'/event/{event_id}/layout').get_json()['layout']
+        layout['columns']['x'][0] = 700
+        body = gzip.compress(json.dumps({'layout': layout}).encode())
+
+        response = admin_client.post(f'/event/{event_id}/save-layout', data=body, headers={
+            'Content-Type': 'application/json', 'Content-Encoding': 'gzip'
+        })
+        result = response.get_json()
+        assert response.status_code == 200
+        assert (result['added'], result['updated'], result['deleted']) == (0, 1, 0)
+
+        with app.app_context():
+            moved = EventSeating.query.filter_by(event_id=event_id, seat_number='M001').one()
+            assert moved.position_x == 700 and moved.id == layout['columns']['id'][0]
+
+    def test_corrupt_gzip_body(self, admin_client, app):
+        response = admin_client.post(f'/event/{event_id_of(app)}/save-layout', data=b'not gzip', headers={
+            'Content-Type': 'application/json', 'Content-Encoding': 'gzip'
+        })
+        assert response.status_code == 400
+
+
+class TestTemplates:
+    """Test packed template storage"""
+
+    def test_save_and_load_template(self, admin_client, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            event_id = event.id
+            create_seatings(event, 6, reserve_every=0)
+
+        template_id = admin_client.post(f'/event/{event_id}/template/save', json={'name': 'Salon'}).get_json()['template_id']
+
+        with app.app_context():
+            stored = json.loads(db.session.get(SeatingLayoutTemplate, template_id).configuration)
+            assert stored['layout']['count'] == 6
+            assert 'id' not in stored['layout']['columns']
+
+        packed = admin_client.post(f'/event/template/{template_id}/load?format=packed').get_json()['data']
+        assert packed['layout']['count'] == 6 and 'seatings' not in packed
+
+        verbose = admin_client.post(f'/event/template/{template_id}/load').get_json()['data']
+        assert [s['seat_number'] for s in verbose['seatings']][:2] == ['M001', 'M002']
+
+        listing = admin_client.get('/template/api/list').get_json()
+        assert listing['templates'][0]['seating_count'] == 6
@@ -0,0 +1,173 @@
+"""
+Tests for diff-based layout saving
+"""
+import pytest
+from app import db
+from app.models import Event, EventSeating, Reservation
+from app.models.reservation import ReservationStatus
+from app.services.layout_service import LayoutService, LayoutChanges, ReservedSeatDeletionError
+
+
+def layout(event_id):
+    seatings = EventSeating.query.filter_by(event_id=event_id).order_by(EventSeating.id).all()
+    return [{
+        'id': s.id,
+        'seating_type_id': s.seating_type_id,
+        'seat_number': s.seat_number,
+        'position_x': s.position_x,
+        'position_y': s.position_y,
+        'width': s.width,
+        'height': s.height,
+        'color_code': s.color_code
+    } for s in seatings]
+
+
+def save(client, event_id, **payload):
+    return client.post(f'/event/{event_id}/save-layout', json={'stage_position': 'top', **payload})
+
+
+class TestSaveLayout:
+    """Test full-list and change-set saves"""
+
+    def test_unchanged_layout_writes_no_seats(self, admin_client, app, create_seatings, query_counter):
+        with app.app_context():
+            event = Event.query.first()
+            event_id = event.id
+            create_seatings(event, 20, reserve_every=0)
+            seats = layout(event_id)
+
+        with query_counter() as statements:
+            response = save(admin_client, event_id, seats=seats)
+
+        assert response.get_json()['updated'] == 0
+        writes = [s for s in statements if s.lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE'))]
+        assert not any('event_seatings' in s for s in writes)
+
+    def test_moving_one_seat_keeps_ids(self, admin_client, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            event_id = event.id
+            create_seatings(event, 5, reserve_every=0)
+            seats = layout(event_id)
+            ids = [seat['id'] for seat in seats]
+
+        seats[2]['position_x'] = 999
+        data = save(admin_client, event_id, seats=seats).get_json()
+        assert (data['added'], data['updated'], data['deleted']) == (0, 1, 0)
+
+        with app.app_context():
+            after = layout(event_id)
+            assert [seat['id'] for seat in after] == ids
+            assert after[2]['position_x'] == 999
+
+    def test_matches_by_seat_number_without_ids(self, admin_client, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            event_id = event.id
+            create_seatings(event, 3, reserve_every=0)
+            seats = layout(event_id)
+            ids = [seat['id'] for seat in seats]
+
+        for seat in seats:
+            seat.pop('id')
+        seats.pop(0)
+        seats.append({**seats[0], 'seat_number': 'M100'})
+
+        data = save(admin_client, event_id, seats=seats).get_json()
+        assert (data['added'], data['updated'], data['deleted']) == (1, 0, 1)
+        assert data['added_ids'][0]['seat_number'] == 'M100'
+
+        with app.app_context():
+            remaining = [seat['id'] for seat in layout(event_id)]
+            assert remaining[:2] == ids[1:]
+
+    def test_change_set(self, admin_client, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            event_id = event.id
+            create_seatings(event, 3, reserve_every=0)
+            seats = layout(event_id)
+
+        new_seat = {**seats[0], 'seat_number': 'M200'}
+        new_seat.pop('id')
+        data = save(admin_client, event_id, changes={
+            'added': [new_seat],
+            'updated': [{'id': seats[1]['id'], 'position_y': 300}],
+            'deleted': [seats[2]['id']]
+        }).get_json()
+        assert data['success']
+        assert data['seats_saved'] == 3
+
+        with app.app_context():
+            after = {seat['seat_number']: seat for seat in layout(event_id)}
+            assert set(after) == {'M001', 'M002', 'M200'}
+            assert after['M002']['position_y'] == 300
+            assert after['M002']['position_x'] == seats[1]['position_x']
+
+    def test_rejects_deleting_reserved_seat(self, admin_client, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            event_id = event.id
+            create_seatings(event, 4, reserve_every=2)
+            seats = layout(event_id)
+
+        response = save(admin_client, event_id, seats=seats[1:])
+        assert response.status_code == 409
+        assert response.get_json()['reserved_seats'] == ['M001']
+
+        with app.app_context():
+            assert EventSeating.query.filter_by(event_id=event_id).count() == 4
+
+    def test_cancelled_reservation_does_not_block_delete(self, admin_client, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            event_id = event.id
+            create_seatings(event, 2, reserve_every=2)
+            reservation = Reservation.query.first()
+            reservation.status = ReservationStatus.CANCELLED
+            reservation_id = reservation.id
+            db.session.commit()
+            seats = layout(event_id)
+
+        assert save(admin_client, event_id, seats=seats[1:]).status_code == 200
+
+        with app.app_context():
+            assert db.session.get(Reservation, reservation_id).seating_id is None
+
+    def test_claim_after_check_is_not_detached(self, app, create_seatings, monkeypatch):
+        """A reservation claimed after the deletable check keeps its seat"""
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 2, reserve_every=2)
+            reservation = Reservation.query.filter_by(event_id=event.id).one()
+            seat_ids = [seat['id'] for seat in layout(event.id)]
+
+            # Kontrol geçtikten sonra rezervasyon yapılmış gibi davran
+            monkeypatch.setattr(LayoutService, '_check_deletable', lambda self, seat_ids: None)
+            with pytest.raises(ReservedSeatDeletionError) as error:
+                LayoutService(event.id).apply(LayoutChanges(deleted=seat_ids))
+            assert error.value.seat_numbers == ['M001']
+
+            seating_id = db.session.query(Reservation.seating_id).filter_by(id=reservation.id).scalar()
+            assert seating_id == seat_ids[0]
+            assert EventSeating.query.filter_by(event_id=event.id).count() == 1
+
+    def test_rejects_other_events_seats(self, admin_client, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            event_id = event.id
+            other = Event(name='Other', company_id=event.company_id, event_date=event.event_date)
+            db.session.add(other)
+            db.session.commit()
+            create_seatings(other, 1, reserve_every=0)
+            other_seat = layout(other.id)[0]
+
+        response = save(admin_client, event_id, changes={'deleted': [other_seat['id']]})
+        assert response.status_code == 400
+
+    def test_invalid_seat_is_bad_request(self, admin_client, app):
+        with app.app_context():
+            event_id = Event.query.first().id
+
+        response = save(admin_client, event_id, seats=[{'seat_number': 'M1'}])
+        assert response.status_code == 400
@@ -0,0 +1,213 @@
+"""
+Tests for the server-push live feed
+"""
+import json
+import uuid
+from app import db
+from app.models import Event, Company, Reservation
+from app.models.reservation import ReservationStatus
+from app.services import reservation_events
+from app.services.live_feed import live_feed, event_channel, company_channel
+
+
+def add_reservation(event, people=2):
+    reservation = Reservation(
+        event_id=event.id,
+        phone='05001234567',
+        first_name='Live',
+        last_name='Feed',
+        number_of_people=people,
+        reservation_code=str(uuid.uuid4())
+    )
+    db.session.add(reservation)
+    reservation_events.on_reservation_created(reservation)
+    return reservation
+
+
+def parse_sse(chunk):
+    """Parse a single SSE frame into (event, data)"""
+    text = chunk.decode() if isinstance(chunk, bytes) else chunk
+    fields = dict(line.split(': ', 1) for line in text.strip().splitlines() if ': ' in line)
+    return fields.get('event'), json.loads(fields['data']) if 'data' in fields else None
+
+
+class TestLiveFeedBus:
+    """Test publish-after-commit semantics"""
+
+    def test_messages_published_only_after_commit(self, app):
+        """Hooks queue messages; subscribers see them once committed"""
+        with app.app_context():
+            event = Event.query.first()
+            subscription = live_feed.subscribe(event_channel(event.id))
+            try:
+                reservation = add_reservation(event, people=3)
+                assert subscription.get(timeout=0) is None
+
+                db.session.commit()
+                message = subscription.get(timeout=0)
+
+                assert message['type'] == 'reservation'
+                assert message['event_id'] == event.id
+                assert message['delta']['reserved_people'] == 3
+                assert message['reservation']['code'] == reservation.reservation_code
+            finally:
+                subscription.close()
+
+    def test_rollback_discards_pending_messages(self, app):
+        """Rolled back changes are never pushed"""
+        with app.app_context():
+            event = Event.query.first()
+            subscription = live_feed.subscribe(event_channel(event.id))
+            try:
+                add_reservation(event)
+                db.session.rollback()
+                db.session.commit()
+
+                assert subscription.get(timeout=0) is None
+            finally:
+                subscription.close()
+
+    def test_company_channel_receives_checkins(self, app):
+        """Admin dashboards follow all events of their company"""
+        with app.app_context():
+            event = Event.query.first()
+            reservation = add_reservation(event)
+            db.session.commit()
+
+            subscription = live_feed.subscribe(company_channel(event.company_id))
+            try:
+                reservation.checked_in = True
+                reservation_events.on_checked_in(reservation)
+                db.session.commit()
+
+                message = subscription.get(timeout=0)
+                assert message['type'] == 'checkin'
+                assert message['delta'] == {'checked_in_count': 1}
+            finally:
+                subscription.close()
+
+    def test_cancellation_message_carries_negative_delta(self, app):
+        """Cancelling reservations pushes the removed people count"""
+        with app.app_context():
+            event = Event.query.first()
+            first = add_reservation(event, people=2)
+            second = add_reservation(event, people=5)
+            db.session.commit()
+
+            subscription = live_feed.subscribe(event_channel(event.id))
+            try:
+                for reservation in (first, second):
+                    reservation.status = ReservationStatus.CANCELLED
+                reservation_events.on_reservations_cancelled(event.id, [first, second])
+                db.session.commit()
+
+                message = subscription.get(timeout=0)
+                assert message['type'] == 'cancellation'
+                assert message['delta'] == {'reserved_people': -7, 'active_reservations': -2}
+            finally:
+                subscription.close()
+
+
+class TestLiveFeedEndpoint:
+    """Test the SSE endpoints"""
+
+    def test_stream_sends_snapshot_then_deltas(self, authenticated_client, app, monkeypatch):
+        """Controller stream starts with counters and pushes committed check-ins"""
+        monkeypatch.setattr(live_feed, 'heartbeat', 0.05)
+
+        with app.app_context():
+            event = Event.query.first()
+            event_id = event.id
+            reservation = add_reservation(event, people=4)
+            db.session.commit()
+            reservation_id = reservation.id
+
+        response = authenticated_client.get(f'/api/events/{event_id}/live', buffered=False)
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        assert response.headers['X-Accel-Buffering'] == 'no'
+
+        chunks = response.iter_encoded()
+        assert next(chunks).startswith(b'retry:')
+
+        event_type, snapshot = parse_sse(next(chunks))
+        assert event_type == 'snapshot'
+        assert snapshot['reserved_people'] == 4
+        assert snapshot['checked_in_count'] == 0
+
+        with app.app_context():
+            reservation = db.session.get(Reservation, reservation_id)
+            reservation.checked_in = True
+            reservation_events.on_checked_in(reservation)
+            db.session.commit()
+
+        frame = next(chunks)
+        while frame.startswith(b': heartbeat'):
+            frame = next(chunks)
+
+        event_type, message = parse_sse(frame)
+        assert event_type == 'checkin'
+        assert message['reservation']['id'] == reservation_id
+
+        response.close()
+        assert live_feed.backend.subscriber_count(event_channel(event_id)) == 0
+
+    def test_stream_rejects_other_company_event(self, authenticated_client, app):
+        """Events of another company are not exposed"""
+        with app.app_context():
+            other = Company(name='Other', email='other@example.com', phone='05009999999')
+            db.session.add(other)
+            db.session.flush()
+            event = Event(name='Other Event', event_date=Event.query.first().event_date,
+                          company_id=other.id)
+            db.session.add(event)
+            db.session.commit()
+            event_id = event.id
+
+        response = authenticated_client.get(f'/api/events/{event_id}/live')
+        assert response.status_code == 404
+
+    def test_admin_company_stream_snapshot(self, admin_client, app):
+        """Admin stream starts with company-wide totals"""
+        with app.app_context():
+            add_reservation(Event.query.first(), people=3)
+            db.session.commit()
+
+        response = admin_client.get('/api/live-feed', buffered=False)
+        assert response.status_code == 200
+
+        chunks = response.iter_encoded()
+        next(chunks)
+        event_type, snapshot = parse_sse(next(chunks))
+        response.close()
+
+        assert event_type == 'snapshot'
+        assert snapshot['total_reservations'] == 1
+        assert snapshot['reserved_people'] == 3
+
+    def test_stream_limit_returns_503_with_retry(self, app, monkeypatch):
+        """Streams beyond the per-worker limit are refused until a slot frees up"""
+        monkeypatch.setattr(live_feed, 'max_streams', 1)
+        with app.app_context():
+            channel = event_channel(Event.query.first().id)
+
+        with app.test_request_context():
+            first = live_feed.stream(channel, {})
+            assert first.status_code == 200
+            assert live_feed.active_streams() == 1
+
+            busy = live_feed.stream(channel, {})
+            assert busy.status_code == 503
+            assert busy.headers['Retry-After'] == '15'
+            assert busy.get_data().startswith(b'retry: 15000')
+            assert live_feed.backend.subscriber_count(channel) == 1
+
+            first.close()
+            first.close()
+            assert live_feed.active_streams() == 0
+            assert live_feed.backend.subscriber_count(channel) == 0
+
+            again = live_feed.stream(channel, {})
+            assert again.status_code == 200
+            again.close()
+        assert live_feed.active_streams() == 0
@@ -0,0 +1,143 @@
+"""
+Tests for live event occupancy counters
+"""
+import uuid
+from app import db
+from app.models import Event, Reservation, EventOccupancy
+from app.models.reservation import ReservationStatus
+from app.services import reservation_events
+from app.services.occupancy_service import OccupancyService
+
+
+def add_reservation(event, people=2, code=None):
+    reservation = Reservation(
+        event_id=event.id,
+        phone='05001234567',
+        first_name='Live',
+        last_name='Counter',
+        number_of_people=people,
+        reservation_code=code or str(uuid.uuid4())
+    )
+    db.session.add(reservation)
+    reservation_events.on_reservation_created(reservation)
+    db.session.commit()
+    return reservation
+
+
+class TestOccupancyCounters:
+    """Test incremental counter maintenance"""
+
+    def test_counters_built_lazily_from_base_tables(self, app, create_seatings):
+        """First read builds counters from reservations and seatings"""
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 4, reserve_every=2, capacity=4, people=3)
+
+            counters = OccupancyService.get_counters(event.id)
+
+            assert counters.total_capacity == 16
+            assert counters.reserved_people == 6
+            assert counters.active_reservations == 2
+            assert counters.checked_in_count == 0
+
+    def test_create_cancel_and_checkin_update_counters(self, app):
+        """Lifecycle hooks keep counters in sync with the base tables"""
+        with app.app_context():
+            event = Event.query.first()
+            OccupancyService.get_counters(event.id)
+
+            first = add_reservation(event, people=4)
+            add_reservation(event, people=2)
+
+            first.checked_in = True
+            reservation_events.on_checked_in(first)
+            db.session.commit()
+
+            first.status = ReservationStatus.CANCELLED
+            reservation_events.on_reservations_cancelled(event.id, [first])
+            db.session.commit()
+
+            counters = db.session.get(EventOccupancy, event.id)
+            assert counters.reserved_people == 2
+            assert counters.active_reservations == 1
+            assert counters.total_reservations == 2
+            assert counters.checked_in_count == 1
+            assert OccupancyService.reconcile(fix=False) == []
+
+    def test_layout_change_refreshes_capacity(self, app, create_seatings):
+        """Capacity counter follows seat changes"""
+        with app.app_context():
+            event = Event.query.first()
+            OccupancyService.get_counters(event.id)
+
+            create_seatings(event, 3, reserve_every=0, capacity=6)
+            reservation_events.on_layout_changed(event.id)
+            db.session.commit()
+
+            assert db.session.get(EventOccupancy, event.id).total_capacity == 18
+
+    def test_first_read_does_not_commit_caller_changes(self, app):
+        """Getters create missing rows without committing the caller's transaction"""
+        with app.app_context():
+            event = Event.query.first()
+            event_id, name = event.id, event.name
+            event.name = 'Uncommitted'
+
+            OccupancyService.get_counters(event_id)
+            OccupancyService.get_company_totals(event.company_id)
+            db.session.rollback()
+
+            assert db.session.get(Event, event_id).name == name
+            assert db.session.get(EventOccupancy, event_id) is None
+
+    def test_concurrent_first_insert_keeps_transaction(self, app):
+        """A losing counter insert is ignored and the transaction stays usable"""
+        with app.app_context():
+            event = Event.query.first()
+            values = OccupancyService.compute_from_base_tables(event.id)
+            assert OccupancyService._insert(event.id, values) is True
+
+            event.name = 'Still pending'
+            assert OccupancyService._insert(event.id, values) is False
+            OccupancyService.apply_delta(event.id, reserved_people=3)
+            db.session.commit()
+
+            assert db.session.get(Event, event.id).name == 'Still pending'
+            assert db.session.get(EventOccupancy, event.id).reserved_people == 3
+
+    def test_scan_checkin_updates_counter(self, authenticated_client, app):
+        """QR scan check-in increments the checked-in counter"""
+        with app.app_context():
+            event = Event.query.first()
+            add_reservation(event, code='COUNTER123')
+            event_id = event.id
+
+        authenticated_client.post('/checkin/scan', json={'code': 'COUNTER123'})
+
+        with app.app_context():
+            assert db.session.get(EventOccupancy, event_id).checked_in_count == 1
+
+
+class TestOccupancyReconciliation:
+    """Test counter reconciliation job"""
+
+    def test_reconcile_reports_and_fixes_drift(self, app):
+        """Drifted counters are reported and rebuilt"""
+        with app.app_context():
+            event = Event.query.first()
+            add_reservation(event, people=5)
+
+            counters = db.session.get(EventOccupancy, event.id)
+            counters.reserved_people = 42
+            db.session.commit()
+
+            drift = OccupancyService.reconcile()
+
+            assert drift == [{
+                'event_id': event.id,
+                'field': 'reserved_people',
+                'counter': 42,
+                'actual': 5
+            }]
+            assert db.session.get(EventOccupancy, event.id).reserved_people == 5
+            assert OccupancyService.reconcile() == []
@@ -0,0 +1,104 @@
+"""
+Tests for the grouped event occupancy report
+"""
+from datetime import timedelta
+from app import db
+from app.models import Event, Reservation, Company
+from app.services.report_service import ReportService
+
+
+def add_events(template, count):
+    events = []
+    for i in range(count):
+        event = Event(
+            name=f'History {i}',
+            company_id=template.company_id,
+            event_date=template.event_date - timedelta(days=i + 1)
+        )
+        db.session.add(event)
+        events.append(event)
+    db.session.commit()
+    return events
+
+
+class TestEventOccupancy:
+    """Test per-event capacity, reserved and checked-in numbers"""
+
+    def test_grouped_numbers(self, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 4, reserve_every=2, capacity=4, people=3)
+            reservation = Reservation.query.filter_by(event_id=event.id).first()
+            reservation.checked_in = True
+            db.session.commit()
+            add_events(event, 1)
+
+            rows, pagination = ReportService(event.company_id)._get_event_occupancy(None)
+
+            assert pagination == {'page': 1, 'per_page': 50, 'total': 2, 'pages': 1}
+            assert rows[0] == {
+                'event_id': event.id,
+                'event_name': event.name,
+                'event_date': event.event_date.isoformat(),
+                'total_seats': 4,
+                'total_capacity': 16,
+                'reserved_seats': 2,
+                'reserved_people': 6,
+                'checked_in': 1,
+                'occupancy_rate': 37.5
+            }
+            assert rows[1]['total_capacity'] == 0
+            assert rows[1]['occupancy_rate'] == 0
+
+    def test_pages(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            add_events(event, 6)
+
+            rows, pagination = ReportService(event.company_id)._get_event_occupancy(None, page=2, per_page=3)
+
+            assert [row['event_name'] for row in rows] == ['History 2', 'History 3', 'History 4']
+            assert pagination['pages'] == 3
+
+    def test_other_company_data_is_not_aggregated(self, app, create_seatings, query_counter):
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 2, reserve_every=1, capacity=4, people=2)
+
+            other = Company(name='Other', email='other@example.com', phone='05009999999')
+            db.session.add(other)
+            db.session.flush()
+            foreign = Event(name='Foreign', company_id=other.id, event_date=event.event_date)
+            db.session.add(foreign)
+            db.session.commit()
+            create_seatings(foreign, 5, reserve_every=1, capacity=8, people=7)
+
+            with query_counter() as statements:
+                rows, pagination = ReportService(event.company_id)._get_event_occupancy(None)
+
+            assert pagination['total'] == 1
+            assert [(row['event_id'], row['total_capacity'], row['reserved_people']) for row in rows] == [
+                (event.id, 8, 4)
+            ]
+            # Aggregates are limited to the events on the page
+            data_query = next(s for s in statements if 'GROUP BY' in s)
+            assert 'event_seatings.event_id IN (SELECT' in data_query
+            assert 'reservations.event_id IN (SELECT' in data_query
+
+    def test_query_count_does_not_grow_with_events(self, app, create_seatings, query_counter):
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 3)
+
+            with query_counter() as few:
+                report = ReportService(event.company_id).get_occupancy_analysis_report()
+            assert 'error' not in report
+
+            for other in add_events(event, 40):
+                create_seatings(other, 2)
+
+            with query_counter() as many:
+                report = ReportService(event.company_id).get_occupancy_analysis_report()
+            assert len(report['event_occupancy']) == 41
+            assert len(many) == len(few)
+            assert len(many) <= 8
@@ -0,0 +1,150 @@
+"""
+Tests for the cached QR code service
+"""
+import pytest
+from app import db
+from app.models import Event, Company, Reservation
+from app.models.reservation import ReservationStatus
+from app.services.qr_service import QRCodeService, get_qr_service, backfill_qr_files, render_png_files
+
+
+def add_reservation(event, code):
+    reservation = Reservation(
+        event_id=event.id,
+        phone='05001234567',
+        first_name='QR',
+        reservation_code=code
+    )
+    db.session.add(reservation)
+    db.session.commit()
+    return reservation
+
+
+class TestQRCodeService:
+    """Test rendering and the LRU cache"""
+
+    def test_renders_once_per_code_and_size(self):
+        service = QRCodeService()
+
+        first = service.get('CODE1')
+        assert first.data.startswith(b'\x89PNG')
+        assert service.get('CODE1') is first
+        assert service.get('CODE1', box_size=5) is not first
+        assert service.stats()['hits'] == 1
+        assert service.stats()['misses'] == 2
+
+    def test_svg_output(self):
+        image = QRCodeService().get('CODE1', 'svg')
+        assert image.mimetype == 'image/svg+xml'
+        assert b'<svg' in image.data
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            QRCodeService().get('CODE1', 'gif')
+
+    def test_evicts_least_recently_used(self):
+        size = len(QRCodeService().png_bytes('A'))
+        service = QRCodeService(max_bytes=size * 2 + size // 2)
+
+        service.get('A')
+        service.get('B')
+        service.get('A')
+        service.get('C')
+
+        stats = service.stats()
+        assert stats['entries'] == 2
+        assert stats['bytes'] <= service.max_bytes
+        service.get('A')
+        assert service.stats()['misses'] == 3
+
+    def test_reservation_bytes_use_cache(self, app):
+        with app.app_context():
+            reservation = add_reservation(Event.query.first(), 'CACHED1')
+            data = reservation.get_qr_code_bytes().read()
+            assert data == get_qr_service().png_bytes('CACHED1')
+
+
+class TestQRImageRoute:
+    """Test serving QR images with ETags"""
+
+    def test_serves_png_with_etag(self, admin_client, app):
+        with app.app_context():
+            add_reservation(Event.query.first(), 'ROUTE1')
+
+        response = admin_client.get('/qr/ROUTE1.png')
+        assert response.status_code == 200
+        assert response.mimetype == 'image/png'
+        etag = response.headers['ETag']
+        assert not etag.startswith('W/')
+
+        cached = admin_client.get('/qr/ROUTE1.png', headers={'If-None-Match': etag})
+        assert cached.status_code == 304
+
+        svg = admin_client.get('/qr/ROUTE1.svg?download=1')
+        assert svg.mimetype == 'image/svg+xml'
+        assert 'attachment' in svg.headers['Content-Disposition']
+
+    def test_rejects_other_company_and_format(self, admin_client, app):
+        with app.app_context():
+            other = Company(name='Other', email='other@example.com', phone='05009999999')
+            db.session.add(other)
+            db.session.commit()
+            event = Event(name='Other Event', company_id=other.id,
+                          event_date=Event.query.first().event_date)
+            db.session.add(event)
+            db.session.commit()
+            add_reservation(event, 'FOREIGN1')
+            add_reservation(Event.query.first(), 'OWN1')
+
+        assert admin_client.get('/qr/FOREIGN1.png').status_code == 404
+        assert admin_client.get('/qr/OWN1.gif').status_code == 404
+
+
+class TestQRBackfill:
+    """Test the parallel QR file backfill"""
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_backfill_is_batched_and_resumable(self, app, tmp_path, query_counter, workers):
+        with app.app_context():
+            event = Event.query.first()
+            for i in range(25):
+                add_reservation(event, f'BACK{i:03d}')
+            cancelled = add_reservation(event, 'CANCELLED1')
+            cancelled.status = ReservationStatus.CANCELLED
+            db.session.commit()
+
+            with query_counter() as statements:
+                stats = backfill_qr_files(str(tmp_path), workers=workers, chunk_size=10, batch_size=4)
+
+            assert stats['total'] == 25
+            assert stats['generated'] == 25
+            assert len(list(tmp_path.iterdir())) == 25
+            updates = [s for s in statements if s.lstrip().upper().startswith('UPDATE RESERVATIONS')]
+            assert len(updates) == 3
+
+            db.session.expire_all()
+            reservation = Reservation.query.filter_by(reservation_code='BACK007').first()
+            assert reservation.qr_code_path == 'uploads/qr/BACK007.png'
+            assert db.session.get(Reservation, cancelled.id).qr_code_path is None
+
+            assert backfill_qr_files(str(tmp_path), workers=1)['total'] == 0
+
+    def test_render_skips_existing_files(self, tmp_path):
+        existing = tmp_path / 'SKIP1.png'
+        existing.write_bytes(b'old')
+
+        results = render_png_files(['SKIP1', 'NEW1'], str(tmp_path))
+
+        assert results == [('SKIP1', None), ('NEW1', None)]
+        assert existing.read_bytes() == b'old'
+        assert (tmp_path / 'NEW1.png').read_bytes().startswith(b'\x89PNG')
+
+    def test_failed_write_leaves_no_partial_file(self, tmp_path, monkeypatch):
+        def interrupted(*args):
+            raise OSError('disk full')
+
+        monkeypatch.setattr('app.services.qr_service.os.replace', interrupted)
+        results = render_png_files(['PART1'], str(tmp_path))
+
+        assert results == [('PART1', 'disk full')]
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,126 @@
+"""
+EXPLAIN checks for the hot filter paths
+
+``used_indexes`` asks the planner which indexes a statement would use. The
+SQLite tests run everywhere; the PostgreSQL tests run when TEST_POSTGRES_URL
+points at a disposable database, with sequential scans disabled so tiny test
+tables still show whether an index is usable.
+"""
+import json
+import os
+import re
+import pytest
+from datetime import date
+from sqlalchemy import create_engine, select, text
+from app import db
+from app.models import Event, EventSeating, Reservation
+from app.models.event import EventStatus
+from app.models.reservation import ReservationStatus
+from app.models.seating import SeatStatus
+
+INDEX_SCANS = ('Index Scan', 'Index Only Scan', 'Bitmap Index Scan')
+
+# (statement, indexes any of which satisfies the access pattern)
+KEY_QUERIES = {
+    'reservations_by_event_status': (
+        select(Reservation).where(
+            Reservation.event_id == 1, Reservation.status == ReservationStatus.CANCELLED
+        ),
+        {'ix_reservations_event_status'}
+    ),
+    'active_reservations_by_event': (
+        select(Reservation).where(
+            Reservation.event_id == 1, Reservation.status == ReservationStatus.ACTIVE
+        ),
+        {'ix_reservations_event_status', 'ix_reservations_active_event_seating'}
+    ),
+    'reservations_by_event_checked_in': (
+        select(Reservation).where(Reservation.event_id == 1, Reservation.checked_in == True),  # noqa: E712
+        {'ix_reservations_event_checked_in'}
+    ),
+    'reservations_by_seating_status': (
+        select(Reservation).where(
+            Reservation.seating_id == 1, Reservation.status == ReservationStatus.ACTIVE
+        ),
+        {'ix_reservations_seating_status'}
+    ),
+    'reservations_by_phone': (
+        select(Reservation).where(Reservation.phone == '05001234567'),
+        {'ix_reservations_phone'}
+    ),
+    'seatings_by_event_status': (
+        select(EventSeating).where(
+            EventSeating.event_id == 1, EventSeating.status == SeatStatus.AVAILABLE
+        ),
+        {'ix_event_seatings_event_status'}
+    ),
+    'events_by_company_status_date': (
+        select(Event).where(
+            Event.company_id == 1,
+            Event.status == EventStatus.ACTIVE,
+            Event.event_date >= date(2026, 1, 1)
+        ),
+        {'ix_events_company_status_date'}
+    ),
+}
+
+
+def used_indexes(connection, statement):
+    """Return the names of the indexes the planner would scan for ``statement``"""
+    sql = str(statement.compile(connection, compile_kwargs={'literal_binds': True}))
+
+    if connection.dialect.name == 'postgresql':
+        plan = connection.execute(text(f'EXPLAIN (FORMAT JSON) {sql}')).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        names, nodes = set(), [plan[0]['Plan']]
+        while nodes:
+            node = nodes.pop()
+            if node.get('Node Type') in INDEX_SCANS:
+                names.add(node['Index Name'])
+            nodes.extend(node.get('Plans', ()))
+        return names
+
+    rows = connection.execute(text(f'EXPLAIN QUERY PLAN {sql}')).fetchall()
+    return {
+        match.group(1)
+        for row in rows
+        for match in [re.search(r'USING (?:COVERING )?INDEX (\w+)', row[-1])]
+        if match
+    }
+
+
+@pytest.fixture
+def pg_connection():
+    url = os.environ.get('TEST_POSTGRES_URL')
+    if not url:
+        pytest.skip('TEST_POSTGRES_URL not set')
+
+    engine = create_engine(url)
+    db.metadata.create_all(engine)
+    try:
+        with engine.connect() as connection:
+            connection.execute(text('SET enable_seqscan = off'))
+            yield connection
+    finally:
+        db.metadata.drop_all(engine)
+        engine.dispose()
+
+
+@pytest.mark.parametrize('name', sorted(KEY_QUERIES))
+def test_sqlite_uses_index(app, name):
+    statement, expected = KEY_QUERIES[name]
+    with app.app_context():
+        assert used_indexes(db.session.connection(), statement) & expected
+
+
+@pytest.mark.parametrize('name', sorted(KEY_QUERIES))
+def test_postgresql_uses_index_scan(pg_connection, name):
+    statement, expected = KEY_QUERIES[name]
+    assert used_indexes(pg_connection, statement) & expected
+
+
+def test_postgresql_search_uses_trigram_index(pg_connection):
+    statement = select(Reservation).where(Reservation.search_text.contains('yilmaz', autoescape=True))
+    assert 'ix_reservations_search_trgm' in used_indexes(pg_connection, statement)
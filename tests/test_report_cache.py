@@ -0,0 +1,145 @@
+"""
+Tests for the report result cache
+"""
+import uuid
+from app import db
+from app.models import Event, Reservation
+from app.services import reservation_events
+from app.services.report_cache import report_cache
+from app.services.report_service import ReportService
+
+
+def add_reservation(event):
+    reservation = Reservation(
+        event_id=event.id,
+        phone='05001234567',
+        first_name='Cache',
+        reservation_code=str(uuid.uuid4())
+    )
+    db.session.add(reservation)
+    reservation_events.on_reservation_created(reservation)
+    db.session.commit()
+    return reservation
+
+
+class Counter:
+    def __init__(self, value=None):
+        self.calls = 0
+        self.value = value if value is not None else {'total': 1}
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def other_event(event):
+    other = Event(name='Second', company_id=event.company_id, event_date=event.event_date)
+    db.session.add(other)
+    db.session.commit()
+    return other
+
+
+class TestReportCache:
+    """Test keys, scopes and invalidation"""
+
+    def test_caches_by_company_type_and_params(self, app):
+        with app.app_context():
+            compute = Counter()
+            for _ in range(2):
+                report_cache.get_or_compute('summary', compute, company_id=1, params={'start_date': None})
+            assert compute.calls == 1
+
+            report_cache.get_or_compute('summary', compute, company_id=1, params={'start_date': '2026-01-01'})
+            report_cache.get_or_compute('summary', compute, company_id=2, params={'start_date': None})
+            report_cache.get_or_compute('occupancy', compute, company_id=1, params={'start_date': None})
+            assert compute.calls == 4
+
+    def test_cached_result_is_a_copy(self, app):
+        with app.app_context():
+            report_cache.get_or_compute('summary', Counter(), company_id=1)['total'] = 99
+            assert report_cache.get_or_compute('summary', Counter(), company_id=1) == {'total': 1}
+
+    def test_errors_are_not_cached(self, app):
+        with app.app_context():
+            compute = Counter({'error': 'boom'})
+            report_cache.get_or_compute('summary', compute, company_id=1)
+            report_cache.get_or_compute('summary', compute, company_id=1)
+            assert compute.calls == 2
+
+    def test_reservation_change_invalidates_event_and_company(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            second = other_event(event)
+            company, event_report, second_report = Counter(), Counter(), Counter()
+
+            def read():
+                report_cache.get_or_compute('summary', company, company_id=event.company_id)
+                report_cache.get_or_compute('overview', event_report, company_id=event.company_id, event_id=event.id)
+                report_cache.get_or_compute('overview', second_report, company_id=event.company_id, event_id=second.id)
+
+            read()
+            add_reservation(event)
+            read()
+
+            assert company.calls == 2
+            assert event_report.calls == 2
+            assert second_report.calls == 1
+
+    def test_invalidation_waits_for_commit(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            compute = Counter()
+            report_cache.get_or_compute('summary', compute, company_id=event.company_id)
+
+            event.name = 'Renamed'
+            db.session.flush()
+            report_cache.get_or_compute('summary', compute, company_id=event.company_id)
+            assert compute.calls == 1
+
+            db.session.rollback()
+            report_cache.get_or_compute('summary', compute, company_id=event.company_id)
+            assert compute.calls == 1
+
+            event.name = 'Renamed'
+            db.session.commit()
+            report_cache.get_or_compute('summary', compute, company_id=event.company_id)
+            assert compute.calls == 2
+
+    def test_memory_cache_disabled_for_multiple_workers(self, app):
+        with app.app_context():
+            app.config['WEB_CONCURRENCY'] = 4
+            try:
+                report_cache.init_app(app)
+                compute = Counter()
+                report_cache.get_or_compute('summary', compute, company_id=1)
+                report_cache.get_or_compute('summary', compute, company_id=1)
+                assert compute.calls == 2
+            finally:
+                app.config['WEB_CONCURRENCY'] = 1
+                report_cache.init_app(app)
+            assert report_cache.ttl == app.config['REPORT_CACHE_TTL']
+
+
+class TestReportRoutes:
+    """Test that report endpoints reuse cached results"""
+
+    def test_api_summary_is_cached(self, admin_client, app, monkeypatch):
+        calls = []
+        original = ReportService.get_summary_report
+
+        def counting(self, *args, **kwargs):
+            calls.append(args)
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(ReportService, 'get_summary_report', counting)
+
+        assert admin_client.get('/api/summary').get_json()['success']
+        admin_client.get('/api/summary')
+        assert len(calls) == 1
+
+        with app.app_context():
+            add_reservation(Event.query.first())
+
+        data = admin_client.get('/api/summary').get_json()['data']
+        assert len(calls) == 2
+        assert data['total_reservations'] >= 1
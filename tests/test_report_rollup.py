@@ -0,0 +1,123 @@
+"""
+Tests for the daily report rollup
+"""
+import uuid
+from datetime import datetime, timedelta
+from app import db
+from app.models import Event, Reservation, ReservationDailyRollup, ReportRollupCoverage
+from app.models.reservation import ReservationStatus
+from app.services import reservation_events
+from app.services.analytics_service import AnalyticsService
+from app.services.report_service import ReportService
+from app.services.rollup_service import RollupService
+
+
+def add_reservation(event, people=2):
+    reservation = Reservation(
+        event_id=event.id,
+        phone='05001234567',
+        first_name='Roll',
+        last_name='Up',
+        number_of_people=people,
+        reservation_code=str(uuid.uuid4()),
+        created_at=datetime.utcnow()
+    )
+    db.session.add(reservation)
+    db.session.flush()
+    reservation_events.on_reservation_created(reservation)
+    db.session.commit()
+    return reservation
+
+
+def rollup_totals(event_id):
+    rows = ReservationDailyRollup.query.filter_by(event_id=event_id).all()
+    return {
+        field: sum(getattr(row, field) for row in rows)
+        for field in ('created', 'cancelled', 'checked_in', 'people')
+    }
+
+
+def run_lifecycle(event):
+    first = add_reservation(event, people=4)
+    add_reservation(event, people=3)
+
+    first.checked_in = True
+    first.checked_in_at = datetime.utcnow()
+    reservation_events.on_checked_in(first)
+    db.session.commit()
+
+    first.status = ReservationStatus.CANCELLED
+    first.cancelled_at = datetime.utcnow()
+    reservation_events.on_reservations_cancelled(event.id, [first])
+    db.session.commit()
+
+
+class TestRollupMaintenance:
+    """Test incremental updates and the rebuild job"""
+
+    def test_hooks_update_rollup(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            run_lifecycle(event)
+            reservation_events.on_reservations_imported(event.id, 5, 10)
+            db.session.commit()
+
+            assert rollup_totals(event.id) == {'created': 7, 'cancelled': 1, 'checked_in': 1, 'people': 17}
+
+    def test_rebuild_matches_incremental_rows(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            run_lifecycle(event)
+            incremental = rollup_totals(event.id)
+
+            RollupService.rebuild_company(event.company_id)
+            db.session.commit()
+
+            assert rollup_totals(event.id) == incremental
+            assert db.session.get(ReportRollupCoverage, event.company_id).covered_from is None
+
+    def test_coverage_window(self, app):
+        with app.app_context():
+            company_id = Event.query.first().company_id
+            today = datetime.utcnow().date()
+            assert not RollupService.covers(company_id)
+
+            RollupService.rebuild_company(company_id, since=today)
+            assert RollupService.covers(company_id, today)
+            assert not RollupService.covers(company_id, today - timedelta(days=1))
+            assert not RollupService.covers(company_id)
+
+            RollupService.rebuild_company(company_id)
+            assert RollupService.covers(company_id)
+
+
+class TestRollupReports:
+    """Test that reports read the rollup without changing their output"""
+
+    def strip(self, report):
+        report.pop('generated_at', None)
+        return report
+
+    def test_reports_match_base_tables(self, app, query_counter):
+        with app.app_context():
+            event = Event.query.first()
+            run_lifecycle(event)
+            company_id = event.company_id
+            start = datetime.now() - timedelta(days=30)
+            end = datetime.now() + timedelta(days=365)
+
+            summary = self.strip(ReportService(company_id).get_summary_report(start, end))
+            analysis = self.strip(ReportService(company_id).get_reservation_analysis_report(start, end))
+            comparative = AnalyticsService().get_comparative_analysis(company_id)
+
+            RollupService.rebuild_company(company_id)
+            db.session.commit()
+
+            with query_counter() as statements:
+                assert self.strip(ReportService(company_id).get_summary_report(start, end)) == summary
+                assert self.strip(ReportService(company_id).get_reservation_analysis_report(start, end)) == analysis
+            assert AnalyticsService().get_comparative_analysis(company_id) == comparative
+            assert 'error' not in summary and 'error' not in analysis
+
+            grouped = [s for s in statements if 'FROM reservations' in s and 'GROUP BY' in s]
+            assert grouped == []
@@ -0,0 +1,143 @@
+"""
+Tests for bulk reservation import
+"""
+import io
+import pytest
+from openpyxl import Workbook
+from app import db
+from app.models import Event, EventSeating, Reservation, EventOccupancy
+from app.models.seating import SeatStatus
+from app.services.reservation_import_service import ReservationImportService
+
+
+def csv_file(lines):
+    return io.BytesIO('\n'.join(lines).encode('utf-8'))
+
+
+class TestReservationImportService:
+    """Test parsing, validation and batched inserts"""
+
+    def test_read_csv_with_turkish_headers(self, app):
+        with app.app_context():
+            rows = ReservationImportService.read_rows(csv_file([
+                'Telefon;Ad;Soyad;Kişi Sayısı;Masa',
+                '05321234567;Ayşe;Yılmaz;3;M002',
+                ';;;;',
+                '0532 123 45 68;Mehmet;;;',
+            ]), 'guests.csv')
+
+            assert rows == [
+                {'phone': '05321234567', 'first_name': 'Ayşe', 'last_name': 'Yılmaz',
+                 'number_of_people': '3', 'seat_number': 'M002'},
+                {'phone': '0532 123 45 68', 'first_name': 'Mehmet', 'last_name': None,
+                 'number_of_people': None, 'seat_number': None},
+            ]
+
+    def test_read_xlsx_restores_leading_zero(self, app):
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(['phone', 'first_name', 'number_of_people'])
+        sheet.append([5321234567, 'Ali', 2])
+        stream = io.BytesIO()
+        workbook.save(stream)
+        stream.seek(0)
+
+        with app.app_context():
+            rows = ReservationImportService.read_rows(stream, 'guests.xlsx')
+
+        assert rows == [{'phone': '05321234567', 'first_name': 'Ali', 'number_of_people': 2}]
+
+    def test_rejects_unknown_file_type(self, app):
+        with app.app_context():
+            with pytest.raises(ValueError):
+                ReservationImportService.read_rows(io.BytesIO(b''), 'guests.pdf')
+
+    def test_import_reports_errors_and_assigns_seats(self, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 3, reserve_every=0, capacity=2)
+            create_seatings(event, 2, reserve_every=0, capacity=6)
+            seats = {s.seat_number: s for s in EventSeating.query.filter_by(event_id=event.id)}
+
+            rows = [
+                {'phone': '05321234567', 'first_name': 'Big', 'number_of_people': '5'},
+                {'phone': '12345', 'first_name': 'Bad'},
+                {'phone': '05321234568', 'first_name': 'Pinned', 'seat_number': 'M002'},
+                {'phone': '05321234569', 'first_name': 'Small', 'number_of_people': '2'},
+                {'phone': '05321234570', 'first_name': 'Ghost', 'seat_number': 'X999'},
+            ]
+            report = ReservationImportService(event.id).import_rows(rows)
+
+            assert report['imported'] == 3
+            assert [e['row'] for e in report['errors']] == [3, 6]
+            assert 'phone' in report['errors'][0]['errors']
+            assert 'seat_number' in report['errors'][1]['errors']
+
+            by_name = {r.first_name: r for r in Reservation.query.all()}
+            assert by_name['Big'].seating.seating_type.capacity == 6
+            assert by_name['Pinned'].seating_id == seats['M002'].id
+            assert by_name['Small'].seating.seating_type.capacity == 2
+            assert by_name['Small'].seating_id != seats['M002'].id
+            assert all(r.seating.status == SeatStatus.RESERVED for r in by_name.values())
+
+            counters = db.session.get(EventOccupancy, event.id)
+            assert counters.active_reservations == 3
+            assert counters.reserved_people == 8
+
+    def test_dry_run_writes_nothing(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            report = ReservationImportService(event.id).import_rows(
+                [{'phone': '05321234567'}], assign_seats=False, dry_run=True
+            )
+
+            assert report['valid'] == 1
+            assert report['imported'] == 0
+            assert Reservation.query.count() == 0
+
+    def test_large_import_uses_batched_statements(self, app, query_counter):
+        with app.app_context():
+            event = Event.query.first()
+            rows = [{'phone': f'0532{i:07d}', 'first_name': 'Guest'} for i in range(1200)]
+
+            with query_counter() as statements:
+                report = ReservationImportService(event.id).import_rows(rows, assign_seats=False)
+
+            assert report['imported'] == 1200
+            assert Reservation.query.count() == 1200
+            inserts = [s for s in statements if s.lstrip().upper().startswith('INSERT INTO RESERVATIONS')]
+            assert len(inserts) <= 3
+            assert len(statements) < 15
+
+
+class TestReservationImportRoute:
+    """Test the upload endpoint"""
+
+    def test_import_endpoint(self, admin_client, app, monkeypatch):
+        queued = []
+        monkeypatch.setattr(ReservationImportService, 'queue_qr_generation',
+                            lambda self, codes, **kwargs: queued.extend(codes) or 'job-1')
+
+        with app.app_context():
+            event_id = Event.query.first().id
+
+        response = admin_client.post(f'/import/{event_id}', data={
+            'file': (csv_file(['phone,first_name', '05321234567,Ayşe', 'abc,Bad']), 'guests.csv'),
+            'assign_seats': 'false'
+        }, content_type='multipart/form-data')
+
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data['imported'] == 1
+        assert data['failed'] == 1
+        assert data['qr_pending'] == 1
+        assert len(queued) == 1
+        assert data['qr_job_id'] == 'job-1'
+
+    def test_import_endpoint_requires_file(self, admin_client, app):
+        with app.app_context():
+            event_id = Event.query.first().id
+
+        response = admin_client.post(f'/import/{event_id}', data={},
+                                     content_type='multipart/form-data')
+        assert response.status_code == 400
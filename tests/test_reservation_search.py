@@ -0,0 +1,155 @@
+"""
+Tests for folded reservation search and the in-memory n-gram index
+"""
+import os
+import time
+import uuid
+import pytest
+from app import db
+from app.models import Event, Reservation
+from app.models.reservation import ReservationStatus
+from app.services import search_service
+from app.services.search_service import EventSearchIndex, ReservationSearchService, get_search_index
+from app.utils.search_text import build_search_text, fold_text, normalize_query, phone_digits
+
+# Type-ahead budget for one search over a 50k-entry event index
+SEARCH_BUDGET_MS = float(os.environ.get('SEARCH_BUDGET_MS', '20'))
+
+
+def add_reservation(event, first_name, last_name=None, phone='05001234567', status=ReservationStatus.ACTIVE):
+    reservation = Reservation(
+        event_id=event.id,
+        phone=phone,
+        first_name=first_name,
+        last_name=last_name,
+        reservation_code=str(uuid.uuid4()),
+        status=status
+    )
+    db.session.add(reservation)
+    db.session.commit()
+    return reservation
+
+
+def search(event, term):
+    query = Reservation.query.filter(Reservation.event_id == event.id)
+    return [r.first_name for r in ReservationSearchService(event.id).filter(query, term).order_by(Reservation.id)]
+
+
+class TestSearchText:
+    """Test Turkish folding and phone normalization"""
+
+    def test_fold_text(self):
+        assert fold_text('  İŞÇİ   Işık ') == 'isci isik'
+        assert fold_text('ĞÜNÖ çağrı') == 'guno cagri'
+        assert fold_text('José') == 'jose'
+
+    def test_phone_digits(self):
+        assert phone_digits('+90 (500) 123 45 67') == '05001234567'
+        assert phone_digits('500 123 45 67') == '05001234567'
+        assert phone_digits('0500-123') == '0500123'
+
+    def test_normalize_query(self):
+        assert normalize_query('0500 123') == ('0500123', True)
+        assert normalize_query('+90 500') == ('0500', True)
+        assert normalize_query('Şahin') == ('sahin', False)
+
+    def test_search_text_kept_in_sync(self, app):
+        with app.app_context():
+            reservation = add_reservation(Event.query.first(), 'Ayşe', 'Yılmaz', phone='0500 111 22 33')
+            assert reservation.search_text == build_search_text('Ayşe', 'Yılmaz', '0500 111 22 33',
+                                                                reservation.reservation_code)
+            assert reservation.search_text.startswith('ayse yilmaz ')
+            assert reservation.search_text.endswith(' 05001112233')
+
+            reservation.last_name = 'Öztürk'
+            db.session.commit()
+            assert reservation.search_text.startswith('ayse ozturk ')
+
+
+class TestReservationSearch:
+    """Test searching through the in-memory index and the LIKE fallback"""
+
+    def test_matches_folded_names_phone_and_code(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            add_reservation(event, 'Işık', 'Şahin', phone='05321112233')
+            second = add_reservation(event, 'Ismail', 'Çelik', phone='05449998877')
+
+            assert search(event, 'ISIK') == ['Işık']
+            assert search(event, 'şah') == ['Işık']
+            assert search(event, 'is') == ['Işık', 'Ismail']
+            assert search(event, '0544 999') == ['Ismail']
+            assert search(event, second.reservation_code[:8].upper()) == ['Ismail']
+            assert search(event, 'zzz') == []
+
+    def test_index_picks_up_new_and_edited_reservations(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            first = add_reservation(event, 'Mehmet')
+            assert search(event, 'mehmet') == ['Mehmet']
+
+            add_reservation(event, 'Mehmet Ali')
+            assert search(event, 'mehmet') == ['Mehmet', 'Mehmet Ali']
+
+            first.first_name = 'Ahmet'
+            db.session.commit()
+            assert search(event, 'mehmet') == ['Mehmet Ali']
+            assert search(event, 'ahmet') == ['Ahmet']
+
+    def test_insert_extends_index_instead_of_rebuilding(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            first = add_reservation(event, 'Zeynep')
+            assert search(event, 'zeynep') == ['Zeynep']
+            index = get_search_index().get_index(event.id)
+
+            add_reservation(event, 'Zeynep Nur')
+            assert search(event, 'zeynep') == ['Zeynep', 'Zeynep Nur']
+            assert get_search_index().get_index(event.id) is index
+
+            first.phone = '05559876543'
+            db.session.commit()
+            assert get_search_index().get_index(event.id) is not index
+
+    def test_falls_back_to_like_for_broad_terms(self, app, monkeypatch, query_counter):
+        monkeypatch.setattr(search_service, 'SEARCH_ID_LIMIT', 1)
+        with app.app_context():
+            event = Event.query.first()
+            add_reservation(event, 'Elif')
+            add_reservation(event, 'Elifnur')
+
+            with query_counter() as statements:
+                assert search(event, 'elif') == ['Elif', 'Elifnur']
+            assert any('search_text LIKE' in s for s in statements)
+
+    def test_api_search(self, authenticated_client, app):
+        with app.app_context():
+            event = Event.query.first()
+            add_reservation(event, 'Gül', 'Öz')
+            add_reservation(event, 'Gülşen', status=ReservationStatus.CANCELLED)
+            event_id = event.id
+
+        with authenticated_client.session_transaction() as sess:
+            sess['active_event_id'] = event_id
+
+        data = authenticated_client.get('/api/reservations/search?q=GUL').get_json()
+        assert [r['name'] for r in data['reservations']] == ['Gül Öz']
+
+
+class TestSearchIndexSpeed:
+    """Type-ahead stays within budget on a large event"""
+
+    @pytest.mark.parametrize('term', ['ah', 'yilmaz', '0532'])
+    def test_search_50k_entries(self, term):
+        names = ['ahmet', 'mehmet', 'ayse', 'fatma', 'mustafa', 'emine', 'ali', 'zeynep']
+        surnames = ['yilmaz', 'kaya', 'demir', 'sahin', 'celik', 'yildiz', 'ozturk']
+        index = EventSearchIndex()
+        for i in range(50000):
+            index.add(i + 1, f'{names[i % 8]} {surnames[i % 7]}{i} {uuid.UUID(int=i).hex} 053{i:08d}')
+
+        started = time.perf_counter()
+        results = index.search(term)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        assert results
+        assert elapsed_ms < SEARCH_BUDGET_MS, f'{term!r} took {elapsed_ms:.1f}ms'
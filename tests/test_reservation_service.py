@@ -0,0 +1,159 @@
+"""
+Tests for atomic seat reservation
+"""
+import threading
+import pytest
+from app import create_app, db
+from app.models import Company, Event, EventSeating, Reservation
+from app.models.reservation import ReservationStatus
+from app.models.seating import SeatStatus
+from app.services import reservation_events
+from app.services.reservation_service import ReservationService, SeatUnavailableError
+from config import TestingConfig
+
+
+def booking(seating_id, people=2, phone='05001234567'):
+    return {
+        'seating_id': seating_id,
+        'phone': phone,
+        'first_name': 'Seat',
+        'last_name': 'Race',
+        'number_of_people': people
+    }
+
+
+class TestReservationService:
+    """Test the available -> reserved transition"""
+
+    def test_create_marks_seat_reserved(self, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 2, reserve_every=0)
+            seating = EventSeating.query.filter_by(event_id=event.id).first()
+
+            reservation = ReservationService(event.id).create_reservation(booking(seating.id))
+
+            assert reservation.id is not None
+            assert db.session.get(EventSeating, seating.id).status == SeatStatus.RESERVED
+
+            with pytest.raises(SeatUnavailableError):
+                ReservationService(event.id).create_reservation(booking(seating.id))
+            assert Reservation.query.count() == 1
+
+    def test_seat_with_active_reservation_is_not_double_booked(self, app, create_seatings):
+        """Legacy rows whose status was never flipped are still protected"""
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 1, reserve_every=1)
+            seating = EventSeating.query.filter_by(event_id=event.id).first()
+            assert seating.status == SeatStatus.AVAILABLE
+
+            with pytest.raises(SeatUnavailableError):
+                ReservationService(event.id).create_reservation(booking(seating.id))
+
+    def test_capacity_and_unknown_seat(self, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 1, reserve_every=0, capacity=2)
+            seating = EventSeating.query.filter_by(event_id=event.id).first()
+            service = ReservationService(event.id)
+
+            with pytest.raises(ValueError, match='kapasite'):
+                service.create_reservation(booking(seating.id, people=5))
+            with pytest.raises(ValueError, match='Geçersiz'):
+                service.create_reservation(booking(999999))
+
+            assert db.session.get(EventSeating, seating.id).status == SeatStatus.AVAILABLE
+
+    def test_cancellation_releases_seat(self, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 1, reserve_every=0)
+            seating = EventSeating.query.filter_by(event_id=event.id).first()
+            reservation = ReservationService(event.id).create_reservation(booking(seating.id))
+
+            reservation.status = ReservationStatus.CANCELLED
+            reservation_events.on_reservations_cancelled(event.id, [reservation])
+            db.session.commit()
+
+            assert db.session.get(EventSeating, seating.id).status == SeatStatus.AVAILABLE
+            ReservationService(event.id).create_reservation(booking(seating.id))
+
+    def test_create_route_returns_conflict(self, admin_client, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 1, reserve_every=0)
+            seating_id = EventSeating.query.filter_by(event_id=event.id).first().id
+            event_id = event.id
+
+        response = admin_client.post(f'/create/{event_id}', json=booking(seating_id))
+        assert response.status_code == 200
+        assert response.get_json()['success'] is True
+
+        response = admin_client.post(f'/create/{event_id}', json=booking(seating_id))
+        assert response.status_code == 409
+        assert response.get_json()['conflict'] is True
+
+
+class TestConcurrentBooking:
+    """Fire parallel bookings at one seat; exactly one may win"""
+
+    BOOKERS = 8
+
+    @pytest.fixture
+    def file_app(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI',
+                            f"sqlite:///{tmp_path / 'race.db'}")
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_ENGINE_OPTIONS',
+                            {'connect_args': {'timeout': 30, 'check_same_thread': False}})
+        app = create_app('testing')
+
+        with app.app_context():
+            db.create_all()
+            yield app
+            db.session.remove()
+            db.drop_all()
+
+    def test_exactly_one_parallel_booking_wins(self, file_app, create_seatings):
+        with file_app.app_context():
+            company = Company(name='Race', email='race@example.com', phone='05001234567')
+            db.session.add(company)
+            db.session.flush()
+            event = Event(name='Race', event_date=db.func.current_date(), company_id=company.id)
+            db.session.add(event)
+            db.session.commit()
+            create_seatings(event, 1, reserve_every=0, capacity=10)
+            event_id = event.id
+            seating_id = EventSeating.query.first().id
+
+        barrier = threading.Barrier(self.BOOKERS)
+        outcomes = []
+        lock = threading.Lock()
+
+        def book(index):
+            with file_app.app_context():
+                barrier.wait()
+                try:
+                    ReservationService(event_id).create_reservation(
+                        booking(seating_id, phone=f'0500123{index:04d}')
+                    )
+                    outcome = 'won'
+                except SeatUnavailableError:
+                    outcome = 'conflict'
+                finally:
+                    db.session.remove()
+                with lock:
+                    outcomes.append(outcome)
+
+        threads = [threading.Thread(target=book, args=(i,)) for i in range(self.BOOKERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert outcomes.count('won') == 1
+        assert outcomes.count('conflict') == self.BOOKERS - 1
+
+        with file_app.app_context():
+            assert Reservation.query.filter_by(seating_id=seating_id).count() == 1
+            assert db.session.get(EventSeating, seating_id).status == SeatStatus.RESERVED
@@ -0,0 +1,118 @@
+"""
+Tests for bulk seat generation
+"""
+import math
+import time
+from app import db
+from app.models import Event, EventSeating, SeatingType
+from app.services.seating_service import SeatingService
+
+
+def seatings(event_id):
+    return EventSeating.query.filter_by(event_id=event_id).order_by(EventSeating.id).all()
+
+
+class TestAddSeatingsToEvent:
+    """Test SeatingService.add_seatings_to_event"""
+
+    def test_grid_numbers_continue_after_existing_seats(self, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            seating_type = create_seatings(event, 3, reserve_every=0)
+            EventSeating.query.filter_by(seat_number='M002').delete()
+            db.session.commit()
+
+            result = SeatingService(event.company_id).add_seatings_to_event(event.id, [
+                {'seating_type_id': seating_type.id, 'count': 4, 'columns': 2,
+                 'position_x': 0, 'position_y': 0, 'width': 50, 'height': 50, 'gap': 10}
+            ])
+
+            assert result['success'] and result['created_count'] == 4
+            added = seatings(event.id)[-4:]
+            assert [s.seat_number for s in added] == ['M004', 'M005', 'M006', 'M007']
+            assert [(s.position_x, s.position_y) for s in added] == [(0, 0), (60, 0), (0, 60), (60, 60)]
+
+    def test_rows_with_aisle(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            SeatingService(event.company_id).add_seatings_to_event(event.id, [
+                {'capacity': 1, 'seat_type': 'chair', 'count': 6, 'arrangement': 'rows', 'per_row': 3,
+                 'aisle_every': 2, 'aisle_width': 100, 'position_x': 0, 'position_y': 0,
+                 'width': 40, 'height': 40, 'gap': 10, 'row_gap': 30}
+            ])
+            positions = [(s.position_x, s.position_y) for s in seatings(event.id)]
+            assert positions == [(0, 0), (50, 0), (200, 0), (0, 70), (50, 70), (200, 70)]
+
+    def test_circle_is_evenly_spaced(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            SeatingService(event.company_id).add_seatings_to_event(event.id, [
+                {'capacity': 4, 'count': 8, 'arrangement': 'circle', 'radius': 200,
+                 'center_x': 400, 'center_y': 300, 'width': 50, 'height': 50}
+            ])
+            for seating in seatings(event.id):
+                distance = math.hypot(seating.position_x + 25 - 400, seating.position_y + 25 - 300)
+                assert abs(distance - 200) < 0.1
+
+    def test_default_type_is_created_once(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            service = SeatingService(event.company_id)
+            service.add_seatings_to_event(event.id, [
+                {'capacity': 4, 'seat_type': 'table', 'count': 2},
+                {'capacity': 4, 'seat_type': 'table', 'count': 2, 'position_y': 400}
+            ])
+            service.add_seatings_to_event(event.id, [{'capacity': 4, 'seat_type': 'table', 'count': 1}])
+
+            types = SeatingType.query.filter_by(name='Masa - 4 Kişilik').all()
+            assert len(types) == 1
+            assert EventSeating.query.filter_by(seating_type_id=types[0].id).count() == 5
+
+    def test_invalid_config_is_reported_and_others_saved(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            result = SeatingService(event.company_id).add_seatings_to_event(event.id, [
+                {'capacity': 4, 'count': 2, 'arrangement': 'spiral'},
+                {'capacity': 4, 'count': 3}
+            ])
+            assert result['created_count'] == 3
+            assert len(result['errors']) == 1
+
+    def test_single_insert_statement(self, app, query_counter):
+        with app.app_context():
+            event = Event.query.first()
+            service = SeatingService(event.company_id)
+            with query_counter() as statements:
+                service.add_seatings_to_event(event.id, [
+                    {'capacity': 1, 'seat_type': 'chair', 'count': 300, 'arrangement': 'rows', 'per_row': 30}
+                ])
+            inserts = [s for s in statements if s.lstrip().upper().startswith('INSERT INTO EVENT_SEATINGS')]
+            assert len(inserts) == 1
+            assert len(statements) < 20
+
+
+class TestGenerateSeatingsRoute:
+    """Test the bulk generation endpoint"""
+
+    def test_concert_hall(self, admin_client, app):
+        with app.app_context():
+            event_id = Event.query.first().id
+
+        started = time.perf_counter()
+        response = admin_client.post(f'/event/{event_id}/generate-seatings', json={'seatings': [
+            {'capacity': 1, 'seat_type': 'chair', 'count': 2000, 'arrangement': 'rows',
+             'per_row': 50, 'aisle_every': 10, 'width': 30, 'height': 30, 'gap': 5}
+        ]})
+        elapsed = time.perf_counter() - started
+
+        assert response.status_code == 201
+        assert response.get_json()['created_count'] == 2000
+        assert elapsed < 5
+
+        with app.app_context():
+            assert EventSeating.query.filter_by(event_id=event_id).count() == 2000
+
+    def test_requires_configs(self, admin_client, app):
+        with app.app_context():
+            event_id = Event.query.first().id
+        assert admin_client.post(f'/event/{event_id}/generate-seatings', json={}).status_code == 400
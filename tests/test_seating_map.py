@@ -0,0 +1,80 @@
+"""
+Tests for the controller seating map loader
+"""
+import pytest
+from app import db
+from app.models import Event, Reservation
+from app.models.reservation import ReservationStatus
+from app.services.seating_map_service import SeatingMapService
+
+
+class TestSeatingMapService:
+    """Test seating map data loading"""
+
+    def test_seating_map_marks_reserved_seats(self, app, create_seatings):
+        """Reserved seats carry their active reservation"""
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 4)
+
+            seatings = SeatingMapService(event.id).get_seating_map()
+
+            assert len(seatings) == 4
+            assert [s['status'] for s in seatings] == ['reserved', 'available', 'reserved', 'available']
+            assert seatings[0]['reservation']['name'] == 'Guest 0'
+            assert seatings[0]['capacity'] == 4
+            assert seatings[1]['reservation'] is None
+
+    def test_cancelled_reservation_frees_seat(self, app, create_seatings):
+        """Cancelled reservations are not shown on the map"""
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 1)
+            Reservation.query.update({'status': ReservationStatus.CANCELLED})
+            db.session.commit()
+
+            seatings = SeatingMapService(event.id).get_seating_map()
+
+            assert seatings[0]['status'] == 'available'
+            assert seatings[0]['reservation'] is None
+
+    @pytest.mark.parametrize('seat_count', [5, 60])
+    def test_seating_map_query_count_is_constant(self, app, query_counter, create_seatings, seat_count):
+        """Seating map uses a single query regardless of seat count"""
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, seat_count)
+            event_id = event.id
+            db.session.expunge_all()
+
+            with query_counter() as statements:
+                seatings = SeatingMapService(event_id).get_seating_map()
+                # Serialization must not trigger lazy loads either
+                assert len(seatings) == seat_count
+
+            assert len(statements) == 1
+
+
+class TestSeatingMapApi:
+    """Test seating map JSON endpoint"""
+
+    def test_api_requires_active_event(self, authenticated_client):
+        """Endpoint rejects requests without an active event"""
+        response = authenticated_client.get('/api/seating-map')
+        assert response.status_code == 400
+
+    def test_api_returns_seatings(self, authenticated_client, app, create_seatings):
+        """Endpoint returns map data for the active event"""
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 3)
+            event_id = event.id
+
+        authenticated_client.post(f'/select-event/{event_id}')
+        response = authenticated_client.get('/api/seating-map')
+
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data['event_id'] == event_id
+        assert len(data['seatings']) == 3
+        assert data['seatings'][0]['status'] == 'reserved'
@@ -0,0 +1,101 @@
+"""
+Tests for the process-wide seating type registry
+"""
+from app import db
+from app.models import CacheVersion, Event, SeatingType
+from app.services.cache_versions import read_version
+from app.services.seating_type_registry import VERSION_NAME, seating_type_registry
+
+
+def add_type(name='Loca', capacity=6):
+    seating_type = SeatingType(name=name, seat_type='table', capacity=capacity)
+    db.session.add(seating_type)
+    db.session.commit()
+    return seating_type
+
+
+class TestSeatingTypeRegistry:
+    """Test loading, invalidation and version checks"""
+
+    def test_reads_from_memory_after_first_load(self, app, query_counter):
+        with app.app_context():
+            type_id = add_type().id
+            seating_type_registry.all()
+
+            with query_counter() as statements:
+                assert seating_type_registry.get(type_id).capacity == 6
+                assert seating_type_registry.capacity(9999, default=3) == 3
+
+            assert statements == []
+
+    def test_create_update_and_delete_bump_version(self, app):
+        with app.app_context():
+            start = read_version(VERSION_NAME)
+            seating_type = add_type()
+            assert seating_type_registry.get(seating_type.id).name == 'Loca'
+
+            seating_type.capacity = 10
+            db.session.commit()
+            assert seating_type_registry.capacity(seating_type.id) == 10
+
+            db.session.delete(seating_type)
+            db.session.commit()
+            assert seating_type_registry.get(seating_type.id) is None
+            assert read_version(VERSION_NAME) == start + 3
+
+    def test_rollback_does_not_leave_phantom_type(self, app):
+        with app.app_context():
+            seating_type = SeatingType(name='Geçici', seat_type='table', capacity=2)
+            db.session.add(seating_type)
+            db.session.flush()
+            type_id = seating_type.id
+            seating_type_registry.all()
+            db.session.rollback()
+
+            assert seating_type_registry.get(type_id) is None
+
+    def test_other_worker_change_seen_after_check_interval(self, app):
+        with app.app_context():
+            seating_type = add_type()
+            seating_type_registry.get(seating_type.id)
+            seating_type_registry.check_interval = 3600
+
+            # Başka bir worker: tabloyu ve sayacı doğrudan değiştirir
+            db.session.execute(SeatingType.__table__.update().values(capacity=12))
+            db.session.execute(CacheVersion.__table__.update().values(version=CacheVersion.version + 1))
+            db.session.commit()
+            assert seating_type_registry.capacity(seating_type.id) == 6
+
+            seating_type_registry.check_interval = 0
+            assert seating_type_registry.capacity(seating_type.id) == 12
+
+    def test_total_capacity_does_not_load_types_per_seat(self, app, create_seatings, query_counter):
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 10, reserve_every=0, capacity=4)
+            seating_type_registry.all()
+            event = db.session.get(Event, event.id)
+
+            with query_counter() as statements:
+                assert event.total_capacity == 40
+
+            assert len(statements) == 1
+
+
+class TestRegistryRoutes:
+    """Test routes reading the registry"""
+
+    def test_seating_config_lists_types(self, admin_client, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            event_id = event.id
+            create_seatings(event, 2, reserve_every=0, capacity=8)
+
+        data = admin_client.get(f'/event/{event_id}/seating-config').get_json()['data']
+        assert [t['capacity'] for t in data['seating_types']] == [8]
+        assert {s['capacity'] for s in data['seatings']} == {8}
+
+    def test_admin_created_type_is_visible(self, admin_client, app):
+        admin_client.post('/seating-types/create', data={'name': 'Balkon', 'capacity': 3})
+        response = admin_client.get('/seating-types')
+        assert 'Balkon' in response.get_data(as_text=True)
@@ -0,0 +1,110 @@
+"""
+Tests for the spatial grid used by seating layout validation
+"""
+import random
+import pytest
+from app import db
+from app.models import Event, EventSeating
+from app.services.seating_service import SeatingService
+from app.utils.spatial_grid import SpatialGrid, cell_size_for, find_layout_problems
+
+
+def brute_force(rects):
+    pairs = []
+    for index, (a, ax, ay, aw, ah) in enumerate(rects):
+        for b, bx, by, bw, bh in rects[index + 1:]:
+            if ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah:
+                pairs.append((a, b))
+    return pairs
+
+
+class TestSpatialGrid:
+    """Test overlap and bounds detection"""
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_matches_pairwise_comparison(self, seed):
+        rng = random.Random(seed)
+        rects = [
+            (i, rng.uniform(-50, 900), rng.uniform(-50, 700), rng.choice([20, 50, 60, 140]), rng.choice([20, 40, 50, 90]))
+            for i in range(300)
+        ]
+        assert SpatialGrid.build(rects, grid_size=20).overlapping_pairs() == brute_force(rects)
+
+    def test_touching_edges_do_not_overlap(self):
+        rects = [('a', 0, 0, 40, 40), ('b', 40, 0, 40, 40), ('c', 0, 40, 40, 40), ('d', 39, 39, 2, 2)]
+        assert SpatialGrid.build(rects, grid_size=20).overlapping_pairs() == [
+            ('a', 'd'), ('b', 'd'), ('c', 'd')
+        ]
+
+    def test_pair_spanning_many_cells_is_reported_once(self):
+        rects = [('stage', 0, 0, 400, 100), ('table', 100, 20, 200, 60)]
+        grid = SpatialGrid(cell_size=20)
+        for rect in rects:
+            grid.insert(*rect)
+        assert grid.overlapping_pairs() == [('stage', 'table')]
+
+    def test_out_of_bounds(self):
+        rects = [('in', 0, 0, 50, 50), ('right', 780, 0, 50, 50), ('top', 100, -1, 50, 50), ('edge', 750, 550, 50, 50)]
+        assert find_layout_problems(rects, 800, 600)['out_of_bounds'] == ['right', 'top']
+
+    def test_cell_size_is_multiple_of_grid(self):
+        rects = [(i, 0, 0, 50, 40) for i in range(3)]
+        assert cell_size_for(rects, 20) == 60
+        assert cell_size_for([], 25) == 25
+
+
+class TestValidateSeatingLayout:
+    """Test SeatingService.validate_seating_layout"""
+
+    def test_reports_overlaps_with_saved_and_new_seats(self, app, create_seatings, query_counter):
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 3, reserve_every=0)
+            service = SeatingService(event.company_id)
+            configs = [
+                {'name': 'A', 'capacity': 4, 'position_x': 10, 'position_y': 110, 'width': 50, 'height': 50},
+                {'name': 'B', 'capacity': 4, 'position_x': 30, 'position_y': 130, 'width': 50, 'height': 50},
+                {'name': 'C', 'capacity': 4, 'position_x': 790, 'position_y': 10, 'width': 50, 'height': 50},
+            ]
+
+            with query_counter() as statements:
+                result = service.validate_seating_layout(event.id, configs)
+
+            assert len(statements) <= 2
+            assert result['valid']
+            assert ('A', 'B') in result['overlaps']
+            assert ('A', 'M001') in result['overlaps']
+            assert result['out_of_bounds'] == ['C']
+
+    def test_edited_seat_replaces_saved_copy(self, app, create_seatings):
+        with app.app_context():
+            event = Event.query.first()
+            create_seatings(event, 2, reserve_every=0)
+            seating = EventSeating.query.filter_by(seat_number='M001').first()
+            configs = [{
+                'id': seating.id, 'seat_number': 'M001', 'capacity': 4,
+                'position_x': seating.position_x + 5, 'position_y': seating.position_y,
+                'width': seating.width, 'height': seating.height
+            }]
+
+            result = SeatingService(event.company_id).validate_seating_layout(event.id, configs)
+            assert result['overlaps'] == []
+
+    def test_invalid_capacity_and_position(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            result = SeatingService(event.company_id).validate_seating_layout(event.id, [
+                {'name': 'X', 'capacity': 0, 'position_x': -10, 'position_y': 0}
+            ])
+            assert not result['valid']
+            assert len(result['issues']) == 2
+
+    def test_uses_event_canvas_size(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            event.canvas_width, event.canvas_height = 2000, 1000
+            db.session.commit()
+            result = SeatingService(event.company_id).validate_seating_layout(event.id, [
+                {'name': 'Far', 'capacity': 4, 'position_x': 1500, 'position_y': 500}
+            ])
+            assert result['out_of_bounds'] == []
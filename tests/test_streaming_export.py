@@ -0,0 +1,128 @@
+"""
+Tests for streaming CSV, write-only Excel and pandas-free exports
+"""
+import csv
+import io
+import os
+import subprocess
+import sys
+import uuid
+from openpyxl import load_workbook
+from app import db
+from app.models import Event, Company, Reservation
+from app.services import export_service
+from app.services.analytics_service import AnalyticsService, EXPORT_COLUMNS, ExportRow
+from app.services.export_service import ExportService
+
+
+def add_reservations(event, count):
+    for i in range(count):
+        db.session.add(Reservation(
+            event_id=event.id,
+            phone='05001234567',
+            first_name=f'Gäst{i}',
+            last_name='Şahin',
+            reservation_code=str(uuid.uuid4())
+        ))
+    db.session.commit()
+
+
+class TestStreamingCsv:
+    """Test chunked CSV generation"""
+
+    def test_stream_emits_chunks_with_single_bom(self, app, monkeypatch):
+        monkeypatch.setattr(export_service, 'CSV_CHUNK_ROWS', 10)
+
+        with app.app_context():
+            event = Event.query.first()
+            add_reservations(event, 25)
+
+            chunks = list(ExportService().stream_csv(event_id=event.id, file_format='utf-8-sig'))
+
+        assert len(chunks) == 3
+        data = b''.join(chunks)
+        assert data.count(b'\xef\xbb\xbf') == 1
+
+        rows = list(csv.reader(io.StringIO(data.decode('utf-8-sig'))))
+        assert rows[0] == EXPORT_COLUMNS
+        assert len(rows) == 26
+        assert rows[1][2] == 'Gäst0'
+
+    def test_company_export_route_streams(self, admin_client, app):
+        with app.app_context():
+            event = Event.query.first()
+            add_reservations(event, 3)
+            other = Company(name='Other', email='other@example.com', phone='05009999999')
+            db.session.add(other)
+            db.session.commit()
+            other_event = Event(name='Other Event', company_id=other.id, event_date=event.event_date)
+            db.session.add(other_event)
+            db.session.commit()
+            add_reservations(other_event, 2)
+            event_id, other_event_id = event.id, other_event.id
+
+        response = admin_client.get('/export/csv')
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == 'text/csv'
+        assert 'attachment' in response.headers['Content-Disposition']
+        assert len(response.data.decode('utf-8-sig').strip().splitlines()) == 4
+
+        response = admin_client.get(f'/export/csv?event_id={event_id}')
+        assert len(response.data.decode('utf-8-sig').strip().splitlines()) == 4
+
+        assert admin_client.get(f'/export/csv?event_id={other_event_id}').status_code == 404
+
+
+class TestWriteOnlyExcel:
+    """Test the write-only Excel workbook"""
+
+    def test_build_excel(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            add_reservations(event, 5)
+
+            data, filename = ExportService().build_excel(event.id, include_analytics=False)
+
+        assert filename.endswith('.xlsx')
+        sheet = load_workbook(io.BytesIO(data))['Rezervasyonlar']
+        rows = list(sheet.iter_rows(values_only=True))
+        assert list(rows[0]) == EXPORT_COLUMNS
+        assert len(rows) == 6
+        assert sheet['A1'].font.bold
+
+
+class TestExportRows:
+    """Test the pandas-free row pipeline"""
+
+    def test_rows_are_named_tuples(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            add_reservations(event, 3)
+
+            rows = list(AnalyticsService().iter_export_rows(event_id=event.id, limit=2))
+
+            assert len(rows) == 2
+            assert isinstance(rows[0], ExportRow)
+            assert rows[0].Ad == 'Gäst0'
+            assert rows[0].Etkinlik == event.name
+
+            df = AnalyticsService().export_data_to_dataframe(event.id)
+            assert list(df.columns) == EXPORT_COLUMNS
+            assert len(df) == 3
+
+    def test_pdf_reservation_list(self, app):
+        with app.app_context():
+            event = Event.query.first()
+            add_reservations(event, 25)
+
+            data, filename = ExportService().build_pdf(event.id, 'reservations')
+
+        assert data.startswith(b'%PDF')
+        assert filename.endswith('.pdf')
+
+    def test_export_module_does_not_load_pandas(self):
+        code = 'import sys, app.services.export_service; print("pandas" in sys.modules)'
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.dirname(__file__)))
+        assert result.stdout.strip() == 'False', result.stderr